@@ -0,0 +1,18 @@
+"""
+Approvals Admin Configuration
+"""
+from django.contrib import admin
+from .models import PendingCount
+
+
+@admin.register(PendingCount)
+class PendingCountAdmin(admin.ModelAdmin):
+    """Pending counters (maintained by signals, read-only)"""
+    list_display = ['school', 'kind', 'department', 'count']
+    list_filter = ['kind', 'school']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
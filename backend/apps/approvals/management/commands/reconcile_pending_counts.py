@@ -0,0 +1,44 @@
+"""
+Compare the approval queue counters with the pending records they count
+
+Usage:
+    python manage.py reconcile_pending_counts               # report drift
+    python manage.py reconcile_pending_counts --fix         # repair it
+"""
+from django.core.management.base import BaseCommand
+
+from apps.approvals import queues
+from apps.approvals.models import PendingCount
+
+
+class Command(BaseCommand):
+    help = 'Detect and optionally repair drift in approval queue pending counts'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Recount every queue')
+    
+    def handle(self, *args, **options):
+        actual = queues.actual_counts()
+        stored = {
+            (row.kind, row.school_id, row.department_id): row.count
+            for row in PendingCount.objects.all()
+        }
+        
+        drifted = 0
+        for key in sorted(set(actual) | set(stored)):
+            counter, count = stored.get(key, 0), actual.get(key, 0)
+            if counter != count:
+                drifted += 1
+                kind, school_id, department_id = key
+                self.stdout.write(
+                    f'{kind} school {school_id} department {department_id}: '
+                    f'counter {counter}, actual {count} (drift {counter - count})'
+                )
+        
+        if options['fix'] and drifted:
+            queues.rebuild()
+        
+        verb = 'Fixed' if options['fix'] else 'Found'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {len(set(actual) | set(stored))} queues. {verb} {drifted} with drift.'
+        ))
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+# kind: (app label, model, lookup of the department a row is queued under)
+QUEUES = {
+    'EXPENSE': ('finance', 'Expense', 'department_id'),
+    'BUDGET': ('budget', 'Budget', 'department_id'),
+    'SALARY': ('salary', 'Salary', 'employee__department_id'),
+}
+
+
+def seed_pending_counts(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    PendingCount = apps.get_model('approvals', 'PendingCount')
+    counts = []
+    for kind, (app_label, model_name, department) in QUEUES.items():
+        rows = apps.get_model(app_label, model_name).objects.using(db_alias).filter(status='PENDING')
+        for row in rows.values('school_id', department).annotate(waiting=Count('id')):
+            counts.append(PendingCount(
+                kind=kind, school_id=row['school_id'], department_id=row[department], count=row['waiting'],
+            ))
+    PendingCount.objects.using(db_alias).bulk_create(counts, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('budget', '0005_pending_partial_index'),
+        ('departments', '0002_school'),
+        ('finance', '0008_pending_partial_index'),
+        ('salary', '0004_pending_partial_index'),
+        ('schools', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('EXPENSE', 'Expense'), ('BUDGET', 'Budget'), ('SALARY', 'Salary')], max_length=7)),
+                ('count', models.IntegerField(default=0)),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='departments.department')),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='schools.school')),
+            ],
+            options={
+                'db_table': 'approval_pending_counts',
+                'ordering': ['kind', 'department'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='pendingcount',
+            constraint=models.UniqueConstraint(fields=('school', 'kind', 'department'), name='unique_pending_count'),
+        ),
+        migrations.RunPython(seed_pending_counts, migrations.RunPython.noop),
+    ]
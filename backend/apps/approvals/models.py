@@ -0,0 +1,33 @@
+"""
+Approvals Models - pending counts behind the approval inbox badges
+"""
+from django.db import models
+
+
+class PendingCount(models.Model):
+    """Records of one kind waiting for an approver in a department of a school
+
+    Maintained by apps.approvals.signals; ``reconcile_pending_counts``
+    repairs drift.
+    """
+    
+    KIND_CHOICES = [
+        ('EXPENSE', 'Expense'),
+        ('BUDGET', 'Budget'),
+        ('SALARY', 'Salary'),
+    ]
+    
+    school = models.ForeignKey('schools.School', on_delete=models.CASCADE, related_name='+')
+    kind = models.CharField(max_length=7, choices=KIND_CHOICES)
+    department = models.ForeignKey('departments.Department', on_delete=models.CASCADE, related_name='+')
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'approval_pending_counts'
+        ordering = ['kind', 'department']
+        constraints = [
+            models.UniqueConstraint(fields=['school', 'kind', 'department'], name='unique_pending_count'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} - department {self.department_id}: {self.count}"
@@ -0,0 +1,133 @@
+"""
+Approval queues - records waiting for an approver, and how many
+
+- ``EXPENSE``: expenses entered and not yet approved or rejected
+- ``BUDGET``: budgets submitted for approval
+- ``SALARY``: salaries generated and not yet paid, queued under the
+  employee's department
+
+Each model has a partial index on its ``PENDING`` rows, so reading a queue
+touches only those rows however many approved and paid ones the years have
+left behind.
+
+The number waiting per school, kind and department is kept in
+``PendingCount``: signals move one unit between rows as a record enters,
+leaves or moves within a queue (the same F() update as the cash-flow
+accumulators), so badges read a few counter rows instead of counting.
+Archiving a year skips signals and rebuilds the counters;
+``reconcile_pending_counts`` repairs drift.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from apps.budget.models import Budget
+from apps.core import tenancy
+from apps.finance.models import Expense
+from apps.salary.models import Salary
+from .models import PendingCount
+
+# kind: (model, lookup of the department a row is queued under)
+QUEUES = {
+    'EXPENSE': (Expense, 'department_id'),
+    'BUDGET': (Budget, 'department_id'),
+    'SALARY': (Salary, 'employee__department_id'),
+}
+
+# kind: the user check of the viewset action that clears it (approve, approve, mark_paid)
+ACTORS = {
+    'EXPENSE': 'has_finance_access',
+    'BUDGET': 'has_finance_access',
+    'SALARY': 'has_finance_access',
+}
+
+# kind: (fields of an inbox item, oldest first order)
+ITEMS = {
+    'EXPENSE': (('id', 'version', 'category_id', 'amount', 'date', 'description', 'requested_by_id', 'created_at'), ('date', 'id')),
+    'BUDGET': (('id', 'version', 'financial_year', 'month', 'allocated_amount', 'notes', 'created_by_id', 'created_at'), ('created_at', 'id')),
+    'SALARY': (('id', 'version', 'employee_id', 'employee__first_name', 'employee__last_name', 'month', 'year', 'net_amount'), ('year', 'month', 'id')),
+}
+
+QUEUE_MODELS = ['finance.Expense', 'budget.Budget', 'salary.Salary', 'salary.Employee', 'departments.Department']
+
+
+def actionable_kinds(user):
+    """Queues ``user`` can clear"""
+    return [kind for kind, check in ACTORS.items() if getattr(user, check)()]
+
+
+# Counters
+
+def pending_key(kind, status, school_id, department_id):
+    """The counter a record in ``status`` counts in, None when it is not waiting"""
+    if status != 'PENDING':
+        return None
+    return kind, school_id, department_id
+
+
+def add(key, delta):
+    """``count += delta`` on the counter of ``key``, creating it if missing"""
+    kind, school_id, department_id = key
+    rows = PendingCount.objects.filter(school_id=school_id, kind=kind, department_id=department_id)
+    if rows.update(count=F('count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            PendingCount.objects.create(school_id=school_id, kind=kind, department_id=department_id, count=delta)
+    except IntegrityError:
+        # Created concurrently
+        rows.update(count=F('count') + delta)
+
+
+def move(before, after):
+    """Move one record between counters (keys of ``pending_key``)"""
+    if before == after:
+        return
+    if before:
+        add(before, -1)
+    if after:
+        add(after, 1)
+
+
+def actual_counts():
+    """``{(kind, school_id, department_id): count}`` counted from the pending rows"""
+    counts = {}
+    for kind, (model, department) in QUEUES.items():
+        rows = model.objects.filter(status='PENDING').values('school_id', department).annotate(waiting=Count('id'))
+        for row in rows:
+            counts[(kind, row['school_id'], row[department])] = row['waiting']
+    return counts
+
+
+@transaction.atomic
+def rebuild():
+    """Recount every queue, after writes that skip signals (archiving)"""
+    PendingCount.objects.all().delete()
+    PendingCount.objects.bulk_create([
+        PendingCount(kind=kind, school_id=school_id, department_id=department_id, count=count)
+        for (kind, school_id, department_id), count in actual_counts().items()
+    ], batch_size=500)
+
+
+# Inbox
+
+def waiting(kinds):
+    """``{kind: {department_id: count}}`` of the current school, from the counters"""
+    result = {kind: {} for kind in kinds}
+    rows = tenancy.scoped(PendingCount.objects.filter(kind__in=kinds, count__gt=0)).values_list(
+        'kind', 'department_id', 'count',
+    )
+    for kind, department_id, count in rows:
+        result[kind][department_id] = count
+    return result
+
+
+def oldest_pending(kind, limit):
+    """The ``limit`` oldest pending records of each department, one query through the partial index"""
+    model, department = QUEUES[kind]
+    fields, order = ITEMS[kind]
+    rows = tenancy.scoped(model.objects.filter(status='PENDING')).annotate(
+        queue_department_id=F(department),
+        position=Window(RowNumber(), partition_by=[F(department)], order_by=[F(name).asc() for name in order]),
+    ).filter(position__lte=limit).order_by('queue_department_id', 'position')
+    return rows.values('queue_department_id', *fields)
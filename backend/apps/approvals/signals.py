@@ -0,0 +1,82 @@
+"""
+Approvals Signals - keep the pending counters in step with the queues
+
+See apps.approvals.queues; each save or delete moves the record between
+counters from its stored state to its new one.
+"""
+from django.db.models import Count
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.budget.models import Budget
+from apps.finance.models import Expense
+from apps.salary.models import Employee, Salary
+from . import queues
+
+
+def stored_key(kind, before):
+    if not before:
+        return None
+    return queues.pending_key(kind, before['status'], before['school_id'], before['department_id'])
+
+
+@receiver(post_save, sender=Expense, dispatch_uid='approvals.expense.save')
+@receiver(post_save, sender=Budget, dispatch_uid='approvals.budget.save')
+def record_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    kind = 'EXPENSE' if sender is Expense else 'BUDGET'
+    queues.move(
+        stored_key(kind, instance.stored_state(created)),
+        queues.pending_key(kind, instance.status, instance.school_id, instance.department_id),
+    )
+
+
+@receiver(post_delete, sender=Expense, dispatch_uid='approvals.expense.delete')
+@receiver(post_delete, sender=Budget, dispatch_uid='approvals.budget.delete')
+def record_deleted(sender, instance, **kwargs):
+    kind = 'EXPENSE' if sender is Expense else 'BUDGET'
+    queues.move(stored_key(kind, instance.stored_state()), None)
+
+
+def stored_salary_key(salary, before):
+    """Counter of the salary as stored; its school and department are its employee's"""
+    if not before or before['status'] != 'PENDING':
+        return None
+    if before['employee_id'] == salary.employee_id:
+        school_id, department_id = salary.school_id, salary.employee.department_id
+    else:
+        school_id, department_id = Employee.objects.filter(pk=before['employee_id']).values_list(
+            'school_id', 'department_id',
+        ).get()
+    return queues.pending_key('SALARY', 'PENDING', school_id, department_id)
+
+
+@receiver(post_save, sender=Salary, dispatch_uid='approvals.salary.save')
+def salary_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    before = instance.stored_state(created)
+    if instance.status != 'PENDING' and not (before and before['status'] == 'PENDING'):
+        return
+    queues.move(
+        stored_salary_key(instance, before),
+        queues.pending_key('SALARY', instance.status, instance.school_id, instance.employee.department_id),
+    )
+
+
+@receiver(post_delete, sender=Salary, dispatch_uid='approvals.salary.delete')
+def salary_deleted(sender, instance, **kwargs):
+    queues.move(stored_salary_key(instance, instance.stored_state()), None)
+
+
+@receiver(post_save, sender=Employee, dispatch_uid='approvals.employee.save')
+def employee_saved(sender, instance, created, raw=False, **kwargs):
+    """An employee changing department takes their pending salaries along"""
+    before = instance.stored_state(created)
+    if raw or not before or before['department_id'] == instance.department_id:
+        return
+    rows = Salary.objects.filter(employee=instance, status='PENDING').values('school_id').annotate(waiting=Count('id'))
+    for row in rows:
+        queues.add(('SALARY', row['school_id'], before['department_id']), -row['waiting'])
+        queues.add(('SALARY', row['school_id'], instance.department_id), row['waiting'])
@@ -0,0 +1,10 @@
+"""
+Approvals URLs
+"""
+from django.urls import path
+from .views import ApprovalInboxView, ApprovalCountsView
+
+urlpatterns = [
+    path('', ApprovalInboxView.as_view(), name='approval-inbox'),
+    path('counts/', ApprovalCountsView.as_view(), name='approval-counts'),
+]
@@ -0,0 +1,105 @@
+"""
+Approvals Views - the approval inbox
+"""
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.refdata import refdata, DEPARTMENT, EXPENSE_CATEGORY
+from . import queues
+
+
+class ApprovalViewMixin(ConditionalGetMixin):
+    permission_classes = [IsAuthenticated]
+    conditional_models = queues.QUEUE_MODELS
+    
+    def requested_kinds(self, request):
+        """Kinds asked for with ``?types=`` that the user can act on; raises ValueError for unknown ones"""
+        kinds = queues.actionable_kinds(request.user)
+        types = request.query_params.get('types')
+        if not types:
+            return kinds
+        requested = [kind.strip().upper() for kind in types.split(',')]
+        unknown = [kind for kind in requested if kind not in queues.QUEUES]
+        if unknown:
+            raise ValueError(f'Unknown types: {", ".join(unknown)}')
+        return [kind for kind in kinds if kind in requested]
+    
+    def get_conditional_key_parts(self, request):
+        # The queues shown follow the role
+        return (getattr(request.user, 'role', ''),)
+
+
+class ApprovalCountsView(ApprovalViewMixin, APIView):
+    """Pending counts per type and department for badges, read from the maintained counters"""
+    
+    def get(self, request):
+        try:
+            kinds = self.requested_kinds(request)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        waiting = queues.waiting(kinds)
+        counts = {kind: sum(by_department.values()) for kind, by_department in waiting.items()}
+        return Response({
+            'counts': counts,
+            'total': sum(counts.values()),
+            'departments': waiting,
+        })
+
+
+class ApprovalInboxView(ApprovalViewMixin, APIView):
+    """Pending expenses, budgets and salaries the user can act on, by type and department
+
+    ``GET /api/approvals/`` returns the count of each type and, for every
+    department with work waiting, its count and its oldest ``?limit`` items
+    (default ``APPROVAL_INBOX_ITEMS``). ``?types=EXPENSE,SALARY`` limits the
+    types. Roles that approve nothing get empty queues.
+    """
+    
+    def get(self, request):
+        try:
+            kinds = self.requested_kinds(request)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', settings.APPROVAL_INBOX_ITEMS)),
+                        settings.APPROVAL_INBOX_MAX_ITEMS)
+        except ValueError:
+            return Response({'error': 'limit must be a whole number'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        waiting = queues.waiting(kinds)
+        groups = []
+        for kind in kinds:
+            items = {}
+            if waiting[kind] and limit > 0:
+                for row in queues.oldest_pending(kind, limit):
+                    items.setdefault(row.pop('queue_department_id'), []).append(self.item(kind, row))
+            
+            departments = set(waiting[kind]) | set(items)
+            for department_id in sorted(departments, key=lambda pk: refdata.name(DEPARTMENT, pk) or ''):
+                groups.append({
+                    'type': kind,
+                    'department_id': department_id,
+                    'department_name': refdata.name(DEPARTMENT, department_id),
+                    'count': waiting[kind].get(department_id, 0),
+                    'items': items.get(department_id, []),
+                })
+        
+        counts = {kind: sum(by_department.values()) for kind, by_department in waiting.items()}
+        return Response({
+            'counts': counts,
+            'total': sum(counts.values()),
+            'groups': groups,
+        })
+    
+    def item(self, kind, row):
+        if kind == 'EXPENSE':
+            row['category_name'] = refdata.name(EXPENSE_CATEGORY, row['category_id'])
+            row['description'] = row['description'][:120]
+        elif kind == 'SALARY':
+            row['employee_name'] = f"{row.pop('employee__first_name')} {row.pop('employee__last_name')}"
+        return row
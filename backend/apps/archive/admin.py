@@ -0,0 +1,46 @@
+from django.contrib import admin
+from apps.core.admin_performance import PerformanceAdminMixin, PeriodListFilter
+from .models import ArchivedFinancialYear, ArchivedIncome, ArchivedExpense, ArchivedSalary
+
+
+class ReadOnlyArchiveAdmin(PerformanceAdminMixin, admin.ModelAdmin):
+    """Archived rows are only moved by the archive_financial_year command"""
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedFinancialYear)
+class ArchivedFinancialYearAdmin(ReadOnlyArchiveAdmin):
+    list_display = ['__str__', 'school', 'income_rows', 'expense_rows', 'salary_rows', 'archived_by', 'archived_at']
+    list_filter = ['school']
+
+
+@admin.register(ArchivedIncome)
+class ArchivedIncomeAdmin(ReadOnlyArchiveAdmin):
+    list_display = ['id', 'income_source', 'amount', 'date', 'department', 'fiscal_year']
+    list_filter = [PeriodListFilter, 'income_source']
+    search_fields = ['reference_id', 'description', 'student_ref']
+    performance_select_related = ['income_source', 'department']
+
+
+@admin.register(ArchivedExpense)
+class ArchivedExpenseAdmin(ReadOnlyArchiveAdmin):
+    list_display = ['id', 'category', 'department', 'amount', 'date', 'status', 'fiscal_year']
+    list_filter = [PeriodListFilter, 'status', 'department']
+    search_fields = ['reference_id', 'description']
+    performance_select_related = ['category', 'department']
+
+
+@admin.register(ArchivedSalary)
+class ArchivedSalaryAdmin(ReadOnlyArchiveAdmin):
+    list_display = ['id', 'employee', 'month', 'year', 'net_amount', 'status']
+    list_filter = ['year', 'status']
+    search_fields = ['employee__first_name', 'employee__last_name', 'employee__employee_id']
+    performance_select_related = ['employee']
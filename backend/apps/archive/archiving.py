@@ -0,0 +1,126 @@
+"""
+Moving closed financial years between the hot tables and the archive
+
+Each school archives its own years, and only once it has closed them
+(see apps.reports.snapshots). Rows are copied with one INSERT ... SELECT
+per table and removed with a plain DELETE, so ids, timestamps and
+receipts are preserved and no model signals fire: moving a year neither
+changes any total (budget spend counters stay as they are) nor looks like
+a burst of edits. DataVersion counters are bumped once per table
+afterwards so cached reports and ETags are invalidated, the sync journal
+is reset (clients reload their lists instead of receiving a deletion per
+moved row) and the approval queue counters are recounted. Everything runs
+on the database the router picks for the school, in one transaction there.
+"""
+from django.db import connections, router, transaction
+from django.db.models import Q
+
+from apps.approvals import queues
+from apps.core import periods, tenancy
+from apps.core.models import DataVersion
+from apps.finance.models import Income, Expense, ExpenseFlag
+from apps.reports.models import ClosedPeriod
+from apps.salary.models import Salary
+from apps.sync import journal
+from .ledger import ARCHIVE_MODELS
+from .models import ArchivedFinancialYear
+
+
+def year_filter(model, school_id, fiscal_year, connection):
+    """SQL condition and params selecting a school's rows of a financial year"""
+    quote = connection.ops.quote_name
+    if not any(field.name == 'fiscal_year' for field in model._meta.concrete_fields):
+        # salaries carry a calendar month/year, e.g. 2024-25 is 4/2024 .. 3/2025
+        return (
+            f'{quote("school_id")} = %s AND '
+            f'(({quote("year")} = %s AND {quote("month")} >= %s) OR '
+            f'({quote("year")} = %s AND {quote("month")} < %s))',
+            [school_id, fiscal_year, periods.FISCAL_YEAR_START_MONTH,
+             fiscal_year + 1, periods.FISCAL_YEAR_START_MONTH],
+        )
+    return f'{quote("school_id")} = %s AND {quote("fiscal_year")} = %s', [school_id, fiscal_year]
+
+
+def move_rows(source, target, school_id, fiscal_year):
+    """Copy a school's rows of a year from ``source`` to ``target`` and delete them from ``source``"""
+    connection = connections[router.db_for_write(source)]
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(field.column) for field in source._meta.concrete_fields)
+    condition, params = year_filter(source, school_id, fiscal_year, connection)
+    source_table, target_table = quote(source._meta.db_table), quote(target._meta.db_table)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {target_table} ({columns}) '
+            f'SELECT {columns} FROM {source_table} WHERE {condition}',
+            params,
+        )
+        cursor.execute(f'DELETE FROM {source_table} WHERE {condition}', params)
+        moved = cursor.rowcount
+
+    DataVersion.bump(source._meta.label)
+    DataVersion.bump(target._meta.label)
+    return moved
+
+
+def archive_financial_year(fiscal_year, archived_by=''):
+    """Move the current school's Income, Expense and Salary rows of a closed year into the archive
+
+    Raises SchoolRequired (a ValueError) when no school is active in a
+    deployment of several schools, and ValueError when the school has not
+    closed the year or already archived it.
+    """
+    school = tenancy.schools.get(tenancy.default_school_id())
+    if school is None:
+        raise tenancy.SchoolRequired('Choose the school whose year to archive (--school)')
+    label = periods.financial_year_label(fiscal_year)
+
+    with tenancy.school_context(school), transaction.atomic(using=router.db_for_write(ArchivedFinancialYear)):
+        if not ClosedPeriod.objects.filter(school_id=school.pk, fiscal_year=fiscal_year, month__isnull=True).exists():
+            raise ValueError(f'{label} is not closed; close it (close_period) before archiving')
+        if ArchivedFinancialYear.objects.filter(school_id=school.pk, fiscal_year=fiscal_year).exists():
+            raise ValueError(f'{label} is already archived')
+
+        # Anomaly flags reference hot expense rows; a rescan rebuilds them after a restore
+        ExpenseFlag.objects.filter(
+            Q(expense__school_id=school.pk, expense__fiscal_year=fiscal_year)
+            | Q(related_expense__school_id=school.pk, related_expense__fiscal_year=fiscal_year)
+        ).delete()
+        counts = {
+            model: move_rows(model, archive_model, school.pk, fiscal_year)
+            for model, archive_model in ARCHIVE_MODELS.items()
+        }
+        journal.force_reset(f'archived {label} of {school.code}')
+        queues.rebuild()
+        return ArchivedFinancialYear.objects.create(
+            school_id=school.pk,
+            fiscal_year=fiscal_year,
+            income_rows=counts[Income],
+            expense_rows=counts[Expense],
+            salary_rows=counts[Salary],
+            archived_by=archived_by,
+        )
+
+
+def restore_financial_year(fiscal_year):
+    """Move a year the current school archived back into the hot tables"""
+    school = tenancy.schools.get(tenancy.default_school_id())
+    if school is None:
+        raise tenancy.SchoolRequired('Choose the school whose year to restore (--school)')
+    label = periods.financial_year_label(fiscal_year)
+
+    with tenancy.school_context(school), transaction.atomic(using=router.db_for_write(ArchivedFinancialYear)):
+        record = ArchivedFinancialYear.objects.select_for_update().filter(
+            school_id=school.pk, fiscal_year=fiscal_year,
+        ).first()
+        if record is None:
+            raise ValueError(f'{label} is not archived')
+
+        counts = {
+            model: move_rows(archive_model, model, school.pk, fiscal_year)
+            for model, archive_model in ARCHIVE_MODELS.items()
+        }
+        record.delete()
+        journal.force_reset(f'restored {label} of {school.code}')
+        queues.rebuild()
+        return counts
@@ -0,0 +1,110 @@
+"""
+Ledger queries spanning the hot tables and the archive
+
+Reports ask for a model plus a date range or a set of financial years and
+get back one queryset per table that can hold matching rows. The archive
+table is only included when the range overlaps an archived year, so
+reports over open years never touch it. While a school is active (see
+apps.core.tenancy) every table is filtered to its rows.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.utils.dateparse import parse_date
+
+from apps.core import periods, tenancy
+from apps.finance.models import Income, Expense
+from apps.salary.models import Salary
+from .models import ArchivedFinancialYear, ArchivedIncome, ArchivedExpense, ArchivedSalary
+
+ARCHIVE_MODELS = {
+    Income: ArchivedIncome,
+    Expense: ArchivedExpense,
+    Salary: ArchivedSalary,
+}
+
+
+def archived_years():
+    """Start years the current school archived (any school's while none is active)"""
+    years = ArchivedFinancialYear.objects.filter(**tenancy.school_filter(ArchivedFinancialYear))
+    return set(years.values_list('fiscal_year', flat=True))
+
+
+def _as_date(value):
+    return parse_date(value) if isinstance(value, str) else value
+
+
+def fiscal_years_between(start_date=None, end_date=None):
+    """Financial years touched by a date range, None when it is open-ended"""
+    start_date, end_date = _as_date(start_date), _as_date(end_date)
+    if not (start_date and end_date):
+        return None
+    return set(range(periods.fiscal_year_of(start_date), periods.fiscal_year_of(end_date) + 1))
+
+
+def ledger(model, start_date=None, end_date=None, fiscal_years=None, date_field='date', **filters):
+    """Querysets of ``model`` and, when needed, its archive table
+
+    ``start_date``/``end_date`` filter on ``date_field`` (inclusive);
+    ``fiscal_years`` narrows the archive check when the caller already
+    knows them. Extra keyword filters apply to every table, and so does the
+    current school.
+    """
+    if start_date:
+        filters[f'{date_field}__gte'] = start_date
+    if end_date:
+        filters[f'{date_field}__lte'] = end_date
+    filters.update(tenancy.school_filter(model))
+
+    querysets = [model.objects.filter(**filters)]
+
+    archive_model = ARCHIVE_MODELS.get(model)
+    if archive_model is not None:
+        if fiscal_years is None:
+            fiscal_years = fiscal_years_between(start_date, end_date)
+        archived = archived_years()
+        if archived and (fiscal_years is None or archived & set(fiscal_years)):
+            querysets.append(archive_model.objects.filter(**filters))
+
+    return querysets
+
+
+def ledger_total(querysets, field='amount'):
+    """Sum of ``field`` across the querysets of ``ledger()``"""
+    total = Decimal('0')
+    for queryset in querysets:
+        total += queryset.aggregate(total=Sum(field))['total'] or Decimal('0')
+    return total
+
+
+def ledger_grouped(querysets, group_by, field='amount'):
+    """``{group values: total}`` across the querysets of ``ledger()``
+
+    Keys are tuples of the ``group_by`` values, in order.
+    """
+    totals = defaultdict(Decimal)
+    for queryset in querysets:
+        rows = queryset.values(*group_by).annotate(total=Sum(field)).order_by()
+        for row in rows:
+            totals[tuple(row[name] for name in group_by)] += row['total'] or Decimal('0')
+    return dict(totals)
+
+
+def ledger_rows(querysets, limit):
+    """Up to ``limit`` rows, hot tables first"""
+    rows = []
+    for queryset in querysets:
+        if len(rows) >= limit:
+            break
+        rows.extend(queryset[:limit - len(rows)])
+    return rows
+
+
+def ledger_breakdown(querysets, group_by, field='amount'):
+    """``values(*group_by).annotate(total=Sum(field))`` rows, largest total first"""
+    totals = ledger_grouped(querysets, group_by, field)
+    return [
+        dict(zip(group_by, key), total=total)
+        for key, total in sorted(totals.items(), key=lambda item: -item[1])
+    ]
@@ -0,0 +1,71 @@
+"""
+Move a closed financial year out of the hot tables, or bring it back
+
+Usage:
+    python manage.py archive_financial_year 2022-23
+    python manage.py archive_financial_year 2022-23 --reopen
+    python manage.py archive_financial_year 2022-23 --school DPS    # deployments of several schools
+
+The school must have closed the year first (close_period 2022-23).
+"""
+from contextlib import nullcontext
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.archive.archiving import archive_financial_year, restore_financial_year
+from apps.core import periods, tenancy
+from apps.finance.models import Income, Expense
+from apps.salary.models import Salary
+
+
+class Command(BaseCommand):
+    help = "Archive a school's Income, Expense and Salary rows of a closed financial year"
+
+    def add_arguments(self, parser):
+        parser.add_argument('financial_year', help='e.g. 2022-23')
+        parser.add_argument(
+            '--reopen',
+            action='store_true',
+            help='Move an archived year back into the hot tables'
+        )
+        parser.add_argument('--school', metavar='CODE', help='School whose year to archive or bring back')
+
+    def handle(self, *args, **options):
+        school = None
+        if options['school']:
+            school = tenancy.schools.by_code(options['school'])
+            if school is None:
+                raise CommandError(f"Unknown school {options['school']}")
+        with tenancy.school_context(school) if school else nullcontext():
+            self.run(options)
+
+    def run(self, options):
+        try:
+            fiscal_year = periods.parse_financial_year(options['financial_year'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        label = periods.financial_year_label(fiscal_year)
+
+        if options['reopen']:
+            try:
+                counts = restore_financial_year(fiscal_year)
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(self.style.SUCCESS(
+                f'Reopened {label}: restored {counts[Income]} incomes, '
+                f'{counts[Expense]} expenses, {counts[Salary]} salaries'
+            ))
+            return
+
+        if fiscal_year >= periods.fiscal_year_of(date.today()):
+            raise CommandError(f'{label} is still open and cannot be archived')
+
+        try:
+            record = archive_financial_year(fiscal_year, archived_by='manage.py')
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {label}: {record.income_rows} incomes, '
+            f'{record.expense_rows} expenses, {record.salary_rows} salaries'
+        ))
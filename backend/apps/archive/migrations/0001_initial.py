@@ -0,0 +1,111 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('departments', '0001_initial'),
+        ('finance', '0002_period_keys'),
+        ('salary', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedFinancialYear',
+            fields=[
+                ('fiscal_year', models.PositiveSmallIntegerField(primary_key=True, serialize=False)),
+                ('income_rows', models.PositiveIntegerField(default=0)),
+                ('expense_rows', models.PositiveIntegerField(default=0)),
+                ('salary_rows', models.PositiveIntegerField(default=0)),
+                ('archived_by', models.CharField(blank=True, max_length=255)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'archived_financial_years',
+                'ordering': ['-fiscal_year'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedSalary',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('month', models.PositiveSmallIntegerField()),
+                ('year', models.PositiveIntegerField()),
+                ('base_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('allowances', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('deductions', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('net_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('status', models.CharField(max_length=10)),
+                ('payment_date', models.DateField(blank=True, null=True)),
+                ('payment_mode', models.CharField(blank=True, max_length=20, null=True)),
+                ('reference_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_salaries', to='salary.employee')),
+                ('processed_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'archived_salaries',
+                'ordering': ['-year', '-month', 'employee'],
+                'indexes': [models.Index(fields=['employee', 'year', 'month'], name='archived_sa_employe_55bf49_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedIncome',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('date', models.DateField()),
+                ('payment_mode', models.CharField(max_length=10)),
+                ('reference_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('student_id', models.CharField(blank=True, max_length=50, null=True)),
+                ('period_key', models.PositiveIntegerField()),
+                ('fiscal_year', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_incomes', to='departments.department')),
+                ('income_source', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_incomes', to='finance.incomesource')),
+                ('recorded_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'archived_incomes',
+                'ordering': ['-date', '-created_at'],
+                'indexes': [models.Index(fields=['fiscal_year', 'period_key'], name='archived_in_fiscal__65978c_idx'), models.Index(fields=['date'], name='archived_in_date_74d312_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedExpense',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('date', models.DateField()),
+                ('payment_mode', models.CharField(blank=True, max_length=10, null=True)),
+                ('reference_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('description', models.TextField()),
+                ('status', models.CharField(max_length=10)),
+                ('receipt', models.FileField(blank=True, null=True, upload_to='expenses/receipts/')),
+                ('period_key', models.PositiveIntegerField()),
+                ('fiscal_year', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('approved_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_expenses', to='finance.expensecategory')),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_expenses', to='departments.department')),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'archived_expenses',
+                'ordering': ['-date', '-created_at'],
+                'indexes': [models.Index(fields=['status', 'fiscal_year', 'department'], name='archived_ex_status_947441_idx'), models.Index(fields=['status', 'period_key', 'department'], name='archived_ex_status_2212a7_idx'), models.Index(fields=['date'], name='archived_ex_date_cd5e54_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:31
+
+import apps.core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archive', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedexpense',
+            name='receipt',
+            field=models.FileField(blank=True, null=True, storage=apps.core.storage.receipt_storage, upload_to='expenses/receipts/'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archive', '0002_receipt_storage'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='archivedincome',
+            old_name='student_id',
+            new_name='student_ref',
+        ),
+        migrations.AddField(
+            model_name='archivedincome',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_incomes', to='students.student'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archive', '0003_income_student'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archivedexpense',
+            index=models.Index(fields=['reference_id'], name='archived_ex_referen_1f14ba_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedincome',
+            index=models.Index(fields=['reference_id'], name='archived_in_referen_0322e7_idx'),
+        ),
+    ]
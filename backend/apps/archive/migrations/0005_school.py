@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0001_initial'),
+        ('archive', '0004_reference_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedexpense',
+            name='school',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='archivedincome',
+            name='school',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='archivedsalary',
+            name='school',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='archivedexpense',
+            index=models.Index(fields=['school', 'status', 'fiscal_year'], name='archived_ex_school__38b850_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedincome',
+            index=models.Index(fields=['school', 'fiscal_year'], name='archived_in_school__0e2fcf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedsalary',
+            index=models.Index(fields=['school', 'year', 'month'], name='archived_sa_school__d3b8ce_idx'),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:06
+
+from django.db import migrations, models
+from django.db.models import Q
+import django.db.models.deletion
+
+from apps.core import periods
+
+
+def split_per_school(apps, schema_editor):
+    """One record per school with rows in each archived year, counting that school's rows"""
+    db_alias = schema_editor.connection.alias
+    LegacyYear = apps.get_model('archive', 'LegacyArchivedFinancialYear')
+    ArchivedFinancialYear = apps.get_model('archive', 'ArchivedFinancialYear')
+    ArchivedIncome = apps.get_model('archive', 'ArchivedIncome')
+    ArchivedExpense = apps.get_model('archive', 'ArchivedExpense')
+    ArchivedSalary = apps.get_model('archive', 'ArchivedSalary')
+    School = apps.get_model('schools', 'School')
+
+    for legacy in LegacyYear.objects.using(db_alias).all():
+        fiscal_year = legacy.fiscal_year
+        rows = {
+            'income_rows': ArchivedIncome.objects.using(db_alias).filter(fiscal_year=fiscal_year),
+            'expense_rows': ArchivedExpense.objects.using(db_alias).filter(fiscal_year=fiscal_year),
+            'salary_rows': ArchivedSalary.objects.using(db_alias).filter(
+                Q(year=fiscal_year, month__gte=periods.FISCAL_YEAR_START_MONTH)
+                | Q(year=fiscal_year + 1, month__lt=periods.FISCAL_YEAR_START_MONTH)
+            ),
+        }
+        school_ids = set()
+        for queryset in rows.values():
+            school_ids.update(queryset.values_list('school_id', flat=True).distinct())
+        if not school_ids:
+            # An empty archived year: it belongs to the school the deployment started with
+            first_school = School.objects.using(db_alias).order_by('pk').first()
+            if first_school is None:
+                continue
+            school_ids = {first_school.pk}
+
+        for school_id in sorted(school_ids):
+            record = ArchivedFinancialYear.objects.using(db_alias).create(
+                school_id=school_id,
+                fiscal_year=fiscal_year,
+                archived_by=legacy.archived_by,
+                **{name: queryset.filter(school_id=school_id).count() for name, queryset in rows.items()},
+            )
+            # archived_at is auto_now_add; keep the original time
+            ArchivedFinancialYear.objects.using(db_alias).filter(pk=record.pk).update(archived_at=legacy.archived_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0001_initial'),
+        ('archive', '0006_record_version'),
+    ]
+
+    operations = [
+        # The year was the primary key; the table is rebuilt keyed on (school, year)
+        migrations.AlterModelTable(
+            name='archivedfinancialyear',
+            table='archived_financial_years_legacy',
+        ),
+        migrations.RenameModel(
+            old_name='ArchivedFinancialYear',
+            new_name='LegacyArchivedFinancialYear',
+        ),
+        migrations.CreateModel(
+            name='ArchivedFinancialYear',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fiscal_year', models.PositiveSmallIntegerField()),
+                ('income_rows', models.PositiveIntegerField(default=0)),
+                ('expense_rows', models.PositiveIntegerField(default=0)),
+                ('salary_rows', models.PositiveIntegerField(default=0)),
+                ('archived_by', models.CharField(blank=True, max_length=255)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('school', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='archived_years', to='schools.school')),
+            ],
+            options={
+                'db_table': 'archived_financial_years',
+                'ordering': ['-fiscal_year'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='archivedfinancialyear',
+            constraint=models.UniqueConstraint(fields=('school', 'fiscal_year'), name='unique_archived_financial_year'),
+        ),
+        migrations.RunPython(split_per_school, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='LegacyArchivedFinancialYear',
+        ),
+    ]
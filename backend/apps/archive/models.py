@@ -0,0 +1,154 @@
+"""
+Archive Models - Closed financial years moved out of the hot tables
+
+Each archive table has exactly the same columns as its hot table, so rows
+move between them with a single INSERT ... SELECT and keep their ids.
+"""
+from django.db import models
+from django.contrib.auth import get_user_model
+from apps.core.storage import receipt_storage
+from apps.departments.models import Department
+from apps.finance.models import IncomeSource, ExpenseCategory
+from apps.salary.models import Employee
+from apps.students.models import Student
+
+User = get_user_model()
+
+
+class ArchivedFinancialYear(models.Model):
+    """A financial year of a school whose transactions live in the archive tables"""
+    
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='archived_years', editable=False)
+    fiscal_year = models.PositiveSmallIntegerField()  # e.g. 2022 for "2022-23"
+    income_rows = models.PositiveIntegerField(default=0)
+    expense_rows = models.PositiveIntegerField(default=0)
+    salary_rows = models.PositiveIntegerField(default=0)
+    archived_by = models.CharField(max_length=255, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'archived_financial_years'
+        ordering = ['-fiscal_year']
+        constraints = [
+            models.UniqueConstraint(fields=['school', 'fiscal_year'], name='unique_archived_financial_year'),
+        ]
+    
+    def __str__(self):
+        return f"FY {self.fiscal_year}-{(self.fiscal_year + 1) % 100:02d}"
+
+
+class ArchivedIncome(models.Model):
+    """Income rows of archived financial years (same columns as `incomes`)"""
+    
+    id = models.BigIntegerField(primary_key=True)
+    income_source = models.ForeignKey(IncomeSource, on_delete=models.PROTECT, related_name='archived_incomes')
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    date = models.DateField()
+    payment_mode = models.CharField(max_length=10)
+    reference_id = models.CharField(max_length=100, blank=True, null=True)
+    description = models.TextField(blank=True, null=True)
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_incomes'
+    )
+    student = models.ForeignKey(
+        Student,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_incomes'
+    )
+    student_ref = models.CharField(max_length=50, blank=True, null=True)
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='+')
+    period_key = models.PositiveIntegerField()
+    fiscal_year = models.PositiveSmallIntegerField()
+    recorded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='+')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'archived_incomes'
+        ordering = ['-date', '-created_at']
+        indexes = [
+            models.Index(fields=['fiscal_year', 'period_key']),
+            models.Index(fields=['date']),
+            models.Index(fields=['reference_id']),
+            models.Index(fields=['school', 'fiscal_year']),
+        ]
+    
+    def __str__(self):
+        return f"Archived income {self.id} - ₹{self.amount} ({self.date})"
+
+
+class ArchivedExpense(models.Model):
+    """Expense rows of archived financial years (same columns as `expenses`)"""
+    
+    id = models.BigIntegerField(primary_key=True)
+    category = models.ForeignKey(ExpenseCategory, on_delete=models.PROTECT, related_name='archived_expenses')
+    department = models.ForeignKey(Department, on_delete=models.PROTECT, related_name='archived_expenses')
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    date = models.DateField()
+    payment_mode = models.CharField(max_length=10, blank=True, null=True)
+    reference_id = models.CharField(max_length=100, blank=True, null=True)
+    description = models.TextField()
+    status = models.CharField(max_length=10)
+    version = models.PositiveIntegerField(default=1)
+    receipt = models.FileField(upload_to='expenses/receipts/', storage=receipt_storage, blank=True, null=True)
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='+')
+    period_key = models.PositiveIntegerField()
+    fiscal_year = models.PositiveSmallIntegerField()
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='+')
+    approved_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'archived_expenses'
+        ordering = ['-date', '-created_at']
+        indexes = [
+            models.Index(fields=['status', 'fiscal_year', 'department']),
+            models.Index(fields=['status', 'period_key', 'department']),
+            models.Index(fields=['date']),
+            models.Index(fields=['reference_id']),
+            models.Index(fields=['school', 'status', 'fiscal_year']),
+        ]
+    
+    def __str__(self):
+        return f"Archived expense {self.id} - ₹{self.amount} ({self.date})"
+
+
+class ArchivedSalary(models.Model):
+    """Salary rows of archived financial years (same columns as `salaries`)"""
+    
+    id = models.BigIntegerField(primary_key=True)
+    employee = models.ForeignKey(Employee, on_delete=models.PROTECT, related_name='archived_salaries')
+    month = models.PositiveSmallIntegerField()
+    year = models.PositiveIntegerField()
+    base_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    allowances = models.DecimalField(max_digits=10, decimal_places=2)
+    deductions = models.DecimalField(max_digits=10, decimal_places=2)
+    net_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=10)
+    version = models.PositiveIntegerField(default=1)
+    payment_date = models.DateField(null=True, blank=True)
+    payment_mode = models.CharField(max_length=20, blank=True, null=True)
+    reference_id = models.CharField(max_length=100, blank=True, null=True)
+    notes = models.TextField(blank=True, null=True)
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='+')
+    processed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='+')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'archived_salaries'
+        ordering = ['-year', '-month', 'employee']
+        indexes = [
+            models.Index(fields=['employee', 'year', 'month']),
+            models.Index(fields=['school', 'year', 'month']),
+        ]
+    
+    def __str__(self):
+        return f"Archived salary {self.id} - {self.month}/{self.year}"
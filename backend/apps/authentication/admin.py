@@ -12,22 +12,22 @@ User = get_user_model()
 class UserAdmin(BaseUserAdmin):
     """Custom User Admin"""
     
-    list_display = ['email', 'first_name', 'last_name', 'role', 'is_active', 'date_joined']
-    list_filter = ['role', 'is_active', 'is_staff']
+    list_display = ['email', 'first_name', 'last_name', 'role', 'school', 'is_active', 'date_joined']
+    list_filter = ['school', 'role', 'is_active', 'is_staff']
     search_fields = ['email', 'first_name', 'last_name']
     ordering = ['-date_joined']
     
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
         ('Personal Info', {'fields': ('first_name', 'last_name', 'phone')}),
-        ('Permissions', {'fields': ('role', 'is_active', 'is_staff', 'is_superuser')}),
+        ('Permissions', {'fields': ('role', 'school', 'is_active', 'is_staff', 'is_superuser')}),
         ('Important Dates', {'fields': ('last_login', 'date_joined')}),
     )
     
     add_fieldsets = (
         (None, {
             'classes': ('wide',),
-            'fields': ('email', 'first_name', 'last_name', 'role', 'password1', 'password2'),
+            'fields': ('email', 'first_name', 'last_name', 'role', 'school', 'password1', 'password2'),
         }),
     )
     
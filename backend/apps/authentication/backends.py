@@ -0,0 +1,54 @@
+"""
+JWT authentication that activates the request's school (see apps.core.tenancy)
+"""
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.core import tenancy
+
+
+def activate_school(school):
+    if school is None or not school.is_active:
+        raise AuthenticationFailed('Unknown or inactive school', code='school_not_found')
+    tenancy.activate(school)
+
+
+class TenantJWTAuthentication(JWTAuthentication):
+    """Activates the token's ``school`` claim, or the ``X-School`` choice of an all-schools user
+
+    Only superusers and super admins may be without a school; other
+    accounts without one (e.g. created before schools existed) are refused.
+    """
+    
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        
+        claimed = validated_token.get('school')
+        if claimed is not None:
+            # Before loading the user, who may live in the school's own database
+            activate_school(tenancy.schools.get(claimed))
+        user = self.get_user(validated_token)
+        
+        if user.school_id is not None:
+            if claimed is None:
+                activate_school(tenancy.schools.get(user.school_id))
+            elif claimed != user.school_id:
+                raise AuthenticationFailed('Your school has changed, please log in again', code='school_changed')
+        elif not (user.is_superuser or user.role == 'SUPER_ADMIN'):
+            raise AuthenticationFailed('Your account is not assigned to a school', code='school_required')
+        elif 'HTTP_X_SCHOOL' in request.META:
+            # An unknown or empty code is refused rather than read as "every school"
+            school = tenancy.schools.by_code(request.META['HTTP_X_SCHOOL'])
+            if school is not None and school.database:
+                raise AuthenticationFailed(
+                    f'{school.name} has its own database; log in with one of its accounts',
+                    code='school_database',
+                )
+            activate_school(school)
+        return user, validated_token
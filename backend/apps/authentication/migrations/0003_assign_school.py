@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:02
+
+from django.db import migrations
+
+
+def assign_first_school(apps, schema_editor):
+    """Existing accounts belong to the school the deployment started with; only superusers administer every school"""
+    db_alias = schema_editor.connection.alias
+    School = apps.get_model('schools', 'School')
+    User = apps.get_model('authentication', 'User')
+    first_school = School.objects.using(db_alias).order_by('pk').first()
+    if first_school is None:
+        return
+    User.objects.using(db_alias).filter(school__isnull=True, is_superuser=False).update(school=first_school)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0001_initial'),
+        ('authentication', '0002_school'),
+    ]
+
+    operations = [
+        migrations.RunPython(assign_first_school, migrations.RunPython.noop),
+    ]
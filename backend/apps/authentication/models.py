@@ -50,6 +50,15 @@ class User(AbstractBaseUser, PermissionsMixin):
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='AUDITOR')
     phone = models.CharField(max_length=15, blank=True, null=True)
     
+    # The school the user works for; users without one administer every school
+    school = models.ForeignKey(
+        'schools.School',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='users'
+    )
+    
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
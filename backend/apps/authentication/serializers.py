@@ -5,6 +5,8 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from apps.core import tenancy
+
 User = get_user_model()
 
 
@@ -13,12 +15,12 @@ class UserSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = User
-        fields = ['id', 'email', 'first_name', 'last_name', 'role', 'phone', 'is_active', 'date_joined']
-        read_only_fields = ['id', 'date_joined']
+        fields = ['id', 'email', 'first_name', 'last_name', 'role', 'phone', 'school', 'is_active', 'date_joined']
+        read_only_fields = ['id', 'role', 'school', 'is_active', 'date_joined']
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
-    """User Registration Serializer"""
+    """User Registration Serializer (the school is the registering admin's, see UserRegistrationView)"""
     password = serializers.CharField(write_only=True, min_length=8)
     password_confirm = serializers.CharField(write_only=True, min_length=8)
     
@@ -38,7 +40,12 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
-    """Custom JWT Token Serializer with user data"""
+    """Custom JWT Token Serializer with user data
+
+    ``school`` (a school code) is required for schools with a database of
+    their own, whose accounts live there.
+    """
+    school = serializers.CharField(required=False, write_only=True)
     
     @classmethod
     def get_token(cls, user):
@@ -48,10 +55,25 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token['email'] = user.email
         token['role'] = user.role
         token['full_name'] = user.get_full_name()
+        token['school'] = user.school_id
         
         return token
     
     def validate(self, attrs):
+        code = attrs.pop('school', None)
+        if not code:
+            return self.validate_credentials(attrs)
+        
+        school = tenancy.schools.by_code(code)
+        if school is None or not school.is_active:
+            raise serializers.ValidationError({'school': 'Unknown or inactive school'})
+        with tenancy.school_context(school):
+            data = self.validate_credentials(attrs)
+        if self.user.school_id != school.pk:
+            raise serializers.ValidationError({'school': 'This account does not belong to that school'})
+        return data
+    
+    def validate_credentials(self, attrs):
         data = super().validate(attrs)
         
         # Add user data to response
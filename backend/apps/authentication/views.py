@@ -3,10 +3,13 @@ Authentication Views
 """
 from rest_framework import generics, status
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import get_user_model
 
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.tenancy import current_school_id, scoped
+
 from .serializers import (
     UserSerializer,
     UserRegistrationSerializer,
@@ -17,15 +20,32 @@ User = get_user_model()
 
 
 class UserRegistrationView(generics.CreateAPIView):
-    """User Registration View"""
+    """User Registration View
+
+    Super admins register the accounts of their school. A deployment
+    administrator picks the school with ``X-School``; only super admins
+    may be registered without one.
+    """
     queryset = User.objects.all()
     serializer_class = UserRegistrationSerializer
-    permission_classes = [AllowAny]
+    permission_classes = [IsAuthenticated]
     
     def create(self, request, *args, **kwargs):
+        if request.user.role != 'SUPER_ADMIN':
+            return Response(
+                {'error': 'Only super admin can register users'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        school_id = current_school_id()
+        if school_id is None and serializer.validated_data.get('role') != 'SUPER_ADMIN':
+            return Response(
+                {'error': 'Choose the school of this user (X-School header)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        user = serializer.save(school_id=school_id)
         
         user_data = UserSerializer(user).data
         
@@ -49,8 +69,11 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         return self.request.user
 
 
-class UserListView(generics.ListAPIView):
-    """View to list all users (used for selections)"""
+class UserListView(ConditionalGetMixin, generics.ListAPIView):
+    """View to list the users of the current school (used for selections)"""
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return scoped(super().get_queryset())
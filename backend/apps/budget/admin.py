@@ -2,20 +2,23 @@
 Budget Admin Configuration
 """
 from django.contrib import admin
-from .models import Budget
+from apps.core.admin_performance import PerformanceAdminMixin
+from .models import Budget, BudgetAlert
 
 
 @admin.register(Budget)
-class BudgetAdmin(admin.ModelAdmin):
+class BudgetAdmin(PerformanceAdminMixin, admin.ModelAdmin):
     """Budget Admin"""
-    list_display = ['department', 'financial_year', 'month', 'allocated_amount', 'status', 'created_by', 'approved_by']
-    list_filter = ['status', 'financial_year', 'department']
+    list_display = ['department', 'financial_year', 'month', 'allocated_amount', 'spent_amount', 'status', 'created_by', 'approved_by']
+    list_filter = ['school', 'status', 'financial_year', 'department']
     search_fields = ['department__name', 'financial_year']
-    readonly_fields = ['created_by', 'approved_by', 'approved_at', 'created_at', 'updated_at']
+    readonly_fields = ['spent_amount', 'created_by', 'approved_by', 'approved_at', 'created_at', 'updated_at']
+    performance_select_related = ['department', 'created_by', 'approved_by']
+    performance_autocomplete_fields = ['department']
     
     fieldsets = (
         ('Budget Details', {
-            'fields': ('department', 'financial_year', 'month', 'allocated_amount', 'notes')
+            'fields': ('department', 'financial_year', 'month', 'allocated_amount', 'spent_amount', 'notes')
         }),
         ('Status', {
             'fields': ('status', 'created_by', 'approved_by', 'approved_at')
@@ -24,3 +27,12 @@ class BudgetAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at')
         }),
     )
+
+
+@admin.register(BudgetAlert)
+class BudgetAlertAdmin(admin.ModelAdmin):
+    """Budget Alert Admin"""
+    list_display = ['budget', 'threshold', 'utilization', 'spent_amount', 'is_acknowledged', 'created_at']
+    list_filter = ['threshold', 'is_acknowledged']
+    list_select_related = ['budget__department']
+    readonly_fields = ['budget', 'threshold', 'utilization', 'spent_amount', 'created_at']
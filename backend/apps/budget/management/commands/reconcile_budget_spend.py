@@ -0,0 +1,74 @@
+"""
+Compare Budget.spent_amount counters with the expenses they summarise
+
+Usage:
+    python manage.py reconcile_budget_spend                 # report drift
+    python manage.py reconcile_budget_spend --fix           # repair it
+    python manage.py reconcile_budget_spend --financial-year 2024-25
+"""
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.archive.ledger import ledger, ledger_grouped
+from apps.core import periods
+from apps.budget.models import Budget
+from apps.finance.models import Expense
+from apps.sync import journal
+
+
+def actual_spend(fiscal_years):
+    """Paid expense totals by (department, period_key) and (department, fiscal_year)
+
+    Archived years are read from the archive tables as well.
+    """
+    paid = ledger(Expense, fiscal_years=fiscal_years, status='PAID', fiscal_year__in=fiscal_years)
+    
+    monthly = ledger_grouped(paid, ['department_id', 'period_key'])
+    yearly = ledger_grouped(paid, ['department_id', 'fiscal_year'])
+    return monthly, yearly
+
+
+class Command(BaseCommand):
+    help = 'Detect and optionally repair drift in budget spent_amount counters'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--financial-year', help='Only budgets of this year, e.g. 2024-25')
+        parser.add_argument('--fix', action='store_true', help='Write the recomputed totals')
+    
+    def handle(self, *args, **options):
+        budgets = Budget.objects.select_related('department')
+        if options['financial_year']:
+            try:
+                fiscal_year = periods.parse_financial_year(options['financial_year'])
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            budgets = budgets.filter(fiscal_year=fiscal_year)
+        
+        budgets = list(budgets)
+        monthly, yearly = actual_spend({budget.fiscal_year for budget in budgets})
+        
+        drifted = []
+        for budget in budgets:
+            if budget.month:
+                actual = monthly.get((budget.department_id, budget.period_key))
+            else:
+                actual = yearly.get((budget.department_id, budget.fiscal_year))
+            actual = actual or Decimal('0')
+            
+            if actual != budget.spent_amount:
+                drifted.append(budget)
+                self.stdout.write(
+                    f'{budget}: counter {budget.spent_amount}, actual {actual} '
+                    f'(drift {budget.spent_amount - actual})'
+                )
+                budget.spent_amount = actual
+        
+        if options['fix'] and drifted:
+            Budget.objects.bulk_update(drifted, ['spent_amount'], batch_size=500)
+            journal.record_many(Budget, [(budget.pk, budget.school_id) for budget in drifted])
+        
+        verb = 'Fixed' if options['fix'] else 'Found'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {len(budgets)} budgets. {verb} {len(drifted)} with drift.'
+        ))
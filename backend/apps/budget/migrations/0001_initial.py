@@ -1,8 +1,4 @@
-<<<<<<< HEAD
 # Generated by Django 4.2.7 on 2026-02-03 06:42
-=======
-# Generated by Django 4.2.7 on 2026-02-03 06:27
->>>>>>> dev
 
 from django.conf import settings
 from django.db import migrations, models
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:21
+
+from django.db import migrations, models
+
+from apps.core import periods
+
+
+def backfill_period_keys(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Budget = apps.get_model('budget', 'Budget')
+    budgets = list(Budget.objects.using(db_alias).only('id', 'financial_year', 'month'))
+    for budget in budgets:
+        budget.fiscal_year = periods.parse_financial_year(budget.financial_year)
+        budget.period_key = periods.month_period_key(budget.fiscal_year, budget.month) if budget.month else None
+    Budget.objects.using(db_alias).bulk_update(budgets, ['fiscal_year', 'period_key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budget',
+            name='fiscal_year',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='budget',
+            name='period_key',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_period_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='budget',
+            name='fiscal_year',
+            field=models.PositiveSmallIntegerField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='budget',
+            index=models.Index(fields=['fiscal_year', 'department'], name='budgets_fiscal__f23beb_idx'),
+        ),
+    ]
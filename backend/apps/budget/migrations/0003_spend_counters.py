@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:23
+
+from django.db import migrations, models
+from django.db.models import Sum
+import django.db.models.deletion
+
+
+def seed_spent_amounts(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Budget = apps.get_model('budget', 'Budget')
+    Expense = apps.get_model('finance', 'Expense')
+    paid = Expense.objects.using(db_alias).filter(status='PAID')
+    
+    monthly = {
+        (row['department_id'], row['period_key']): row['total']
+        for row in paid.values('department_id', 'period_key').annotate(total=Sum('amount'))
+    }
+    yearly = {
+        (row['department_id'], row['fiscal_year']): row['total']
+        for row in paid.values('department_id', 'fiscal_year').annotate(total=Sum('amount'))
+    }
+    
+    budgets = list(Budget.objects.using(db_alias).all())
+    for budget in budgets:
+        if budget.month:
+            budget.spent_amount = monthly.get((budget.department_id, budget.period_key)) or 0
+        else:
+            budget.spent_amount = yearly.get((budget.department_id, budget.fiscal_year)) or 0
+    Budget.objects.using(db_alias).bulk_update(budgets, ['spent_amount'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0002_period_keys'),
+        ('finance', '0002_period_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budget',
+            name='spent_amount',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=15),
+        ),
+        migrations.CreateModel(
+            name='BudgetAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('threshold', models.PositiveSmallIntegerField()),
+                ('utilization', models.DecimalField(decimal_places=2, max_digits=7)),
+                ('spent_amount', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('is_acknowledged', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('budget', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='budget.budget')),
+            ],
+            options={
+                'db_table': 'budget_alerts',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['budget', 'threshold'], name='budget_aler_budget__40cf54_idx')],
+            },
+        ),
+        migrations.RunPython(seed_spent_amounts, migrations.RunPython.noop),
+    ]
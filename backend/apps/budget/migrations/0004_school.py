@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0001_initial'),
+        ('budget', '0003_spend_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budget',
+            name='school',
+            field=models.ForeignKey(default=1, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='budgets', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='budget',
+            index=models.Index(fields=['school', 'fiscal_year', 'status'], name='budgets_school__b474ce_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget', '0004_school'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='budget',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['school', 'department'], name='budgets_pending_idx'),
+        ),
+    ]
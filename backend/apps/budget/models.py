@@ -2,15 +2,23 @@
 Budget Planning Models
 """
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 from apps.departments.models import Department
+from apps.core import periods
+from apps.core.tenancy import assign_school, department_school_id
+from apps.core.tracking import TrackedFieldsMixin
 
 User = get_user_model()
 
 
-class Budget(models.Model):
+class Budget(TrackedFieldsMixin, models.Model):
     """Budget Model for Planning"""
     
+    # Scope of the spend counter; status and school for the approval queue (apps.approvals)
+    scope_fields = ('department_id', 'financial_year', 'month')
+    tracked_fields = scope_fields + ('status', 'school_id')
+    
     STATUS_CHOICES = [
         ('DRAFT', 'Draft'),
         ('PENDING', 'Pending Approval'),
@@ -19,13 +27,33 @@ class Budget(models.Model):
         ('LOCKED', 'Locked'),
     ]
     
+    # Status graph applied by apps.core.transitions: name -> (from, to)
+    TRANSITIONS = {
+        'submit': (('DRAFT',), 'PENDING'),
+        'approve': (('DRAFT', 'PENDING'), 'APPROVED'),
+        'reject': (('DRAFT', 'PENDING'), 'REJECTED'),
+        'lock': (('APPROVED',), 'LOCKED'),
+    }
+    
     department = models.ForeignKey(Department, on_delete=models.PROTECT, related_name='budgets')
     financial_year = models.CharField(max_length=10)  # e.g., "2024-25"
     month = models.PositiveSmallIntegerField(null=True, blank=True)  # 1-12 for monthly, null for yearly
     allocated_amount = models.DecimalField(max_digits=15, decimal_places=2)
     
+    # Running total of PAID expenses in this department and period,
+    # maintained by apps.budget.signals; `reconcile_budget_spend` repairs drift
+    spent_amount = models.DecimalField(max_digits=15, decimal_places=2, default=0, editable=False)
+    
+    # School (tenant), the department's
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='budgets', editable=False)
+    
+    # Fiscal period keys, derived from financial_year/month on save
+    fiscal_year = models.PositiveSmallIntegerField(editable=False)  # e.g. 2024 for "2024-25"
+    period_key = models.PositiveIntegerField(null=True, blank=True, editable=False)  # YYYYMM, monthly only
+    
     # Status tracking
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='DRAFT')
+    version = models.PositiveIntegerField(default=1, editable=False)  # bumped by every write, for optimistic concurrency
     notes = models.TextField(blank=True, null=True)
     
     # Approval tracking
@@ -43,6 +71,9 @@ class Budget(models.Model):
         indexes = [
             models.Index(fields=['department', 'financial_year']),
             models.Index(fields=['status']),
+            models.Index(fields=['fiscal_year', 'department']),
+            models.Index(fields=['school', 'fiscal_year', 'status']),
+            models.Index(fields=['school', 'department'], condition=Q(status='PENDING'), name='budgets_pending_idx'),
         ]
     
     def __str__(self):
@@ -51,42 +82,70 @@ class Budget(models.Model):
             period += f" - Month {self.month}"
         return f"{self.department.name} - {period} - ₹{self.allocated_amount}"
     
-    def get_spent_amount(self):
-        """Calculate actual spent amount against this budget"""
-        from apps.finance.models import Expense
-        from datetime import datetime
+    def save(self, *args, **kwargs):
+        self.fiscal_year = periods.parse_financial_year(self.financial_year)
+        self.period_key = periods.month_period_key(self.fiscal_year, self.month) if self.month else None
+        assign_school(self, department_school_id(self.department_id))
         
-        # Get year range
-        year_parts = self.financial_year.split('-')
-        start_year = int(f"20{year_parts[0]}")
+        # Start (or restart) the running total when the budget's scope is set
+        if self._state.adding or any(self.has_changed(name) for name in self.scope_fields):
+            self.spent_amount = self.calculate_spent_amount()
         
+        if not self._state.adding:
+            self.version += 1
+        super().save(*args, **kwargs)
+    
+    def get_date_range(self):
+        """Return (start_date, end_date) of the budget period, end exclusive"""
         if self.month:
-            # Monthly budget
-            start_date = datetime(start_year, self.month, 1).date()
-            if self.month == 12:
-                end_date = datetime(start_year + 1, 1, 1).date()
-            else:
-                end_date = datetime(start_year, self.month + 1, 1).date()
-        else:
-            # Yearly budget
-            start_date = datetime(start_year, 4, 1).date()  # FY starts in April in India
-            end_date = datetime(start_year + 1, 4, 1).date()
-        
-        expenses = Expense.objects.filter(
-            department=self.department,
-            date__gte=start_date,
-            date__lt=end_date,
-            status='PAID'
-        ).aggregate(total=models.Sum('amount'))
+            return periods.period_bounds(self.period_key)
+        return periods.fiscal_year_bounds(self.fiscal_year)
+    
+    def spent_filter(self):
+        """Filter kwargs selecting the paid expenses counted against this budget"""
+        if self.month:
+            return {'department_id': self.department_id, 'status': 'PAID', 'period_key': self.period_key}
+        return {'department_id': self.department_id, 'status': 'PAID', 'fiscal_year': self.fiscal_year}
+    
+    def calculate_spent_amount(self):
+        """Sum the paid expenses from scratch (used to seed and reconcile the counter)"""
+        from apps.archive.ledger import ledger, ledger_total
+        from apps.finance.models import Expense
         
-        return expenses['total'] or 0
+        # archived years are included so closed budgets still reconcile
+        return ledger_total(ledger(Expense, fiscal_years=[self.fiscal_year], **self.spent_filter()))
+    
+    def get_spent_amount(self):
+        """Actual spent amount against this budget"""
+        return self.spent_amount
     
     def get_remaining_amount(self):
         """Calculate remaining budget"""
-        return self.allocated_amount - self.get_spent_amount()
+        return self.allocated_amount - self.spent_amount
     
     def get_utilization_percentage(self):
         """Calculate budget utilization percentage"""
         if self.allocated_amount == 0:
             return 0
-        return (self.get_spent_amount() / self.allocated_amount) * 100
+        return (self.spent_amount / self.allocated_amount) * 100
+
+
+class BudgetAlert(models.Model):
+    """Raised when a budget's utilization crosses a configured threshold"""
+    
+    budget = models.ForeignKey(Budget, on_delete=models.CASCADE, related_name='alerts')
+    threshold = models.PositiveSmallIntegerField()  # percent, e.g. 80 or 100
+    utilization = models.DecimalField(max_digits=7, decimal_places=2)  # percent when crossed
+    spent_amount = models.DecimalField(max_digits=15, decimal_places=2)
+    is_acknowledged = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'budget_alerts'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['budget', 'threshold']),
+        ]
+    
+    def __str__(self):
+        return f"{self.budget} crossed {self.threshold}%"
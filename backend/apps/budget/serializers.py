@@ -2,32 +2,62 @@
 Budget Serializers
 """
 from rest_framework import serializers
-from .models import Budget
+from apps.core import periods
+from apps.core.refdata import DEPARTMENT, ReferenceNameField
+from apps.reports.validators import ensure_open_budget_period
+from .models import Budget, BudgetAlert
 
 
 class BudgetSerializer(serializers.ModelSerializer):
     """Budget Serializer"""
-    department_name = serializers.CharField(source='department.name', read_only=True)
+    department_name = ReferenceNameField(DEPARTMENT, source='department_id')
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
     approved_by_name = serializers.CharField(source='approved_by.get_full_name', read_only=True)
-    spent_amount = serializers.SerializerMethodField()
-    remaining_amount = serializers.SerializerMethodField()
+    remaining_amount = serializers.DecimalField(
+        source='get_remaining_amount', max_digits=15, decimal_places=2, read_only=True
+    )
     utilization_percentage = serializers.SerializerMethodField()
     
     class Meta:
         model = Budget
         fields = '__all__'
-        read_only_fields = ['created_by', 'approved_by', 'approved_at', 'created_at', 'updated_at']
+        read_only_fields = ['status', 'created_by', 'approved_by', 'approved_at', 'created_at', 'updated_at']
     
-    def get_spent_amount(self, obj):
-        return float(obj.get_spent_amount())
+    def validate_financial_year(self, value):
+        try:
+            return periods.financial_year_label(periods.parse_financial_year(value))
+        except ValueError:
+            raise serializers.ValidationError('Use the "2024-25" format')
     
-    def get_remaining_amount(self, obj):
-        return float(obj.get_remaining_amount())
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if self.instance is not None:
+            ensure_open_budget_period(self.instance.school_id, self.instance.fiscal_year, self.instance.month)
+        if 'financial_year' in attrs or 'month' in attrs or 'department' in attrs:
+            financial_year = attrs.get('financial_year', getattr(self.instance, 'financial_year', None))
+            month = attrs.get('month', getattr(self.instance, 'month', None))
+            department = attrs.get('department', getattr(self.instance, 'department', None))
+            ensure_open_budget_period(department.school_id, periods.parse_financial_year(financial_year), month)
+        return attrs
     
     def get_utilization_percentage(self, obj):
-        return round(obj.get_utilization_percentage(), 2)
+        return round(float(obj.get_utilization_percentage()), 2)
     
     def create(self, validated_data):
         validated_data['created_by'] = self.context['request'].user
         return super().create(validated_data)
+
+
+class BudgetAlertSerializer(serializers.ModelSerializer):
+    """Budget Alert Serializer"""
+    department = serializers.IntegerField(source='budget.department_id', read_only=True)
+    department_name = ReferenceNameField(DEPARTMENT, source='budget.department_id')
+    financial_year = serializers.CharField(source='budget.financial_year', read_only=True)
+    month = serializers.IntegerField(source='budget.month', read_only=True)
+    allocated_amount = serializers.DecimalField(
+        source='budget.allocated_amount', max_digits=15, decimal_places=2, read_only=True
+    )
+    
+    class Meta:
+        model = BudgetAlert
+        fields = '__all__'
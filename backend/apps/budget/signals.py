@@ -0,0 +1,117 @@
+"""
+Budget Signals - Running spend counters and threshold alerts
+
+Every PAID expense counts against the monthly budget of its department and
+period_key, and the yearly budget of its department and fiscal_year. When an
+expense enters, leaves or changes while PAID, the matching budgets are
+adjusted with a single F() update instead of re-summing expenses.
+"""
+import logging
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from apps.events import outbox
+from apps.finance.models import Expense
+from apps.sync import journal
+from .models import Budget, BudgetAlert
+
+logger = logging.getLogger(__name__)
+
+# Sent as budget_threshold_crossed.send(sender=Budget, budget=..., threshold=..., utilization=...)
+budget_threshold_crossed = Signal()
+
+
+def spend_contribution(state):
+    """(department_id, period_key, fiscal_year, amount) counted by an expense state, or None"""
+    if not state or state['status'] != 'PAID':
+        return None
+    return (state['department_id'], state['period_key'], state['fiscal_year'], Decimal(state['amount']))
+
+
+def budgets_for(department_id, period_key, fiscal_year):
+    return Budget.objects.filter(
+        Q(period_key=period_key) | Q(fiscal_year=fiscal_year, period_key__isnull=True),
+        department_id=department_id,
+    )
+
+
+def apply_spend(department_id, period_key, fiscal_year, delta):
+    """Add ``delta`` to every budget the expense counts against"""
+    with transaction.atomic():
+        budgets = budgets_for(department_id, period_key, fiscal_year)
+        if not budgets.update(spent_amount=F('spent_amount') + delta):
+            return
+        rows = list(budgets.values_list('id', 'school_id'))
+        journal.record_many(Budget, rows)
+        outbox.budgets_changed([pk for pk, _ in rows])
+        
+        if delta > 0:
+            # Rows stay locked until commit, so spent - delta is the exact previous value
+            for budget in budgets.select_related('department'):
+                check_thresholds(budget, budget.spent_amount - delta)
+
+
+def check_thresholds(budget, previous_spent):
+    if budget.allocated_amount <= 0:
+        return
+    
+    before = previous_spent / budget.allocated_amount * 100
+    after = budget.spent_amount / budget.allocated_amount * 100
+    for threshold in settings.BUDGET_ALERT_THRESHOLDS:
+        if before < threshold <= after:
+            budget_threshold_crossed.send(
+                sender=Budget, budget=budget, threshold=threshold, utilization=after
+            )
+
+
+def sync_expense_spend(before, after):
+    """Move an expense's contribution from its stored state to its new state"""
+    old = spend_contribution(before)
+    new = spend_contribution(after)
+    if old == new:
+        return
+    
+    if old and new and old[:3] == new[:3]:
+        # Same budgets, only the amount moved
+        apply_spend(*new[:3], new[3] - old[3])
+        return
+    
+    if old:
+        apply_spend(*old[:3], -old[3])
+    if new:
+        apply_spend(*new[:3], new[3])
+
+
+def expense_state(expense):
+    return {name: getattr(expense, name) for name in Expense.tracked_fields}
+
+
+@receiver(post_save, sender=Expense, dispatch_uid='budget.expense_spend.save')
+def update_spend_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    sync_expense_spend(instance.stored_state(created), expense_state(instance))
+
+
+@receiver(post_delete, sender=Expense, dispatch_uid='budget.expense_spend.delete')
+def update_spend_on_delete(sender, instance, **kwargs):
+    sync_expense_spend(instance.stored_state(), None)
+
+
+@receiver(budget_threshold_crossed, dispatch_uid='budget.record_alert')
+def record_alert(sender, budget, threshold, utilization, **kwargs):
+    """Store the alert so department heads see it in /api/budget/alerts/"""
+    BudgetAlert.objects.create(
+        budget=budget,
+        threshold=threshold,
+        utilization=round(utilization, 2),
+        spent_amount=budget.spent_amount,
+    )
+    logger.warning(
+        'Budget %s crossed %s%% utilization (%.2f%%)', budget.pk, threshold, utilization
+    )
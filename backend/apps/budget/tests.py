@@ -1,3 +1,104 @@
+"""
+Budget Tests - Running spend counters and threshold alerts
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db.models import Sum
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core import tenancy
+from apps.departments.models import Department
+from apps.finance.models import Expense, ExpenseCategory
+from apps.schools.models import School
+from .models import Budget, BudgetAlert
+
 
-# Create your tests here.
+class BudgetSpendTests(TestCase):
+    """``Budget.spent_amount`` follows expenses through the approval workflow"""
+    
+    def setUp(self):
+        tenancy.schools.invalidate()
+        school = School.objects.create(name='Test School', code='TST')
+        self.department = Department.objects.create(school=school, name='Science', code='SCI')
+        self.category = ExpenseCategory.objects.create(name='Lab', code='LAB')
+        self.budget = Budget.objects.create(
+            department=self.department, financial_year='2024-25', allocated_amount='1000.00', status='APPROVED',
+        )
+        user = get_user_model().objects.create_user(
+            email='admin@example.com', password='pw12345!', first_name='A', last_name='B',
+            role='SUPER_ADMIN', is_staff=True, is_superuser=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+    
+    def create_expense(self, amount):
+        response = self.client.post('/api/finance/expenses/', {
+            'category': self.category.id, 'department': self.department.id,
+            'amount': amount, 'date': '2024-07-10', 'description': 'Test',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data
+    
+    def act(self, expense, name):
+        response = self.client.post(
+            f"/api/finance/expenses/{expense['id']}/{name}/", {'version': expense['version']}, format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+    
+    def pay(self, amount):
+        return self.act(self.act(self.create_expense(amount), 'approve'), 'mark_paid')
+    
+    def assertSpentMatchesPaid(self, expected):
+        self.budget.refresh_from_db()
+        paid = Expense.objects.filter(
+            department=self.department, fiscal_year=2024, status='PAID',
+        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
+        self.assertEqual(paid, Decimal(expected))
+        self.assertEqual(self.budget.spent_amount, paid)
+        self.assertEqual(self.budget.calculate_spent_amount(), paid)
+    
+    def test_only_paid_expenses_count(self):
+        expense = self.create_expense('100.00')
+        self.assertSpentMatchesPaid('0')
+        expense = self.act(expense, 'approve')
+        self.assertSpentMatchesPaid('0')
+        self.act(expense, 'mark_paid')
+        self.assertSpentMatchesPaid('100.00')
+        
+        rejected = self.create_expense('50.00')
+        self.act(rejected, 'reject')
+        self.assertSpentMatchesPaid('100.00')
+    
+    def test_amount_change_and_delete_of_paid_expense(self):
+        expense = self.pay('100.00')
+        self.pay('40.00')
+        self.assertSpentMatchesPaid('140.00')
+        
+        response = self.client.patch(
+            f"/api/finance/expenses/{expense['id']}/", {'amount': '250.00', 'version': expense['version']},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertSpentMatchesPaid('290.00')
+        
+        response = self.client.delete(f"/api/finance/expenses/{expense['id']}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertSpentMatchesPaid('40.00')
+    
+    def test_threshold_alerts_are_raised_once(self):
+        self.pay('500.00')
+        self.assertFalse(BudgetAlert.objects.exists())
+        
+        self.pay('350.00')  # 85%
+        self.pay('100.00')  # 95%: still past 80% only
+        self.assertEqual(list(BudgetAlert.objects.values_list('threshold', flat=True)), [80])
+        
+        self.pay('100.00')  # 105%
+        self.pay('10.00')
+        alerts = BudgetAlert.objects.filter(budget=self.budget).order_by('threshold')
+        self.assertEqual([alert.threshold for alert in alerts], [80, 100])
+        self.assertEqual(alerts[1].spent_amount, Decimal('1050.00'))
+        self.assertSpentMatchesPaid('1060.00')
@@ -8,11 +8,15 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
 
-from .models import Budget
-from .serializers import BudgetSerializer
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.tenancy import TenantScopedMixin, scoped
+from apps.core.transitions import TransitionActionsMixin
+from apps.reports.validators import ensure_open_budget_period
+from .models import Budget, BudgetAlert
+from .serializers import BudgetSerializer, BudgetAlertSerializer
 
 
-class BudgetViewSet(viewsets.ModelViewSet):
+class BudgetViewSet(TenantScopedMixin, ConditionalGetMixin, TransitionActionsMixin, viewsets.ModelViewSet):
     """Budget ViewSet"""
     queryset = Budget.objects.all()
     serializer_class = BudgetSerializer
@@ -20,6 +24,54 @@ class BudgetViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['department', 'financial_year', 'status', 'month']
     ordering = ['-financial_year', 'department']
+    conditional_extra_models = ['finance.Expense']  # spent_amount moves with expenses
+    
+    def perform_destroy(self, instance):
+        ensure_open_budget_period(instance.school_id, instance.fiscal_year, instance.month)
+        instance.delete()
+    
+    @action(detail=False, methods=['get'])
+    def alerts(self, request):
+        """Threshold alerts; department heads only see their own departments"""
+        alerts = scoped(BudgetAlert.objects.select_related('budget'), 'budget__school')
+        
+        if not request.user.has_finance_access():
+            alerts = alerts.filter(budget__department__head=request.user)
+        if 'acknowledged' in request.query_params:
+            alerts = alerts.filter(is_acknowledged=request.query_params['acknowledged'] == 'true')
+        
+        page = self.paginate_queryset(alerts)
+        serializer = BudgetAlertSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=True, methods=['post'], url_path=r'alerts/(?P<alert_id>\d+)/acknowledge')
+    def acknowledge_alert(self, request, pk=None, alert_id=None):
+        """Mark one of this budget's alerts as seen"""
+        budget = self.get_object()
+        
+        if not (request.user.has_finance_access() or budget.department.head_id == request.user.pk):
+            return Response(
+                {'error': 'You do not have permission to acknowledge this alert'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        updated = budget.alerts.filter(pk=alert_id).update(is_acknowledged=True)
+        if not updated:
+            return Response({'error': 'Alert not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'acknowledged': True})
+    
+    @action(detail=True, methods=['post'])
+    def submit(self, request, pk=None):
+        """Send a draft budget for approval"""
+        budget = self.get_object()
+        
+        if not (request.user.has_finance_access() or budget.department.head_id == request.user.pk):
+            return Response(
+                {'error': 'You do not have permission to submit this budget'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        return self.transition(request, budget, 'submit', 'Only draft budgets can be submitted')
     
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
@@ -32,19 +84,23 @@ class BudgetViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        if budget.status not in ['DRAFT', 'PENDING']:
+        return self.transition(
+            request, budget, 'approve', 'Only draft or pending budgets can be approved',
+            approved_by=request.user, approved_at=timezone.now(),
+        )
+    
+    @action(detail=True, methods=['post'])
+    def reject(self, request, pk=None):
+        """Reject a budget"""
+        budget = self.get_object()
+        
+        if not request.user.has_finance_access():
             return Response(
-                {'error': 'Only draft or pending budgets can be approved'},
-                status=status.HTTP_400_BAD_REQUEST
+                {'error': 'You do not have permission to reject budgets'},
+                status=status.HTTP_403_FORBIDDEN
             )
         
-        budget.status = 'APPROVED'
-        budget.approved_by = request.user
-        budget.approved_at = timezone.now()
-        budget.save()
-        
-        serializer = self.get_serializer(budget)
-        return Response(serializer.data)
+        return self.transition(request, budget, 'reject', 'Only draft or pending budgets can be rejected')
     
     @action(detail=True, methods=['post'])
     def lock(self, request, pk=None):
@@ -57,14 +113,4 @@ class BudgetViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        if budget.status != 'APPROVED':
-            return Response(
-                {'error': 'Only approved budgets can be locked'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        budget.status = 'LOCKED'
-        budget.save()
-        
-        serializer = self.get_serializer(budget)
-        return Response(serializer.data)
+        return self.transition(request, budget, 'lock', 'Only approved budgets can be locked')
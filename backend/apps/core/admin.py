@@ -0,0 +1,13 @@
+"""
+Core Admin Configuration
+"""
+from django.contrib import admin
+from .models import DataVersion
+
+
+@admin.register(DataVersion)
+class DataVersionAdmin(admin.ModelAdmin):
+    """Data Version Admin"""
+    list_display = ['label', 'version', 'updated_at']
+    search_fields = ['label']
+    readonly_fields = ['label', 'version', 'updated_at']
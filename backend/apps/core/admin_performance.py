@@ -0,0 +1,163 @@
+"""
+Admin changelist performance for large tables
+
+With ``ADMIN_PERFORMANCE_MODE`` on (the default), admins using
+``PerformanceAdminMixin``:
+
+- join the foreign keys shown in ``list_display`` (``list_select_related``)
+- edit foreign keys with autocomplete widgets instead of full dropdowns
+- count rows with ``EstimatedCountPaginator`` and skip the second,
+  unfiltered count (``show_full_result_count = False``)
+- replace ``date_hierarchy`` with ``PeriodListFilter``, whose choices come
+  from cached per-period row counts
+"""
+from django.conf import settings
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count
+from django.utils.functional import cached_property
+
+from apps.core import periods
+from apps.core.models import DataVersion
+
+ESTIMATE_MIN_ROWS = 100000  # below this an exact count is cheap enough
+FILTERED_COUNT_LIMIT = 10000  # filtered changelists count at most this many rows
+PERIOD_COUNTS_TIMEOUT = 60 * 60  # seconds; keys also change with the table's data version
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def estimated_row_count(model, using='default'):
+    """Planner estimate of a table's rows (PostgreSQL), None where unavailable"""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+        row = cursor.fetchone()
+    if not row or row[0] < 0:  # never analyzed
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that avoids COUNT(*) over the whole table
+
+    Unfiltered lists use the planner estimate when the table is large.
+    Filtered lists stop counting at ``FILTERED_COUNT_LIMIT`` rows, which
+    still allows paging through the first pages of any result.
+    """
+    
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return len(queryset)
+        
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= ESTIMATE_MIN_ROWS:
+                return estimate
+            return queryset.count()
+        
+        return queryset.order_by().values('pk')[:FILTERED_COUNT_LIMIT].count()
+
+
+def period_counts(model):
+    """``[(fiscal_year, period_key, rows), ...]`` newest first, cached per data version"""
+    label = model._meta.label
+    version = DataVersion.current([label]).get(label, (0, None))[0]
+    key = f'admin:period-counts:{label}:{version}'
+    
+    def compute():
+        rows = (
+            model.objects.values('fiscal_year', 'period_key')
+            .annotate(rows=Count('pk'))
+            .order_by('-period_key')
+        )
+        return [(row['fiscal_year'], row['period_key'], row['rows']) for row in rows]
+    
+    return cache.get_or_set(key, compute, PERIOD_COUNTS_TIMEOUT)
+
+
+class PeriodListFilter(admin.SimpleListFilter):
+    """Financial year / month drill-down over the indexed period keys
+
+    Lists financial years; once one (or a month in it) is selected, its
+    months are listed as well.
+    """
+    title = 'period'
+    parameter_name = 'period'
+    
+    def lookups(self, request, model_admin):
+        counts = period_counts(model_admin.model)
+        
+        years = {}
+        for fiscal_year, _, rows in counts:
+            years[fiscal_year] = years.get(fiscal_year, 0) + rows
+        choices = [
+            (f'FY{fiscal_year}', f'FY {periods.financial_year_label(fiscal_year)} ({rows:,})')
+            for fiscal_year, rows in years.items()
+        ]
+        
+        selected_year = self.selected_fiscal_year()
+        if selected_year is not None:
+            choices += [
+                (str(period_key), f'↳ {MONTH_NAMES[period_key % 100 - 1]} {period_key // 100} ({rows:,})')
+                for fiscal_year, period_key, rows in counts
+                if fiscal_year == selected_year
+            ]
+        return choices
+    
+    def selected_fiscal_year(self):
+        value = self.value()
+        if not value:
+            return None
+        if value.startswith('FY') and value[2:].isdigit():
+            return int(value[2:])
+        if value.isdigit():
+            return periods.fiscal_year_of_key(int(value))
+        return None
+    
+    def queryset(self, request, queryset):
+        value = self.value()
+        if not value:
+            return queryset
+        if value.startswith('FY') and value[2:].isdigit():
+            return queryset.filter(fiscal_year=int(value[2:]))
+        if value.isdigit():
+            return queryset.filter(period_key=int(value))
+        return queryset
+
+
+class PerformanceAdminMixin:
+    """Switches a ModelAdmin to the large-table settings described above
+
+    ``performance_select_related`` and ``performance_autocomplete_fields``
+    list the relations to join and to edit through autocomplete.
+    """
+    performance_select_related = ()
+    performance_autocomplete_fields = ()
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not getattr(settings, 'ADMIN_PERFORMANCE_MODE', True):
+            return
+        
+        self.paginator = EstimatedCountPaginator
+        self.show_full_result_count = False
+        if self.performance_select_related:
+            self.list_select_related = list(self.performance_select_related)
+        if self.performance_autocomplete_fields:
+            self.autocomplete_fields = list(self.performance_autocomplete_fields)
+        
+        if self.date_hierarchy and hasattr(self.model, 'period_key'):
+            date_field = self.date_hierarchy
+            self.date_hierarchy = None
+            self.list_filter = [
+                PeriodListFilter if name == date_field else name
+                for name in self.list_filter
+            ]
+            if PeriodListFilter not in self.list_filter:
+                self.list_filter.insert(0, PeriodListFilter)
@@ -0,0 +1,141 @@
+"""
+Admission control for expensive views
+
+A multi-year audit or summary can hold a worker's threads long enough to
+starve routine expense entry. Views that aggregate over a date range use
+``AdmissionControlMixin``: before the handler runs, the request's cost is
+estimated and it is admitted only while the worker has room, within
+
+- ``ADMISSION_CAPACITY`` cost units running at once in the process
+- ``ADMISSION_USER_CAPACITY`` units per user (and school)
+
+A request that does not fit waits up to ``ADMISSION_QUEUE_SECONDS`` for
+room, behind at most ``ADMISSION_MAX_QUEUE`` others; otherwise it gets a
+429 with ``Retry-After``. A request costing more than the user budget is
+counted as the whole user budget, so it runs rather than never, and one
+user never holds more than that share of the worker. Views without the
+mixin (CRUD) are never held back. 304 answers of ConditionalGetMixin are
+given before admission and cost nothing.
+
+Metrics: ``admission.admitted``, ``admission.queued``,
+``admission.rejected.queue_full``, ``admission.rejected.timeout`` and the
+gauges ``admission.queue_depth`` and ``admission.in_flight_cost``.
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from django.conf import settings
+from rest_framework.exceptions import Throttled
+
+from . import metrics, tenancy
+
+
+class AdmissionController:
+    """Cost budgets of one worker process"""
+    
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.in_flight = 0
+        self.by_user = defaultdict(int)
+        self.waiting = 0
+        self.average_seconds = 1.0  # moving average of admitted requests, for Retry-After
+    
+    def fits(self, user_key, cost):
+        return (
+            self.in_flight + cost <= settings.ADMISSION_CAPACITY
+            and self.by_user[user_key] + cost <= settings.ADMISSION_USER_CAPACITY
+        )
+    
+    def admit(self, user_key, cost):
+        """Take ``cost`` units for ``user_key``, waiting for room; raises Throttled. Returns the ticket"""
+        cost = min(cost, settings.ADMISSION_USER_CAPACITY, settings.ADMISSION_CAPACITY)
+        with self.condition:
+            if not self.fits(user_key, cost):
+                if self.waiting >= settings.ADMISSION_MAX_QUEUE:
+                    metrics.incr('admission.rejected.queue_full')
+                    raise self.rejection()
+                self.wait_for_room(user_key, cost)
+            self.in_flight += cost
+            self.by_user[user_key] += cost
+            metrics.gauge('admission.in_flight_cost', self.in_flight)
+        metrics.incr('admission.admitted')
+        return user_key, cost, time.monotonic()
+    
+    def wait_for_room(self, user_key, cost):
+        metrics.incr('admission.queued')
+        self.waiting += 1
+        metrics.gauge('admission.queue_depth', self.waiting)
+        try:
+            deadline = time.monotonic() + settings.ADMISSION_QUEUE_SECONDS
+            while not self.fits(user_key, cost):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    metrics.incr('admission.rejected.timeout')
+                    raise self.rejection()
+                self.condition.wait(remaining)
+        finally:
+            self.waiting -= 1
+            metrics.gauge('admission.queue_depth', self.waiting)
+    
+    def release(self, ticket):
+        user_key, cost, admitted_at = ticket
+        with self.condition:
+            self.in_flight -= cost
+            self.by_user[user_key] -= cost
+            if not self.by_user[user_key]:
+                del self.by_user[user_key]
+            self.average_seconds = 0.8 * self.average_seconds + 0.2 * (time.monotonic() - admitted_at)
+            metrics.gauge('admission.in_flight_cost', self.in_flight)
+            self.condition.notify_all()
+    
+    def rejection(self):
+        return Throttled(
+            wait=max(1, math.ceil(self.average_seconds)),
+            detail='Too many reports are being prepared right now; please retry shortly.',
+        )
+
+
+controller = AdmissionController()
+
+
+def months_between(start_date, end_date):
+    """Calendar months touched by a YYYY-MM-DD range, None when it is missing or invalid"""
+    try:
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+    return max((end.year - start.year) * 12 + end.month - start.month + 1, 1)
+
+
+class AdmissionControlMixin:
+    """Admits an expensive view's requests within the worker's cost budgets
+
+    The cost is ``admission_cost`` units per month of the
+    ``start_date``/``end_date`` range; views without a range, or with a
+    missing one, count a year. Override ``get_admission_cost()`` for other
+    shapes.
+    """
+    admission_cost = 1
+    
+    def get_admission_cost(self, request):
+        months = months_between(request.query_params.get('start_date'), request.query_params.get('end_date'))
+        return self.admission_cost * (months or 12)
+    
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        user_key = (tenancy.current_school_id(), request.user.pk)
+        self._admission = controller.admit(user_key, self.get_admission_cost(request))
+    
+    def dispatch(self, request, *args, **kwargs):
+        # Released here rather than in finalize_response(), which unhandled errors skip
+        self._admission = None
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._admission is not None:
+                controller.release(self._admission)
+                self._admission = None
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+
+    def ready(self):
+        from . import autocomplete, refdata, signals
+        signals.connect_data_version_signals()
+        autocomplete.connect_autocomplete_signals()
+        refdata.connect_refdata_signals()
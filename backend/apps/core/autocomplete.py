@@ -0,0 +1,276 @@
+"""
+In-memory prefix index for pickers (employees, departments, sources, ...)
+
+Each process keeps one sorted array of ``(term, id)`` pairs per source;
+a query is a ``bisect`` into that array followed by a short scan, so
+lookups never touch the database. The arrays are:
+
+- built lazily, one query per source, on first use
+- patched in place by post_save/post_delete in the process that made the
+  change
+- rebuilt when the source's DataVersion moved, checked at most every
+  ``AUTOCOMPLETE_VERSION_CHECK_INTERVAL`` seconds (changes made by other
+  processes)
+
+Records remember their school: a request acting for a school only gets
+that school's employees, departments and users, and schools with a
+database of their own (apps.core.tenancy) get indexes of their own.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_save, post_delete
+
+from . import metrics, tenancy
+from .models import DataVersion
+
+WORD_RE = re.compile(r'\w+')
+MAX_SCAN = 2000  # prefix entries examined per query, enough for any top-k
+
+
+def index_terms(texts):
+    """Lowercased whole values and their words, e.g. "EMP-001" -> emp-001, emp, 001"""
+    terms = set()
+    for text in texts:
+        if not text:
+            continue
+        text = str(text).lower().strip()
+        terms.add(text)
+        terms.update(WORD_RE.findall(text))
+    return terms
+
+
+class PrefixIndex:
+    """Sorted ``(term, id)`` array with records kept alongside"""
+    
+    def __init__(self):
+        self.terms = []
+        self.records = {}  # id -> (label, detail, terms, school_id)
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def add(self, pk, label, detail, texts, school_id=None):
+        self.remove(pk)
+        terms = index_terms(texts)
+        for term in terms:
+            insort(self.terms, (term, pk))
+        self.records[pk] = (label, detail, terms, school_id)
+    
+    def load(self, entries):
+        """Bulk build from ``(pk, label, detail, texts, school_id)`` tuples"""
+        self.records = {}
+        pairs = []
+        for pk, label, detail, texts, school_id in entries:
+            terms = index_terms(texts)
+            self.records[pk] = (label, detail, terms, school_id)
+            pairs.extend((term, pk) for term in terms)
+        pairs.sort()
+        self.terms = pairs
+    
+    def remove(self, pk):
+        record = self.records.pop(pk, None)
+        if record is None:
+            return
+        for term in record[2]:
+            position = bisect_left(self.terms, (term, pk))
+            if position < len(self.terms) and self.terms[position] == (term, pk):
+                del self.terms[position]
+    
+    def search(self, query, limit, school_id=None):
+        """Up to ``limit`` ``(id, label, detail)`` matches, closest completions first
+
+        Terms are sorted, so walking the prefix range visits "sha", "shah",
+        "sharma", ... in order and the scan stops as soon as ``limit``
+        records matched. With ``school_id`` records of other schools are
+        skipped (records without a school always match).
+        """
+        words = WORD_RE.findall(query.lower())
+        if not words:
+            return []
+        # Walk the most selective (longest) word, check the others per record
+        words.sort(key=len, reverse=True)
+        first, others = words[0], words[1:]
+        
+        results = []
+        seen = set()
+        position = bisect_left(self.terms, (first,))
+        end = min(position + MAX_SCAN, len(self.terms))
+        while position < end and len(results) < limit:
+            term, pk = self.terms[position]
+            position += 1
+            if not term.startswith(first):
+                break
+            if pk in seen:
+                continue
+            seen.add(pk)
+            label, detail, terms, record_school = self.records[pk]
+            if school_id is not None and record_school is not None and record_school != school_id:
+                continue
+            if others and not all(any(t.startswith(word) for t in terms) for word in others):
+                continue
+            results.append((pk, label, detail))
+        return results
+
+
+class Source:
+    """How one model is indexed"""
+    
+    def __init__(self, model, fields, label, detail, active_field='is_active', school_field=None):
+        self.model_label = model
+        self.fields = fields
+        self.label = label
+        self.detail = detail
+        self.active_field = active_field
+        self.school_field = school_field
+    
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+    
+    def entry(self, row):
+        """``row`` is a dict of field values, or a model instance"""
+        get = row.get if isinstance(row, dict) else lambda name: getattr(row, name)
+        values = {name: get(name) for name in self.fields}
+        school_id = get(self.school_field) if self.school_field else None
+        return values['id'], self.label(values), self.detail(values), [values[name] for name in self.fields[1:]], school_id
+    
+    def is_active(self, instance):
+        return not self.active_field or getattr(instance, self.active_field)
+    
+    def rows(self):
+        queryset = self.model.objects.all()
+        if self.active_field:
+            queryset = queryset.filter(**{self.active_field: True})
+        school_fields = (self.school_field,) if self.school_field else ()
+        return queryset.values(*self.fields, *school_fields).iterator()
+
+
+SOURCES = {
+    'employee': Source(
+        'salary.Employee', ('id', 'employee_id', 'first_name', 'last_name', 'email'),
+        label=lambda row: f"{row['first_name']} {row['last_name']}",
+        detail=lambda row: row['employee_id'],
+        school_field='school_id',
+    ),
+    'department': Source(
+        'departments.Department', ('id', 'name', 'code'),
+        label=lambda row: row['name'],
+        detail=lambda row: row['code'],
+        school_field='school_id',
+    ),
+    'income_source': Source(
+        'finance.IncomeSource', ('id', 'name', 'code'),
+        label=lambda row: row['name'],
+        detail=lambda row: row['code'],
+    ),
+    'expense_category': Source(
+        'finance.ExpenseCategory', ('id', 'name', 'code'),
+        label=lambda row: row['name'],
+        detail=lambda row: row['code'],
+    ),
+    'user': Source(
+        settings.AUTH_USER_MODEL, ('id', 'email', 'first_name', 'last_name'),
+        label=lambda row: f"{row['first_name']} {row['last_name']}",
+        detail=lambda row: row['email'],
+        school_field='school_id',
+    ),
+}
+
+
+class AutocompleteRegistry:
+    """The per-process indexes of every source, per database"""
+    
+    def __init__(self, sources):
+        self.sources = sources
+        self.databases = {}  # alias: ({kind: PrefixIndex}, {kind: version})
+        self.checked_at = {}  # alias: monotonic time of the last version check
+        self.lock = threading.RLock()
+    
+    def state(self):
+        alias = tenancy.current_database() or DEFAULT_DB_ALIAS
+        return alias, self.databases.setdefault(alias, ({}, {}))
+    
+    @property
+    def indexes(self):
+        return self.state()[1][0]
+    
+    @property
+    def versions(self):
+        return self.state()[1][1]
+    
+    def build(self, kind):
+        source = self.sources[kind]
+        label = source.model._meta.label
+        # Read the version first so a change during the load triggers another build
+        self.versions[kind] = DataVersion.current([label]).get(label, (0, None))[0]
+        index = PrefixIndex()
+        index.load(source.entry(row) for row in source.rows())
+        self.indexes[kind] = index
+        alias = self.state()[0]
+        self.checked_at[alias] = self.checked_at.get(alias) or time.monotonic()
+        metrics.incr('autocomplete.builds')
+        metrics.gauge(f'autocomplete.entries.{kind}', len(index))
+    
+    def refresh_if_stale(self):
+        interval = getattr(settings, 'AUTOCOMPLETE_VERSION_CHECK_INTERVAL', 5)
+        alias = self.state()[0]
+        now = time.monotonic()
+        if now - self.checked_at.get(alias, 0.0) < interval or not self.indexes:
+            return
+        self.checked_at[alias] = now
+        
+        labels = {kind: self.sources[kind].model._meta.label for kind in self.indexes}
+        current = DataVersion.current(labels.values())
+        for kind, label in labels.items():
+            if current.get(label, (0, None))[0] != self.versions.get(kind):
+                self.build(kind)
+    
+    def search(self, query, kinds, limit):
+        school_id = tenancy.current_school_id()
+        with self.lock:
+            self.refresh_if_stale()
+            results = []
+            for kind in kinds:
+                if kind not in self.indexes:
+                    self.build(kind)
+                results.extend(
+                    {'type': kind, 'id': pk, 'label': label, 'detail': detail}
+                    for pk, label, detail in self.indexes[kind].search(query, limit, school_id)
+                )
+        metrics.incr('autocomplete.queries')
+        return results
+    
+    def apply(self, kind, instance, deleted=False):
+        """Patch a loaded index after a save or delete in this process"""
+        with self.lock:
+            index = self.indexes.get(kind)
+            if index is None:
+                return
+            source = self.sources[kind]
+            if deleted or not source.is_active(instance):
+                index.remove(instance.pk)
+            else:
+                index.add(*source.entry(instance))
+
+
+registry = AutocompleteRegistry(SOURCES)
+
+
+def connect_autocomplete_signals():
+    for kind, source in SOURCES.items():
+        def on_save(sender, instance, raw=False, kind=kind, **kwargs):
+            if not raw:
+                registry.apply(kind, instance)
+        
+        def on_delete(sender, instance, kind=kind, **kwargs):
+            registry.apply(kind, instance, deleted=True)
+        
+        uid = f'core.autocomplete.{kind}'
+        post_save.connect(on_save, sender=source.model_label, weak=False, dispatch_uid=uid + '.save')
+        post_delete.connect(on_delete, sender=source.model_label, weak=False, dispatch_uid=uid + '.delete')
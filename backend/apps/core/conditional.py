@@ -0,0 +1,136 @@
+"""
+Conditional GET support (ETag / Last-Modified) for API views
+
+Validators are built from the DataVersion counters of the models a view
+reads, so checking them costs a single small query and never touches the
+rows being listed. A matching If-None-Match / If-Modified-Since short
+circuits the request with 304 before any queryset or serializer runs.
+"""
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import APIException
+
+from . import metrics, tenancy
+from .models import DataVersion
+
+_related_models_cache = {}
+
+
+def related_model_labels(model):
+    """Labels of a model and every local model reachable through forward FKs
+
+    Serializers render names of related rows (department_name, category_name,
+    ...), so a change to any of them has to invalidate the payload too.
+    """
+    if model in _related_models_cache:
+        return _related_models_cache[model]
+
+    user_model = get_user_model()
+    seen = set()
+    pending = [model]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        for field in current._meta.get_fields():
+            if not (field.is_relation and field.many_to_one and field.concrete):
+                continue
+            target = field.related_model
+            if target is user_model or target._meta.app_config.name.startswith('apps.'):
+                pending.append(target)
+
+    labels = tuple(sorted(m._meta.label for m in seen))
+    _related_models_cache[model] = labels
+    return labels
+
+
+class NotModified(APIException):
+    """Raised from ``initial()`` to skip the handler entirely"""
+    status_code = 304
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """Adds ETag / Last-Modified validators to GET and HEAD requests
+
+    ViewSets derive the models to watch from their queryset and can add
+    models their serializer reads through ``conditional_extra_models``.
+    APIViews without a queryset declare ``conditional_models`` explicitly.
+    Actions that set their own validators (file downloads) pass
+    ``conditional_get=False`` to ``@action``. Views whose output also
+    depends on something other than data (e.g. today's date) add it
+    through ``get_conditional_key_parts()``.
+    """
+    conditional_get = True
+    conditional_models = None
+    conditional_extra_models = ()
+
+    def get_conditional_models(self):
+        if self.conditional_models is not None:
+            labels = tuple(self.conditional_models)
+        else:
+            labels = related_model_labels(self.get_queryset().model)
+        return labels + tuple(self.conditional_extra_models)
+
+    def get_conditional_key_parts(self, request):
+        return ()
+
+    def get_validators(self, request):
+        labels = self.get_conditional_models()
+        versions = DataVersion.current(labels)
+        self.data_versions = versions  # reusable by the handler, e.g. for cache keys
+
+        parts = [str(getattr(request.user, 'pk', '')), f'school:{tenancy.current_school_id()}', request.get_full_path()]
+        parts.extend(self.get_conditional_key_parts(request))
+        last_modified = None
+        for label in labels:
+            version, updated_at = versions.get(label, (0, None))
+            parts.append(f'{label}:{version}')
+            if updated_at and (last_modified is None or updated_at > last_modified):
+                last_modified = updated_at
+
+        etag = quote_etag(hashlib.sha1('|'.join(parts).encode()).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return etag, timestamp
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._conditional_validators = None
+
+        if request.method not in ('GET', 'HEAD') or not self.conditional_get:
+            return
+
+        etag, last_modified = self.get_validators(request)
+        self._conditional_validators = (etag, last_modified)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            metrics.incr('conditional_get.hit')
+            raise NotModified(response)
+        metrics.incr('conditional_get.miss')
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, '_conditional_validators', None)
+
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            response['Cache-Control'] = 'private, no-cache'
+            patch_vary_headers(response, ['Authorization', 'X-School'])
+
+        return response
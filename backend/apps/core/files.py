@@ -0,0 +1,214 @@
+"""
+Serving stored files after Django has checked permissions
+
+Views authorise the request, then hand the file to ``serve_file()``:
+
+- ``If-None-Match`` / ``If-Modified-Since`` are answered with 304
+- with ``FILE_SERVE_BACKEND = 'x-accel-redirect'`` (nginx) or
+  ``'x-sendfile'`` (Apache, lighttpd) only headers are returned and the
+  proxy sends the bytes, Range requests included
+- otherwise whole files go out as ``FileResponse`` (``sendfile`` through
+  ``wsgi.file_wrapper`` where the server supports it) and single
+  ``Range: bytes=`` requests get a 206 with just that slice
+"""
+import mimetypes
+import os
+import re
+import tempfile
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import renderers
+
+from . import metrics
+from .renderers import dumps
+from .storage import content_digest
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+STREAM_BLOCK_SIZE = 64 * 1024
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def parse_range(header, size):
+    """(start, end) inclusive for a single satisfiable byte range, None to send everything
+
+    Raises ValueError when the range cannot be satisfied. Multi-range
+    requests are answered with the full file, which RFC 9110 allows.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:  # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Empty suffix range')
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def iter_file_range(path, start, end, block_size=STREAM_BLOCK_SIZE):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(block_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def content_disposition(filename, as_attachment):
+    kind = 'attachment' if as_attachment else 'inline'
+    try:
+        filename.encode('ascii')
+        return f'{kind}; filename="{filename}"'
+    except UnicodeEncodeError:
+        return f"{kind}; filename*=utf-8''{quote(filename)}"
+
+
+def serve_file(request, storage, name, filename=None, as_attachment=False, content_type=None,
+               accel_prefix=None):
+    """Response for a file in a local storage, honouring validators and Range
+
+    ``accel_prefix`` is the nginx internal location of the storage's root
+    (default ``FILE_SERVE_ACCEL_PREFIX``, which maps MEDIA_ROOT).
+    """
+    try:
+        path = storage.path(name)
+        stat = os.stat(path)
+    except (NotImplementedError, FileNotFoundError, ValueError):
+        raise Http404('File not found')
+    
+    digest = content_digest(name)
+    etag = quote_etag(digest or f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+    last_modified = int(stat.st_mtime)
+    
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        metrics.incr('files.not_modified')
+        return finish_headers(response, etag, last_modified, digest)
+    
+    filename = filename or os.path.basename(name)
+    if content_type is None:
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    
+    backend = getattr(settings, 'FILE_SERVE_BACKEND', 'django')
+    if backend in ('x-accel-redirect', 'x-sendfile'):
+        response = HttpResponse(content_type=content_type)
+        if backend == 'x-accel-redirect':
+            prefix = accel_prefix or settings.FILE_SERVE_ACCEL_PREFIX
+            response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(name)
+        else:
+            response['X-Sendfile'] = path
+        metrics.incr('files.offloaded')
+    else:
+        response = django_file_response(request, path, stat.st_size, etag, last_modified, content_type)
+    
+    response['Content-Disposition'] = content_disposition(filename, as_attachment)
+    return finish_headers(response, etag, last_modified, digest)
+
+
+def django_file_response(request, path, size, etag, last_modified, content_type):
+    byte_range = None
+    if request.method == 'GET' and range_applies(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    
+    if byte_range is None:
+        metrics.incr('files.full')
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        metrics.incr('files.partial')
+        response = StreamingHttpResponse(iter_file_range(path, start, end), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def range_applies(request, etag, last_modified):
+    """If-Range: the Range header only counts when the client's copy is current"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def finish_headers(response, etag, last_modified, digest):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    if digest:
+        # content-addressed files never change under the same name
+        response['Cache-Control'] = f'private, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def cached_export(storage, name, write, stale_prefix=None):
+    """Generate ``name`` with ``write(text_file)`` unless it already exists
+
+    The file is written next to its destination and renamed into place, so
+    concurrent requests never serve a half-written export. Older exports
+    whose names start with ``stale_prefix`` are removed.
+    """
+    path = storage.path(name)
+    if os.path.exists(path):
+        metrics.incr('exports.cache.hit')
+        return name
+    metrics.incr('exports.cache.miss')
+    
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix='.export-')
+    try:
+        with os.fdopen(handle, 'w', newline='', encoding='utf-8') as text_file:
+            write(text_file)
+        # mkstemp() creates 0600; a proxy serving it (X-Sendfile) may run as another user
+        os.chmod(temp_path, storage.file_permissions_mode or 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    
+    if stale_prefix:
+        basename = os.path.basename(path)
+        for entry in os.scandir(directory):
+            if entry.name.startswith(stale_prefix) and entry.name != basename:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass  # removed by a concurrent request
+    return name
+
+
+class PassthroughRenderer(renderers.BaseRenderer):
+    """Lets file download actions accept any ``Accept`` header
+
+    File responses bypass rendering; error payloads are still sent as JSON.
+    """
+    media_type = '*/*'
+    format = None
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+        return dumps(data)
@@ -0,0 +1,74 @@
+"""
+Benchmark DRF's JSONRenderer against FastJSONRenderer
+
+Usage: python manage.py bench_renderers --rows 10000 --repeat 5
+"""
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.renderers import FastJSONRenderer, orjson
+from apps.departments.models import Department
+from apps.finance.models import Expense, ExpenseCategory
+from apps.finance.serializers import ExpenseSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Render ExpenseSerializer rows with the default and the fast JSON renderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        data = ExpenseSerializer(self.build_expenses(rows), many=True).data
+
+        renderers = [
+            ('rest_framework JSONRenderer', JSONRenderer()),
+            ('FastJSONRenderer (%s)' % ('orjson' if orjson else 'stdlib'), FastJSONRenderer()),
+        ]
+
+        self.stdout.write(f'Rendering {rows} expense rows, best of {repeat}')
+        baseline = None
+        for name, renderer in renderers:
+            best = min(self.time_render(renderer, data) for _ in range(repeat))
+            baseline = baseline or best
+            self.stdout.write(
+                f'  {name:<34} {best * 1000:8.1f} ms  ({baseline / best:4.1f}x)'
+            )
+
+    def time_render(self, renderer, data):
+        started = time.perf_counter()
+        renderer.render(data)
+        return time.perf_counter() - started
+
+    def build_expenses(self, count):
+        """Unsaved Expense objects with related rows attached, no DB needed"""
+        user = User(id=1, email='bench@example.com', first_name='Bench', last_name='User')
+        department = Department(id=1, name='Science', code='SCI')
+        category = ExpenseCategory(id=1, name='Lab Equipment', code='LAB')
+        start = date(2024, 4, 1)
+
+        return [
+            Expense(
+                id=i,
+                category=category,
+                department=department,
+                amount=Decimal('1234.56') + i,
+                date=start + timedelta(days=i % 365),
+                payment_mode='BANK',
+                reference_id=f'TXN{i:08d}',
+                description='Lab consumables for practical sessions',
+                status='PAID',
+                requested_by=user,
+                approved_by=user,
+            )
+            for i in range(1, count + 1)
+        ]
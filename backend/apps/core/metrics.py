@@ -0,0 +1,48 @@
+"""
+Process-local metrics counters
+
+Counters live in the memory of each worker process. Pairs of counters named
+``<name>.hit`` and ``<name>.miss`` get a derived ``<name>.hit_rate`` in the
+snapshot.
+"""
+import threading
+from collections import defaultdict
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_gauges = {}
+
+
+def incr(name, value=1):
+    """Increment a counter"""
+    with _lock:
+        _counters[name] += value
+
+
+def gauge(name, value):
+    """Set a point-in-time value"""
+    with _lock:
+        _gauges[name] = value
+
+
+def snapshot():
+    """Return all counters, gauges and derived hit rates"""
+    with _lock:
+        data = dict(_counters)
+        data.update(_gauges)
+    
+    for name in list(data):
+        if not name.endswith('.hit'):
+            continue
+        prefix = name[:-len('.hit')]
+        hits = data[name]
+        total = hits + data.get(f'{prefix}.miss', 0)
+        data[f'{prefix}.hit_rate'] = round(hits / total, 4) if total else 0.0
+    
+    return dict(sorted(data.items()))
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:19
+
+from django.db import migrations, models
+
+from apps.core import periods
+
+
+def seed_fiscal_periods(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    FiscalPeriod = apps.get_model('core', 'FiscalPeriod')
+    rows = []
+    for fiscal_year in range(2000, 2061):
+        low, high = periods.fiscal_year_key_range(fiscal_year)
+        for key in range(low, high + 1):
+            if not 1 <= key % 100 <= 12:
+                continue
+            start_date, end_date = periods.period_bounds(key)
+            rows.append(FiscalPeriod(
+                key=key,
+                fiscal_year=fiscal_year,
+                fiscal_year_label=periods.financial_year_label(fiscal_year),
+                quarter=periods.fiscal_quarter_of(start_date),
+                year=start_date.year,
+                month=start_date.month,
+                start_date=start_date,
+                end_date=end_date,
+            ))
+    FiscalPeriod.objects.using(db_alias).bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FiscalPeriod',
+            fields=[
+                ('key', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('fiscal_year', models.PositiveSmallIntegerField()),
+                ('fiscal_year_label', models.CharField(max_length=10)),
+                ('quarter', models.PositiveSmallIntegerField()),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+            ],
+            options={
+                'db_table': 'fiscal_periods',
+                'ordering': ['key'],
+                'indexes': [models.Index(fields=['fiscal_year', 'quarter'], name='fiscal_peri_fiscal__fc9863_idx')],
+            },
+        ),
+        migrations.RunPython(seed_fiscal_periods, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+"""
+Core Models - Shared infrastructure used across apps
+"""
+from django.db import models, transaction, IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+
+class DataVersion(models.Model):
+    """Change counter per model, bumped on every save/delete"""
+    
+    label = models.CharField(max_length=100, unique=True)  # e.g., "finance.Expense"
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'data_versions'
+        ordering = ['label']
+    
+    def __str__(self):
+        return f"{self.label} v{self.version}"
+    
+    @classmethod
+    def bump(cls, label):
+        """Increment the version of a model label atomically"""
+        now = timezone.now()
+        updated = cls.objects.filter(label=label).update(version=F('version') + 1, updated_at=now)
+        if updated:
+            return
+        
+        try:
+            with transaction.atomic():
+                cls.objects.create(label=label, version=1, updated_at=now)
+        except IntegrityError:
+            # Another writer created the row first
+            cls.objects.filter(label=label).update(version=F('version') + 1, updated_at=now)
+    
+    @classmethod
+    def current(cls, labels):
+        """Return {label: (version, updated_at)} for the given labels in one query"""
+        rows = cls.objects.filter(label__in=labels).values_list('label', 'version', 'updated_at')
+        return {label: (version, updated_at) for label, version, updated_at in rows}
+
+
+class FiscalPeriod(models.Model):
+    """Month dimension with financial-year attributes (April fiscal start)"""
+    
+    key = models.PositiveIntegerField(primary_key=True)  # YYYYMM, e.g. 202405
+    fiscal_year = models.PositiveSmallIntegerField()  # start year, e.g. 2024
+    fiscal_year_label = models.CharField(max_length=10)  # e.g. "2024-25"
+    quarter = models.PositiveSmallIntegerField()  # 1-4 within the financial year
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()  # calendar month 1-12
+    start_date = models.DateField()
+    end_date = models.DateField()  # exclusive
+    
+    class Meta:
+        db_table = 'fiscal_periods'
+        ordering = ['key']
+        indexes = [
+            models.Index(fields=['fiscal_year', 'quarter']),
+        ]
+    
+    def __str__(self):
+        return f"FY {self.fiscal_year_label} Q{self.quarter} - {self.year}/{self.month:02d}"
@@ -0,0 +1,84 @@
+"""
+Fiscal period helpers
+
+Financial years start in April. Two integer keys identify periods:
+
+- ``period_key``: calendar month as YYYYMM, e.g. 202405 for May 2024
+- ``fiscal_year``: start year of the financial year, e.g. 2024 for "2024-25"
+
+Every month of a financial year falls in one contiguous ``period_key``
+range (202404..202503), so yearly filters stay simple range scans.
+"""
+from datetime import date
+
+FISCAL_YEAR_START_MONTH = 4  # April
+
+
+def period_key(day):
+    """YYYYMM key of the calendar month containing ``day``"""
+    return day.year * 100 + day.month
+
+
+def fiscal_year_of(day):
+    """Start year of the financial year containing ``day``"""
+    return day.year if day.month >= FISCAL_YEAR_START_MONTH else day.year - 1
+
+
+def fiscal_year_of_key(key):
+    """Start year of the financial year containing period ``key``"""
+    year, month = divmod(key, 100)
+    return year if month >= FISCAL_YEAR_START_MONTH else year - 1
+
+
+def fiscal_quarter_of(day):
+    """1-4, counted from the start of the financial year"""
+    return (day.month - FISCAL_YEAR_START_MONTH) % 12 // 3 + 1
+
+
+def financial_year_label(start_year):
+    """2024 -> "2024-25" """
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+
+def parse_financial_year(label):
+    """"2024-25" (or "24-25", or "2024") -> 2024
+
+    Raises ValueError for anything else.
+    """
+    start = str(label).strip().split('-')[0]
+    if not start.isdigit():
+        raise ValueError(f'Invalid financial year: {label!r}')
+    start_year = int(start)
+    if start_year < 100:
+        start_year += 2000  # short form, e.g. "24-25"
+    return start_year
+
+
+def month_period_key(start_year, month):
+    """Key of calendar ``month`` (1-12) inside the financial year ``start_year``"""
+    year = start_year if month >= FISCAL_YEAR_START_MONTH else start_year + 1
+    return year * 100 + month
+
+
+def fiscal_year_key_range(start_year):
+    """(first, last) period keys of a financial year, both inclusive"""
+    first = start_year * 100 + FISCAL_YEAR_START_MONTH
+    last_month = (FISCAL_YEAR_START_MONTH - 2) % 12 + 1
+    last_year = start_year + 1 if FISCAL_YEAR_START_MONTH > 1 else start_year
+    return first, last_year * 100 + last_month
+
+
+def period_bounds(key):
+    """(start_date, end_date) of a period key, end exclusive"""
+    year, month = divmod(key, 100)
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def fiscal_year_bounds(start_year):
+    """(start_date, end_date) of a financial year, end exclusive"""
+    return (
+        date(start_year, FISCAL_YEAR_START_MONTH, 1),
+        date(start_year + 1, FISCAL_YEAR_START_MONTH, 1),
+    )
@@ -0,0 +1,189 @@
+"""
+Process-local cache of reference data (departments, income sources, expense categories)
+
+These tables are small and rarely change but their names appear in almost
+every serialized row and report. Each process loads a table once into a
+``{id: row}`` dict of namedtuples, so serializers and reports resolve
+``department_name``, ``category_name``, ... by id instead of joining.
+
+- loaded lazily, one query per table, on first use
+- dropped by post_save/post_delete in the process that made the change
+- reloaded when the table's DataVersion moved, checked at most every
+  ``REFERENCE_DATA_CHECK_INTERVAL`` seconds (changes made by other processes)
+- an id that is not cached (a row created elsewhere since the last check)
+  triggers one reload; lookups count ``refdata.hit`` / ``refdata.miss``
+
+Schools with a database of their own (apps.core.tenancy) get their own
+set of tables, since ids repeat across databases.
+
+Memory use of every loaded table is published as the
+``refdata.bytes.<label>`` gauge.
+"""
+import sys
+import threading
+import time
+from collections import namedtuple
+from operator import attrgetter
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_save, post_delete
+from rest_framework import serializers
+
+from . import metrics, tenancy
+from .models import DataVersion
+
+DEPARTMENT = 'departments.Department'
+INCOME_SOURCE = 'finance.IncomeSource'
+EXPENSE_CATEGORY = 'finance.ExpenseCategory'
+
+TABLES = {
+    DEPARTMENT: ('name', 'code', 'is_active', 'school_id'),
+    INCOME_SOURCE: ('name', 'code', 'is_active'),
+    EXPENSE_CATEGORY: ('name', 'code', 'category_type', 'is_active'),
+}
+
+
+def deep_size(rows):
+    """Approximate bytes held by a ``{id: namedtuple}`` dict"""
+    size = sys.getsizeof(rows)
+    for pk, row in rows.items():
+        size += sys.getsizeof(pk) + sys.getsizeof(row)
+        size += sum(sys.getsizeof(value) for value in row)
+    return size
+
+
+class ReferenceTable:
+    """One cached table; ``rows`` is None until loaded"""
+    
+    def __init__(self, label, fields):
+        self.label = label
+        self.fields = fields
+        self.row_type = namedtuple(label.split('.')[1] + 'Ref', ('id',) + fields)
+        self.rows = None
+        self.version = None
+    
+    def load(self):
+        # Read the version first so a change during the load triggers another load
+        self.version = DataVersion.current([self.label]).get(self.label, (0, None))[0]
+        queryset = apps.get_model(self.label).objects.values_list('id', *self.fields)
+        rows = {row[0]: self.row_type(*row) for row in queryset.iterator()}
+        self.rows = rows
+        
+        metrics.incr('refdata.loads')
+        metrics.gauge(f'refdata.rows.{self.label}', len(rows))
+        metrics.gauge(f'refdata.bytes.{self.label}', deep_size(rows))
+        return rows
+
+
+class ReferenceData:
+    """The per-process cache of every reference table, one set per database"""
+    
+    def __init__(self, tables):
+        self.table_fields = tables
+        self.databases = {}  # alias: {label: ReferenceTable}
+        self.checked_at = {}  # alias: monotonic time of the last version check
+        self.lock = threading.RLock()
+    
+    @property
+    def tables(self):
+        """Tables of the database the current school reads"""
+        alias = tenancy.current_database() or DEFAULT_DB_ALIAS
+        tables = self.databases.get(alias)
+        if tables is None:
+            with self.lock:
+                tables = self.databases.setdefault(alias, {
+                    label: ReferenceTable(label, fields) for label, fields in self.table_fields.items()
+                })
+        return tables
+    
+    def refresh_if_stale(self):
+        interval = getattr(settings, 'REFERENCE_DATA_CHECK_INTERVAL', 5)
+        alias = tenancy.current_database() or DEFAULT_DB_ALIAS
+        now = time.monotonic()
+        if now - self.checked_at.get(alias, 0.0) < interval:
+            return
+        with self.lock:
+            self.checked_at[alias] = now
+            loaded = [table for table in self.tables.values() if table.rows is not None]
+            if not loaded:
+                return
+            current = DataVersion.current([table.label for table in loaded])
+            for table in loaded:
+                if current.get(table.label, (0, None))[0] != table.version:
+                    table.rows = None
+    
+    def rows(self, label):
+        """``{id: row}`` of a table, inactive rows included"""
+        self.refresh_if_stale()
+        table = self.tables[label]
+        rows = table.rows
+        if rows is None:
+            with self.lock:
+                rows = table.rows if table.rows is not None else table.load()
+        return rows
+    
+    def get(self, label, pk):
+        """The cached row with that id, or None"""
+        if pk is None:
+            return None
+        row = self.rows(label).get(pk)
+        if row is not None:
+            metrics.incr('refdata.hit')
+            return row
+        
+        metrics.incr('refdata.miss')
+        with self.lock:
+            # Possibly created by another process since the last version check
+            return self.tables[label].load().get(pk)
+    
+    def name(self, label, pk):
+        row = self.get(label, pk)
+        return row.name if row is not None else None
+    
+    def active(self, label):
+        """Active rows (of the current school, for departments) ordered by name, like the models' default ordering"""
+        return sorted(
+            (
+                row for row in self.rows(label).values()
+                if row.is_active and ('school_id' not in row._fields or tenancy.in_scope(row.school_id))
+            ),
+            key=attrgetter('name')
+        )
+    
+    def invalidate(self, label=None):
+        with self.lock:
+            for tables in self.databases.values():
+                for table in tables.values():
+                    if label is None or table.label == label:
+                        table.rows = None
+
+
+refdata = ReferenceData(TABLES)
+
+
+class ReferenceNameField(serializers.ReadOnlyField):
+    """Read-only attribute of a reference row looked up by the FK id in ``source``
+
+    ``department_name = ReferenceNameField(DEPARTMENT, source='department_id')``
+    """
+    
+    def __init__(self, model_label, attribute='name', **kwargs):
+        self.model_label = model_label
+        self.attribute = attribute
+        super().__init__(**kwargs)
+    
+    def to_representation(self, value):
+        row = refdata.get(self.model_label, value)
+        return getattr(row, self.attribute) if row is not None else None
+
+
+def connect_refdata_signals():
+    for label in TABLES:
+        def on_change(sender, label=label, **kwargs):
+            refdata.invalidate(label)
+        
+        uid = f'core.refdata.{label}'
+        post_save.connect(on_change, sender=label, weak=False, dispatch_uid=uid + '.save')
+        post_delete.connect(on_change, sender=label, weak=False, dispatch_uid=uid + '.delete')
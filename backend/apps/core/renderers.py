@@ -0,0 +1,72 @@
+"""
+JSON renderer with exact Decimal handling
+
+Uses orjson when it is installed and falls back to the standard library
+encoder otherwise. Decimals are written as exact strings, the same way DRF
+serializes ``DecimalField`` when ``COERCE_DECIMAL_TO_STRING`` is on, instead
+of being rounded through ``float``.
+"""
+import decimal
+import json
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class ExactJSONEncoder(encoders.JSONEncoder):
+    """DRF's encoder, but Decimals keep every digit"""
+    
+    def default(self, obj):
+        if isinstance(obj, decimal.Decimal):
+            return encode_decimal(obj)
+        return super().default(obj)
+
+
+_fallback_encoder = ExactJSONEncoder()
+
+
+def encode_decimal(value):
+    if api_settings.COERCE_DECIMAL_TO_STRING:
+        return format(value, 'f')  # never scientific notation
+    return float(value)
+
+
+def orjson_default(obj):
+    """Called by orjson only for types it cannot encode natively"""
+    if isinstance(obj, decimal.Decimal):
+        return encode_decimal(obj)
+    return _fallback_encoder.default(obj)
+
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+    
+    def dumps(data):
+        return orjson.dumps(data, default=orjson_default, option=ORJSON_OPTIONS)
+else:
+    def dumps(data):
+        return json.dumps(
+            data, cls=ExactJSONEncoder, ensure_ascii=False,
+            separators=(',', ':'), allow_nan=False,
+        ).encode('utf-8')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Drop-in replacement for DRF's JSONRenderer"""
+    encoder_class = ExactJSONEncoder
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        
+        # Indented output (browsable API, ?indent=) goes through the stdlib path
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        return dumps(data)
@@ -0,0 +1,34 @@
+"""
+Core Signals - Keep data versions in step with model changes
+"""
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete
+
+from .models import DataVersion
+
+
+def tracked_models():
+    """Models of the local apps whose changes are versioned
+
+    The change journal (apps.sync) is left out: it grows with every write
+    and nothing caches it.
+    """
+    return [
+        model for model in apps.get_models()
+        if model._meta.app_config.name.startswith('apps.')
+        and model._meta.app_label not in ('core', 'sync')
+    ]
+
+
+def bump_data_version(sender, raw=False, **kwargs):
+    if raw:
+        # Skip fixture loading
+        return
+    DataVersion.bump(sender._meta.label)
+
+
+def connect_data_version_signals():
+    for model in tracked_models():
+        uid = f'core.data_version.{model._meta.label}'
+        post_save.connect(bump_data_version, sender=model, dispatch_uid=uid + '.save')
+        post_delete.connect(bump_data_version, sender=model, dispatch_uid=uid + '.delete')
@@ -0,0 +1,206 @@
+"""
+Single-flight - one computation for concurrent identical requests
+
+At month end many users open the same report for the same period at
+once. ``run(namespace, parts, compute)`` lets the first caller compute and
+the others wait for its result instead of repeating the aggregation:
+
+- threads of a worker wait for the computation in flight and share the
+  object it returns, so callers treat it as read-only
+- worker processes of a node take an ``flock()`` on a lock file per key in
+  ``SINGLEFLIGHT_DIR``; the one that gets it computes and leaves the
+  result (pickled) beside the lock, and processes that were waiting for
+  the lock read it instead of computing. Unpickling runs code, so the
+  directory must be private: it is created 0700, and when it is owned by
+  another user or writable by group/others processes stop sharing through
+  it (each computes on its own) rather than read what someone else wrote
+
+``parts`` must capture everything the result depends on: the normalized
+parameters, the school and the DataVersion counters of what it reads, so a
+result is never shared across a write. A waiter gives up after
+``SINGLEFLIGHT_TIMEOUT`` seconds and computes on its own, as does every
+waiter when the computation fails.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import stat
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+from . import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the threads of a worker are coalesced
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LOCK_POLL_SECONDS = 0.05
+# Result files only serve processes that waited for them; lock files are
+# left for later flights of the same key until nobody has used them for long
+RESULT_MAX_AGE = 5 * 60
+LOCK_MAX_AGE = 60 * 60
+
+_MISSING = object()
+
+
+class Flight:
+    """A computation in progress in this process"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.failed = False
+
+
+_flights = {}
+_lock = threading.Lock()
+_swept_at = 0.0
+_refused = set()  # directories already reported as not private
+
+
+def make_key(namespace, parts):
+    return f'{namespace}-' + hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def run(namespace, parts, compute):
+    """``compute()``, or the result of an identical computation already in flight"""
+    key = make_key(namespace, parts)
+    with _lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = Flight()
+    
+    if not leader:
+        if flight.done.wait(settings.SINGLEFLIGHT_TIMEOUT) and not flight.failed:
+            metrics.incr('singleflight.shared')
+            return flight.result
+        metrics.incr('singleflight.abandoned')
+        return compute()
+    
+    try:
+        flight.result = run_across_processes(key, compute)
+        return flight.result
+    except BaseException:
+        flight.failed = True
+        raise
+    finally:
+        with _lock:
+            del _flights[key]
+        flight.done.set()
+
+
+def flight_directory():
+    """``SINGLEFLIGHT_DIR`` when it is private to this user, else None"""
+    directory = settings.SINGLEFLIGHT_DIR
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if is_private(os.lstat(directory)):
+            return directory
+    except OSError:
+        pass
+    if directory not in _refused:
+        _refused.add(directory)
+        logger.warning('Single-flight directory %s is not private to this user; processes compute on their own', directory)
+    return None
+
+
+def is_private(info):
+    """A directory or file owned by this user that nobody else can write"""
+    return info.st_uid == os.geteuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def run_across_processes(key, compute):
+    directory = flight_directory() if fcntl is not None else None
+    if directory is None:
+        metrics.incr('singleflight.computed')
+        return compute()
+    
+    lock_path = os.path.join(directory, key + '.lock')
+    result_path = os.path.join(directory, key + '.result')
+    started = time.time()
+    with open(lock_path, 'a') as handle:
+        waited = acquire(handle, settings.SINGLEFLIGHT_TIMEOUT)
+        if waited is None:
+            metrics.incr('singleflight.abandoned')
+            return compute()
+        try:
+            os.utime(lock_path)  # in use: keep it from the sweep
+            if waited:
+                # Written by the process we waited for (file times run on a coarser clock)
+                result = read_result(result_path, started - 1)
+                if result is not _MISSING:
+                    metrics.incr('singleflight.shared')
+                    return result
+            metrics.incr('singleflight.computed')
+            result = compute()
+            write_result(result_path, result)
+            return result
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+            sweep(directory)
+
+
+def acquire(handle, timeout):
+    """Lock ``handle``: False when it was free, True after waiting, None on timeout"""
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return False
+    except BlockingIOError:
+        pass
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_SECONDS)
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            continue
+    return None
+
+
+def read_result(path, since):
+    try:
+        with open(path, 'rb') as handle:
+            info = os.fstat(handle.fileno())
+            if info.st_mtime < since or not is_private(info):
+                return _MISSING
+            return pickle.load(handle)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return _MISSING
+
+
+def write_result(path, result):
+    """Pickle ``result`` next to its lock, renamed into place like cached exports"""
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.flight-')
+    try:
+        with os.fdopen(handle, 'wb') as result_file:
+            pickle.dump(result, result_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        # Not shareable across processes; the threads of this one still get it
+        os.remove(temp_path)
+
+
+def sweep(directory):
+    """Remove old result and lock files, at most once a minute per process"""
+    global _swept_at
+    now = time.time()
+    if now - _swept_at < 60:
+        return
+    _swept_at = now
+    for entry in os.scandir(directory):
+        max_age = RESULT_MAX_AGE if entry.name.endswith('.result') else LOCK_MAX_AGE
+        try:
+            if now - entry.stat().st_mtime > max_age:
+                # A process still holding an old lock file only risks one duplicate computation
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass  # removed by another process
@@ -0,0 +1,91 @@
+"""
+Content-addressed file storage
+
+Files are stored under the sha256 of their content, e.g.
+``expenses/receipts/ab/cd/abcd...ef.pdf``. Uploading the same file twice
+stores it once and both records point at the same name. Content is hashed
+while it is streamed to a temporary file next to its destination, so
+large uploads never sit in memory and are read only once.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASH_NAME_LENGTH = 64  # hex sha256
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by content hash and never stores a duplicate"""
+    
+    def get_available_name(self, name, max_length=None):
+        # The final name is only known once the content is hashed in _save()
+        return name
+    
+    def _save(self, name, content):
+        directory, basename = os.path.split(name)
+        extension = os.path.splitext(basename)[1].lower()
+        
+        staging_dir = self.path(directory)
+        os.makedirs(staging_dir, exist_ok=True)
+        hasher = hashlib.sha256()
+        
+        handle, temp_path = tempfile.mkstemp(dir=staging_dir, prefix='.upload-')
+        try:
+            with os.fdopen(handle, 'wb') as temp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    hasher.update(chunk)
+                    temp_file.write(chunk)
+            
+            digest = hasher.hexdigest()
+            target = os.path.join(directory, digest[:2], digest[2:4], digest + extension).replace('\\', '/')
+            target_path = self.path(target)
+            
+            if os.path.exists(target_path):
+                return target  # duplicate content: keep the stored copy
+            
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(temp_path, self.file_permissions_mode)
+            os.replace(temp_path, target_path)
+            temp_path = None
+            return target
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+def content_digest(name):
+    """sha256 a content-addressed name was stored under, or None for other names"""
+    stem = os.path.splitext(os.path.basename(name or ''))[0]
+    if len(stem) == HASH_NAME_LENGTH and all(c in '0123456789abcdef' for c in stem):
+        return stem
+    return None
+
+
+_receipt_storage = None
+
+
+def receipt_storage():
+    """Storage of expense receipts (callable, so migrations do not embed paths)"""
+    global _receipt_storage
+    if _receipt_storage is None:
+        _receipt_storage = ContentAddressedStorage()
+    return _receipt_storage
+
+
+_export_storage = None
+
+
+def export_storage():
+    """Storage of generated exports: EXPORT_ROOT, outside MEDIA_ROOT so they are only served after a permission check"""
+    global _export_storage
+    if _export_storage is None:
+        _export_storage = FileSystemStorage(location=settings.EXPORT_ROOT)
+    return _export_storage
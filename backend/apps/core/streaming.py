@@ -0,0 +1,95 @@
+"""
+Streaming JSON, CSV and XLSX responses for large exports
+"""
+import csv
+import tempfile
+from itertools import chain
+
+from django.http import FileResponse, StreamingHttpResponse
+from openpyxl import Workbook
+
+from .renderers import dumps
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def iter_json_array(queryset, serializer_class, context, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield a JSON array chunk by chunk without materialising the queryset
+
+    ``queryset`` may also be a list of querysets, streamed one after another.
+    """
+    querysets = queryset if isinstance(queryset, (list, tuple)) else [queryset]
+    yield b'['
+    first = True
+    batch = []
+    
+    for obj in chain.from_iterable(qs.iterator(chunk_size=chunk_size) for qs in querysets):
+        batch.append(obj)
+        if len(batch) >= chunk_size:
+            yield _encode_batch(batch, serializer_class, context, first)
+            first = False
+            batch = []
+    
+    if batch:
+        yield _encode_batch(batch, serializer_class, context, first)
+    yield b']'
+
+
+def _encode_batch(batch, serializer_class, context, first):
+    rows = serializer_class(batch, many=True, context=context).data
+    body = dumps(list(rows))[1:-1]  # strip the surrounding brackets
+    return body if first else b',' + body
+
+
+def streaming_json_response(queryset, serializer_class, context, filename=None):
+    response = StreamingHttpResponse(
+        iter_json_array(queryset, serializer_class, context),
+        content_type='application/json',
+    )
+    if filename:
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the line, for csv.writer"""
+    
+    def write(self, value):
+        return value
+
+
+def iter_csv(header, rows):
+    """Yield encoded CSV lines; ``rows`` is any iterable of sequences"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header).encode('utf-8')
+    for row in rows:
+        yield writer.writerow(row).encode('utf-8')
+
+
+def streaming_csv_response(header, rows, filename):
+    response = StreamingHttpResponse(iter_csv(header, rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def xlsx_response(header, rows, filename, title='Sheet1'):
+    """Write rows with openpyxl's write-only mode (constant memory) and send the file
+
+    XLSX is a zip archive, so it is spooled to a temporary file rather than
+    streamed while being generated.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title)
+    sheet.append(header)
+    for row in rows:
+        sheet.append(list(row))
+    
+    handle = tempfile.TemporaryFile()
+    workbook.save(handle)
+    handle.seek(0)
+    return FileResponse(
+        handle,
+        as_attachment=True,
+        filename=filename,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
@@ -0,0 +1,253 @@
+"""
+Multi-school tenancy
+
+A request acts for at most one school (tenant):
+
+- school users carry their school in the JWT ``school`` claim; users
+  without a school (deployment administrators) pick one with the
+  ``X-School: <code>`` header, or see every school without it
+- ``TenantJWTAuthentication`` (apps.authentication.backends) activates the
+  school, ``TenantMiddleware`` starts every request without one
+- ``TenantScopedMixin`` filters viewset querysets by the school and rejects
+  related rows of another school; ``ledger()`` and the reports use
+  ``scoped()`` the same way
+- ``TenantRouter`` sends every query of a school that has a database of
+  its own (``School.database``) to that database
+
+Management commands and background jobs run unscoped unless they wrap
+their work in ``school_context()``.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import serializers
+
+_current_school = contextvars.ContextVar('current_school', default=None)
+
+
+class SchoolRequired(ValueError):
+    """A tenant row was saved with no school to derive its own from"""
+
+
+class SchoolDirectory:
+    """Process-local cache of the schools table, always read from the default database"""
+    
+    def __init__(self):
+        self.by_id = None
+        self.loaded_at = 0.0
+        self.lock = threading.Lock()
+    
+    def all(self):
+        """``{id: School}``, reloaded every ``SCHOOL_CACHE_SECONDS`` and on changes in this process"""
+        timeout = getattr(settings, 'SCHOOL_CACHE_SECONDS', 60)
+        by_id = self.by_id
+        if by_id is None or time.monotonic() - self.loaded_at > timeout:
+            with self.lock:
+                model = apps.get_model('schools', 'School')
+                by_id = {school.pk: school for school in model.objects.using(DEFAULT_DB_ALIAS).all()}
+                self.by_id, self.loaded_at = by_id, time.monotonic()
+        return by_id
+    
+    def get(self, pk):
+        return self.all().get(pk)
+    
+    def by_code(self, code):
+        code = code.strip().upper()
+        return next((school for school in self.all().values() if school.code.upper() == code), None)
+    
+    def invalidate(self):
+        self.by_id = None
+
+
+schools = SchoolDirectory()
+
+
+def current_school():
+    """The School the current request or ``school_context()`` acts for, or None"""
+    return _current_school.get()
+
+
+def current_school_id():
+    school = _current_school.get()
+    return school.pk if school is not None else None
+
+
+def current_database():
+    """Database alias of the current school when it has its own database, else None"""
+    school = _current_school.get()
+    if school is None:
+        return None
+    return school.database or None
+
+
+def activate(school):
+    """Make ``school`` current; returns the token for ``deactivate()``"""
+    return _current_school.set(school)
+
+
+def deactivate(token):
+    _current_school.reset(token)
+
+
+@contextmanager
+def school_context(school):
+    """Run a block (e.g. in a management command) as ``school``"""
+    token = activate(school)
+    try:
+        yield school
+    finally:
+        deactivate(token)
+
+
+def scoped(queryset, field='school'):
+    """``queryset`` limited to the current school (unchanged when none is active)"""
+    school_id = current_school_id()
+    return queryset.filter(**{field: school_id}) if school_id is not None else queryset
+
+
+def in_scope(school_id):
+    """Whether a row of ``school_id`` is visible to the current request"""
+    current = current_school_id()
+    return current is None or school_id == current
+
+
+def school_filter(model):
+    """``{'school_id': id}`` for tenant models while a school is active, else ``{}``"""
+    school_id = current_school_id()
+    if school_id is None or not any(field.name == 'school' for field in model._meta.concrete_fields):
+        return {}
+    return {'school_id': school_id}
+
+
+def department_school_id(department_id):
+    """School of a department, from the reference data cache"""
+    from .refdata import refdata, DEPARTMENT
+    
+    row = refdata.get(DEPARTMENT, department_id)
+    return row.school_id if row is not None else None
+
+
+def default_school_id():
+    """The current school, else the only school of a single-school deployment, else None"""
+    school_id = current_school_id()
+    if school_id is None:
+        directory = schools.all()
+        if len(directory) == 1:
+            school_id = next(iter(directory))
+    return school_id
+
+
+def assign_school(instance, source_school_id=None):
+    """Set ``instance.school_id`` before a save
+
+    The school of the row it hangs off (its department, its employee) wins;
+    otherwise a school already set is kept, then ``default_school_id()``.
+    """
+    if source_school_id is not None:
+        instance.school_id = source_school_id
+        return
+    if instance.school_id is not None:
+        return
+    school_id = default_school_id()
+    if school_id is None:
+        raise SchoolRequired(f'Choose the school of this {instance._meta.verbose_name} (X-School header)')
+    instance.school_id = school_id
+
+
+def taken_in_school(model, school_id, attrs, fields, instance=None):
+    """``{field: error}`` for values of ``attrs`` another row of the school already uses
+
+    Serializer-side check of the per-school unique constraints, which DRF
+    does not validate on its own.
+    """
+    if school_id is None:
+        return {}
+    rows = model._default_manager.filter(school_id=school_id)
+    if instance is not None:
+        rows = rows.exclude(pk=instance.pk)
+    return {
+        name: f'{model._meta.verbose_name} with this {model._meta.get_field(name).verbose_name} already exists.'
+        for name in fields
+        if name in attrs and rows.filter(**{name: attrs[name]}).exists()
+    }
+
+
+class TenantScopedMixin:
+    """Limits a viewset to the current school's rows
+
+    ``tenant_field`` is the lookup to the school: ``'school'`` on tenant
+    models, e.g. ``'budget__school'`` on their child rows. Related rows
+    named in a create or update (department, employee, ...) must belong to
+    the same school.
+    """
+    tenant_field = 'school'
+    
+    def get_queryset(self):
+        return scoped(super().get_queryset(), self.tenant_field)
+    
+    def perform_create(self, serializer):
+        self.check_tenant(serializer)
+        try:
+            super().perform_create(serializer)
+        except SchoolRequired as exc:
+            raise serializers.ValidationError({'school': str(exc)})
+    
+    def perform_update(self, serializer):
+        self.check_tenant(serializer)
+        super().perform_update(serializer)
+    
+    def check_tenant(self, serializer):
+        school_id = current_school_id()
+        if school_id is None:
+            return
+        school_model = apps.get_model('schools', 'School')
+        for name, value in serializer.validated_data.items():
+            other = value.pk if isinstance(value, school_model) else getattr(value, 'school_id', None)
+            if other is not None and other != school_id:
+                raise serializers.ValidationError({name: 'Belongs to another school'})
+
+
+class TenantRouter:
+    """Sends the queries of a school with its own database to that database
+
+    Every database holds the full schema (``migrate --database=<alias>``),
+    users included: accounts of such a school live in its database and log
+    in with the school's code.
+    """
+    
+    def db_for_read(self, model, **hints):
+        return current_database()
+    
+    def db_for_write(self, model, **hints):
+        return current_database()
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # School rows are mirrored into the school's own database
+        school_model = apps.get_model('schools', 'School')
+        if isinstance(obj1, school_model) or isinstance(obj2, school_model):
+            return True
+        return None
+
+
+class TenantMiddleware:
+    """Starts every request with no school active
+
+    The authentication class activates the request's school. Streaming
+    responses keep it until they are consumed; the next request on the
+    thread starts clean again.
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        token = activate(None)
+        response = self.get_response(request)
+        if not response.streaming:
+            deactivate(token)
+        return response
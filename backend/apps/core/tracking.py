@@ -0,0 +1,42 @@
+"""
+Field change tracking for models
+
+Models list the attributes they care about in ``tracked_fields``. The values
+as last loaded from (or saved to) the database are kept on the instance, so
+signal receivers can compute deltas without re-reading the row.
+"""
+
+
+class TrackedFieldsMixin:
+    """Remembers the stored value of ``tracked_fields`` (attnames, e.g. department_id)"""
+    tracked_fields = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reset_tracking()
+
+    def reset_tracking(self):
+        self._tracked_state = {
+            name: self.__dict__.get(name) for name in self.tracked_fields
+        }
+
+    def stored_state(self, created=False):
+        """Tracked values as they are in the database
+
+        Returns None for rows that did not exist before; post_save receivers
+        pass their ``created`` flag since the row is already saved by then.
+        """
+        if created or self._state.adding:
+            return None
+        return dict(self._tracked_state)
+
+    def has_changed(self, name):
+        return self._tracked_state.get(name) != self.__dict__.get(name)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.reset_tracking()
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.reset_tracking()
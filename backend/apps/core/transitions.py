@@ -0,0 +1,176 @@
+"""
+State transitions - status changes applied as one conditional UPDATE
+
+Models with an approval workflow declare their status graph in
+``TRANSITIONS`` (``{name: (statuses it leaves from, status it leads to)}``)
+and carry a ``version`` that every save increments. ``apply()`` moves a
+loaded record along an edge with a single statement
+
+    UPDATE ... SET status = ?, <changed columns>, version = version + 1
+    WHERE id = ? AND status = ? AND version = ?
+
+so only the columns the transition changes are written, and an approver
+acting on a stale copy (the row was approved, rejected or edited since it
+was read, or the client's ``version`` is behind) matches no row and gets
+``StaleTransition`` instead of overwriting it. A transition that went
+through sends ``post_save`` (with ``update_fields``) like a save does, so
+spend counters, cash-flow totals, approval queues, the change journal and
+live events follow it as before.
+
+``status`` is read-only in the serializers of these models: it changes
+through transitions only. Edits must send the ``version`` they were made
+on. ``claim()`` moves the version on with the same kind of conditional
+UPDATE before the save, in one transaction, so an edit of a changed row
+gets 409 instead of overwriting it.
+"""
+from django.core.exceptions import ValidationError
+from django.db import router, transaction
+from django.db.models import F
+from django.db.models.signals import post_save
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+
+class TransitionNotAllowed(Exception):
+    """The record's status has no such edge"""
+
+
+class StaleTransition(Exception):
+    """The row changed since it was read; carries its current status and version (None once deleted)"""
+    
+    def __init__(self, current_status=None, current_version=None):
+        super().__init__('This record was changed by someone else; reload it and try again')
+        self.current_status = current_status
+        self.current_version = current_version
+
+
+def requested_version(request):
+    """The ``version`` the client sent (None when missing); raises ValueError when it is not a number"""
+    version = request.data.get('version')
+    return int(version) if version not in (None, '') else None
+
+
+def claim(instance, expected_version):
+    """Move the stored version of ``instance`` on from ``expected_version`` before saving it
+
+        UPDATE ... SET version = version + 1 WHERE id = ? AND version = ?
+
+    Raises StaleTransition when the row (or the copy in ``instance``) is not
+    at that version. Call it inside the transaction of the save, which
+    writes the same version again.
+    """
+    model = type(instance)
+    rows = model._base_manager.using(router.db_for_write(model, instance=instance))
+    if expected_version == instance.version:
+        if rows.filter(pk=instance.pk, version=expected_version).update(version=F('version') + 1):
+            return
+    current = rows.filter(pk=instance.pk).values('status', 'version').first() or {}
+    raise StaleTransition(current.get('status'), current.get('version'))
+
+
+def column_values(model, changes):
+    """``{attname: value}`` to write for ``changes``; raises ValidationError for unparseable values"""
+    columns = {}
+    for name, value in changes.items():
+        field = model._meta.get_field(name)
+        if field.is_relation:
+            columns[field.attname] = value.pk if value is not None else None
+        else:
+            columns[field.attname] = field.to_python(value)
+    return columns
+
+
+def apply(instance, name, expected_version=None, **changes):
+    """Move ``instance`` along transition ``name``, writing ``changes`` (field: value) with the new status"""
+    model = type(instance)
+    sources, target = model.TRANSITIONS[name]
+    if instance.status not in sources:
+        raise TransitionNotAllowed(name)
+    if expected_version is not None and expected_version != instance.version:
+        raise StaleTransition(instance.status, instance.version)
+    
+    columns = column_values(model, changes)
+    columns['status'] = target
+    written = set(changes) | {'status', 'version'}
+    now = timezone.now()
+    for field in model._meta.concrete_fields:
+        if getattr(field, 'auto_now', False):
+            columns[field.attname] = now
+            written.add(field.name)
+    
+    using = router.db_for_write(model, instance=instance)
+    rows = model._base_manager.using(using)
+    with transaction.atomic(using=using):
+        updated = rows.filter(pk=instance.pk, status=instance.status, version=instance.version).update(
+            version=F('version') + 1, **columns,
+        )
+        if not updated:
+            current = rows.filter(pk=instance.pk).values('status', 'version').first() or {}
+            raise StaleTransition(current.get('status'), current.get('version'))
+        
+        for field_name, value in changes.items():
+            if model._meta.get_field(field_name).is_relation:
+                setattr(instance, field_name, value)  # keeps the related object for the response
+        for attname, value in columns.items():
+            setattr(instance, attname, value)
+        instance.version += 1
+        post_save.send(
+            sender=model, instance=instance, created=False, raw=False, using=using,
+            update_fields=frozenset(written),
+        )
+    instance.reset_tracking()
+    return instance
+
+
+class TransitionActionsMixin:
+    """ViewSet actions that move the object along its model's ``TRANSITIONS``
+
+    The client may send the ``version`` it last read; a stale one, or a
+    change that raced the request, answers 409 with the current status and
+    version. Updates must send it.
+    """
+    
+    def perform_update(self, serializer):
+        try:
+            version = requested_version(self.request)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({'version': 'Must be a whole number'})
+        if version is None:
+            raise serializers.ValidationError({'version': 'Send the version of the record you edited'})
+        
+        instance = serializer.instance
+        with transaction.atomic(using=router.db_for_write(type(instance), instance=instance)):
+            claim(instance, version)
+            super().perform_update(serializer)
+    
+    def update(self, request, *args, **kwargs):
+        try:
+            return super().update(request, *args, **kwargs)
+        except StaleTransition as exc:
+            return self.conflict(exc)
+    
+    def conflict(self, exc):
+        return Response({
+            'error': str(exc),
+            'status': exc.current_status,
+            'version': exc.current_version,
+        }, status=status.HTTP_409_CONFLICT)
+    
+    def transition(self, request, instance, name, not_allowed, **changes):
+        try:
+            version = requested_version(request)
+        except (TypeError, ValueError):
+            return Response({'error': 'version must be a whole number'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            apply(instance, name, version, **changes)
+        except TransitionNotAllowed:
+            return Response({'error': not_allowed}, status=status.HTTP_400_BAD_REQUEST)
+        except ValidationError as exc:
+            return Response({'error': ' '.join(exc.messages)}, status=status.HTTP_400_BAD_REQUEST)
+        except StaleTransition as exc:
+            return self.conflict(exc)
+        
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
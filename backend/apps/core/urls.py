@@ -0,0 +1,9 @@
+"""
+Core URLs
+"""
+from django.urls import path
+from .views import MetricsView
+
+urlpatterns = [
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+]
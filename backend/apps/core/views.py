@@ -0,0 +1,48 @@
+"""
+Core Views
+"""
+import time
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+
+from . import metrics
+from .autocomplete import SOURCES, registry
+
+
+class MetricsView(APIView):
+    """Process-local counters (cache hit rates, etc.) for this worker"""
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        return Response(metrics.snapshot())
+
+
+class AutocompleteView(APIView):
+    """Top matches for pickers, served from the in-memory prefix index"""
+    permission_classes = [IsAuthenticated]
+    max_limit = 50
+    
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q parameter is required'}, status=400)
+        
+        types = request.query_params.get('types')
+        kinds = types.split(',') if types else list(SOURCES)
+        unknown = [kind for kind in kinds if kind not in SOURCES]
+        if unknown:
+            return Response({'error': f'Unknown types: {", ".join(unknown)}'}, status=400)
+        
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), self.max_limit)
+        except ValueError:
+            return Response({'error': 'limit must be a number'}, status=400)
+        
+        started = time.perf_counter()
+        results = registry.search(query, kinds, limit)
+        return Response({
+            'results': results,
+            'took_ms': round((time.perf_counter() - started) * 1000, 3),
+        })
@@ -2,13 +2,16 @@
 Department Admin Configuration
 """
 from django.contrib import admin
+from apps.core.admin_performance import PerformanceAdminMixin
 from .models import Department
 
 
 @admin.register(Department)
-class DepartmentAdmin(admin.ModelAdmin):
+class DepartmentAdmin(PerformanceAdminMixin, admin.ModelAdmin):
     """Department Admin"""
-    list_display = ['name', 'code', 'head', 'is_active', 'created_at']
-    list_filter = ['is_active', 'created_at']
+    list_display = ['name', 'code', 'school', 'head', 'is_active', 'created_at']
+    list_filter = ['school', 'is_active', 'created_at']
     search_fields = ['name', 'code']
     ordering = ['name']
+    performance_select_related = ['head']
+    performance_autocomplete_fields = ['head']
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0001_initial'),
+        ('departments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='department',
+            name='school',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.PROTECT, related_name='departments', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='department',
+            name='code',
+            field=models.CharField(max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='department',
+            name='name',
+            field=models.CharField(max_length=200),
+        ),
+        migrations.AddConstraint(
+            model_name='department',
+            constraint=models.UniqueConstraint(fields=('school', 'code'), name='unique_department_code'),
+        ),
+        migrations.AddConstraint(
+            model_name='department',
+            constraint=models.UniqueConstraint(fields=('school', 'name'), name='unique_department_name'),
+        ),
+    ]
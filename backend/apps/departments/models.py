@@ -3,6 +3,7 @@ Department Models
 """
 from django.db import models
 from django.contrib.auth import get_user_model
+from apps.core.tenancy import assign_school
 
 User = get_user_model()
 
@@ -10,8 +11,9 @@ User = get_user_model()
 class Department(models.Model):
     """Department Model"""
     
-    name = models.CharField(max_length=200, unique=True)
-    code = models.CharField(max_length=20, unique=True)
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='departments')
+    name = models.CharField(max_length=200)
+    code = models.CharField(max_length=20)
     description = models.TextField(blank=True, null=True)
     head = models.ForeignKey(
         User,
@@ -29,6 +31,14 @@ class Department(models.Model):
         verbose_name = 'Department'
         verbose_name_plural = 'Departments'
         ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(fields=['school', 'code'], name='unique_department_code'),
+            models.UniqueConstraint(fields=['school', 'name'], name='unique_department_name'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.code})"
+    
+    def save(self, *args, **kwargs):
+        assign_school(self)
+        super().save(*args, **kwargs)
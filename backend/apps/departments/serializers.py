@@ -2,6 +2,7 @@
 Department Serializers
 """
 from rest_framework import serializers
+from apps.core import tenancy
 from .models import Department
 
 
@@ -11,8 +12,24 @@ class DepartmentSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Department
-        fields = ['id', 'name', 'code', 'description', 'head', 'head_name', 'is_active', 'created_at']
+        fields = ['id', 'school', 'name', 'code', 'description', 'head', 'head_name', 'is_active', 'created_at']
         read_only_fields = ['id', 'created_at']
+        extra_kwargs = {'school': {'required': False}}  # the request's school by default
+    
+    def validate(self, attrs):
+        school = attrs.get('school')
+        if school is not None and self.instance is not None and school.pk != self.instance.school_id:
+            raise serializers.ValidationError({'school': 'A department cannot move to another school'})
+        if school is not None:
+            school_id = school.pk
+        elif self.instance is not None:
+            school_id = self.instance.school_id
+        else:
+            school_id = tenancy.default_school_id()
+        errors = tenancy.taken_in_school(Department, school_id, attrs, ['code', 'name'], self.instance)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
     
     def get_head_name(self, obj):
         return obj.head.get_full_name() if obj.head else None
@@ -3,11 +3,13 @@ Department Views
 """
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.tenancy import TenantScopedMixin
 from .models import Department
 from .serializers import DepartmentSerializer
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(TenantScopedMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """Department ViewSet"""
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
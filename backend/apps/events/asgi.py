@@ -0,0 +1,162 @@
+"""
+/api/events/ - server-sent events for dashboards
+
+Served by the ASGI application (config/asgi.py) beside Django: an open
+stream is a coroutine and a queue in the process's event loop rather than
+a worker thread, so one process holds many of them. Browsers' EventSource
+cannot set headers, so the access token may come as ``?token=`` and the
+school of an all-schools user as ``?school=<code>``.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.exceptions import AuthenticationFailed
+
+from apps.authentication.backends import TenantJWTAuthentication
+from apps.core import tenancy
+from .hub import AUDIENCES, Subscription, encode, hub, topic_scopes
+
+STREAM_PATH = '/api/events/'
+HEARTBEAT = b': ping\n\n'
+
+
+class StreamRefused(Exception):
+    def __init__(self, status, error):
+        super().__init__(error)
+        self.status = status
+        self.error = error
+
+
+def open_subscription(meta, topics):
+    """(school_id, topic scopes) of the user a request's token belongs to"""
+    close_old_connections()
+    token = tenancy.activate(None)
+    try:
+        try:
+            result = TenantJWTAuthentication().authenticate(SimpleNamespace(META=meta))
+        except AuthenticationFailed as exc:
+            detail = exc.detail.get('detail', exc.detail) if isinstance(exc.detail, dict) else exc.detail
+            raise StreamRefused(401, str(detail))
+        if result is None:
+            raise StreamRefused(401, 'Authentication credentials were not provided.')
+        user = result[0]
+        department_ids = ()
+        if user.role == 'DEPARTMENT_HEAD':
+            department_ids = list(user.headed_departments.values_list('id', flat=True))
+        scopes = topic_scopes(user.role, department_ids, topics)
+        if not scopes:
+            raise StreamRefused(403, 'You do not have permission to receive these events')
+        return tenancy.current_school_id(), scopes
+    finally:
+        tenancy.deactivate(token)
+        close_old_connections()
+
+
+class EventStreamRouter:
+    """ASGI application serving ``STREAM_PATH`` and passing everything else to Django"""
+    
+    def __init__(self, application):
+        self.application = application
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] != STREAM_PATH:
+            return await self.application(scope, receive, send)
+        
+        headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+        extra_headers = cors_headers(headers.get('origin'))
+        if scope['method'] != 'GET':
+            return await respond(send, 405, {'error': 'Method not allowed'}, extra_headers)
+        
+        query = {name: values[-1] for name, values in parse_qs(scope['query_string'].decode('latin-1')).items()}
+        meta = {}
+        if headers.get('authorization'):
+            meta['HTTP_AUTHORIZATION'] = headers['authorization']
+        elif query.get('token'):
+            meta['HTTP_AUTHORIZATION'] = f'Bearer {query["token"]}'
+        if headers.get('x-school') or query.get('school'):
+            meta['HTTP_X_SCHOOL'] = headers.get('x-school') or query['school']
+        
+        topics = query['topics'].split(',') if query.get('topics') else list(AUDIENCES)
+        unknown = [topic for topic in topics if topic not in AUDIENCES]
+        if unknown:
+            return await respond(send, 400, {'error': f'Unknown topics: {", ".join(unknown)}'}, extra_headers)
+        
+        try:
+            school_id, scopes = await sync_to_async(open_subscription)(meta, topics)
+        except StreamRefused as exc:
+            return await respond(send, exc.status, {'error': exc.error}, extra_headers)
+        await stream(Subscription(school_id, scopes), receive, send, extra_headers)
+
+
+def cors_headers(origin):
+    if not origin or origin not in settings.CORS_ALLOWED_ORIGINS:
+        return []
+    return [
+        (b'access-control-allow-origin', origin.encode('latin-1')),
+        (b'access-control-allow-credentials', b'true'),
+        (b'vary', b'Origin'),
+    ]
+
+
+async def respond(send, status, body, extra_headers):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json')] + extra_headers,
+    })
+    await send({'type': 'http.response.body', 'body': json.dumps(body).encode()})
+
+
+async def watch_disconnect(receive, subscription):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            subscription.close()
+            return
+
+
+async def stream(subscription, receive, send, extra_headers):
+    """Send the subscription's frames until the client goes away"""
+    heartbeat = settings.EVENTS_HEARTBEAT_SECONDS
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),  # nginx: pass frames through as they come
+        ] + extra_headers,
+    })
+    hello = encode('hello', {'topics': sorted(subscription.scopes), 'heartbeat': heartbeat})
+    await send({'type': 'http.response.body', 'body': b'retry: 5000\n' + hello, 'more_body': True})
+    
+    hub.add(subscription)
+    watcher = asyncio.ensure_future(watch_disconnect(receive, subscription))
+    try:
+        while True:
+            try:
+                frame = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                frame = HEARTBEAT
+            # Whatever else is queued goes out in the same write
+            frames = [frame]
+            while frames[-1] is not None and not subscription.queue.empty():
+                frames.append(subscription.queue.get_nowait())
+            closing = frames[-1] is None
+            if closing:
+                frames.pop()
+            if frames:
+                await send({'type': 'http.response.body', 'body': b''.join(frames), 'more_body': True})
+            if closing:
+                return
+    except OSError:
+        # The connection dropped while writing
+        return
+    finally:
+        hub.remove(subscription)
+        watcher.cancel()
@@ -0,0 +1,122 @@
+"""
+Brokers - carry committed events to the processes holding the streams
+
+A broker has two sides: ``publish(events)`` is called from any thread
+(usually a request thread, after its transaction commits) and
+``listen(deliver)`` runs in the event loop of a process serving
+``/api/events/``, calling ``deliver(events)`` in that loop.
+
+- ``InProcessBroker`` (default) hands events to the loops of the same
+  process; enough for one ASGI process serving both the API and the streams
+- ``RedisBroker`` goes through Redis pub/sub, for several processes or nodes
+
+Other brokers subclass ``Broker`` and are named in ``EVENTS_BROKER``.
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Broker:
+    """Interface of the event brokers"""
+    
+    @property
+    def active(self):
+        """False when nobody can be listening, so publishers may skip building events"""
+        return True
+    
+    def publish(self, events):
+        raise NotImplementedError
+    
+    async def listen(self, deliver):
+        raise NotImplementedError
+
+
+class InProcessBroker(Broker):
+    """Delivers to the event loops of this process"""
+    
+    def __init__(self):
+        self.listeners = set()  # (loop, deliver)
+        self.lock = threading.Lock()
+    
+    @property
+    def active(self):
+        return bool(self.listeners)
+    
+    def publish(self, events):
+        with self.lock:
+            listeners = list(self.listeners)
+        for loop, deliver in listeners:
+            try:
+                loop.call_soon_threadsafe(deliver, events)
+            except RuntimeError:
+                # The loop closed without unregistering
+                with self.lock:
+                    self.listeners.discard((loop, deliver))
+    
+    async def listen(self, deliver):
+        listener = (asyncio.get_running_loop(), deliver)
+        with self.lock:
+            self.listeners.add(listener)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            with self.lock:
+                self.listeners.discard(listener)
+
+
+class RedisBroker(Broker):
+    """Publishes to a Redis pub/sub channel every streaming process subscribes to"""
+    
+    def __init__(self):
+        self.url = settings.EVENTS_REDIS_URL
+        self.channel = settings.EVENTS_REDIS_CHANNEL
+        self.client = None
+    
+    def publish(self, events):
+        import redis
+        
+        if self.client is None:
+            # Short timeouts: publishing runs on the request thread after the commit
+            self.client = redis.Redis.from_url(self.url, socket_connect_timeout=1, socket_timeout=1)
+        try:
+            self.client.publish(self.channel, json.dumps(events, cls=DjangoJSONEncoder))
+        except redis.RedisError:
+            # Pushes are hints; the write they announce has already committed
+            logger.warning('Could not publish %s events to %s', len(events), self.url, exc_info=True)
+    
+    async def listen(self, deliver):
+        import redis.asyncio as redis
+        
+        while True:
+            client = redis.Redis.from_url(self.url)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        deliver(json.loads(message['data']))
+            except redis.RedisError:
+                logger.warning('Lost the event channel at %s, reconnecting', self.url, exc_info=True)
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+
+
+_broker = None
+
+
+def get_broker():
+    """The process's broker, built from ``EVENTS_BROKER`` on first use"""
+    global _broker
+    if _broker is None:
+        _broker = import_string(settings.EVENTS_BROKER)()
+    return _broker
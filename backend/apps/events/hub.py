@@ -0,0 +1,124 @@
+"""
+Hub - fans events out to the open streams of this process
+
+All streams of a process share one event loop and one broker listener.
+Streams are indexed by school, so an event is only checked against the
+streams of its school (and those of all-schools administrators), and it
+is encoded once however many streams receive it. Each stream has a
+bounded queue: a client that stops reading has its backlog dropped and
+gets a ``reset`` event (reload, then carry on) instead of holding memory.
+"""
+import asyncio
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .broker import get_broker
+
+APPROVERS = ('SUPER_ADMIN', 'FINANCE_ADMIN')
+EVERYONE = ('SUPER_ADMIN', 'FINANCE_ADMIN', 'DEPARTMENT_HEAD', 'AUDITOR')
+
+# topic: (roles that receive it for the whole school, whether department heads receive it for their departments)
+AUDIENCES = {
+    'expense.pending': (APPROVERS, True),
+    'expense.status': (APPROVERS, True),
+    'budget.utilization': (APPROVERS, True),
+    'budget.alert': (APPROVERS, True),
+    'totals': (EVERYONE, False),
+}
+
+RESET = b'event: reset\ndata: {}\n\n'
+
+
+def encode(topic, data):
+    """One server-sent event frame"""
+    return f'event: {topic}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'.encode()
+
+
+def topic_scopes(role, department_ids, topics):
+    """``{topic: None (whole school) or department ids}`` for the topics a role may receive"""
+    scopes = {}
+    for topic in topics:
+        roles, by_department = AUDIENCES[topic]
+        if role in roles:
+            scopes[topic] = None
+        elif by_department and role == 'DEPARTMENT_HEAD':
+            scopes[topic] = frozenset(department_ids)
+    return scopes
+
+
+class Subscription:
+    """One open stream: what it may receive and its queue of encoded frames"""
+    
+    def __init__(self, school_id, scopes):
+        self.school_id = school_id  # None: every school
+        self.scopes = scopes
+        self.queue = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+    
+    def accepts(self, event):
+        if event['topic'] not in self.scopes:
+            return False
+        departments = self.scopes[event['topic']]
+        return departments is None or event['department_id'] in departments
+    
+    def push(self, frame):
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.drain()
+            self.queue.put_nowait(RESET)
+    
+    def close(self):
+        """Wake the stream so it ends (None is its end marker)"""
+        self.drain()
+        self.queue.put_nowait(None)
+    
+    def drain(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class Hub:
+    def __init__(self):
+        self.loop = None
+        self.listener = None
+        self.by_school = defaultdict(set)
+    
+    def add(self, subscription):
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            # First stream of the process (or of a new loop, as in tests)
+            self.loop, self.listener, self.by_school = loop, None, defaultdict(set)
+        self.by_school[subscription.school_id].add(subscription)
+        if self.listener is None or self.listener.done():
+            self.listener = loop.create_task(get_broker().listen(self.deliver))
+    
+    def remove(self, subscription):
+        group = self.by_school.get(subscription.school_id)
+        if group is None:
+            return
+        group.discard(subscription)
+        if not group:
+            del self.by_school[subscription.school_id]
+        if not self.by_school and self.listener is not None:
+            # Nobody left: stop listening so publishers skip building events
+            self.listener.cancel()
+            self.listener = None
+    
+    def deliver(self, events):
+        everywhere = self.by_school.get(None, ())
+        for event in events:
+            frame = None
+            for group in (self.by_school.get(event['school_id'], ()), everywhere):
+                for subscription in group:
+                    if not subscription.accepts(event):
+                        continue
+                    if frame is None:
+                        data = dict(event['data'], school_id=event['school_id'], department_id=event['department_id'])
+                        frame = encode(event['topic'], data)
+                    subscription.push(frame)
+
+
+hub = Hub()
@@ -0,0 +1,180 @@
+"""
+Outbox - what a transaction changed, pushed as events once it commits
+
+Writers mark what changed (an expense, budgets, a month's totals, an
+alert) in a per-thread buffer. When the transaction commits, the marks
+are read back in a few queries as one batch of events carrying the rows'
+current values, and handed to the broker. As with the change journal
+(apps.sync.journal), marks left by a rolled-back transaction go out with
+the next batch; that is harmless since events carry committed values and
+an expense that no longer exists reads as deleted.
+
+Nothing is marked while no stream can be listening (the in-process
+broker of a process without open streams), so plain WSGI workers pay a
+single attribute check per write.
+"""
+import threading
+from decimal import Decimal
+
+from django.db import router, transaction
+from django.db.models import Sum
+
+from apps.budget.models import Budget, BudgetAlert
+from apps.finance.models import Expense
+from apps.reports.models import CashFlowMonth
+from .broker import get_broker
+
+_buffer = threading.local()
+
+
+def marks(using):
+    """This thread's unsent marks for a database"""
+    if not hasattr(_buffer, 'marks'):
+        _buffer.marks = {}
+    if using not in _buffer.marks:
+        _buffer.marks[using] = {'expenses': {}, 'budgets': set(), 'alerts': set(), 'totals': set()}
+    return _buffer.marks[using]
+
+
+def schedule(using):
+    # Registered every time, like the journal: the first callback sends everything
+    transaction.on_commit(lambda: flush(using), using=using, robust=True)
+
+
+def expense_changed(expense_id, school_id, department_id, using=None):
+    """An expense entered, changed while in or left the approval queue"""
+    if not get_broker().active:
+        return
+    using = using or router.db_for_write(Expense)
+    marks(using)['expenses'][expense_id] = (school_id, department_id)
+    schedule(using)
+
+
+def budgets_changed(budget_ids, using=None):
+    """Budgets whose allocation or spend moved"""
+    if not get_broker().active:
+        return
+    using = using or router.db_for_write(Budget)
+    marks(using)['budgets'].update(budget_ids)
+    schedule(using)
+
+
+def alert_raised(alert_id, using=None):
+    if not get_broker().active:
+        return
+    using = using or router.db_for_write(BudgetAlert)
+    marks(using)['alerts'].add(alert_id)
+    schedule(using)
+
+
+def totals_changed(school_id, kind, period_key, using=None):
+    """The month's income or paid expense total of a school moved"""
+    if not get_broker().active:
+        return
+    using = using or router.db_for_write(CashFlowMonth)
+    marks(using)['totals'].add((school_id, kind, period_key))
+    schedule(using)
+
+
+def flush(using):
+    pending = marks(using)
+    if not any(pending.values()):
+        return
+    batch = {name: values.copy() for name, values in pending.items()}
+    for values in pending.values():
+        values.clear()
+    
+    events = []
+    for name, resolve in RESOLVERS.items():
+        if batch[name]:
+            events.extend(resolve(batch[name], using))
+    if events:
+        get_broker().publish(events)
+
+
+def event(topic, school_id, department_id, data):
+    return {'topic': topic, 'school_id': school_id, 'department_id': department_id, 'data': data}
+
+
+def expense_events(expenses, using):
+    rows = Expense.objects.using(using).filter(pk__in=list(expenses)).values(
+        'id', 'school_id', 'department_id', 'category_id', 'amount', 'date', 'status', 'description',
+    )
+    current = {row['id']: row for row in rows}
+    events = []
+    for pk, (school_id, department_id) in expenses.items():
+        row = current.get(pk)
+        if row is None:
+            events.append(event('expense.status', school_id, department_id, {'id': pk, 'status': 'DELETED'}))
+        elif row['status'] == 'PENDING':
+            events.append(event('expense.pending', row['school_id'], row['department_id'], {
+                'id': pk,
+                'category_id': row['category_id'],
+                'amount': row['amount'],
+                'date': row['date'],
+                'description': row['description'][:120],
+            }))
+        else:
+            events.append(event('expense.status', row['school_id'], row['department_id'], {
+                'id': pk, 'status': row['status'],
+            }))
+    return events
+
+
+def budget_events(budget_ids, using):
+    rows = Budget.objects.using(using).filter(pk__in=list(budget_ids)).values(
+        'id', 'school_id', 'department_id', 'financial_year', 'month', 'allocated_amount', 'spent_amount',
+    )
+    events = []
+    for row in rows:
+        allocated, spent = row['allocated_amount'], row['spent_amount']
+        events.append(event('budget.utilization', row['school_id'], row['department_id'], {
+            'id': row['id'],
+            'financial_year': row['financial_year'],
+            'month': row['month'],
+            'allocated_amount': allocated,
+            'spent_amount': spent,
+            'utilization': round(spent / allocated * 100, 2) if allocated else 0,
+        }))
+    return events
+
+
+def alert_events(alert_ids, using):
+    rows = BudgetAlert.objects.using(using).filter(pk__in=list(alert_ids)).values(
+        'id', 'budget_id', 'budget__school_id', 'budget__department_id', 'threshold', 'utilization', 'spent_amount',
+    )
+    return [
+        event('budget.alert', row['budget__school_id'], row['budget__department_id'], {
+            'id': row['id'],
+            'budget_id': row['budget_id'],
+            'threshold': row['threshold'],
+            'utilization': row['utilization'],
+            'spent_amount': row['spent_amount'],
+        })
+        for row in rows
+    ]
+
+
+def total_events(keys, using):
+    """Month totals from the cash-flow accumulators (apps.reports.forecast), one query for the batch"""
+    rows = CashFlowMonth.objects.using(using).filter(
+        school_id__in={school_id for school_id, _, _ in keys},
+        period_key__in={period_key for _, _, period_key in keys},
+    ).values('school_id', 'kind', 'period_key').annotate(total=Sum('amount'))
+    totals = {(row['school_id'], row['kind'], row['period_key']): row['total'] for row in rows}
+    return [
+        event('totals', school_id, None, {
+            'kind': kind,
+            'period_key': period_key,
+            'amount': totals.get((school_id, kind, period_key), Decimal('0')),
+        })
+        for school_id, kind, period_key in sorted(keys)
+    ]
+
+
+RESOLVERS = {
+    'expenses': expense_events,
+    'budgets': budget_events,
+    'alerts': alert_events,
+    'totals': total_events,
+}
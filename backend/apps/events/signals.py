@@ -0,0 +1,42 @@
+"""
+Events Signals - mark the changes dashboards are told about
+
+Spend counters and month totals are updated with F() expressions that
+skip model signals; apps.budget.signals and apps.reports.forecast mark
+those themselves.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.budget.models import Budget, BudgetAlert
+from apps.finance.models import Expense
+from . import outbox
+
+
+@receiver(post_save, sender=Expense, dispatch_uid='events.expense.save')
+def expense_saved(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    before = instance.stored_state(created)
+    if instance.status == 'PENDING' or (before and before['status'] == 'PENDING'):
+        outbox.expense_changed(instance.pk, instance.school_id, instance.department_id, using)
+
+
+@receiver(post_delete, sender=Expense, dispatch_uid='events.expense.delete')
+def expense_deleted(sender, instance, using=None, **kwargs):
+    before = instance.stored_state()
+    if before and before['status'] == 'PENDING':
+        outbox.expense_changed(instance.pk, instance.school_id, instance.department_id, using)
+
+
+@receiver(post_save, sender=Budget, dispatch_uid='events.budget.save')
+def budget_saved(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    outbox.budgets_changed([instance.pk], using)
+
+
+@receiver(post_save, sender=BudgetAlert, dispatch_uid='events.budget_alert.save')
+def alert_saved(sender, instance, created, raw=False, using=None, **kwargs):
+    if created and not raw:
+        outbox.alert_raised(instance.pk, using)
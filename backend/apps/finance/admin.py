@@ -2,7 +2,8 @@
 Finance Admin Configuration
 """
 from django.contrib import admin
-from .models import IncomeSource, Income, ExpenseCategory, Expense
+from apps.core.admin_performance import PerformanceAdminMixin
+from .models import IncomeSource, Income, ExpenseCategory, Expense, ExpenseFlag, ExpenseScan
 
 
 @admin.register(IncomeSource)
@@ -14,13 +15,15 @@ class IncomeSourceAdmin(admin.ModelAdmin):
 
 
 @admin.register(Income)
-class IncomeAdmin(admin.ModelAdmin):
+class IncomeAdmin(PerformanceAdminMixin, admin.ModelAdmin):
     """Income Admin"""
     list_display = ['income_source', 'amount', 'date', 'payment_mode', 'department', 'recorded_by', 'created_at']
-    list_filter = ['income_source', 'payment_mode', 'date', 'department']
-    search_fields = ['reference_id', 'description', 'student_id']
+    list_filter = ['school', 'income_source', 'payment_mode', 'date', 'department']
+    search_fields = ['reference_id', 'description', 'student_ref']
     date_hierarchy = 'date'
     readonly_fields = ['recorded_by', 'created_at', 'updated_at']
+    performance_select_related = ['income_source', 'department', 'recorded_by']
+    performance_autocomplete_fields = ['income_source', 'department']
 
 
 @admin.register(ExpenseCategory)
@@ -31,14 +34,29 @@ class ExpenseCategoryAdmin(admin.ModelAdmin):
     search_fields = ['name', 'code']
 
 
+class ExpenseFlagInline(admin.TabularInline):
+    model = ExpenseFlag
+    fk_name = 'expense'
+    fields = ['kind', 'score', 'detail', 'related_expense', 'dismissed', 'created_at']
+    readonly_fields = fields  # reviewed on the flag admin
+    extra = 0
+    can_delete = False
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Expense)
-class ExpenseAdmin(admin.ModelAdmin):
+class ExpenseAdmin(PerformanceAdminMixin, admin.ModelAdmin):
     """Expense Admin"""
     list_display = ['category', 'department', 'amount', 'date', 'status', 'requested_by', 'approved_by']
-    list_filter = ['category', 'department', 'status', 'date']
+    list_filter = ['school', 'category', 'department', 'status', 'date']
     search_fields = ['reference_id', 'description']
     date_hierarchy = 'date'
     readonly_fields = ['requested_by', 'approved_by', 'created_at', 'updated_at']
+    performance_select_related = ['category', 'department', 'requested_by', 'approved_by']
+    performance_autocomplete_fields = ['category', 'department']
+    inlines = [ExpenseFlagInline]
     
     fieldsets = (
         ('Basic Information', {
@@ -54,3 +72,41 @@ class ExpenseAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at')
         }),
     )
+
+
+@admin.register(ExpenseFlag)
+class ExpenseFlagAdmin(PerformanceAdminMixin, admin.ModelAdmin):
+    """Anomaly flags raised by scan_expense_anomalies"""
+    list_display = ['expense', 'kind', 'score', 'detail', 'dismissed', 'created_at']
+    list_filter = ['kind', 'dismissed']
+    search_fields = ['expense__reference_id', 'detail']
+    readonly_fields = ['expense', 'kind', 'score', 'detail', 'related_expense', 'dismissed_by', 'created_at', 'updated_at']
+    performance_select_related = ['expense', 'expense__category', 'expense__department']
+    actions = ['dismiss_flags']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    @admin.action(description='Dismiss selected flags')
+    def dismiss_flags(self, request, queryset):
+        for flag in queryset.filter(dismissed=False):
+            flag.dismissed = True
+            flag.dismissed_by = request.user
+            flag.save(update_fields=['dismissed', 'dismissed_by', 'updated_at'])
+    
+    def save_model(self, request, obj, form, change):
+        if 'dismissed' in form.changed_data:
+            obj.dismissed_by = request.user if obj.dismissed else None
+        super().save_model(request, obj, form, change)
+
+
+@admin.register(ExpenseScan)
+class ExpenseScanAdmin(admin.ModelAdmin):
+    """Anomaly scan runs and their watermarks (read-only)"""
+    list_display = ['started_at', 'finished_at', 'scanned', 'flagged', 'watermark_updated_at', 'watermark_id']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,246 @@
+"""
+Batch anomaly scan of expenses
+
+Each run picks up the pending, approved and paid expenses changed since the
+previous run (keyset watermark on ``updated_at, id``), in chunks, and stores
+what it finds as ``ExpenseFlag`` rows:
+
+- ``CATEGORY_OUTLIER`` / ``DEPARTMENT_OUTLIER``: the amount is far above the
+  group's norm. Robust z-score of the log amount against the group's median
+  and MAD (median absolute deviation), so one huge bill does not hide itself
+  by inflating the spread; flagged above ``ANOMALY_Z_THRESHOLD``
+- ``DUPLICATE``: another expense has the same amount, date and reference, or
+  the same amount, date, department and category when a reference is missing
+
+Group statistics are computed with NumPy over all open-year expenses of the
+groups a chunk touches, once per group and run. Flags of rescanned expenses
+that no longer apply are removed; dismissed flags stay dismissed.
+"""
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core.models import DataVersion
+from apps.core.refdata import refdata, DEPARTMENT, EXPENSE_CATEGORY
+from .models import Expense, ExpenseFlag, ExpenseScan
+
+SCANNED_STATUSES = ('PENDING', 'APPROVED', 'PAID')
+
+# (flag kind, grouping column, reference table, noun)
+OUTLIER_GROUPS = [
+    ('CATEGORY_OUTLIER', 'category_id', EXPENSE_CATEGORY, 'category'),
+    ('DEPARTMENT_OUTLIER', 'department_id', DEPARTMENT, 'department'),
+]
+
+# Scale of the MAD / mean absolute deviation that estimates a normal standard deviation
+MAD_SCALE = 1.4826
+MEAN_ABS_SCALE = 1.2533
+
+
+def group_medians(groups, values):
+    """(unique groups, median per group, size per group), without a Python loop per group"""
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    unique, starts, counts = np.unique(groups, return_index=True, return_counts=True)
+    median = (values[starts + (counts - 1) // 2] + values[starts + counts // 2]) / 2
+    return unique, median, counts
+
+
+def robust_stats(groups, amounts):
+    """(unique groups, median, scale, size) of the log amounts of each group
+
+    ``scale`` estimates the standard deviation from the MAD; when more than half
+    of a group has the same amount (MAD 0) the mean absolute deviation is used.
+    """
+    values = np.log(np.maximum(amounts, 0.01))
+    unique, median, counts = group_medians(groups, values)
+    position = np.searchsorted(unique, groups)
+    deviation = np.abs(values - median[position])
+    _, mad, _ = group_medians(groups, deviation)
+    mean_abs = np.bincount(position, weights=deviation, minlength=len(unique)) / counts
+    scale = np.where(mad > 0, MAD_SCALE * mad, MEAN_ABS_SCALE * mean_abs)
+    return unique, median, scale, counts
+
+
+class GroupStats:
+    """Robust statistics of one grouping column, loaded per group on first use"""
+    
+    def __init__(self, column):
+        self.column = column
+        self.stats = {}  # group id: (median log amount, scale, size)
+    
+    def load(self, group_ids):
+        missing = set(group_ids) - self.stats.keys()
+        if not missing:
+            return
+        rows = Expense.objects.filter(
+            status__in=SCANNED_STATUSES, **{f'{self.column}__in': missing}
+        ).order_by().values_list(self.column, 'amount')
+        
+        groups, amounts = [], []
+        for group, amount in rows.iterator(chunk_size=10000):
+            groups.append(group)
+            amounts.append(float(amount))
+        self.stats.update(dict.fromkeys(missing))
+        if groups:
+            unique, median, scale, counts = robust_stats(np.array(groups), np.array(amounts))
+            self.stats.update(zip(unique.tolist(), zip(median.tolist(), scale.tolist(), counts.tolist())))
+    
+    def scores(self, group_ids, amounts):
+        """(z-scores, group medians) of amounts; z is NaN where the group is too small to judge"""
+        self.load(group_ids)
+        minimum = getattr(settings, 'ANOMALY_MIN_GROUP_SIZE', 10)
+        stats = [self.stats[group] or (0.0, 0.0, 0) for group in group_ids]
+        median = np.array([row[0] for row in stats])
+        scale = np.array([row[1] for row in stats])
+        usable = (np.array([row[2] for row in stats]) >= minimum) & (scale > 0)
+        values = np.log(np.maximum(amounts, 0.01))
+        z = np.divide(values - median, scale, out=np.full(len(stats), np.nan), where=usable)
+        return z, np.exp(median)
+
+
+def duplicate_keys(row):
+    """Keys under which a row matches its likely duplicates"""
+    pk, amount, date, reference, department_id, category_id = row
+    reference = (reference or '').strip().upper()
+    keys = [('ROW', amount, date, department_id, category_id)]
+    if reference:
+        keys.append(('REF', amount, date, reference))
+    return reference, keys
+
+
+def find_duplicates(rows):
+    """{expense id: id of its likely duplicate} for the scanned rows and their counterparts"""
+    if not rows:
+        return {}
+    candidates = Expense.objects.filter(
+        status__in=SCANNED_STATUSES,
+        date__in={row[2] for row in rows},
+        amount__in={row[1] for row in rows},
+    ).order_by('id').values_list('id', 'amount', 'date', 'reference_id', 'department_id', 'category_id')
+    
+    by_key = defaultdict(list)
+    for candidate in candidates:
+        reference, keys = duplicate_keys(candidate)
+        for key in keys:
+            by_key[key].append((candidate[0], reference))
+    
+    pairs = {}
+    for row in rows:
+        reference, keys = duplicate_keys(row)
+        for key in keys:
+            for other, other_reference in by_key[key]:
+                # Two different references on the same day and amount are two bills
+                if other == row[0] or (key[0] == 'ROW' and reference and other_reference):
+                    continue
+                pairs.setdefault(row[0], other)
+                pairs.setdefault(other, row[0])
+    return pairs
+
+
+def rupees(value):
+    return f'₹{value:,.2f}'
+
+
+def chunk_flags(rows, stats, duplicates):
+    """{(expense id, kind): (score, detail, related id)} found in one chunk"""
+    found = {}
+    if rows:
+        threshold = getattr(settings, 'ANOMALY_Z_THRESHOLD', 3.5)
+        amounts = np.array([float(row[1]) for row in rows])
+        columns = {'department_id': 4, 'category_id': 5}
+        for kind, column, label, noun in OUTLIER_GROUPS:
+            group_ids = [row[columns[column]] for row in rows]
+            z, median = stats[column].scores(group_ids, amounts)
+            for index in np.flatnonzero(z > threshold):
+                name = refdata.name(label, group_ids[index]) or f'#{group_ids[index]}'
+                detail = (
+                    f'{rupees(amounts[index])} is {amounts[index] / median[index]:.1f}x '
+                    f'the {noun} median {rupees(median[index])} ({name})'
+                )
+                found[(rows[index][0], kind)] = (round(float(z[index]), 2), detail, None)
+    
+    for pk, other in duplicates.items():
+        found[(pk, 'DUPLICATE')] = (0.0, f'Same amount and date as expense {other}', other)
+    return found
+
+
+def write_flags(scanned_ids, found):
+    """Replace the flags of the scanned expenses (and duplicate counterparts) with ``found``"""
+    scanned_ids = set(scanned_ids)
+    existing = ExpenseFlag.objects.filter(
+        Q(expense_id__in=scanned_ids | {pk for pk, _ in found})
+        | Q(kind='DUPLICATE', related_expense_id__in=scanned_ids)
+        | Q(kind='DUPLICATE', related_expense__isnull=True)  # the other expense was deleted
+    )
+    
+    stale, changed = [], []
+    for flag in existing:
+        key = (flag.expense_id, flag.kind)
+        if key not in found:
+            # Counterparts were only re-checked for the pair with a scanned expense
+            if flag.expense_id in scanned_ids or (
+                flag.kind == 'DUPLICATE'
+                and (flag.related_expense_id is None or flag.related_expense_id in scanned_ids)
+            ):
+                stale.append(flag.pk)
+            continue
+        score, detail, related = found.pop(key)
+        if (flag.score, flag.detail, flag.related_expense_id) != (score, detail, related):
+            flag.score, flag.detail, flag.related_expense_id = score, detail, related
+            flag.updated_at = timezone.now()
+            changed.append(flag)
+    
+    created = [
+        ExpenseFlag(expense_id=pk, kind=kind, score=score, detail=detail, related_expense_id=related)
+        for (pk, kind), (score, detail, related) in found.items()
+    ]
+    ExpenseFlag.objects.filter(pk__in=stale).delete()
+    ExpenseFlag.objects.bulk_update(changed, ['score', 'detail', 'related_expense', 'updated_at'], batch_size=500)
+    ExpenseFlag.objects.bulk_create(created, batch_size=500)
+    return len(created), len(stale)
+
+
+def scan_expenses(chunk_size=1000, full=False, log=None):
+    """Scan the expenses changed since the last run; returns the ExpenseScan row"""
+    previous = None if full else ExpenseScan.objects.first()
+    scan = ExpenseScan.objects.create(
+        watermark_updated_at=previous.watermark_updated_at if previous else None,
+        watermark_id=previous.watermark_id if previous else 0,
+    )
+    # Rows changed after the scan started are left for the next run
+    cutoff = scan.started_at
+    stats = {column: GroupStats(column) for _, column, _, _ in OUTLIER_GROUPS}
+    
+    while True:
+        changed = Expense.objects.filter(updated_at__lte=cutoff)
+        if scan.watermark_updated_at is not None:
+            changed = changed.filter(
+                Q(updated_at__gt=scan.watermark_updated_at)
+                | Q(updated_at=scan.watermark_updated_at, id__gt=scan.watermark_id)
+            )
+        chunk = list(changed.order_by('updated_at', 'id').values_list(
+            'id', 'amount', 'date', 'reference_id', 'department_id', 'category_id', 'status', 'updated_at'
+        )[:chunk_size])
+        if not chunk:
+            break
+        
+        rows = [row[:6] for row in chunk if row[6] in SCANNED_STATUSES]
+        found = chunk_flags(rows, stats, find_duplicates(rows))
+        with transaction.atomic():
+            created, removed = write_flags([row[0] for row in chunk], found)
+            scan.watermark_updated_at, scan.watermark_id = chunk[-1][7], chunk[-1][0]
+            scan.scanned += len(chunk)
+            scan.flagged += created
+            scan.save(update_fields=['watermark_updated_at', 'watermark_id', 'scanned', 'flagged'])
+        if log:
+            log(f'{scan.scanned} scanned, {created} new flags, {removed} cleared')
+    
+    DataVersion.bump(ExpenseFlag._meta.label)  # bulk writes skip the post_save bump
+    scan.finished_at = timezone.now()
+    scan.save(update_fields=['finished_at'])
+    return scan
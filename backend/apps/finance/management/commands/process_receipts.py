@@ -0,0 +1,57 @@
+"""
+Move existing receipts into content-addressed storage and build previews
+
+Usage:
+    python manage.py process_receipts
+    python manage.py process_receipts --delete-legacy
+"""
+from django.core.files import File
+from django.core.management.base import BaseCommand
+
+from apps.archive.models import ArchivedExpense
+from apps.core.models import DataVersion
+from apps.core.storage import content_digest, receipt_storage
+from apps.finance.models import Expense
+from apps.finance.receipts import get_executor, generate_previews
+from apps.sync import journal
+
+
+class Command(BaseCommand):
+    help = 'Deduplicate stored receipts by content hash and generate missing previews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delete-legacy',
+            action='store_true',
+            help='Remove the old file once a receipt has been re-stored'
+        )
+
+    def handle(self, *args, **options):
+        storage = receipt_storage()
+        names = set()
+        moved = 0
+
+        for model in (Expense, ArchivedExpense):
+            rows = model.objects.exclude(receipt='').exclude(receipt__isnull=True)
+            for pk, name, school_id in rows.values_list('pk', 'receipt', 'school_id').iterator():
+                if content_digest(name) is None:
+                    if not storage.exists(name):
+                        self.stderr.write(f'{model.__name__} {pk}: missing file {name}')
+                        continue
+                    with storage.open(name, 'rb') as legacy:
+                        new_name = storage.save(name, File(legacy))
+                    # update() keeps this out of the expense signals; nothing else changes
+                    model.objects.filter(pk=pk).update(receipt=new_name)
+                    if model is Expense:
+                        journal.record_many(Expense, [(pk, school_id)])
+                    if options['delete_legacy']:
+                        storage.delete(name)
+                    moved += 1
+                    name = new_name
+                names.add(name)
+            DataVersion.bump(model._meta.label)
+
+        written = sum(len(result) for result in get_executor().map(generate_previews, sorted(names)))
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(names)} distinct receipts, {moved} re-stored by content hash, {written} previews written'
+        ))
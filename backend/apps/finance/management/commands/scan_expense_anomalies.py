@@ -0,0 +1,28 @@
+"""
+Flag unusual and duplicate expenses changed since the last scan
+
+Usage:
+    python manage.py scan_expense_anomalies                 # incremental, e.g. nightly from cron
+    python manage.py scan_expense_anomalies --full          # rescan every expense
+    python manage.py scan_expense_anomalies --chunk-size 500
+"""
+from django.core.management.base import BaseCommand
+
+from apps.finance.anomalies import scan_expenses
+
+
+class Command(BaseCommand):
+    help = 'Scan changed expenses for outliers and likely duplicates'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Ignore the watermark and rescan everything')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Expenses per batch')
+        parser.add_argument('--quiet', action='store_true', help='No per-chunk progress')
+    
+    def handle(self, *args, **options):
+        log = None if options['quiet'] else self.stdout.write
+        scan = scan_expenses(chunk_size=options['chunk_size'], full=options['full'], log=log)
+        took = (scan.finished_at - scan.started_at).total_seconds()
+        self.stdout.write(self.style.SUCCESS(
+            f'Scanned {scan.scanned} expenses in {took:.1f}s, {scan.flagged} new flags.'
+        ))
@@ -0,0 +1,89 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:21
+
+from django.db import migrations, models
+from django.db.models import Case, When
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def backfill_period_keys(apps, schema_editor):
+    """One UPDATE per table; financial years start in April"""
+    db_alias = schema_editor.connection.alias
+    year = ExtractYear('date')
+    month = ExtractMonth('date')
+    for model_name in ['Income', 'Expense']:
+        model = apps.get_model('finance', model_name)
+        model.objects.using(db_alias).update(
+            period_key=year * 100 + month,
+            fiscal_year=Case(When(date__month__gte=4, then=year), default=year - 1),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expense',
+            name='fiscal_year',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='period_key',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='income',
+            name='fiscal_year',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='income',
+            name='period_key',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_period_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='expense',
+            name='fiscal_year',
+            field=models.PositiveSmallIntegerField(editable=False),
+        ),
+        migrations.AlterField(
+            model_name='expense',
+            name='period_key',
+            field=models.PositiveIntegerField(editable=False),
+        ),
+        migrations.AlterField(
+            model_name='income',
+            name='fiscal_year',
+            field=models.PositiveSmallIntegerField(editable=False),
+        ),
+        migrations.AlterField(
+            model_name='income',
+            name='period_key',
+            field=models.PositiveIntegerField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['status', 'period_key', 'department'], name='expenses_status_3f1a79_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['department', 'status', 'period_key'], name='expenses_departm_6918c6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['status', 'fiscal_year', 'department'], name='expenses_status_908776_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['period_key', 'income_source'], name='incomes_period__5e8784_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['fiscal_year', 'department'], name='incomes_fiscal__cb5440_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:31
+
+import apps.core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0002_period_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='expense',
+            name='receipt',
+            field=models.FileField(blank=True, null=True, storage=apps.core.storage.receipt_storage, upload_to='expenses/receipts/'),
+        ),
+    ]
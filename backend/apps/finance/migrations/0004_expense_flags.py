@@ -0,0 +1,75 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('finance', '0003_receipt_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpenseFlag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('CATEGORY_OUTLIER', 'Unusual for category'), ('DEPARTMENT_OUTLIER', 'Unusual for department'), ('DUPLICATE', 'Possible duplicate')], max_length=20)),
+                ('score', models.FloatField(default=0)),
+                ('detail', models.CharField(max_length=255)),
+                ('dismissed', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'expense_flags',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ExpenseScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('watermark_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('watermark_id', models.BigIntegerField(default=0)),
+                ('scanned', models.PositiveIntegerField(default=0)),
+                ('flagged', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'expense_scans',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['updated_at', 'id'], name='expenses_updated_5f8b80_idx'),
+        ),
+        migrations.AddField(
+            model_name='expenseflag',
+            name='dismissed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='expenseflag',
+            name='expense',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='flags', to='finance.expense'),
+        ),
+        migrations.AddField(
+            model_name='expenseflag',
+            name='related_expense',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='finance.expense'),
+        ),
+        migrations.AddIndex(
+            model_name='expenseflag',
+            index=models.Index(fields=['dismissed', 'kind'], name='expense_fla_dismiss_2cabce_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='expenseflag',
+            constraint=models.UniqueConstraint(fields=('expense', 'kind'), name='unique_expense_flag'),
+        ),
+    ]
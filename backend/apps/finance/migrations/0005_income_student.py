@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0004_expense_flags'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        # The free-text admission number keeps its value; student_id becomes the FK column
+        migrations.RenameField(
+            model_name='income',
+            old_name='student_id',
+            new_name='student_ref',
+        ),
+        migrations.AddField(
+            model_name='income',
+            name='student',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='incomes', to='students.student'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['student', 'fiscal_year'], name='incomes_student_882674_idx'),
+        ),
+    ]
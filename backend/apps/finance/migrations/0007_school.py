@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0001_initial'),
+        ('finance', '0006_reference_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expense',
+            name='school',
+            field=models.ForeignKey(default=1, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='expenses', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='income',
+            name='school',
+            field=models.ForeignKey(default=1, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='incomes', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['school', 'date'], name='expenses_school__768d59_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['school', 'status', 'period_key'], name='expenses_school__026a4e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['school', 'status', 'fiscal_year'], name='expenses_school__faad73_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['school', 'date'], name='incomes_school__d5f66f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['school', 'period_key', 'income_source'], name='incomes_school__343672_idx'),
+        ),
+    ]
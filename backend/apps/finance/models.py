@@ -1,13 +1,29 @@
 """
 Finance Models - Income and Expense Management
 """
+import datetime
+
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 from apps.departments.models import Department
+from apps.core import periods
+from apps.core.storage import receipt_storage
+from apps.core.tenancy import assign_school, department_school_id
+from apps.core.tracking import TrackedFieldsMixin
 
 User = get_user_model()
 
 
+def set_period_keys(record):
+    """Fill period_key / fiscal_year from the transaction date"""
+    day = record.date
+    if isinstance(day, str):
+        day = datetime.date.fromisoformat(day)
+    record.period_key = periods.period_key(day)
+    record.fiscal_year = periods.fiscal_year_of(day)
+
+
 class IncomeSource(models.Model):
     """Income Source Categories"""
     
@@ -25,9 +41,12 @@ class IncomeSource(models.Model):
         return self.name
 
 
-class Income(models.Model):
+class Income(TrackedFieldsMixin, models.Model):
     """Income Transactions"""
     
+    # Stored values kept for cash-flow accumulators (see apps.reports.forecast) and fee balances
+    tracked_fields = ('amount', 'income_source_id', 'date', 'period_key', 'fiscal_year', 'student_id', 'school_id')
+    
     PAYMENT_MODES = [
         ('CASH', 'Cash'),
         ('UPI', 'UPI'),
@@ -51,7 +70,22 @@ class Income(models.Model):
         blank=True,
         related_name='incomes'
     )
-    student_id = models.CharField(max_length=50, blank=True, null=True)
+    student = models.ForeignKey(
+        'students.Student',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_index=False,  # covered by the (student, fiscal_year) index
+        related_name='incomes'
+    )
+    student_ref = models.CharField(max_length=50, blank=True, null=True)  # admission number as entered
+    
+    # School (tenant): the department's, else the school the income was recorded for
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='incomes', editable=False)
+    
+    # Fiscal period keys, derived from date on save
+    period_key = models.PositiveIntegerField(editable=False)  # YYYYMM
+    fiscal_year = models.PositiveSmallIntegerField(editable=False)  # e.g. 2024 for "2024-25"
     
     # Tracking
     recorded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='recorded_incomes')
@@ -64,10 +98,21 @@ class Income(models.Model):
         indexes = [
             models.Index(fields=['date']),
             models.Index(fields=['income_source']),
+            models.Index(fields=['period_key', 'income_source']),
+            models.Index(fields=['fiscal_year', 'department']),
+            models.Index(fields=['student', 'fiscal_year']),
+            models.Index(fields=['reference_id']),  # statement reconciliation, receipt lookups
+            models.Index(fields=['school', 'date']),
+            models.Index(fields=['school', 'period_key', 'income_source']),
         ]
     
     def __str__(self):
         return f"{self.income_source.name} - ₹{self.amount} ({self.date})"
+    
+    def save(self, *args, **kwargs):
+        set_period_keys(self)
+        assign_school(self, department_school_id(self.department_id))
+        super().save(*args, **kwargs)
 
 
 class ExpenseCategory(models.Model):
@@ -95,9 +140,12 @@ class ExpenseCategory(models.Model):
         return self.name
 
 
-class Expense(models.Model):
+class Expense(TrackedFieldsMixin, models.Model):
     """Expense Transactions"""
     
+    # Stored values kept for spend counters (see apps.budget.signals) and cash-flow accumulators
+    tracked_fields = ('status', 'amount', 'department_id', 'category_id', 'date', 'period_key', 'fiscal_year', 'school_id')
+    
     PAYMENT_MODES = [
         ('CASH', 'Cash'),
         ('UPI', 'UPI'),
@@ -113,6 +161,13 @@ class Expense(models.Model):
         ('REJECTED', 'Rejected'),
     ]
     
+    # Status graph applied by apps.core.transitions: name -> (from, to)
+    TRANSITIONS = {
+        'approve': (('PENDING',), 'APPROVED'),
+        'reject': (('PENDING',), 'REJECTED'),
+        'mark_paid': (('APPROVED',), 'PAID'),
+    }
+    
     category = models.ForeignKey(ExpenseCategory, on_delete=models.PROTECT, related_name='expenses')
     department = models.ForeignKey(Department, on_delete=models.PROTECT, related_name='expenses')
     amount = models.DecimalField(max_digits=12, decimal_places=2)
@@ -121,9 +176,17 @@ class Expense(models.Model):
     reference_id = models.CharField(max_length=100, blank=True, null=True)
     description = models.TextField()
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    version = models.PositiveIntegerField(default=1, editable=False)  # bumped by every write, for optimistic concurrency
+    
+    # Receipts/Documents (stored once per distinct content, see apps.core.storage)
+    receipt = models.FileField(upload_to='expenses/receipts/', storage=receipt_storage, blank=True, null=True)
     
-    # Receipts/Documents
-    receipt = models.FileField(upload_to='expenses/receipts/', blank=True, null=True)
+    # School (tenant), the department's
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='expenses', editable=False)
+    
+    # Fiscal period keys, derived from date on save
+    period_key = models.PositiveIntegerField(editable=False)  # YYYYMM
+    fiscal_year = models.PositiveSmallIntegerField(editable=False)  # e.g. 2024 for "2024-25"
     
     # Tracking
     requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='requested_expenses')
@@ -139,7 +202,85 @@ class Expense(models.Model):
             models.Index(fields=['category']),
             models.Index(fields=['department']),
             models.Index(fields=['status']),
+            models.Index(fields=['status', 'period_key', 'department']),
+            models.Index(fields=['department', 'status', 'period_key']),
+            models.Index(fields=['status', 'fiscal_year', 'department']),
+            models.Index(fields=['updated_at', 'id']),  # anomaly scan watermark
+            models.Index(fields=['reference_id']),  # statement reconciliation, duplicate bills
+            models.Index(fields=['school', 'date']),
+            models.Index(fields=['school', 'status', 'period_key']),
+            models.Index(fields=['school', 'status', 'fiscal_year']),
+            # Approval queue (apps.approvals): only the pending rows
+            models.Index(fields=['school', 'department', 'date'], condition=Q(status='PENDING'), name='expenses_pending_idx'),
         ]
     
     def __str__(self):
         return f"{self.category.name} - {self.department.name} - ₹{self.amount} ({self.date})"
+    
+    def save(self, *args, **kwargs):
+        set_period_keys(self)
+        assign_school(self, department_school_id(self.department_id))
+        new_receipt = bool(self.receipt) and not self.receipt._committed
+        if not self._state.adding:
+            self.version += 1
+        super().save(*args, **kwargs)
+        if new_receipt:
+            from .receipts import schedule_previews
+            schedule_previews(self.receipt.name)
+
+
+class ExpenseFlag(models.Model):
+    """An anomaly found by the expense scan (see apps.finance.anomalies)"""
+    
+    KIND_CHOICES = [
+        ('CATEGORY_OUTLIER', 'Unusual for category'),
+        ('DEPARTMENT_OUTLIER', 'Unusual for department'),
+        ('DUPLICATE', 'Possible duplicate'),
+    ]
+    
+    expense = models.ForeignKey(Expense, on_delete=models.CASCADE, related_name='flags')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    score = models.FloatField(default=0)  # robust z-score; 0 for duplicates
+    detail = models.CharField(max_length=255)
+    related_expense = models.ForeignKey(
+        Expense, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )  # the other expense of a duplicate pair
+    
+    # Review
+    dismissed = models.BooleanField(default=False)
+    dismissed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'expense_flags'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['expense', 'kind'], name='unique_expense_flag'),
+        ]
+        indexes = [
+            models.Index(fields=['dismissed', 'kind']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} - expense {self.expense_id}"
+
+
+class ExpenseScan(models.Model):
+    """One run of the anomaly scan; the last run's watermark is where the next one starts"""
+    
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    # Expenses changed after (watermark_updated_at, watermark_id) are scanned next
+    watermark_updated_at = models.DateTimeField(null=True, blank=True)
+    watermark_id = models.BigIntegerField(default=0)
+    scanned = models.PositiveIntegerField(default=0)
+    flagged = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'expense_scans'
+        ordering = ['-started_at']
+    
+    def __str__(self):
+        return f"Scan {self.started_at:%Y-%m-%d %H:%M} - {self.scanned} scanned, {self.flagged} flagged"
@@ -0,0 +1,116 @@
+"""
+Receipt thumbnails and previews
+
+Image receipts get two JPEG derivatives, generated off the request path
+by a small thread pool once the upload is committed:
+
+- thumbnail: fits 200x200, for lists
+- preview: fits 1200x1200, for viewing on screen
+
+Derivatives are named after the receipt's content hash, so duplicates
+share them and their URLs are known without touching the disk.
+"""
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from apps.core import metrics
+from apps.core.storage import content_digest, receipt_storage
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_DIR = 'expenses/previews'
+PREVIEW_SIZES = {
+    'thumbnail': (200, 200),
+    'preview': (1200, 1200),
+}
+PREVIEW_QUALITY = 70
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tif', '.tiff'}
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.RECEIPT_PREVIEW_WORKERS,
+            thread_name_prefix='receipt-preview',
+        )
+    return _executor
+
+
+def has_previews(name):
+    """Whether previews are generated for this receipt type (images only)"""
+    return bool(content_digest(name)) and os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def preview_name(name, size):
+    """Storage name of a receipt derivative, e.g. expenses/previews/ab/abcd..._thumbnail.jpg"""
+    digest = content_digest(name)
+    return f'{PREVIEW_DIR}/{digest[:2]}/{digest}_{size}.jpg'
+
+
+def render_preview(image, bounds):
+    from PIL import Image
+    
+    preview = image.copy()
+    preview.thumbnail(bounds, Image.LANCZOS)
+    if preview.mode not in ('RGB', 'L'):
+        preview = preview.convert('RGB')
+    buffer = io.BytesIO()
+    preview.save(buffer, 'JPEG', quality=PREVIEW_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def generate_previews(name):
+    """Write the missing derivatives of a receipt; returns the names written"""
+    from PIL import Image, UnidentifiedImageError
+    
+    if not has_previews(name):
+        return []
+    
+    missing = {
+        size: bounds for size, bounds in PREVIEW_SIZES.items()
+        if not default_storage.exists(preview_name(name, size))
+    }
+    if not missing:
+        return []
+    
+    written = []
+    try:
+        with receipt_storage().open(name, 'rb') as source, Image.open(source) as image:
+            # Let the JPEG decoder downscale while reading when it can
+            image.draft('RGB', max(missing.values()))
+            image.load()
+            for size, bounds in missing.items():
+                target = preview_name(name, size)
+                default_storage.save(target, ContentFile(render_preview(image, bounds)))
+                written.append(target)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        # Decompression bombs (far above MAX_IMAGE_PIXELS) get no preview, like unreadable files
+        metrics.incr('receipts.preview_failed')
+        logger.warning('Could not generate previews for receipt %s', name, exc_info=True)
+        return written
+    
+    metrics.incr('receipts.previews_generated', len(written))
+    return written
+
+
+def _generate_safely(name):
+    try:
+        generate_previews(name)
+    except Exception:  # never let a worker die silently
+        logger.exception('Preview worker failed for %s', name)
+
+
+def schedule_previews(name):
+    """Generate derivatives in the background once the current transaction commits"""
+    if has_previews(name):
+        transaction.on_commit(lambda: get_executor().submit(_generate_safely, name))
@@ -2,7 +2,12 @@
 Finance Serializers
 """
 from rest_framework import serializers
-from .models import IncomeSource, Income, ExpenseCategory, Expense
+from rest_framework.reverse import reverse
+from apps.core.refdata import DEPARTMENT, INCOME_SOURCE, EXPENSE_CATEGORY, ReferenceNameField
+from apps.reports.validators import OpenPeriodSerializerMixin
+from apps.students.models import Student
+from .models import IncomeSource, Income, ExpenseCategory, Expense, ExpenseFlag
+from .receipts import has_previews
 
 
 class IncomeSourceSerializer(serializers.ModelSerializer):
@@ -13,10 +18,10 @@ class IncomeSourceSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class IncomeSerializer(serializers.ModelSerializer):
+class IncomeSerializer(OpenPeriodSerializerMixin, serializers.ModelSerializer):
     """Income Serializer"""
-    source_name = serializers.CharField(source='income_source.name', read_only=True)
-    department_name = serializers.CharField(source='department.name', read_only=True)
+    source_name = ReferenceNameField(INCOME_SOURCE, source='income_source_id')
+    department_name = ReferenceNameField(DEPARTMENT, source='department_id')
     recorded_by_name = serializers.CharField(source='recorded_by.get_full_name', read_only=True)
     
     class Meta:
@@ -24,6 +29,18 @@ class IncomeSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['recorded_by', 'created_at', 'updated_at']
     
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        # Receipts entered with an admission number are linked to the student
+        if attrs.get('student_ref') and not attrs.get('student'):
+            attrs['student_ref'] = attrs['student_ref'].strip()
+            attrs['student'] = Student.objects.filter(
+                school_id=self.school_id(attrs), admission_number=attrs['student_ref'],
+            ).first()
+        elif attrs.get('student') and not attrs.get('student_ref'):
+            attrs['student_ref'] = attrs['student'].admission_number
+        return attrs
+    
     def create(self, validated_data):
         validated_data['recorded_by'] = self.context['request'].user
         return super().create(validated_data)
@@ -37,17 +54,62 @@ class ExpenseCategorySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class ExpenseSerializer(serializers.ModelSerializer):
+class ExpenseFlagSerializer(serializers.ModelSerializer):
+    """Anomaly flag of an expense"""
+    kind_display = serializers.CharField(source='get_kind_display', read_only=True)
+    
+    class Meta:
+        model = ExpenseFlag
+        fields = ['id', 'kind', 'kind_display', 'score', 'detail', 'related_expense', 'created_at']
+
+
+class ExpenseSerializer(OpenPeriodSerializerMixin, serializers.ModelSerializer):
     """Expense Serializer"""
-    category_name = serializers.CharField(source='category.name', read_only=True)
-    department_name = serializers.CharField(source='department.name', read_only=True)
+    category_name = ReferenceNameField(EXPENSE_CATEGORY, source='category_id')
+    department_name = ReferenceNameField(DEPARTMENT, source='department_id')
     requested_by_name = serializers.CharField(source='requested_by.get_full_name', read_only=True)
     approved_by_name = serializers.CharField(source='approved_by.get_full_name', read_only=True)
+    receipt_thumbnail_url = serializers.SerializerMethodField()
+    receipt_preview_url = serializers.SerializerMethodField()
+    flags = serializers.SerializerMethodField()
     
     class Meta:
         model = Expense
         fields = '__all__'
-        read_only_fields = ['requested_by', 'approved_by', 'created_at', 'updated_at']
+        read_only_fields = ['status', 'requested_by', 'approved_by', 'created_at', 'updated_at']
+    
+    def get_receipt_thumbnail_url(self, obj):
+        return self.derivative_url(obj, 'thumbnail')
+    
+    def get_receipt_preview_url(self, obj):
+        return self.derivative_url(obj, 'preview')
+    
+    def get_flags(self, obj):
+        """Open anomaly flags (prefetched as ``open_flags`` by the viewset); archived rows have none"""
+        flags = getattr(obj, 'open_flags', None)
+        if flags is None:
+            if not isinstance(obj, Expense) or obj.pk is None:
+                return []
+            flags = obj.flags.filter(dismissed=False)
+        return ExpenseFlagSerializer(flags, many=True).data if flags else []
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # The download action, which checks the school, rather than the file's public media URL
+        data['receipt'] = self.receipt_url(instance, 'expense-receipt', {'pk': instance.pk})
+        return data
+    
+    def derivative_url(self, obj, size):
+        """URL of a receipt thumbnail/preview (image receipts only; built without disk access)"""
+        if not obj.receipt or not has_previews(obj.receipt.name):
+            return None
+        return self.receipt_url(obj, 'expense-receipt-preview', {'pk': obj.pk, 'size': size})
+    
+    def receipt_url(self, obj, name, kwargs):
+        """Absolute URL of a receipt action; null without a receipt and for archived rows, which have no actions"""
+        if not obj.receipt or not isinstance(obj, Expense):
+            return None
+        return reverse(name, kwargs=kwargs, request=self.context.get('request'))
     
     def create(self, validated_data):
         validated_data['requested_by'] = self.context['request'].user
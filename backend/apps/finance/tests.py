@@ -1,3 +1,95 @@
+"""
+Finance Tests - Versioned edits and approval transitions of expenses
+"""
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.core import tenancy, transitions
+from apps.departments.models import Department
+from apps.schools.models import School
+from .models import Expense, ExpenseCategory
+
+
+class ExpenseVersionTests(TestCase):
+    """Edits and transitions of a changed expense get 409 instead of overwriting it"""
+    
+    def setUp(self):
+        tenancy.schools.invalidate()
+        school = School.objects.create(name='Test School', code='TST')
+        department = Department.objects.create(school=school, name='Science', code='SCI')
+        category = ExpenseCategory.objects.create(name='Lab', code='LAB')
+        self.expense = Expense.objects.create(
+            category=category, department=department, amount='100.00', date='2024-07-10', description='Test',
+        )
+        user = get_user_model().objects.create_user(
+            email='admin@example.com', password='pw12345!', first_name='A', last_name='B',
+            role='SUPER_ADMIN', is_staff=True, is_superuser=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self.url = f'/api/finance/expenses/{self.expense.id}/'
+    
+    def test_edit_without_version_is_rejected(self):
+        response = self.client.patch(self.url, {'amount': '150.00'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('version', response.data)
+        
+        response = self.client.patch(self.url, {'amount': '150.00', 'version': 'x'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.expense.refresh_from_db()
+        self.assertEqual(str(self.expense.amount), '100.00')
+    
+    def test_edit_with_current_version_moves_it_on(self):
+        response = self.client.patch(self.url, {'amount': '150.00', 'version': 1}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['amount'], '150.00')
+        self.assertEqual(response.data['version'], 2)
+    
+    def test_edit_with_stale_version_conflicts(self):
+        self.client.patch(self.url, {'amount': '150.00', 'version': 1}, format='json')
+        
+        response = self.client.patch(self.url, {'amount': '999.00', 'version': 1}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['status'], 'PENDING')
+        self.assertEqual(response.data['version'], 2)
+        self.expense.refresh_from_db()
+        self.assertEqual(str(self.expense.amount), '150.00')
+    
+    def test_status_cannot_be_edited(self):
+        response = self.client.patch(self.url, {'status': 'PAID', 'version': 1}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['status'], 'PENDING')
+    
+    def test_transition_with_stale_version_conflicts(self):
+        self.client.patch(self.url, {'amount': '150.00', 'version': 1}, format='json')
+        
+        response = self.client.post(f'{self.url}approve/', {'version': 1}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['status'], 'PENDING')
+        self.assertEqual(response.data['version'], 2)
+        
+        response = self.client.post(f'{self.url}approve/', {'version': 2}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual((response.data['status'], response.data['version']), ('APPROVED', 3))
+        
+        response = self.client.post(f'{self.url}approve/', {'version': 3}, format='json')
+        self.assertEqual(response.status_code, 400)
+    
+    def test_apply_on_a_changed_row_conflicts(self):
+        stale_copy = Expense.objects.get(pk=self.expense.pk)
+        transitions.apply(self.expense, 'approve')
+        
+        with self.assertRaises(transitions.StaleTransition) as raised:
+            transitions.apply(stale_copy, 'reject')
+        self.assertEqual(raised.exception.current_status, 'APPROVED')
+        self.expense.refresh_from_db()
+        self.assertEqual((self.expense.status, self.expense.version), ('APPROVED', 2))
+    
+    def test_claim_on_a_changed_row_conflicts(self):
+        stale_copy = Expense.objects.get(pk=self.expense.pk)
+        transitions.claim(self.expense, 1)
+        
+        with self.assertRaises(transitions.StaleTransition) as raised:
+            transitions.claim(stale_copy, 1)
+        self.assertEqual(raised.exception.current_version, 2)
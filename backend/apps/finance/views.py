@@ -1,6 +1,8 @@
 """
 Finance Views
 """
+import os
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -8,7 +10,18 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 
-from .models import IncomeSource, Income, ExpenseCategory, Expense
+from django.core.files.storage import default_storage
+from django.db.models import Prefetch
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.files import PassthroughRenderer, serve_file
+from apps.core.renderers import FastJSONRenderer
+from apps.core.streaming import streaming_json_response
+from apps.core.tenancy import TenantScopedMixin, scoped
+from apps.core.transitions import TransitionActionsMixin
+from apps.archive.models import ArchivedIncome, ArchivedExpense
+from apps.reports.validators import ensure_open
+from .models import IncomeSource, Income, ExpenseCategory, Expense, ExpenseFlag
+from .receipts import generate_previews, has_previews, preview_name
 from .serializers import (
     IncomeSourceSerializer,
     IncomeSerializer,
@@ -17,7 +30,7 @@ from .serializers import (
 )
 
 
-class IncomeSourceViewSet(viewsets.ModelViewSet):
+class IncomeSourceViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Income Source ViewSet"""
     queryset = IncomeSource.objects.filter(is_active=True)
     serializer_class = IncomeSourceSerializer
@@ -25,19 +38,38 @@ class IncomeSourceViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'code']
 
 
-class IncomeViewSet(viewsets.ModelViewSet):
+class IncomeViewSet(TenantScopedMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """Income ViewSet"""
     queryset = Income.objects.all()
     serializer_class = IncomeSerializer
+    conditional_extra_models = ['archive.ArchivedIncome']
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['income_source', 'department', 'payment_mode', 'date']
-    search_fields = ['reference_id', 'description', 'student_id']
+    filterset_fields = ['income_source', 'department', 'payment_mode', 'date', 'student']
+    search_fields = ['reference_id', 'description', 'student_ref']
     ordering_fields = ['date', 'amount', 'created_at']
     ordering = ['-date']
+    
+    def perform_destroy(self, instance):
+        ensure_open(instance.date, instance.school_id)
+        instance.delete()
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream all filtered incomes as one JSON array
+
+        ``?include_archived=true`` appends rows of archived financial years.
+        """
+        querysets = [self.filter_queryset(self.get_queryset())]
+        if request.query_params.get('include_archived') == 'true':
+            querysets.append(self.filter_queryset(scoped(ArchivedIncome.objects.all())))
+        querysets = [queryset.select_related('recorded_by') for queryset in querysets]
+        return streaming_json_response(
+            querysets, self.get_serializer_class(), self.get_serializer_context(), 'incomes.json'
+        )
 
 
-class ExpenseCategoryViewSet(viewsets.ModelViewSet):
+class ExpenseCategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Expense Category ViewSet"""
     queryset = ExpenseCategory.objects.filter(is_active=True)
     serializer_class = ExpenseCategorySerializer
@@ -46,10 +78,13 @@ class ExpenseCategoryViewSet(viewsets.ModelViewSet):
     filterset_fields = ['category_type']
 
 
-class ExpenseViewSet(viewsets.ModelViewSet):
+class ExpenseViewSet(TenantScopedMixin, ConditionalGetMixin, TransitionActionsMixin, viewsets.ModelViewSet):
     """Expense ViewSet"""
-    queryset = Expense.objects.all()
+    queryset = Expense.objects.prefetch_related(
+        Prefetch('flags', queryset=ExpenseFlag.objects.filter(dismissed=False), to_attr='open_flags')
+    )
     serializer_class = ExpenseSerializer
+    conditional_extra_models = ['archive.ArchivedExpense', 'finance.ExpenseFlag']
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'department', 'status', 'payment_mode', 'date']
@@ -57,6 +92,53 @@ class ExpenseViewSet(viewsets.ModelViewSet):
     ordering_fields = ['date', 'amount', 'created_at']
     ordering = ['-date']
     
+    def perform_destroy(self, instance):
+        ensure_open(instance.date, instance.school_id)
+        instance.delete()
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream all filtered expenses as one JSON array
+
+        ``?include_archived=true`` appends rows of archived financial years.
+        """
+        querysets = [self.filter_queryset(self.get_queryset())]
+        if request.query_params.get('include_archived') == 'true':
+            querysets.append(self.filter_queryset(scoped(ArchivedExpense.objects.all())))
+        querysets = [queryset.select_related('requested_by', 'approved_by') for queryset in querysets]
+        return streaming_json_response(
+            querysets, self.get_serializer_class(), self.get_serializer_context(), 'expenses.json'
+        )
+    
+    @action(detail=True, methods=['get'], conditional_get=False,
+            renderer_classes=[FastJSONRenderer, PassthroughRenderer])
+    def receipt(self, request, pk=None):
+        """Download the receipt (supports Range and If-None-Match)"""
+        expense = self.get_object()
+        
+        if not expense.receipt:
+            return Response({'error': 'This expense has no receipt'}, status=status.HTTP_404_NOT_FOUND)
+        
+        extension = os.path.splitext(expense.receipt.name)[1]
+        return serve_file(
+            request, expense.receipt.storage, expense.receipt.name,
+            filename=f'receipt-{expense.id}{extension}'
+        )
+    
+    @action(detail=True, methods=['get'], url_path=r'receipt/(?P<size>thumbnail|preview)',
+            conditional_get=False, renderer_classes=[FastJSONRenderer, PassthroughRenderer])
+    def receipt_preview(self, request, pk=None, size=None):
+        """Download the receipt thumbnail or preview image"""
+        expense = self.get_object()
+        
+        if not expense.receipt or not has_previews(expense.receipt.name):
+            return Response({'error': 'No preview for this receipt'}, status=status.HTTP_404_NOT_FOUND)
+        
+        name = preview_name(expense.receipt.name, size)
+        if not default_storage.exists(name):
+            generate_previews(expense.receipt.name)  # background worker has not run yet
+        return serve_file(request, default_storage, name, filename=f'receipt-{expense.id}-{size}.jpg')
+    
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
         """Approve an expense"""
@@ -68,18 +150,9 @@ class ExpenseViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        if expense.status != 'PENDING':
-            return Response(
-                {'error': 'Only pending expenses can be approved'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        expense.status = 'APPROVED'
-        expense.approved_by = request.user
-        expense.save()
-        
-        serializer = self.get_serializer(expense)
-        return Response(serializer.data)
+        return self.transition(
+            request, expense, 'approve', 'Only pending expenses can be approved', approved_by=request.user,
+        )
     
     @action(detail=True, methods=['post'])
     def reject(self, request, pk=None):
@@ -92,18 +165,9 @@ class ExpenseViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        if expense.status != 'PENDING':
-            return Response(
-                {'error': 'Only pending expenses can be rejected'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        expense.status = 'REJECTED'
-        expense.approved_by = request.user
-        expense.save()
-        
-        serializer = self.get_serializer(expense)
-        return Response(serializer.data)
+        return self.transition(
+            request, expense, 'reject', 'Only pending expenses can be rejected', approved_by=request.user,
+        )
     
     @action(detail=True, methods=['post'])
     def mark_paid(self, request, pk=None):
@@ -116,14 +180,5 @@ class ExpenseViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        if expense.status != 'APPROVED':
-            return Response(
-                {'error': 'Only approved expenses can be marked as paid'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        expense.status = 'PAID'
-        expense.save()
-        
-        serializer = self.get_serializer(expense)
-        return Response(serializer.data)
+        ensure_open(expense.date, expense.school_id)
+        return self.transition(request, expense, 'mark_paid', 'Only approved expenses can be marked as paid')
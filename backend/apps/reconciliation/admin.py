@@ -0,0 +1,35 @@
+"""
+Reconciliation Admin Configuration
+"""
+from django.contrib import admin
+from apps.core.admin_performance import PerformanceAdminMixin
+from .models import BankStatement, StatementLine
+
+
+@admin.register(BankStatement)
+class BankStatementAdmin(admin.ModelAdmin):
+    """Imported statements (upload through the API or import_bank_statement)"""
+    list_display = ['name', 'account_name', 'start_date', 'end_date', 'line_count', 'matched_count', 'created_at']
+    search_fields = ['name', 'account_name']
+    readonly_fields = [
+        'start_date', 'end_date', 'line_count', 'matched_count', 'credit_total', 'debit_total',
+        'uploaded_by', 'created_at', 'reconciled_at',
+    ]
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(StatementLine)
+class StatementLineAdmin(PerformanceAdminMixin, admin.ModelAdmin):
+    """Statement lines and their matches (read-only)"""
+    list_display = ['statement', 'line_number', 'date', 'direction', 'amount', 'reference_id', 'status', 'match_rule', 'ledger_id']
+    list_filter = ['status', 'direction', 'match_rule']
+    search_fields = ['reference_id', 'description']
+    performance_select_related = ['statement']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,75 @@
+"""
+Import a bank/UPI statement CSV and match it against the ledger
+
+Usage:
+    python manage.py import_bank_statement statement.csv
+    python manage.py import_bank_statement statement.csv --name "SBI Oct 2026" --account "SBI 1234"
+    python manage.py import_bank_statement statement.csv --school DPS    # deployments of several schools
+    python manage.py import_bank_statement --rematch 12     # retry the unmatched lines of statement 12
+"""
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import tenancy
+from apps.reconciliation.matching import import_statement, rematch_statement
+from apps.reconciliation.models import BankStatement
+from apps.reconciliation.statements import StatementError, read_statement
+
+
+def file_chunks(path, size=64 * 1024):
+    with open(path, 'rb') as statement_file:
+        while True:
+            chunk = statement_file.read(size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class Command(BaseCommand):
+    help = 'Import a statement CSV and reconcile it with incomes and paid expenses'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help='Statement CSV file')
+        parser.add_argument('--name', help='Statement name (default: the file name)')
+        parser.add_argument('--account', default='', help='Bank account name')
+        parser.add_argument('--rematch', type=int, metavar='STATEMENT_ID', help='Match the unmatched lines again')
+        parser.add_argument('--school', metavar='CODE', help='School of the statement')
+    
+    def handle(self, *args, **options):
+        school = None
+        if options['school']:
+            school = tenancy.schools.by_code(options['school'])
+            if school is None:
+                raise CommandError(f"Unknown school {options['school']}")
+        with tenancy.school_context(school) if school else nullcontext():
+            self.run(options)
+    
+    def run(self, options):
+        started = time.perf_counter()
+        if options['rematch']:
+            statement = BankStatement.objects.filter(pk=options['rematch']).first()
+            if statement is None:
+                raise CommandError(f"Statement {options['rematch']} does not exist")
+            matched = rematch_statement(statement)
+            self.stdout.write(self.style.SUCCESS(
+                f'{matched} more lines matched, {statement.matched_count}/{statement.line_count} in total '
+                f'({time.perf_counter() - started:.1f}s).'
+            ))
+            return
+        
+        if not options['path']:
+            raise CommandError('Give a statement CSV path or --rematch STATEMENT_ID')
+        try:
+            statement = import_statement(
+                read_statement(file_chunks(options['path'])),
+                name=options['name'] or options['path'],
+                account_name=options['account'],
+            )
+        except (OSError, StatementError, UnicodeDecodeError, tenancy.SchoolRequired) as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f'Statement {statement.pk}: {statement.matched_count}/{statement.line_count} lines matched '
+            f'({time.perf_counter() - started:.1f}s).'
+        ))
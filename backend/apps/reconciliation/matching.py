@@ -0,0 +1,287 @@
+"""
+Matching statement lines with ledger rows
+
+Credits are matched with incomes, debits with paid expenses. The ledger
+rows that can match a statement are loaded once (archived years included)
+and indexed in dicts, so matching is two hash joins and never queries per
+line:
+
+1. reference: the line's reference (or, when it has none, the longer
+   tokens of its narration, where UPI/NEFT references usually sit) equals
+   a ledger ``reference_id``, compared upper-case without punctuation, and
+   the amounts agree within ``RECONCILIATION_AMOUNT_TOLERANCE``
+2. amount and date: amount within the tolerance and date within
+   ``RECONCILIATION_DATE_TOLERANCE_DAYS``
+
+The closest candidate wins (amount difference, then date difference, then
+the older row). Only the statement's school's ledger is searched, and its
+rows already matched by any statement are skipped.
+"""
+import datetime
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.archive.ledger import ledger
+from apps.core.tenancy import assign_school
+from apps.core.models import DataVersion
+from apps.finance.models import Income, Expense
+from .models import BankStatement, StatementLine
+
+LEDGER_MODELS = {
+    'CREDIT': (Income, {}),
+    'DEBIT': (Expense, {'status': 'PAID'}),
+}
+REFERENCE_BATCH = 500
+INSERTED_FIELDS = (
+    'statement_id', 'line_number', 'date', 'description', 'reference_id',
+    'amount', 'direction', 'status', 'match_rule', 'ledger_id',
+)
+NARRATION_TOKEN = re.compile(r'[A-Z0-9]{6,}')
+NOT_ALPHANUMERIC = re.compile(r'[^A-Z0-9]')
+
+
+def tolerances():
+    """(amount tolerance in paise, date tolerance in days)"""
+    amount = Decimal(str(getattr(settings, 'RECONCILIATION_AMOUNT_TOLERANCE', '0')))
+    return int(amount * 100), getattr(settings, 'RECONCILIATION_DATE_TOLERANCE_DAYS', 3)
+
+
+def normalize_reference(value):
+    return NOT_ALPHANUMERIC.sub('', (value or '').upper())
+
+
+def line_references(line):
+    reference = normalize_reference(line.reference_id)
+    if reference:
+        return [reference]
+    return [token for token in NARRATION_TOKEN.findall(line.description.upper()) if not token.isalpha()]
+
+
+def paise(amount):
+    return int(amount * 100)
+
+
+class LedgerIndex:
+    """Unmatched ledger rows of one direction, by reference and by (day, amount)"""
+    
+    def __init__(self):
+        self.by_reference = defaultdict(list)
+        self.by_day = defaultdict(lambda: defaultdict(deque))  # day: {paise: rows, oldest first}
+        self.day_amounts = {}  # day: sorted paise amounts
+        self.rows = set()
+        self.taken = set()
+    
+    def add(self, pk, date, amount, reference_id):
+        if pk in self.rows:
+            return
+        self.rows.add(pk)
+        row = (pk, date.toordinal(), paise(amount))
+        reference = normalize_reference(reference_id)
+        if reference:
+            self.by_reference[reference].append(row)
+        self.by_day[row[1]][row[2]].append(row)
+    
+    def finish(self):
+        for day, amounts in self.by_day.items():
+            for paise_amount, rows in amounts.items():
+                amounts[paise_amount] = deque(sorted(rows))
+            self.day_amounts[day] = sorted(amounts)
+    
+    def nearest(self, amount, day, amount_tolerance, date_tolerance):
+        """Closest untaken row within the tolerances (amount gap, then date gap, then oldest)"""
+        chosen = None
+        for offset in range(date_tolerance + 1):
+            for candidate_day in {day - offset, day + offset}:
+                amounts = self.day_amounts.get(candidate_day)
+                if not amounts:
+                    continue
+                low = bisect_left(amounts, amount - amount_tolerance)
+                high = bisect_right(amounts, amount + amount_tolerance)
+                for candidate_amount in amounts[low:high]:
+                    rows = self.by_day[candidate_day][candidate_amount]
+                    while rows and rows[0][0] in self.taken:
+                        rows.popleft()  # matched through its reference or by an earlier line
+                    if rows:
+                        key = (abs(candidate_amount - amount), offset, rows[0][0])
+                        if chosen is None or key < chosen:
+                            chosen = key
+        return chosen[2] if chosen else None
+
+
+def load_index(direction, lines, school_id, exclude_ids, date_tolerance):
+    """LedgerIndex of the school's rows that can match ``lines`` (all of one direction)"""
+    model, filters = LEDGER_MODELS[direction]
+    filters = dict(filters, school_id=school_id)
+    index = LedgerIndex()
+    if not lines:
+        return index
+    
+    # Rows dated around the statement, for both passes
+    margin = datetime.timedelta(days=date_tolerance)
+    start = min(line.date for line in lines) - margin
+    end = max(line.date for line in lines) + margin
+    for queryset in ledger(model, start, end, **filters):
+        for row in queryset.order_by().values_list('id', 'date', 'amount', 'reference_id').iterator(chunk_size=5000):
+            if row[0] not in exclude_ids:
+                index.add(*row)
+    
+    # Rows outside that window that share a reference (indexed reference_id lookups)
+    references = sorted({
+        line.reference_id.strip() for line in lines
+        if line.reference_id.strip() and normalize_reference(line.reference_id) not in index.by_reference
+    })
+    for offset in range(0, len(references), REFERENCE_BATCH):
+        batch = references[offset:offset + REFERENCE_BATCH]
+        for queryset in ledger(model, reference_id__in=batch, **filters):
+            for row in queryset.order_by().values_list('id', 'date', 'amount', 'reference_id'):
+                if row[0] not in exclude_ids:
+                    index.add(*row)
+    index.finish()
+    return index
+
+
+def closest_by_reference(line, index, amount_tolerance):
+    amount, day = paise(line.amount), line.date.toordinal()
+    chosen = None
+    for reference in line_references(line):
+        for pk, row_day, row_amount in index.by_reference.get(reference, ()):
+            if pk in index.taken or abs(row_amount - amount) > amount_tolerance:
+                continue
+            key = (abs(row_amount - amount), abs(row_day - day), pk)
+            if chosen is None or key < chosen:
+                chosen = key
+    return chosen[2] if chosen else None
+
+
+def match_lines(lines, school_id, exclude_ids=None):
+    """Set status/match_rule/ledger_id on unmatched ``lines`` of a statement of ``school_id`` in place; returns the matched count"""
+    amount_tolerance, date_tolerance = tolerances()
+    exclude_ids = exclude_ids if exclude_ids is not None else matched_ledger_ids(school_id)
+    lines = sorted((line for line in lines if line.ledger_id is None), key=lambda line: (line.date, line.line_number))
+    matched = 0
+    
+    for direction in LEDGER_MODELS:
+        pending = [line for line in lines if line.direction == direction]
+        index = load_index(direction, pending, school_id, exclude_ids[direction], date_tolerance)
+        
+        unmatched = []
+        for line in pending:
+            pk = closest_by_reference(line, index, amount_tolerance)
+            if pk is None:
+                unmatched.append(line)
+                continue
+            index.taken.add(pk)
+            line.status, line.match_rule, line.ledger_id = 'MATCHED', 'REFERENCE', pk
+            matched += 1
+        
+        for line in unmatched:
+            pk = index.nearest(paise(line.amount), line.date.toordinal(), amount_tolerance, date_tolerance)
+            if pk is None:
+                continue
+            index.taken.add(pk)
+            line.status, line.match_rule, line.ledger_id = 'MATCHED', 'AMOUNT_DATE', pk
+            matched += 1
+    return matched
+
+
+def matched_ledger_ids(school_id):
+    """{direction: ids of ledger rows matched by any statement line of the school}"""
+    matched = {direction: set() for direction in LEDGER_MODELS}
+    rows = StatementLine.objects.filter(statement__school_id=school_id, ledger_id__isnull=False).values_list(
+        'direction', 'ledger_id',
+    )
+    for direction, ledger_id in rows.iterator(chunk_size=10000):
+        matched[direction].add(ledger_id)
+    return matched
+
+
+class PendingLine:
+    """A parsed statement line on its way in; matched like a StatementLine, inserted as a tuple"""
+    __slots__ = INSERTED_FIELDS
+    
+    def __init__(self, parsed):
+        self.statement_id = None
+        self.line_number, self.date, self.description = parsed.line_number, parsed.date, parsed.description
+        self.reference_id, self.amount, self.direction = parsed.reference_id, parsed.amount, parsed.direction
+        self.status, self.match_rule, self.ledger_id = 'UNMATCHED', '', None
+
+
+def insert_lines(lines, batch_size):
+    """INSERT the lines with executemany; bulk_create spends most of a large import preparing values"""
+    quote = connection.ops.quote_name
+    table = quote(StatementLine._meta.db_table)
+    columns = ', '.join(quote(StatementLine._meta.get_field(name).column) for name in INSERTED_FIELDS)
+    placeholders = ', '.join(['%s'] * len(INSERTED_FIELDS))
+    sql = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+    with connection.cursor() as cursor:
+        for offset in range(0, len(lines), batch_size):
+            cursor.executemany(sql, [
+                tuple(getattr(line, name) for name in INSERTED_FIELDS)
+                for line in lines[offset:offset + batch_size]
+            ])
+
+
+def import_statement(parsed_lines, name, account_name='', uploaded_by=None, batch_size=5000):
+    """Create a statement of the current school from ParsedLine rows, matched before they are written
+
+    Raises SchoolRequired when no school is active in a deployment of several.
+    """
+    statement = BankStatement(name=name, account_name=account_name, uploaded_by=uploaded_by)
+    assign_school(statement)
+    lines = [PendingLine(parsed) for parsed in parsed_lines]
+    matched = match_lines(lines, statement.school_id)
+    
+    statement.start_date = min((line.date for line in lines), default=None)
+    statement.end_date = max((line.date for line in lines), default=None)
+    statement.line_count = len(lines)
+    statement.matched_count = matched
+    statement.credit_total = sum((line.amount for line in lines if line.direction == 'CREDIT'), Decimal('0'))
+    statement.debit_total = sum((line.amount for line in lines if line.direction == 'DEBIT'), Decimal('0'))
+    statement.reconciled_at = timezone.now()
+    with transaction.atomic():
+        statement.save(force_insert=True)
+        for line in lines:
+            line.statement_id = statement.pk
+        insert_lines(lines, batch_size)
+    DataVersion.bump(StatementLine._meta.label)  # raw inserts skip the post_save bump
+    return statement
+
+
+def rematch_statement(statement):
+    """Match the unmatched lines of a statement again (after ledger entries were added)"""
+    lines = list(statement.lines.filter(status='UNMATCHED'))
+    matched = match_lines(lines, statement.school_id)
+    with transaction.atomic():
+        StatementLine.objects.bulk_update(
+            [line for line in lines if line.ledger_id is not None],
+            ['status', 'match_rule', 'ledger_id'], batch_size=500,
+        )
+        statement.matched_count = statement.lines.filter(status='MATCHED').count()
+        statement.reconciled_at = timezone.now()
+        statement.save(update_fields=['matched_count', 'reconciled_at'])
+    DataVersion.bump(StatementLine._meta.label)
+    return matched
+
+
+def unmatched_ledger(statement):
+    """Incomes and paid expenses of the statement's school dated inside its period that no statement line matched"""
+    if statement.start_date is None:
+        return []
+    matched = matched_ledger_ids(statement.school_id)
+    rows = []
+    for direction, (model, filters) in LEDGER_MODELS.items():
+        kind = 'INCOME' if direction == 'CREDIT' else 'EXPENSE'
+        for queryset in ledger(model, statement.start_date, statement.end_date, school_id=statement.school_id, **filters):
+            for pk, date, amount, reference_id in queryset.order_by('date', 'id').values_list(
+                'id', 'date', 'amount', 'reference_id'
+            ):
+                if pk not in matched[direction]:
+                    rows.append({'kind': kind, 'id': pk, 'date': date, 'amount': amount, 'reference_id': reference_id})
+    rows.sort(key=lambda row: (row['date'], row['kind'], row['id']))
+    return rows
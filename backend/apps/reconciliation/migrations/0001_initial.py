@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BankStatement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('account_name', models.CharField(blank=True, max_length=200)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('line_count', models.PositiveIntegerField(default=0)),
+                ('matched_count', models.PositiveIntegerField(default=0)),
+                ('credit_total', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('debit_total', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True)),
+                ('uploaded_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bank_statements', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'bank_statements',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatementLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('line_number', models.PositiveIntegerField()),
+                ('date', models.DateField()),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('reference_id', models.CharField(blank=True, max_length=100)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('direction', models.CharField(choices=[('CREDIT', 'Credit'), ('DEBIT', 'Debit')], max_length=6)),
+                ('status', models.CharField(choices=[('UNMATCHED', 'Unmatched'), ('MATCHED', 'Matched')], default='UNMATCHED', max_length=10)),
+                ('match_rule', models.CharField(blank=True, choices=[('REFERENCE', 'Reference'), ('AMOUNT_DATE', 'Amount and date')], max_length=12)),
+                ('ledger_id', models.BigIntegerField(blank=True, null=True)),
+                ('statement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='reconciliation.bankstatement')),
+            ],
+            options={
+                'db_table': 'bank_statement_lines',
+                'ordering': ['statement', 'line_number'],
+                'indexes': [models.Index(fields=['statement', 'status'], name='bank_statem_stateme_b5bf21_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='statementline',
+            constraint=models.UniqueConstraint(fields=('statement', 'line_number'), name='unique_statement_line'),
+        ),
+        migrations.AddConstraint(
+            model_name='statementline',
+            constraint=models.UniqueConstraint(condition=models.Q(('ledger_id__isnull', False)), fields=('direction', 'ledger_id'), name='unique_statement_line_ledger_match'),
+        ),
+    ]
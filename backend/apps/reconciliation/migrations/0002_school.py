@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0001_initial'),
+        ('reconciliation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bankstatement',
+            name='school',
+            field=models.ForeignKey(default=1, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='bank_statements', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='bankstatement',
+            index=models.Index(fields=['school', 'created_at'], name='bank_statem_school__6ecb30_idx'),
+        ),
+    ]
@@ -0,0 +1,91 @@
+"""
+Reconciliation Models - Bank/UPI statements matched against the ledger
+"""
+from django.db import models
+from django.db.models import Q
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class BankStatement(models.Model):
+    """One imported statement file"""
+    
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='bank_statements', editable=False)
+    name = models.CharField(max_length=200)
+    account_name = models.CharField(max_length=200, blank=True)
+    start_date = models.DateField(null=True, blank=True)  # first and last line dates
+    end_date = models.DateField(null=True, blank=True)
+    line_count = models.PositiveIntegerField(default=0)
+    matched_count = models.PositiveIntegerField(default=0)
+    credit_total = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    debit_total = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    
+    uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='bank_statements')
+    created_at = models.DateTimeField(auto_now_add=True)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'bank_statements'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['school', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.start_date} - {self.end_date})"
+
+
+class StatementLine(models.Model):
+    """A statement line and the ledger row it was matched with
+
+    Credits match incomes and debits match paid expenses. ``ledger_id`` is
+    the id of that Income/Expense; ids are kept when a year is archived, so
+    matches stay valid for archived rows too.
+    """
+    
+    DIRECTION_CHOICES = [
+        ('CREDIT', 'Credit'),
+        ('DEBIT', 'Debit'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('UNMATCHED', 'Unmatched'),
+        ('MATCHED', 'Matched'),
+    ]
+    
+    RULE_CHOICES = [
+        ('REFERENCE', 'Reference'),
+        ('AMOUNT_DATE', 'Amount and date'),
+    ]
+    
+    statement = models.ForeignKey(BankStatement, on_delete=models.CASCADE, related_name='lines')
+    line_number = models.PositiveIntegerField()  # row in the file
+    date = models.DateField()
+    description = models.CharField(max_length=255, blank=True)
+    reference_id = models.CharField(max_length=100, blank=True)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)  # always positive
+    direction = models.CharField(max_length=6, choices=DIRECTION_CHOICES)
+    
+    # Match
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='UNMATCHED')
+    match_rule = models.CharField(max_length=12, choices=RULE_CHOICES, blank=True)
+    ledger_id = models.BigIntegerField(null=True, blank=True)  # Income (credit) or Expense (debit) id
+    
+    class Meta:
+        db_table = 'bank_statement_lines'
+        ordering = ['statement', 'line_number']
+        constraints = [
+            models.UniqueConstraint(fields=['statement', 'line_number'], name='unique_statement_line'),
+            # A ledger row is matched by one statement line at most
+            models.UniqueConstraint(
+                fields=['direction', 'ledger_id'], condition=Q(ledger_id__isnull=False),
+                name='unique_statement_line_ledger_match'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['statement', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.statement_id}:{self.line_number} {self.direction} ₹{self.amount} ({self.date})"
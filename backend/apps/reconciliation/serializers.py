@@ -0,0 +1,43 @@
+"""
+Reconciliation Serializers
+"""
+from rest_framework import serializers
+from .models import BankStatement, StatementLine
+
+
+class BankStatementSerializer(serializers.ModelSerializer):
+    """Bank Statement Serializer"""
+    uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
+    unmatched_count = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = BankStatement
+        fields = '__all__'
+        read_only_fields = [
+            'start_date', 'end_date', 'line_count', 'matched_count', 'credit_total', 'debit_total',
+            'uploaded_by', 'created_at', 'reconciled_at',
+        ]
+    
+    def get_unmatched_count(self, obj):
+        return obj.line_count - obj.matched_count
+
+
+class StatementUploadSerializer(serializers.Serializer):
+    """Multipart upload of a statement CSV"""
+    file = serializers.FileField()
+    name = serializers.CharField(max_length=200, required=False)
+    account_name = serializers.CharField(max_length=200, required=False, allow_blank=True)
+
+
+class StatementLineSerializer(serializers.ModelSerializer):
+    """Statement Line Serializer (``ledger_kind`` tells which table ``ledger_id`` points to)"""
+    ledger_kind = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = StatementLine
+        exclude = ['statement']
+    
+    def get_ledger_kind(self, obj):
+        if obj.ledger_id is None:
+            return None
+        return 'INCOME' if obj.direction == 'CREDIT' else 'EXPENSE'
@@ -0,0 +1,152 @@
+"""
+Streaming reader for bank/UPI statement CSV files
+
+Rows are decoded and parsed one at a time from the upload, so the file is
+never held in memory as a whole. The header row is found among the first
+lines (banks often put the account details above it) and its columns are
+recognised by their usual names:
+
+- date: ``Date``, ``Txn Date``, ``Value Date``, ...
+- description: ``Description``, ``Narration``, ``Particulars``, ...
+- reference: ``Reference``, ``Ref No``, ``Chq/Ref No``, ``UTR``, ...
+- amounts: one signed ``Amount`` column (negative = debit) or separate
+  ``Debit``/``Withdrawal`` and ``Credit``/``Deposit`` columns
+"""
+import codecs
+import csv
+import datetime
+import re
+from collections import namedtuple
+from functools import lru_cache
+from decimal import Decimal, InvalidOperation
+
+HEADER_ALIASES = {
+    'date': ('date', 'txndate', 'transactiondate', 'valuedate', 'postingdate', 'trandate'),
+    'description': ('description', 'narration', 'particulars', 'remarks', 'details', 'transactiondetails'),
+    'reference': (
+        'reference', 'referenceid', 'refno', 'referenceno', 'referencenumber', 'chqrefno',
+        'chequeno', 'chqno', 'utr', 'utrno', 'transactionid', 'txnid',
+    ),
+    'amount': ('amount', 'transactionamount', 'amountinr'),
+    'debit': ('debit', 'withdrawal', 'withdrawals', 'withdrawalamt', 'withdrawalamount', 'debitamount', 'dr'),
+    'credit': ('credit', 'deposit', 'deposits', 'depositamt', 'depositamount', 'creditamount', 'cr'),
+}
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d/%m/%y', '%d-%m-%y', '%d-%b-%Y', '%d %b %Y', '%d-%b-%y')
+HEADER_SEARCH_ROWS = 30
+
+ParsedLine = namedtuple('ParsedLine', 'line_number date description reference_id amount direction')
+
+
+class StatementError(ValueError):
+    """The file is not a statement we can read; the message says where"""
+
+
+def normalize_header(value):
+    return re.sub(r'[^a-z0-9]', '', value.lower())
+
+
+def find_columns(row):
+    """{field: column index} when ``row`` looks like a header, else None"""
+    names = [normalize_header(value) for value in row]
+    columns = {}
+    for field, aliases in HEADER_ALIASES.items():
+        for index, name in enumerate(names):
+            if name in aliases:
+                columns[field] = index
+                break
+    has_amount = 'amount' in columns or ('debit' in columns and 'credit' in columns)
+    return columns if 'date' in columns and has_amount else None
+
+
+@lru_cache(maxsize=2048)
+def parse_date(value):
+    """Date in any of DATE_FORMATS (cached: a statement repeats the same few hundred dates)"""
+    value = value.strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f'unrecognised date "{value}"')
+
+
+def parse_amount(value):
+    """Signed Decimal from "1,250.00", "(500.00)", "₹ 300 Dr", ...; None when blank"""
+    text = value.strip().upper()
+    if not text or text in ('-', '0', '0.00'):
+        return None
+    sign = 1
+    if text.startswith('(') and text.endswith(')'):
+        sign, text = -1, text[1:-1]
+    if text.endswith('DR'):
+        sign, text = -1, text[:-2]
+    elif text.endswith('CR'):
+        text = text[:-2]
+    text = re.sub(r'[^0-9.\-]', '', text)
+    try:
+        return sign * Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f'unrecognised amount "{value}"')
+
+
+def cell(row, columns, field):
+    index = columns.get(field)
+    return row[index] if index is not None and index < len(row) else ''
+
+
+def read_statement(chunks, encoding='utf-8-sig'):
+    """Yield a ParsedLine per transaction row of a statement given as byte chunks
+
+    Blank rows and rows without an amount (opening balance lines and the like)
+    are skipped. Raises StatementError for a missing header or an unreadable row.
+    """
+    lines = codecs.iterdecode(chunks, encoding)
+    reader = csv.reader(line_splitter(lines))
+    columns = None
+    for row in reader:
+        if not any(value.strip() for value in row):
+            continue
+        if columns is None:
+            columns = find_columns(row)
+            if columns is None and reader.line_num >= HEADER_SEARCH_ROWS:
+                break
+            continue
+        
+        try:
+            if 'amount' in columns:
+                amount = parse_amount(cell(row, columns, 'amount'))
+            else:
+                debit = parse_amount(cell(row, columns, 'debit'))
+                credit = parse_amount(cell(row, columns, 'credit'))
+                amount = credit if credit else (-abs(debit) if debit else None)
+            if amount is None:
+                continue
+            day = parse_date(cell(row, columns, 'date'))
+        except ValueError as exc:
+            raise StatementError(f'Line {reader.line_num}: {exc}')
+        
+        yield ParsedLine(
+            reader.line_num,
+            day,
+            cell(row, columns, 'description').strip()[:255],
+            cell(row, columns, 'reference').strip()[:100],
+            abs(amount),
+            'CREDIT' if amount > 0 else 'DEBIT',
+        )
+    
+    if columns is None:
+        raise StatementError(
+            'No header row with a date column and an amount (or debit/credit) column was found'
+        )
+
+
+def line_splitter(pieces):
+    """Text lines from text chunks that may end anywhere"""
+    pending = ''
+    for piece in pieces:
+        pending += piece
+        lines = pending.splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(('\n', '\r')) else ''
+        yield from lines
+    if pending:
+        yield pending
@@ -0,0 +1,93 @@
+"""
+Reconciliation Views
+"""
+import time
+
+from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.tenancy import SchoolRequired, TenantScopedMixin
+from .matching import import_statement, rematch_statement, unmatched_ledger
+from .models import BankStatement
+from .serializers import BankStatementSerializer, StatementUploadSerializer, StatementLineSerializer
+from .statements import StatementError, read_statement
+
+
+class BankStatementViewSet(TenantScopedMixin, ConditionalGetMixin, mixins.ListModelMixin,
+                           mixins.RetrieveModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """Bank statements: upload a CSV, see what matched and what did not"""
+    queryset = BankStatement.objects.select_related('uploaded_by')
+    serializer_class = BankStatementSerializer
+    conditional_extra_models = [
+        'reconciliation.StatementLine', 'finance.Income', 'finance.Expense',
+        'archive.ArchivedIncome', 'archive.ArchivedExpense',
+    ]
+    permission_classes = [IsAuthenticated]
+    
+    def forbidden(self, request):
+        if request.user.has_finance_access():
+            return None
+        return Response(
+            {'error': 'You do not have permission to reconcile bank statements'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    def create(self, request, *args, **kwargs):
+        """Import and reconcile a statement CSV (multipart ``file``, optional ``name``, ``account_name``)"""
+        denied = self.forbidden(request)
+        if denied:
+            return denied
+        upload = StatementUploadSerializer(data=request.data)
+        upload.is_valid(raise_exception=True)
+        
+        started = time.perf_counter()
+        statement_file = upload.validated_data['file']
+        try:
+            statement = import_statement(
+                read_statement(statement_file.chunks()),
+                name=upload.validated_data.get('name') or statement_file.name,
+                account_name=upload.validated_data.get('account_name', ''),
+                uploaded_by=request.user,
+            )
+        except (StatementError, UnicodeDecodeError) as exc:
+            return Response({'error': f'Could not read the statement: {exc}'}, status=status.HTTP_400_BAD_REQUEST)
+        except SchoolRequired as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        data = self.get_serializer(statement).data
+        data['took_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return Response(data, status=status.HTTP_201_CREATED)
+    
+    def destroy(self, request, *args, **kwargs):
+        return self.forbidden(request) or super().destroy(request, *args, **kwargs)
+    
+    @action(detail=True, methods=['get'])
+    def lines(self, request, pk=None):
+        """Lines of the statement; ``?status=UNMATCHED`` or ``MATCHED``"""
+        statement = self.get_object()
+        lines = statement.lines.all()
+        if request.query_params.get('status'):
+            lines = lines.filter(status=request.query_params['status'].upper())
+        page = self.paginate_queryset(lines)
+        return self.get_paginated_response(StatementLineSerializer(page, many=True).data)
+    
+    @action(detail=True, methods=['get'], url_path='unmatched-ledger')
+    def unmatched_ledger(self, request, pk=None):
+        """Incomes and paid expenses of the statement period that no statement line matched"""
+        page = self.paginate_queryset(unmatched_ledger(self.get_object()))
+        return self.get_paginated_response(page)
+    
+    @action(detail=True, methods=['post'])
+    def reconcile(self, request, pk=None):
+        """Try the unmatched lines again, e.g. after missing receipts were recorded"""
+        denied = self.forbidden(request)
+        if denied:
+            return denied
+        statement = self.get_object()
+        matched = rematch_statement(statement)
+        data = self.get_serializer(statement).data
+        data['newly_matched'] = matched
+        return Response(data)
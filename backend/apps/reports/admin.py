@@ -0,0 +1,21 @@
+from django.contrib import admin
+from .models import ClosedPeriod, PeriodSnapshot
+
+
+class PeriodSnapshotInline(admin.TabularInline):
+    model = PeriodSnapshot
+    fields = ['kind', 'content_hash', 'created_at']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+
+@admin.register(ClosedPeriod)
+class ClosedPeriodAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'is_stale', 'stale_since', 'closed_by', 'closed_at']
+    list_filter = ['fiscal_year', 'is_stale']
+    readonly_fields = ['fiscal_year', 'month', 'period_key', 'stale_since', 'closed_by', 'closed_at']
+    inlines = [PeriodSnapshotInline]
+    
+    def has_add_permission(self, request):
+        return False  # closing runs the snapshot builders: use the API or close_period
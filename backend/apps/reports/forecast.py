@@ -0,0 +1,302 @@
+"""
+Cash-flow forecast from seasonal baselines of income and paid expenses
+
+History is reduced as it is written: income/expense signals add every
+record to the monthly total of its stream (an income source or an expense
+category, ``CashFlowMonth``) and to the stream's day-of-month profile
+(``CashFlowDay``). A forecast reads those two small tables, never the
+transactions, so its cost grows with the number of months, not records.
+Both tables are kept per school; a school's forecast reads only its rows.
+
+The fit is vectorized over all streams at once:
+
+- seasonal baseline: recency-weighted mean of each calendar month (term
+  fees in April, salaries every month, ...); weights halve every
+  ``HALF_LIFE_YEARS``, months before a stream first appeared are ignored
+- spread: weighted standard deviation around the baseline, for the bands
+- day-of-month profile: when in the month a stream lands (fee due dates,
+  salary day), used for the rest of the current month and for the lowest
+  balance within each month
+"""
+import calendar
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+import numpy as np
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import ExtractDay
+
+from apps.archive.models import ArchivedIncome, ArchivedExpense
+from apps.core import periods, tenancy
+from apps.core.refdata import refdata, INCOME_SOURCE, EXPENSE_CATEGORY
+from apps.events import outbox
+from apps.finance.models import Income, Expense
+from .models import CashFlowMonth, CashFlowDay
+from .queries import money
+
+HALF_LIFE_YEARS = 2
+Z_SCORES = {80: 1.2816, 90: 1.6449, 95: 1.96}
+MAX_MONTHS = 24
+
+
+# Accumulators
+
+def as_date(value):
+    return datetime.date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def income_flow(state):
+    """(kind, school_id, stream_id, period_key, day, amount) counted by an income state, or None"""
+    if not state:
+        return None
+    day = as_date(state['date'])
+    return (
+        'INCOME', state['school_id'], state['income_source_id'],
+        periods.period_key(day), day.day, Decimal(state['amount']),
+    )
+
+
+def expense_flow(state):
+    """Same for expenses; only PAID expenses move cash"""
+    if not state or state['status'] != 'PAID':
+        return None
+    day = as_date(state['date'])
+    return (
+        'EXPENSE', state['school_id'], state['category_id'],
+        periods.period_key(day), day.day, Decimal(state['amount']),
+    )
+
+
+def add_amount(model, delta, **keys):
+    """``amount += delta`` on the row identified by ``keys``, creating it if missing"""
+    rows = model.objects.filter(**keys)
+    if rows.update(amount=F('amount') + delta):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(amount=delta, **keys)
+    except IntegrityError:
+        # Another writer created the row first
+        rows.update(amount=F('amount') + delta)
+
+
+def apply_flow(flow, delta):
+    kind, school_id, stream_id, period_key, day, _ = flow
+    with transaction.atomic():
+        add_amount(CashFlowMonth, delta, kind=kind, school_id=school_id, stream_id=stream_id, period_key=period_key)
+        add_amount(CashFlowDay, delta, kind=kind, school_id=school_id, stream_id=stream_id, day=day)
+    outbox.totals_changed(school_id, kind, period_key)
+
+
+def sync_cash_flow(old, new):
+    """Move a record's contribution from its stored flow to its new flow"""
+    if old == new:
+        return
+    if old and new and old[:5] == new[:5]:
+        # Same school, stream, month and day, only the amount moved
+        apply_flow(new, new[-1] - old[-1])
+        return
+    if old:
+        apply_flow(old, -old[-1])
+    if new:
+        apply_flow(new, new[-1])
+
+
+def record_state(instance):
+    return {name: getattr(instance, name) for name in instance.tracked_fields}
+
+
+def actual_cash_flow():
+    """Recomputed ({(kind, school_id, stream_id, period_key): amount}, {(kind, school_id, stream_id, day): amount})"""
+    months = defaultdict(Decimal)
+    days = defaultdict(Decimal)
+    sources = [
+        ('INCOME', 'income_source_id', Income.objects.all()),
+        ('INCOME', 'income_source_id', ArchivedIncome.objects.all()),
+        ('EXPENSE', 'category_id', Expense.objects.filter(status='PAID')),
+        ('EXPENSE', 'category_id', ArchivedExpense.objects.filter(status='PAID')),
+    ]
+    for kind, stream, queryset in sources:
+        for row in queryset.order_by().values('school_id', stream, 'period_key').annotate(total=Sum('amount')):
+            months[(kind, row['school_id'], row[stream], row['period_key'])] += row['total']
+        by_day = queryset.order_by().annotate(day=ExtractDay('date')).values('school_id', stream, 'day')
+        for row in by_day.annotate(total=Sum('amount')):
+            days[(kind, row['school_id'], row[stream], row['day'])] += row['total']
+    return months, days
+
+
+# Fit
+
+def month_index(key):
+    year, month = divmod(key, 100)
+    return year * 12 + month - 1
+
+
+def index_key(index):
+    return (index // 12) * 100 + index % 12 + 1
+
+
+def load_history(current_key):
+    """Streams, dense (streams, months) totals of the complete months and this month's totals so far
+
+    Without a current school the streams of all schools are added together.
+    """
+    rows = list(
+        tenancy.scoped(CashFlowMonth.objects.filter(period_key__lte=current_key))
+        .values_list('kind', 'stream_id', 'period_key', 'amount')
+    )
+    streams = sorted({(kind, stream_id) for kind, stream_id, _, _ in rows})
+    position = {stream: row for row, stream in enumerate(streams)}
+    current = month_index(current_key)
+    first = min((month_index(key) for _, _, key, _ in rows if key < current_key), default=current)
+    
+    totals = np.zeros((len(streams), current - first))
+    to_date = np.zeros(len(streams))
+    for kind, stream_id, key, amount in rows:
+        index = month_index(key)
+        if index < current:
+            totals[position[(kind, stream_id)], index - first] += float(amount)
+        else:
+            to_date[position[(kind, stream_id)]] += float(amount)
+    return streams, totals, to_date, first
+
+
+def fit(totals, first_index, half_life=HALF_LIFE_YEARS):
+    """Seasonal baseline and spread, both (streams, 12) indexed by calendar month (0 = January)"""
+    count, months = totals.shape
+    if not months:
+        return np.zeros((count, 12)), np.zeros((count, 12))
+    
+    index = first_index + np.arange(months)
+    weights = 0.5 ** ((index[-1] - index) / 12 / half_life)
+    indicator = np.zeros((months, 12))
+    indicator[np.arange(months), index % 12] = 1
+    
+    # Ignore the months before a stream's first non-zero month
+    started = np.argmax(totals != 0, axis=1)
+    active = np.arange(months)[None, :] >= started[:, None]
+    weighted = active * weights[None, :]
+    
+    weight_sum = weighted @ indicator
+    observed = weight_sum > 0
+    mean = np.divide((totals * weighted) @ indicator, weight_sum, out=np.zeros((count, 12)), where=observed)
+    second = np.divide((totals ** 2 * weighted) @ indicator, weight_sum, out=np.zeros((count, 12)), where=observed)
+    variance = np.maximum(second - mean ** 2, 0)
+    
+    # Calendar months seen fewer than twice fall back to the stream's overall mean / variance
+    total_weight = np.maximum(weighted.sum(axis=1), 1e-12)
+    overall_mean = (totals * weighted).sum(axis=1) / total_weight
+    overall_variance = np.maximum((totals ** 2 * weighted).sum(axis=1) / total_weight - overall_mean ** 2, 0)
+    seen = active.astype(float) @ indicator
+    mean = np.where(seen > 0, mean, overall_mean[:, None])
+    variance = np.where(seen > 1, variance, overall_variance[:, None])
+    return mean, np.sqrt(variance)
+
+
+def day_profiles(streams):
+    """(streams, 31) share of each stream's amount landing on each day of the month"""
+    position = {stream: row for row, stream in enumerate(streams)}
+    profile = np.zeros((len(streams), 31))
+    for kind, stream_id, day, amount in tenancy.scoped(CashFlowDay.objects.all()).values_list(
+        'kind', 'stream_id', 'day', 'amount'
+    ):
+        row = position.get((kind, stream_id))
+        if row is not None:
+            profile[row, day - 1] += float(amount)
+    
+    totals = profile.sum(axis=1, keepdims=True)
+    return np.where(totals > 0, profile / np.where(totals > 0, totals, 1), 1 / 31)
+
+
+def month_shares(profile, days):
+    """Profile of a month with ``days`` days: days 29-31 fold into its last day"""
+    shares = profile[:, :days].copy()
+    shares[:, -1] += profile[:, days:].sum(axis=1)
+    return shares
+
+
+# Forecast
+
+def recorded_balance(before_key):
+    """Income minus paid expenses recorded before a period"""
+    totals = dict(
+        tenancy.scoped(CashFlowMonth.objects.filter(period_key__lt=before_key))
+        .order_by().values_list('kind').annotate(total=Sum('amount'))
+    )
+    return totals.get('INCOME', Decimal('0')) - totals.get('EXPENSE', Decimal('0'))
+
+
+def cash_forecast(today, months=6, confidence=80, opening_balance=None):
+    """Projected inflow, outflow and balance with bands for ``months`` months from today's month"""
+    current_key = periods.period_key(today)
+    streams, totals, to_date, first = load_history(current_key)
+    mean, spread = fit(totals, first)
+    profile = day_profiles(streams)
+    sign = np.array([1.0 if kind == 'INCOME' else -1.0 for kind, _ in streams])
+    
+    horizon = month_index(current_key) + np.arange(months)
+    expected = mean[:, horizon % 12]
+    deviation = spread[:, horizon % 12]
+    
+    # This month: what is recorded so far plus the part of the baseline still to come
+    this_month = month_shares(profile, calendar.monthrange(today.year, today.month)[1])
+    remaining = 1 - this_month[:, :today.day].sum(axis=1)
+    expected[:, 0] = to_date + mean[:, horizon[0] % 12] * remaining
+    deviation[:, 0] *= remaining
+    
+    inflow = (expected * (sign > 0)[:, None]).sum(axis=0)
+    outflow = (expected * (sign < 0)[:, None]).sum(axis=0)
+    net = inflow - outflow
+    if opening_balance is None:
+        opening_balance = recorded_balance(current_key)
+    closing = float(opening_balance) + np.cumsum(net)
+    band = Z_SCORES[confidence] * np.sqrt(np.cumsum((deviation ** 2).sum(axis=0)))
+    
+    # Lowest balance inside each month, following the streams' day-of-month profiles
+    lowest = np.empty(months)
+    today_balance = float(opening_balance) + float(sign @ to_date)
+    upcoming = (sign * mean[:, horizon[0] % 12]) @ this_month[:, today.day:]
+    lowest[0] = (today_balance + np.cumsum(upcoming)).min(initial=today_balance)
+    for month in range(1, months):
+        year, number = divmod(horizon[month], 12)
+        shares = month_shares(profile, calendar.monthrange(year, number + 1)[1])
+        daily = (sign * expected[:, month]) @ shares
+        lowest[month] = (closing[month - 1] + np.cumsum(daily)).min(initial=closing[month - 1])
+    
+    rows = []
+    for month in range(months):
+        key = index_key(horizon[month])
+        rows.append({
+            'period': f'{key // 100}-{key % 100:02d}',
+            'income': money(inflow[month]),
+            'expenses': money(outflow[month]),
+            'net': money(net[month]),
+            'closing_balance': money(closing[month]),
+            'balance_low': money(closing[month] - band[month]),
+            'balance_high': money(closing[month] + band[month]),
+            'lowest_balance': money(lowest[month]),
+        })
+    
+    projected = expected.sum(axis=1)
+    return {
+        'as_of': today.isoformat(),
+        'opening_balance': Decimal(opening_balance).quantize(Decimal('0.01')),
+        'confidence': confidence,
+        'history_months': totals.shape[1],
+        'months': rows,
+        'income_streams': stream_rows(streams, projected, 'INCOME', 'income_source', INCOME_SOURCE),
+        'expense_streams': stream_rows(streams, projected, 'EXPENSE', 'category', EXPENSE_CATEGORY),
+    }
+
+
+def stream_rows(streams, projected, kind, name, label):
+    """Projected totals over the horizon of one kind of stream, largest first"""
+    rows = [
+        {f'{name}_id': stream_id, name: refdata.name(label, stream_id), 'projected': money(projected[row])}
+        for row, (stream_kind, stream_id) in enumerate(streams)
+        if stream_kind == kind
+    ]
+    rows.sort(key=lambda row: -row['projected'])
+    return rows
@@ -0,0 +1,60 @@
+"""
+Close a financial year or month, freezing its report figures
+
+Usage:
+    python manage.py close_period 2024-25
+    python manage.py close_period 2024-25 --month 5
+    python manage.py close_period 2024-25 --reopen
+    python manage.py close_period 2024-25 --school DPS    # deployments of several schools
+"""
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import periods, tenancy
+from apps.reports.models import ClosedPeriod
+from apps.reports.snapshots import close_period, reopen_period
+
+
+class Command(BaseCommand):
+    help = 'Snapshot budget-vs-actual, department and category reports of a closed period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('financial_year', help='e.g. 2024-25')
+        parser.add_argument('--month', type=int, help='Close a single calendar month (1-12)')
+        parser.add_argument('--reopen', action='store_true', help='Drop the snapshots of a closed period')
+        parser.add_argument('--school', metavar='CODE', help='School whose period to close or reopen')
+
+    def handle(self, *args, **options):
+        school = None
+        if options['school']:
+            school = tenancy.schools.by_code(options['school'])
+            if school is None:
+                raise CommandError(f"Unknown school {options['school']}")
+        with tenancy.school_context(school) if school else nullcontext():
+            self.run(options)
+
+    def run(self, options):
+        try:
+            fiscal_year = periods.parse_financial_year(options['financial_year'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        month = options['month']
+
+        if options['reopen']:
+            closed_period = ClosedPeriod.objects.filter(
+                school_id=tenancy.default_school_id(), fiscal_year=fiscal_year, month=month,
+            ).first()
+            if closed_period is None:
+                raise CommandError('That period is not closed')
+            reopen_period(closed_period)
+            self.stdout.write(self.style.SUCCESS(f'Reopened {closed_period}'))
+            return
+
+        try:
+            closed_period = close_period(fiscal_year, month)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        for snapshot in closed_period.snapshots.all():
+            self.stdout.write(f'  {snapshot.kind:<20} {snapshot.content_hash}')
+        self.stdout.write(self.style.SUCCESS(f'Closed {closed_period}'))
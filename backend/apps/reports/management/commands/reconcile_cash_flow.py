@@ -0,0 +1,55 @@
+"""
+Compare the cash-flow accumulators with the income and paid expenses they summarise
+
+Usage:
+    python manage.py reconcile_cash_flow            # report drift
+    python manage.py reconcile_cash_flow --fix      # repair it
+"""
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.core.models import DataVersion
+from apps.reports.forecast import actual_cash_flow
+from apps.reports.models import CashFlowMonth, CashFlowDay
+
+
+class Command(BaseCommand):
+    help = 'Detect and optionally repair drift in the cash-flow forecast accumulators'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Write the recomputed totals')
+    
+    def handle(self, *args, **options):
+        months, days = actual_cash_flow()
+        drifted = 0
+        for model, key_field, actual in ((CashFlowMonth, 'period_key', months), (CashFlowDay, 'day', days)):
+            stored = {
+                (row.kind, row.school_id, row.stream_id, getattr(row, key_field)): row
+                for row in model.objects.all()
+            }
+            changed = []
+            for key in sorted(stored.keys() | actual.keys()):
+                expected = actual.get(key, Decimal('0'))
+                row = stored.get(key) or model(
+                    kind=key[0], school_id=key[1], stream_id=key[2], **{key_field: key[3]}
+                )
+                if row.amount == expected:
+                    continue
+                self.stdout.write(
+                    f'{model.__name__} {key[0]} school {key[1]} {key[2]} {key_field} {key[3]}: '
+                    f'counter {row.amount}, actual {expected} (drift {row.amount - expected})'
+                )
+                row.amount = expected
+                changed.append(row)
+            
+            drifted += len(changed)
+            if options['fix'] and changed:
+                with transaction.atomic():
+                    model.objects.bulk_create([row for row in changed if row.pk is None], batch_size=500)
+                    model.objects.bulk_update([row for row in changed if row.pk], ['amount'], batch_size=500)
+                    DataVersion.bump(model._meta.label)
+        
+        verb = 'Fixed' if options['fix'] else 'Found'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {drifted} cash-flow totals with drift.'))
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:30
+
+import apps.core.renderers
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClosedPeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fiscal_year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('period_key', models.PositiveIntegerField(blank=True, editable=False, null=True)),
+                ('is_stale', models.BooleanField(default=False)),
+                ('stale_since', models.DateTimeField(blank=True, null=True)),
+                ('closed_at', models.DateTimeField(auto_now_add=True)),
+                ('closed_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='closed_periods', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'closed_periods',
+                'ordering': ['-fiscal_year', 'month'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PeriodSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('BUDGET_VS_ACTUAL', 'Budget vs Actual'), ('DEPARTMENT_SUMMARY', 'Department Summary'), ('CATEGORY_BREAKDOWN', 'Category Breakdown')], max_length=20)),
+                ('payload', models.JSONField(encoder=apps.core.renderers.ExactJSONEncoder)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('closed_period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='reports.closedperiod')),
+            ],
+            options={
+                'db_table': 'period_snapshots',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='periodsnapshot',
+            constraint=models.UniqueConstraint(fields=('closed_period', 'kind'), name='unique_period_snapshot_kind'),
+        ),
+        migrations.AddConstraint(
+            model_name='closedperiod',
+            constraint=models.UniqueConstraint(condition=models.Q(('month__isnull', True)), fields=('fiscal_year',), name='unique_closed_financial_year'),
+        ),
+        migrations.AddConstraint(
+            model_name='closedperiod',
+            constraint=models.UniqueConstraint(fields=('fiscal_year', 'month'), name='unique_closed_month'),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:50
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import ExtractDay
+
+
+def seed_cash_flow(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    CashFlowMonth = apps.get_model('reports', 'CashFlowMonth')
+    CashFlowDay = apps.get_model('reports', 'CashFlowDay')
+    months = defaultdict(Decimal)
+    days = defaultdict(Decimal)
+    
+    sources = [
+        ('INCOME', 'income_source_id', apps.get_model('finance', 'Income').objects.using(db_alias).all()),
+        ('INCOME', 'income_source_id', apps.get_model('archive', 'ArchivedIncome').objects.using(db_alias).all()),
+        ('EXPENSE', 'category_id', apps.get_model('finance', 'Expense').objects.using(db_alias).filter(status='PAID')),
+        ('EXPENSE', 'category_id', apps.get_model('archive', 'ArchivedExpense').objects.using(db_alias).filter(status='PAID')),
+    ]
+    for kind, stream, queryset in sources:
+        for row in queryset.values(stream, 'period_key').annotate(total=Sum('amount')).order_by():
+            months[(kind, row[stream], row['period_key'])] += row['total']
+        for row in queryset.annotate(day=ExtractDay('date')).values(stream, 'day').annotate(total=Sum('amount')).order_by():
+            days[(kind, row[stream], row['day'])] += row['total']
+    
+    CashFlowMonth.objects.using(db_alias).bulk_create([
+        CashFlowMonth(kind=kind, stream_id=stream_id, period_key=period_key, amount=amount)
+        for (kind, stream_id, period_key), amount in months.items()
+    ], batch_size=500)
+    CashFlowDay.objects.using(db_alias).bulk_create([
+        CashFlowDay(kind=kind, stream_id=stream_id, day=day, amount=amount)
+        for (kind, stream_id, day), amount in days.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+        ('archive', '0002_receipt_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CashFlowDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('INCOME', 'Income'), ('EXPENSE', 'Expense')], max_length=7)),
+                ('stream_id', models.PositiveIntegerField()),
+                ('day', models.PositiveSmallIntegerField()),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+            ],
+            options={
+                'db_table': 'cash_flow_days',
+                'ordering': ['kind', 'stream_id', 'day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CashFlowMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('INCOME', 'Income'), ('EXPENSE', 'Expense')], max_length=7)),
+                ('stream_id', models.PositiveIntegerField()),
+                ('period_key', models.PositiveIntegerField()),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+            ],
+            options={
+                'db_table': 'cash_flow_months',
+                'ordering': ['period_key', 'kind', 'stream_id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='cashflowmonth',
+            constraint=models.UniqueConstraint(fields=('kind', 'stream_id', 'period_key'), name='unique_cash_flow_month'),
+        ),
+        migrations.AddConstraint(
+            model_name='cashflowday',
+            constraint=models.UniqueConstraint(fields=('kind', 'stream_id', 'day'), name='unique_cash_flow_day'),
+        ),
+        migrations.RunPython(seed_cash_flow, migrations.RunPython.noop),
+    ]
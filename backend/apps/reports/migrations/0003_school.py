@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0001_initial'),
+        ('reports', '0002_cash_flow'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='cashflowday',
+            name='unique_cash_flow_day',
+        ),
+        migrations.RemoveConstraint(
+            model_name='cashflowmonth',
+            name='unique_cash_flow_month',
+        ),
+        migrations.AddField(
+            model_name='cashflowday',
+            name='school',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='cashflowmonth',
+            name='school',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AddConstraint(
+            model_name='cashflowday',
+            constraint=models.UniqueConstraint(fields=('school', 'kind', 'stream_id', 'day'), name='unique_cash_flow_day'),
+        ),
+        migrations.AddConstraint(
+            model_name='cashflowmonth',
+            constraint=models.UniqueConstraint(fields=('school', 'kind', 'stream_id', 'period_key'), name='unique_cash_flow_month'),
+        ),
+    ]
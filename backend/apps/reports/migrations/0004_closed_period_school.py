@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:54
+
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def flag_shared_closes(apps, schema_editor):
+    """Closes made before schools closed their own periods now belong to the first school
+
+    Their snapshots add up every school of the database, so with several
+    schools they are flagged stale: reopen and close the period again.
+    """
+    db_alias = schema_editor.connection.alias
+    School = apps.get_model('schools', 'School')
+    ClosedPeriod = apps.get_model('reports', 'ClosedPeriod')
+    if School.objects.using(db_alias).count() > 1:
+        ClosedPeriod.objects.using(db_alias).filter(is_stale=False).update(is_stale=True, stale_since=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0001_initial'),
+        ('reports', '0003_school'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='closedperiod',
+            name='unique_closed_financial_year',
+        ),
+        migrations.RemoveConstraint(
+            model_name='closedperiod',
+            name='unique_closed_month',
+        ),
+        migrations.AddField(
+            model_name='closedperiod',
+            name='school',
+            field=models.ForeignKey(default=1, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='closed_periods', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AddConstraint(
+            model_name='closedperiod',
+            constraint=models.UniqueConstraint(condition=models.Q(('month__isnull', True)), fields=('school', 'fiscal_year'), name='unique_closed_financial_year'),
+        ),
+        migrations.AddConstraint(
+            model_name='closedperiod',
+            constraint=models.UniqueConstraint(fields=('school', 'fiscal_year', 'month'), name='unique_closed_month'),
+        ),
+        migrations.RunPython(flag_shared_closes, migrations.RunPython.noop),
+    ]
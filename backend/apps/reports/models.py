@@ -1,4 +1,142 @@
 """
-Reports app does not have models.
-All reports are computed from existing data.
+Reports Models - Period-close snapshots and cash-flow accumulators
+
+Reports are computed from existing data. Once a school closes a financial
+year or month its figures are frozen here and served from the snapshot. Cash-flow
+totals per stream are kept current by signals for the forecast.
 """
+from django.db import models
+from django.db.models import Q
+from django.contrib.auth import get_user_model
+from apps.core import periods
+from apps.core.tenancy import assign_school
+from apps.core.renderers import ExactJSONEncoder
+
+User = get_user_model()
+
+
+class ClosedPeriod(models.Model):
+    """A financial year (month is null) or a single month a school closed"""
+
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='closed_periods', editable=False)
+    fiscal_year = models.PositiveSmallIntegerField()  # e.g. 2024 for "2024-25"
+    month = models.PositiveSmallIntegerField(null=True, blank=True)  # 1-12 for a monthly close
+    period_key = models.PositiveIntegerField(null=True, blank=True, editable=False)  # YYYYMM
+
+    # Changes recorded after the close (outside the API) flag the snapshot stale
+    is_stale = models.BooleanField(default=False)
+    stale_since = models.DateTimeField(null=True, blank=True)
+
+    closed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='closed_periods')
+    closed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'closed_periods'
+        ordering = ['-fiscal_year', 'month']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['school', 'fiscal_year'],
+                condition=Q(month__isnull=True),
+                name='unique_closed_financial_year'
+            ),
+            models.UniqueConstraint(fields=['school', 'fiscal_year', 'month'], name='unique_closed_month'),
+        ]
+
+    def __str__(self):
+        label = periods.financial_year_label(self.fiscal_year)
+        return f"FY {label}" + (f" - Month {self.month}" if self.month else "")
+
+    def save(self, *args, **kwargs):
+        self.period_key = periods.month_period_key(self.fiscal_year, self.month) if self.month else None
+        assign_school(self)
+        super().save(*args, **kwargs)
+
+    def get_date_range(self):
+        """Return (start_date, end_date) of the closed period, end exclusive"""
+        if self.month:
+            return periods.period_bounds(self.period_key)
+        return periods.fiscal_year_bounds(self.fiscal_year)
+
+    @classmethod
+    def covering(cls, school_id, fiscal_year, period_key):
+        """Closes of a school that include the given period: its financial year or the month itself"""
+        return cls.objects.filter(
+            Q(month__isnull=True) | Q(period_key=period_key),
+            school_id=school_id,
+            fiscal_year=fiscal_year,
+        )
+
+    @classmethod
+    def for_date(cls, school_id, day):
+        """The school's close covering ``day``, if any"""
+        return cls.covering(school_id, periods.fiscal_year_of(day), periods.period_key(day)).first()
+
+
+class PeriodSnapshot(models.Model):
+    """Frozen report payload of a closed period"""
+
+    KIND_CHOICES = [
+        ('BUDGET_VS_ACTUAL', 'Budget vs Actual'),
+        ('DEPARTMENT_SUMMARY', 'Department Summary'),
+        ('CATEGORY_BREAKDOWN', 'Category Breakdown'),
+    ]
+
+    closed_period = models.ForeignKey(ClosedPeriod, on_delete=models.CASCADE, related_name='snapshots')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    payload = models.JSONField(encoder=ExactJSONEncoder)
+    content_hash = models.CharField(max_length=64)  # sha256 of the canonical payload
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'period_snapshots'
+        constraints = [
+            models.UniqueConstraint(fields=['closed_period', 'kind'], name='unique_period_snapshot_kind'),
+        ]
+
+    def __str__(self):
+        return f"{self.closed_period} - {self.get_kind_display()}"
+
+
+class CashFlowMonth(models.Model):
+    """Monthly total of one cash stream of a school: an income source or a paid expense category"""
+    
+    KIND_CHOICES = [
+        ('INCOME', 'Income'),
+        ('EXPENSE', 'Expense'),
+    ]
+    
+    school = models.ForeignKey('schools.School', on_delete=models.CASCADE, related_name='+')
+    kind = models.CharField(max_length=7, choices=KIND_CHOICES)
+    stream_id = models.PositiveIntegerField()  # income_source_id or category_id
+    period_key = models.PositiveIntegerField()  # YYYYMM
+    amount = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    
+    class Meta:
+        db_table = 'cash_flow_months'
+        ordering = ['period_key', 'kind', 'stream_id']
+        constraints = [
+            models.UniqueConstraint(fields=['school', 'kind', 'stream_id', 'period_key'], name='unique_cash_flow_month'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} {self.stream_id} - {self.period_key} - ₹{self.amount}"
+
+
+class CashFlowDay(models.Model):
+    """All-time total of one cash stream on a day of the month, its intra-month profile"""
+    
+    school = models.ForeignKey('schools.School', on_delete=models.CASCADE, related_name='+')
+    kind = models.CharField(max_length=7, choices=CashFlowMonth.KIND_CHOICES)
+    stream_id = models.PositiveIntegerField()
+    day = models.PositiveSmallIntegerField()  # 1-31
+    amount = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    
+    class Meta:
+        db_table = 'cash_flow_days'
+        ordering = ['kind', 'stream_id', 'day']
+        constraints = [
+            models.UniqueConstraint(fields=['school', 'kind', 'stream_id', 'day'], name='unique_cash_flow_day'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} {self.stream_id} - day {self.day} - ₹{self.amount}"
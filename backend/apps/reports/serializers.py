@@ -0,0 +1,75 @@
+"""
+Reports Serializers
+"""
+from rest_framework import serializers
+from apps.core import periods
+from .models import ClosedPeriod, PeriodSnapshot
+
+
+class PeriodSnapshotSerializer(serializers.ModelSerializer):
+    """Period Snapshot Serializer (payloads are served by the report endpoints)"""
+    
+    class Meta:
+        model = PeriodSnapshot
+        fields = ['kind', 'content_hash', 'created_at']
+
+
+class ClosedPeriodSerializer(serializers.ModelSerializer):
+    """Closed Period Serializer"""
+    financial_year = serializers.SerializerMethodField()
+    closed_by_name = serializers.CharField(source='closed_by.get_full_name', read_only=True)
+    snapshots = PeriodSnapshotSerializer(many=True, read_only=True)
+    
+    class Meta:
+        model = ClosedPeriod
+        fields = '__all__'
+    
+    def get_financial_year(self, obj):
+        return periods.financial_year_label(obj.fiscal_year)
+
+
+class ProjectionScenarioSerializer(serializers.Serializer):
+    """One payroll projection scenario; rates are annual percentages"""
+    name = serializers.CharField(max_length=100, required=False)
+    increment_pct = serializers.DecimalField(max_digits=5, decimal_places=2, default=0, min_value=-100, max_value=100)
+    attrition_pct = serializers.DecimalField(max_digits=5, decimal_places=2, default=0, min_value=0, max_value=100)
+    hiring_pct = serializers.DecimalField(max_digits=6, decimal_places=2, default=0, min_value=0, max_value=1000)
+    department_increments = serializers.DictField(
+        child=serializers.DecimalField(max_digits=5, decimal_places=2, min_value=-100, max_value=100), required=False
+    )
+    hires = serializers.DictField(
+        child=serializers.DecimalField(max_digits=8, decimal_places=2, min_value=0), required=False
+    )
+    
+    def validate_department_increments(self, value):
+        return self.department_keys(value)
+    
+    def validate_hires(self, value):
+        return self.department_keys(value)
+    
+    def department_keys(self, value):
+        if not all(str(key).isdigit() for key in value):
+            raise serializers.ValidationError('Keys must be department ids')
+        return value
+
+
+class PayrollProjectionSerializer(serializers.Serializer):
+    """Payroll projection request"""
+    MAX_SCENARIOS = 500
+    
+    financial_year = serializers.CharField()
+    department = serializers.IntegerField(required=False)
+    scenarios = ProjectionScenarioSerializer(many=True)
+    
+    def validate_financial_year(self, value):
+        try:
+            return periods.parse_financial_year(value)
+        except ValueError:
+            raise serializers.ValidationError('Use the "2024-25" format')
+    
+    def validate_scenarios(self, value):
+        if not value:
+            raise serializers.ValidationError('At least one scenario is required')
+        if len(value) > self.MAX_SCENARIOS:
+            raise serializers.ValidationError(f'At most {self.MAX_SCENARIOS} scenarios per request')
+        return value
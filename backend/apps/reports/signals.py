@@ -0,0 +1,69 @@
+"""
+Reports Signals - Closed-period flags and cash-flow accumulators
+
+The API rejects edits inside closed periods; admin, shell or script edits
+cannot be stopped there, so they mark the period's snapshots stale instead.
+Every income and paid expense also moves the cash-flow totals the
+forecast reads (see apps.reports.forecast).
+"""
+import logging
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.finance.models import Income, Expense
+from .forecast import income_flow, expense_flow, record_state, sync_cash_flow
+from .snapshots import flag_stale
+
+logger = logging.getLogger(__name__)
+
+
+def record_periods(instance, created=False):
+    """(school_id, fiscal_year, period_key) of the periods a saved or deleted record touches"""
+    touched = {(instance.school_id, instance.fiscal_year, instance.period_key)}
+    stored = instance.stored_state(created) if hasattr(instance, 'stored_state') else None
+    if stored and stored.get('period_key'):
+        touched.add((stored['school_id'], stored['fiscal_year'], stored['period_key']))
+    return touched
+
+
+def flag_changed_periods(instance, created=False):
+    for school_id, fiscal_year, period_key in record_periods(instance, created):
+        if flag_stale(school_id, fiscal_year, period_key):
+            logger.warning(
+                'Closed period changed: %s %s (period %s) - snapshots are stale',
+                instance._meta.verbose_name, instance.pk, period_key
+            )
+
+
+@receiver(post_save, sender=Income, dispatch_uid='reports.closed_period.income_save')
+@receiver(post_save, sender=Expense, dispatch_uid='reports.closed_period.expense_save')
+def flag_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    flag_changed_periods(instance, created)
+
+
+@receiver(post_delete, sender=Income, dispatch_uid='reports.closed_period.income_delete')
+@receiver(post_delete, sender=Expense, dispatch_uid='reports.closed_period.expense_delete')
+def flag_on_delete(sender, instance, **kwargs):
+    flag_changed_periods(instance)
+
+
+CASH_FLOWS = {Income: income_flow, Expense: expense_flow}
+
+
+@receiver(post_save, sender=Income, dispatch_uid='reports.cash_flow.income_save')
+@receiver(post_save, sender=Expense, dispatch_uid='reports.cash_flow.expense_save')
+def update_cash_flow_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    flow = CASH_FLOWS[sender]
+    sync_cash_flow(flow(instance.stored_state(created)), flow(record_state(instance)))
+
+
+@receiver(post_delete, sender=Income, dispatch_uid='reports.cash_flow.income_delete')
+@receiver(post_delete, sender=Expense, dispatch_uid='reports.cash_flow.expense_delete')
+def update_cash_flow_on_delete(sender, instance, **kwargs):
+    flow = CASH_FLOWS[sender]
+    sync_cash_flow(flow(instance.stored_state()), None)
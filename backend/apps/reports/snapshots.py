@@ -0,0 +1,135 @@
+"""
+Period close - freezing report figures of a financial year or month
+
+Each school closes its own periods. Closing locks the school's approved
+budgets of the period and stores its budget-vs-actual, department summary
+and category breakdown payloads in PeriodSnapshot rows. Report views
+serve the school's closed periods from those rows instead of recomputing
+them, and finance serializers refuse edits dated inside them. A request
+for every school at once has no snapshot and is computed live.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.db import router, transaction
+from django.utils import timezone
+
+from apps.core import periods, tenancy
+from apps.core.models import DataVersion
+from apps.core.renderers import ExactJSONEncoder
+from .models import ClosedPeriod, PeriodSnapshot
+from .queries import reportable_budgets, budget_vs_actual_rows, department_summary, expense_breakdown
+
+
+def canonical_json(payload):
+    """Stable serialisation used for content hashes"""
+    return json.dumps(payload, cls=ExactJSONEncoder, sort_keys=True, separators=(',', ':'))
+
+
+def content_hash(payload):
+    return hashlib.sha256(canonical_json(payload).encode('utf-8')).hexdigest()
+
+
+def build_snapshots(closed_period):
+    """``{kind: payload}`` for a closed period, computed from live data of the current school"""
+    start, end = closed_period.get_date_range()
+    last_day = end - timedelta(days=1)
+    filters = {'period_key': closed_period.period_key} if closed_period.month else {}
+    
+    budgets = reportable_budgets(closed_period.fiscal_year, period_key=closed_period.period_key)
+    payloads = {
+        'BUDGET_VS_ACTUAL': budget_vs_actual_rows(budgets),
+        'DEPARTMENT_SUMMARY': department_summary(start, last_day),
+        'CATEGORY_BREAKDOWN': expense_breakdown(closed_period.fiscal_year, **filters),
+    }
+    # Store exactly what the hash covers: Decimals become strings
+    return {kind: json.loads(canonical_json(payload)) for kind, payload in payloads.items()}
+
+
+def close_period(fiscal_year, month=None, user=None):
+    """Lock the current school's budgets of the period and freeze its report figures
+
+    Raises SchoolRequired (a ValueError) when no school is active in a
+    deployment of several.
+    """
+    if month is not None and not 1 <= month <= 12:
+        raise ValueError('Month must be between 1 and 12')
+    school = tenancy.schools.get(tenancy.default_school_id())
+    if school is None:
+        raise tenancy.SchoolRequired('Choose the school whose period to close (X-School header)')
+    
+    # Budgets, ledger rows and departments below are the school's
+    with tenancy.school_context(school), transaction.atomic(using=router.db_for_write(ClosedPeriod)):
+        label = periods.financial_year_label(fiscal_year)
+        closes = ClosedPeriod.objects.filter(school_id=school.pk, fiscal_year=fiscal_year)
+        if closes.filter(month__isnull=True).exists():
+            raise ValueError(f'FY {label} is already closed')
+        if month is not None and closes.filter(month=month).exists():
+            raise ValueError(f'FY {label} - Month {month} is already closed')
+        
+        closed_period = ClosedPeriod.objects.create(
+            school_id=school.pk, fiscal_year=fiscal_year, month=month, closed_by=user,
+        )
+        
+        # Budgets of a closed period are immutable (save() keeps signals and data versions)
+        for budget in reportable_budgets(fiscal_year, period_key=closed_period.period_key).filter(status='APPROVED'):
+            budget.status = 'LOCKED'
+            budget.save()
+        
+        PeriodSnapshot.objects.bulk_create([
+            PeriodSnapshot(
+                closed_period=closed_period,
+                kind=kind,
+                payload=payload,
+                content_hash=content_hash(payload),
+            )
+            for kind, payload in build_snapshots(closed_period).items()
+        ])
+    return closed_period
+
+
+def reopen_period(closed_period):
+    """Drop the snapshots of a school's period so its reports are computed live again
+
+    Budgets stay locked.
+    """
+    with transaction.atomic(using=router.db_for_write(ClosedPeriod, instance=closed_period)):
+        closed_period.delete()
+
+
+def find_snapshot(kind, fiscal_year, month=None):
+    """Snapshot of an exactly matching period the current school closed, or None
+
+    None as well for a request covering every school at once: such figures
+    are never frozen and are computed live.
+    """
+    school_id = tenancy.default_school_id()
+    if school_id is None:
+        return None
+    return PeriodSnapshot.objects.select_related('closed_period').filter(
+        kind=kind,
+        closed_period__school_id=school_id,
+        closed_period__fiscal_year=fiscal_year,
+        closed_period__month=month,
+    ).first()
+
+
+def snapshot_info(snapshot):
+    """Metadata added to report responses served from a snapshot"""
+    closed_period = snapshot.closed_period
+    return {
+        'closed_at': closed_period.closed_at,
+        'content_hash': snapshot.content_hash,
+        'is_stale': closed_period.is_stale,
+    }
+
+
+def flag_stale(school_id, fiscal_year, period_key):
+    """Mark a school's closes covering a period stale after a change recorded outside the API"""
+    flagged = ClosedPeriod.covering(school_id, fiscal_year, period_key).filter(is_stale=False).update(
+        is_stale=True, stale_since=timezone.now()
+    )
+    if flagged:
+        DataVersion.bump(ClosedPeriod._meta.label)  # update() skips the post_save bump
+    return flagged
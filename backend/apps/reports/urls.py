@@ -1,19 +1,31 @@
 """
 Reports URLs
 """
-from django.urls import path
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
 from .views import (
     MonthlyExpenseReportView,
     BudgetVsActualReportView,
     IncomeVsExpenseSummaryView,
     DepartmentFinancialSummaryView,
-    AuditReportView
+    AuditReportView,
+    DashboardView,
+    PayrollProjectionView,
+    CashForecastView,
+    ClosedPeriodViewSet
 )
 
+router = DefaultRouter()
+router.register(r'closed-periods', ClosedPeriodViewSet, basename='closed-period')
+
 urlpatterns = [
     path('monthly-expense/', MonthlyExpenseReportView.as_view(), name='monthly-expense-report'),
     path('budget-vs-actual/', BudgetVsActualReportView.as_view(), name='budget-vs-actual'),
     path('income-vs-expense/', IncomeVsExpenseSummaryView.as_view(), name='income-vs-expense'),
     path('department-summary/', DepartmentFinancialSummaryView.as_view(), name='department-summary'),
     path('audit-download/', AuditReportView.as_view(), name='audit-download'),
+    path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('payroll-projection/', PayrollProjectionView.as_view(), name='payroll-projection'),
+    path('cash-forecast/', CashForecastView.as_view(), name='cash-forecast'),
+    path('', include(router.urls)),
 ]
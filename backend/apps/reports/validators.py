@@ -0,0 +1,47 @@
+"""
+Rejecting changes to closed periods
+"""
+from rest_framework import serializers
+
+from apps.core import periods, tenancy
+from .models import ClosedPeriod
+
+
+def ensure_open(day, school_id, field='date'):
+    """Raise ValidationError when ``day`` falls inside a period the school closed"""
+    closed_period = ClosedPeriod.for_date(school_id, day) if day else None
+    if closed_period is not None:
+        raise serializers.ValidationError({field: f'{closed_period} is closed and cannot be changed'})
+
+
+def ensure_open_budget_period(school_id, fiscal_year, month=None, field='financial_year'):
+    """Same check for a budget's financial year / month"""
+    closes = ClosedPeriod.objects.filter(school_id=school_id, fiscal_year=fiscal_year)
+    if month:
+        closes = ClosedPeriod.covering(school_id, fiscal_year, periods.month_period_key(fiscal_year, month))
+    closed_period = closes.first()
+    if closed_period is not None:
+        raise serializers.ValidationError({field: f'{closed_period} is closed and cannot be changed'})
+
+
+class OpenPeriodSerializerMixin:
+    """Rejects creating, moving or editing dated records inside a period their school closed"""
+    period_date_field = 'date'
+    
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        field = self.period_date_field
+        if self.instance is not None:
+            ensure_open(getattr(self.instance, field), self.instance.school_id, field)
+        if field in attrs or 'department' in attrs:
+            ensure_open(attrs.get(field, getattr(self.instance, field, None)), self.school_id(attrs), field)
+        return attrs
+    
+    def school_id(self, attrs):
+        """School the record will be saved under: its department's, else its own or the current one"""
+        department = attrs.get('department', getattr(self.instance, 'department', None))
+        if department is not None:
+            return department.school_id
+        if self.instance is not None:
+            return self.instance.school_id
+        return tenancy.default_school_id()
@@ -1,19 +1,63 @@
 """
 Financial Reports Views - Analytics Engine
 """
+import csv
+import hashlib
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils import timezone
+from django.core.cache import cache
+from rest_framework import mixins, status, viewsets
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Sum, Q
-from datetime import datetime
+from django.db.models import Sum
+from datetime import datetime, timedelta
+from decimal import Decimal
 from apps.finance.models import Income, Expense
 from apps.budget.models import Budget
-from apps.departments.models import Department
+from apps.archive.ledger import ledger, ledger_total, ledger_rows
+from apps.core import periods, singleflight, tenancy
+from apps.core.admission import AdmissionControlMixin
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.files import PassthroughRenderer, cached_export, serve_file
+from apps.core.models import DataVersion
+from apps.core.refdata import refdata, DEPARTMENT, INCOME_SOURCE, EXPENSE_CATEGORY
+from apps.core.renderers import FastJSONRenderer
+from apps.core.storage import export_storage
+from apps.core.tenancy import TenantScopedMixin
+from .forecast import MAX_MONTHS, Z_SCORES, cash_forecast
+from .models import ClosedPeriod
+from .queries import (
+    reportable_budgets, budget_vs_actual_rows, department_summary, expense_breakdown, named_breakdown,
+    payroll_projection,
+)
+from .serializers import ClosedPeriodSerializer, PayrollProjectionSerializer
+from .snapshots import close_period, reopen_period, find_snapshot, snapshot_info
+
+EXPENSE_MODELS = [
+    'finance.Expense', 'archive.ArchivedExpense', 'finance.ExpenseCategory', 'departments.Department',
+]
+LEDGER_MODELS = ['finance.Income', 'archive.ArchivedIncome', 'finance.IncomeSource'] + EXPENSE_MODELS
+SNAPSHOT_MODELS = ['reports.ClosedPeriod', 'reports.PeriodSnapshot']
+
+
+def shared_report(view, name, params, compute):
+    """``compute()``, shared with concurrent requests for the same report, parameters, school and data
 
+    ``params`` must be normalized (parsed dates and numbers) so equivalent
+    requests meet; the data versions come from ConditionalGetMixin.
+    """
+    versions = sorted(getattr(view, 'data_versions', {}).items())
+    return singleflight.run(f'reports-{name}', (params, tenancy.current_school_id(), versions), compute)
 
-class MonthlyExpenseReportView(APIView):
+
+class MonthlyExpenseReportView(ConditionalGetMixin, APIView):
     """Monthly Expense Report - Department-wise and Category-wise breakdown"""
     permission_classes = [IsAuthenticated]
+    conditional_models = EXPENSE_MODELS + SNAPSHOT_MODELS
     
     def get(self, request):
         month = request.query_params.get('month')
@@ -22,38 +66,28 @@ class MonthlyExpenseReportView(APIView):
         if not month or not year:
             return Response({'error': 'Month and year parameters are required'}, status=400)
         
-        # Get expenses for the month
-        expenses = Expense.objects.filter(
-            date__month=month,
-            date__year=year,
-            status='PAID'
-        )
-        
-        # Department-wise breakdown
-        dept_summary = expenses.values('department__name').annotate(
-            total=Sum('amount')
-        ).order_by('-total')
-        
-        # Category-wise breakdown
-        category_summary = expenses.values('category__name', 'category__category_type').annotate(
-            total=Sum('amount')
-        ).order_by('-total')
+        try:
+            key = int(year) * 100 + int(month)
+        except ValueError:
+            return Response({'error': 'Month and year must be numbers'}, status=400)
         
-        # Total expenses
-        total_expenses = expenses.aggregate(total=Sum('amount'))['total'] or 0
+        fiscal_year = periods.fiscal_year_of_key(key)
+        snapshot = find_snapshot('CATEGORY_BREAKDOWN', fiscal_year, int(month))
+        if snapshot is not None:
+            return Response({'month': month, 'year': year, **snapshot.payload, 'snapshot': snapshot_info(snapshot)})
         
+        # Paid expenses of the month (status, period_key index), archive included
         return Response({
             'month': month,
             'year': year,
-            'total_expenses': float(total_expenses),
-            'department_breakdown': list(dept_summary),
-            'category_breakdown': list(category_summary),
+            **expense_breakdown(fiscal_year, period_key=key),
         })
 
 
-class BudgetVsActualReportView(APIView):
+class BudgetVsActualReportView(ConditionalGetMixin, APIView):
     """Budget vs Actual Report - Variance Analysis"""
     permission_classes = [IsAuthenticated]
+    conditional_models = ['budget.Budget'] + EXPENSE_MODELS + SNAPSHOT_MODELS
     
     def get(self, request):
         financial_year = request.query_params.get('financial_year')
@@ -62,43 +96,43 @@ class BudgetVsActualReportView(APIView):
         if not financial_year:
             return Response({'error': 'Financial year parameter is required'}, status=400)
         
-        # Query budgets
-        budgets = Budget.objects.filter(
-            financial_year=financial_year,
-            status__in=['APPROVED', 'LOCKED']
-        )
-        
-        if department_id:
-            budgets = budgets.filter(department_id=department_id)
+        try:
+            fiscal_year = periods.parse_financial_year(financial_year)
+        except ValueError:
+            return Response({'error': 'Invalid financial_year'}, status=400)
+        try:
+            department_id = int(department_id) if department_id else None
+        except ValueError:
+            return Response({'error': 'department must be a number'}, status=400)
         
-        # Calculate budget vs actual
-        report_data = []
-        for budget in budgets:
-            spent = budget.get_spent_amount()
-            allocated = float(budget.allocated_amount)
-            variance = allocated - spent
-            variance_percentage = (variance / allocated * 100) if allocated > 0 else 0
-            
-            report_data.append({
-                'department': budget.department.name,
-                'period': f"FY {budget.financial_year}" + (f" - Month {budget.month}" if budget.month else ""),
-                'allocated_budget': allocated,
-                'actual_spent': spent,
-                'variance': variance,
-                'variance_percentage': round(variance_percentage, 2),
-                'utilization_percentage': round(budget.get_utilization_percentage(), 2),
-                'status': 'Over Budget' if variance < 0 else 'Under Budget'
+        # Closed years are served from their frozen snapshot
+        snapshot = find_snapshot('BUDGET_VS_ACTUAL', fiscal_year)
+        if snapshot is not None:
+            report_data = snapshot.payload
+            if department_id:
+                report_data = [row for row in report_data if row['department_id'] == department_id]
+            return Response({
+                'financial_year': financial_year,
+                'budgets': report_data,
+                'snapshot': snapshot_info(snapshot),
             })
         
+        # Calculate budget vs actual, once for concurrent identical requests
+        rows = shared_report(
+            self, 'budget-vs-actual', (fiscal_year, department_id),
+            lambda: budget_vs_actual_rows(reportable_budgets(fiscal_year, department_id=department_id)),
+        )
+        
         return Response({
             'financial_year': financial_year,
-            'budgets': report_data,
+            'budgets': rows,
         })
 
 
-class IncomeVsExpenseSummaryView(APIView):
+class IncomeVsExpenseSummaryView(AdmissionControlMixin, ConditionalGetMixin, APIView):
     """Income vs Expense Summary - Financial Health"""
     permission_classes = [IsAuthenticated]
+    conditional_models = LEDGER_MODELS
     
     def get(self, request):
         start_date = request.query_params.get('start_date')
@@ -107,54 +141,51 @@ class IncomeVsExpenseSummaryView(APIView):
         if not start_date or not end_date:
             return Response({'error': 'start_date and end_date parameters are required'}, status=400)
         
-        # Total income
-        total_income = Income.objects.filter(
-            date__gte=start_date,
-            date__lte=end_date
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        # Total expenses
-        total_expenses = Expense.objects.filter(
-            date__gte=start_date,
-            date__lte=end_date,
-            status='PAID'
-        ).aggregate(total=Sum('amount'))['total'] or 0
+        try:
+            start = datetime.strptime(start_date, '%Y-%m-%d').date()
+            end = datetime.strptime(end_date, '%Y-%m-%d').date()
+        except ValueError:
+            return Response({'error': 'Dates must be in YYYY-MM-DD format'}, status=400)
         
-        # Calculate surplus/deficit
-        balance = float(total_income) - float(total_expenses)
-        
-        # Income breakdown by source
-        income_breakdown = Income.objects.filter(
-            date__gte=start_date,
-            date__lte=end_date
-        ).values('income_source__name').annotate(total=Sum('amount')).order_by('-total')
-        
-        # Expense breakdown by category
-        expense_breakdown = Expense.objects.filter(
-            date__gte=start_date,
-            date__lte=end_date,
-            status='PAID'
-        ).values('category__name').annotate(total=Sum('amount')).order_by('-total')
+        # Month-end crowds ask for the same period at once: compute it once
+        summary = shared_report(self, 'income-vs-expense', (start, end), lambda: self.summarize(start, end))
         
         return Response({
             'period': {
                 'start_date': start_date,
                 'end_date': end_date,
             },
+            **summary,
+        })
+    
+    def summarize(self, start, end):
+        incomes = ledger(Income, start, end)
+        expenses = ledger(Expense, start, end, status='PAID')
+        
+        # Totals
+        total_income = ledger_total(incomes)
+        total_expenses = ledger_total(expenses)
+        
+        # Calculate surplus/deficit
+        balance = total_income - total_expenses
+        
+        return {
             'summary': {
-                'total_income': float(total_income),
-                'total_expenses': float(total_expenses),
+                'total_income': total_income,
+                'total_expenses': total_expenses,
                 'balance': balance,
                 'status': 'Surplus' if balance >= 0 else 'Deficit'
             },
-            'income_breakdown': list(income_breakdown),
-            'expense_breakdown': list(expense_breakdown),
-        })
+            # Breakdowns by income source and expense category
+            'income_breakdown': named_breakdown(incomes, 'income_source', INCOME_SOURCE),
+            'expense_breakdown': named_breakdown(expenses, 'category', EXPENSE_CATEGORY),
+        }
 
 
-class DepartmentFinancialSummaryView(APIView):
+class DepartmentFinancialSummaryView(AdmissionControlMixin, ConditionalGetMixin, APIView):
     """Department-wise Financial Summary"""
     permission_classes = [IsAuthenticated]
+    conditional_models = LEDGER_MODELS + SNAPSHOT_MODELS
     
     def get(self, request):
         start_date = request.query_params.get('start_date')
@@ -163,74 +194,375 @@ class DepartmentFinancialSummaryView(APIView):
         if not start_date or not end_date:
             return Response({'error': 'start_date and end_date parameters are required'}, status=400)
         
-        departments = Department.objects.filter(is_active=True)
-        
-        summary = []
-        for dept in departments:
-            # Department income
-            dept_income = Income.objects.filter(
-                department=dept,
-                date__gte=start_date,
-                date__lte=end_date
-            ).aggregate(total=Sum('amount'))['total'] or 0
-            
-            # Department expenses
-            dept_expenses = Expense.objects.filter(
-                department=dept,
-                date__gte=start_date,
-                date__lte=end_date,
-                status='PAID'
-            ).aggregate(total=Sum('amount'))['total'] or 0
-            
-            summary.append({
-                'department': dept.name,
-                'income': float(dept_income),
-                'expenses': float(dept_expenses),
-                'net': float(dept_income) - float(dept_expenses),
+        snapshot = self.find_period_snapshot(start_date, end_date)
+        if snapshot is not None:
+            return Response({
+                'period': {'start_date': start_date, 'end_date': end_date},
+                'departments': snapshot.payload,
+                'snapshot': snapshot_info(snapshot),
             })
         
         return Response({
             'period': {'start_date': start_date, 'end_date': end_date},
-            'departments': summary
+            'departments': department_summary(start_date, end_date)
         })
+    
+    def find_period_snapshot(self, start_date, end_date):
+        """Snapshot of a closed year or month whose bounds match the requested range exactly"""
+        try:
+            start = datetime.strptime(start_date, '%Y-%m-%d').date()
+            end = datetime.strptime(end_date, '%Y-%m-%d').date()
+        except ValueError:
+            return None
+        
+        fiscal_year = periods.fiscal_year_of(start)
+        key = periods.period_key(start)
+        if (start, end + timedelta(days=1)) == periods.fiscal_year_bounds(fiscal_year):
+            return find_snapshot('DEPARTMENT_SUMMARY', fiscal_year)
+        if (start, end + timedelta(days=1)) == periods.period_bounds(key):
+            return find_snapshot('DEPARTMENT_SUMMARY', fiscal_year, start.month)
+        return None
 
 
-class AuditReportView(APIView):
+class AuditReportView(AdmissionControlMixin, ConditionalGetMixin, APIView):
     """View to generate a consolidated audit report data"""
     permission_classes = [IsAuthenticated]
+    conditional_models = LEDGER_MODELS
+    admission_cost = 2  # also writes the export file
+    conditional_get = False  # serve_file() sets validators for the CSV itself
+    renderer_classes = [FastJSONRenderer, PassthroughRenderer]
     
     def get(self, request):
         # In a real app, this might generate a PDF or Excel
-        # For now, we return a consolidated JSON that the frontend can format
+        # For now, we return a consolidated CSV that the frontend can download
         start_date = request.query_params.get('start_date', '2024-01-01')
         end_date = request.query_params.get('end_date', '2024-12-31')
         
+        # The file is regenerated only when the ledger changes; ranges and
+        # proxy offload then come from serve_file()
+        versions = sorted(DataVersion.current(self.get_conditional_models()).items())
+        params_key = hashlib.sha1(
+            repr((start_date, end_date, tenancy.current_school_id())).encode()
+        ).hexdigest()[:16]
+        versions_key = hashlib.sha1(repr(versions).encode()).hexdigest()[:16]
+        storage = export_storage()
+        name = cached_export(
+            storage,
+            f'audit/{params_key}-{versions_key}.csv',
+            lambda handle: self.write_report(handle, start_date, end_date),
+            stale_prefix=f'{params_key}-',
+        )
+        return serve_file(
+            request, storage, name,
+            filename=f'audit_report_{start_date}_to_{end_date}.csv',
+            as_attachment=True,
+            content_type='text/csv',
+            accel_prefix=settings.EXPORT_ACCEL_PREFIX,
+        )
+    
+    def write_report(self, handle, start_date, end_date):
         # Consolidation logic...
-        incomes = Income.objects.filter(date__range=[start_date, end_date]).aggregate(total=Sum('amount'))['total'] or 0
-        expenses = Expense.objects.filter(date__range=[start_date, end_date], status='PAID').aggregate(total=Sum('amount'))['total'] or 0
+        income_querysets = ledger(Income, start_date, end_date)
+        expense_querysets = ledger(Expense, start_date, end_date, status='PAID')
+        incomes = ledger_total(income_querysets)
+        expenses = ledger_total(expense_querysets)
         
-        import csv
-        from django.http import HttpResponse
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="audit_report_{start_date}_to_{end_date}.csv"'
-        
-        writer = csv.writer(response)
+        writer = csv.writer(handle)
         writer.writerow(['School Finance Audit Report'])
         writer.writerow(['Period', f"{start_date} to {end_date}"])
         writer.writerow([])
         writer.writerow(['Summary'])
-        writer.writerow(['Total Income', float(incomes)])
-        writer.writerow(['Total Expenses', float(expenses)])
-        writer.writerow(['Net Balance', float(incomes - expenses)])
+        writer.writerow(['Total Income', incomes])
+        writer.writerow(['Total Expenses', expenses])
+        writer.writerow(['Net Balance', incomes - expenses])
         writer.writerow([])
         writer.writerow(['Recent Transactions'])
         writer.writerow(['Type', 'Source/Category', 'Amount', 'Date', 'Status'])
         
-        for inc in Income.objects.filter(date__range=[start_date, end_date])[:20]:
-            writer.writerow(['INCOME', inc.income_source.name, float(inc.amount), inc.date, 'RECEIVED'])
-            
-        for exp in Expense.objects.filter(date__range=[start_date, end_date], status='PAID')[:20]:
-            writer.writerow(['EXPENSE', exp.category.name, float(exp.amount), exp.date, exp.status])
+        for inc in ledger_rows(income_querysets, 20):
+            writer.writerow(['INCOME', refdata.name(INCOME_SOURCE, inc.income_source_id), inc.amount, inc.date, 'RECEIVED'])
+        
+        for exp in ledger_rows(expense_querysets, 20):
+            writer.writerow(['EXPENSE', refdata.name(EXPENSE_CATEGORY, exp.category_id), exp.amount, exp.date, exp.status])
+
+
+class DashboardView(AdmissionControlMixin, ConditionalGetMixin, APIView):
+    """All dashboard widgets in one request, computed from one shared dataset"""
+    permission_classes = [IsAuthenticated]
+    conditional_models = ['budget.Budget'] + LEDGER_MODELS
+    
+    def get(self, request):
+        start_date = request.query_params.get('start_date')
+        end_date = request.query_params.get('end_date')
+        
+        if not start_date or not end_date:
+            return Response({'error': 'start_date and end_date parameters are required'}, status=400)
+        
+        try:
+            start = datetime.strptime(start_date, '%Y-%m-%d').date()
+            end = datetime.strptime(end_date, '%Y-%m-%d').date()
+        except ValueError:
+            return Response({'error': 'Dates must be in YYYY-MM-DD format'}, status=400)
+        
+        financial_year = request.query_params.get('financial_year') or periods.financial_year_label(periods.fiscal_year_of(end))
+        try:
+            periods.parse_financial_year(financial_year)
+        except ValueError:
+            return Response({'error': 'Invalid financial_year'}, status=400)
+        
+        versions = sorted(getattr(self, 'data_versions', {}).items())
+        cache_key = 'reports:dashboard:' + hashlib.sha1(
+            repr((start_date, end_date, financial_year, tenancy.current_school_id(), versions)).encode()
+        ).hexdigest()
+        
+        payload = cache.get(cache_key)
+        if payload is None:
+            # Concurrent misses share one build; the shared payload is copied, not marked
+            payload = dict(shared_report(
+                self, 'dashboard', (start, end, financial_year),
+                lambda: self.build_and_cache(cache_key, start, end, financial_year),
+            ), cached=False)
+        else:
+            payload['cached'] = True
+        
+        return Response(payload)
+    
+    def build_and_cache(self, cache_key, start, end, financial_year):
+        payload = self.build_payload(start, end, financial_year)
+        cache.set(cache_key, payload, settings.DASHBOARD_CACHE_TIMEOUT)
+        return payload
+    
+    def build_payload(self, start, end, financial_year):
+        timings = {}
+        
+        # Shared dataset: one grouped query per ledger table (archive included when needed)
+        started = time.perf_counter()
+        income_rows = [
+            row
+            for queryset in ledger(Income, start, end)
+            for row in queryset.values('department_id', 'income_source_id').annotate(total=Sum('amount'))
+        ]
+        expense_rows = [
+            row
+            for queryset in ledger(Expense, start, end, status='PAID')
+            for row in queryset.values('department_id', 'category_id').annotate(total=Sum('amount'))
+        ]
+        timings['dataset'] = self.elapsed_ms(started)
+        
+        started = time.perf_counter()
+        summary, income_breakdown, expense_breakdown = self.summary_widget(income_rows, expense_rows)
+        timings['summary'] = self.elapsed_ms(started)
+        
+        started = time.perf_counter()
+        departments = self.department_widget(income_rows, expense_rows)
+        timings['departments'] = self.elapsed_ms(started)
+        
+        started = time.perf_counter()
+        budgets = self.budget_widget(financial_year)
+        timings['budgets'] = self.elapsed_ms(started)
+        
+        return {
+            'period': {'start_date': start.isoformat(), 'end_date': end.isoformat()},
+            'financial_year': financial_year,
+            'summary': summary,
+            'income_breakdown': income_breakdown,
+            'expense_breakdown': expense_breakdown,
+            'departments': departments,
+            'budgets': budgets,
+            'timings_ms': timings,
+        }
+    
+    def summary_widget(self, income_rows, expense_rows):
+        by_source = defaultdict(Decimal)
+        for row in income_rows:
+            by_source[row['income_source_id']] += row['total']
+        
+        by_category = defaultdict(Decimal)
+        for row in expense_rows:
+            by_category[row['category_id']] += row['total']
+        
+        total_income = sum(by_source.values(), Decimal('0'))
+        total_expenses = sum(by_category.values(), Decimal('0'))
+        balance = total_income - total_expenses
+        
+        summary = {
+            'total_income': total_income,
+            'total_expenses': total_expenses,
+            'balance': balance,
+            'status': 'Surplus' if balance >= 0 else 'Deficit'
+        }
+        income_breakdown = [
+            {'income_source__name': refdata.name(INCOME_SOURCE, source_id), 'total': total}
+            for source_id, total in sorted(by_source.items(), key=lambda item: -item[1])
+        ]
+        expense_breakdown = [
+            {'category__name': refdata.name(EXPENSE_CATEGORY, category_id), 'total': total}
+            for category_id, total in sorted(by_category.items(), key=lambda item: -item[1])
+        ]
+        return summary, income_breakdown, expense_breakdown
+    
+    def department_widget(self, income_rows, expense_rows):
+        income_by_dept = defaultdict(Decimal)
+        for row in income_rows:
+            income_by_dept[row['department_id']] += row['total']
+        
+        expense_by_dept = defaultdict(Decimal)
+        for row in expense_rows:
+            expense_by_dept[row['department_id']] += row['total']
+        
+        summary = []
+        for department in refdata.active(DEPARTMENT):
+            income = income_by_dept.get(department.id, Decimal('0'))
+            expenses = expense_by_dept.get(department.id, Decimal('0'))
+            summary.append({
+                'department': department.name,
+                'income': income,
+                'expenses': expenses,
+                'net': income - expenses,
+            })
+        return summary
+    
+    def budget_widget(self, financial_year):
+        fiscal_year = periods.parse_financial_year(financial_year)
+        budgets = list(
+            tenancy.scoped(Budget.objects.filter(
+                fiscal_year=fiscal_year,
+                status__in=['APPROVED', 'LOCKED']
+            ))
+        )
+        
+        # spent_amount is a maintained counter, no expense query needed
+        report_data = []
+        for budget in budgets:
+            spent = budget.spent_amount
+            allocated = budget.allocated_amount
+            variance = allocated - spent
+            variance_percentage = float(variance / allocated * 100) if allocated > 0 else 0
+            utilization = float(spent / allocated * 100) if allocated > 0 else 0
             
-        return response
+            report_data.append({
+                'department': refdata.name(DEPARTMENT, budget.department_id),
+                'period': f"FY {budget.financial_year}" + (f" - Month {budget.month}" if budget.month else ""),
+                'allocated_budget': allocated,
+                'actual_spent': spent,
+                'variance': variance,
+                'variance_percentage': round(variance_percentage, 2),
+                'utilization_percentage': round(utilization, 2),
+                'status': 'Over Budget' if variance < 0 else 'Under Budget'
+            })
+        return report_data
+    
+    @staticmethod
+    def elapsed_ms(started):
+        return round((time.perf_counter() - started) * 1000, 2)
+
+
+class PayrollProjectionView(ConditionalGetMixin, APIView):
+    """Projected payroll cost per department against budgets, for one or many scenarios
+
+    GET takes one scenario as query parameters (``increment_pct``,
+    ``attrition_pct``, ``hiring_pct``); POST takes
+    ``{"financial_year": "2025-26", "scenarios": [{...}, ...]}``.
+    """
+    permission_classes = [IsAuthenticated]
+    conditional_models = ['salary.Employee', 'budget.Budget', 'departments.Department']
+    scenario_params = ('increment_pct', 'attrition_pct', 'hiring_pct')
+    
+    def get(self, request):
+        params = request.query_params
+        data = {key: params[key] for key in ('financial_year', 'department') if key in params}
+        data['scenarios'] = [{key: params[key] for key in self.scenario_params if key in params}]
+        return self.project(request, data)
+    
+    def post(self, request):
+        return self.project(request, request.data)
+    
+    def project(self, request, data):
+        if not request.user.has_finance_access():
+            return Response({'error': 'You do not have permission to view payroll projections'}, status=403)
+        
+        serializer = PayrollProjectionSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        fiscal_year = serializer.validated_data['financial_year']
+        
+        started = time.perf_counter()
+        payload = payroll_projection(
+            fiscal_year,
+            serializer.validated_data['scenarios'],
+            serializer.validated_data.get('department'),
+        )
+        return Response({
+            'financial_year': periods.financial_year_label(fiscal_year),
+            **payload,
+            'took_ms': round((time.perf_counter() - started) * 1000, 2),
+        })
+
+
+class CashForecastView(ConditionalGetMixin, APIView):
+    """Projected monthly cash flow and balance with confidence bands
+
+    ``?months=6`` (1-24), ``?confidence=80`` (80, 90 or 95) and
+    ``?opening_balance=`` (defaults to all recorded income minus paid expenses).
+    """
+    permission_classes = [IsAuthenticated]
+    conditional_models = LEDGER_MODELS + ['reports.CashFlowMonth', 'reports.CashFlowDay']
+    
+    def get_conditional_key_parts(self, request):
+        # The current month's remainder depends on the day
+        return [timezone.localdate().isoformat()]
+    
+    def get(self, request):
+        try:
+            months = int(request.query_params.get('months', 6))
+            confidence = int(request.query_params.get('confidence', 80))
+            opening_balance = request.query_params.get('opening_balance')
+            opening_balance = Decimal(opening_balance) if opening_balance else None
+        except (ValueError, ArithmeticError):
+            return Response({'error': 'months and confidence must be integers, opening_balance a number'}, status=400)
+        
+        if not 1 <= months <= MAX_MONTHS:
+            return Response({'error': f'months must be between 1 and {MAX_MONTHS}'}, status=400)
+        if confidence not in Z_SCORES:
+            return Response({'error': 'confidence must be 80, 90 or 95'}, status=400)
+        
+        started = time.perf_counter()
+        payload = cash_forecast(timezone.localdate(), months, confidence, opening_balance)
+        payload['took_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return Response(payload)
+
+
+class ClosedPeriodViewSet(TenantScopedMixin, ConditionalGetMixin, mixins.ListModelMixin,
+                          mixins.RetrieveModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """Closed Period ViewSet - close a financial year or month of the school, or reopen it"""
+    queryset = ClosedPeriod.objects.select_related('closed_by').prefetch_related('snapshots')
+    serializer_class = ClosedPeriodSerializer
+    permission_classes = [IsAuthenticated]
+    conditional_extra_models = ['reports.PeriodSnapshot']
+    
+    def create(self, request):
+        if not request.user.role == 'SUPER_ADMIN':
+            return Response(
+                {'error': 'Only super admin can close periods'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        month = request.data.get('month')
+        try:
+            fiscal_year = periods.parse_financial_year(request.data.get('financial_year', ''))
+            closed_period = close_period(fiscal_year, int(month) if month else None, user=request.user)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = self.get_serializer(closed_period)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    
+    def destroy(self, request, pk=None):
+        """Reopen a period: its snapshots are dropped, budgets stay locked"""
+        if not request.user.role == 'SUPER_ADMIN':
+            return Response(
+                {'error': 'Only super admin can reopen periods'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        reopen_period(self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
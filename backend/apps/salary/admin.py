@@ -2,23 +2,47 @@
 Salary Admin Configuration
 """
 from django.contrib import admin
-from .models import Employee, Salary
+from apps.core.admin_performance import PerformanceAdminMixin
+from .models import Employee, Salary, PayrollYTD
 
 
 @admin.register(Employee)
-class EmployeeAdmin(admin.ModelAdmin):
+class EmployeeAdmin(PerformanceAdminMixin, admin.ModelAdmin):
     """Employee Admin"""
     list_display = ['employee_id', 'first_name', 'last_name', 'role', 'department', 'base_salary', 'is_active']
-    list_filter = ['role', 'department', 'is_active']
+    list_filter = ['school', 'role', 'department', 'is_active']
     search_fields = ['employee_id', 'first_name', 'last_name', 'email']
     ordering = ['employee_id']
+    performance_select_related = ['department']
+    performance_autocomplete_fields = ['department']
 
 
 @admin.register(Salary)
-class SalaryAdmin(admin.ModelAdmin):
+class SalaryAdmin(PerformanceAdminMixin, admin.ModelAdmin):
     """Salary Admin"""
     list_display = ['employee', 'month', 'year', 'base_amount', 'net_amount', 'status', 'payment_date']
-    list_filter = ['status', 'year', 'month']
+    list_filter = ['school', 'status', 'year', 'month']
     search_fields = ['employee__employee_id', 'employee__first_name', 'employee__last_name']
     readonly_fields = ['net_amount', 'processed_by', 'created_at', 'updated_at']
     ordering = ['-year', '-month']
+    performance_select_related = ['employee']
+    performance_autocomplete_fields = ['employee']
+
+
+@admin.register(PayrollYTD)
+class PayrollYTDAdmin(PerformanceAdminMixin, admin.ModelAdmin):
+    """Payroll year-to-date accumulators (maintained by salary signals, read-only)"""
+    list_display = ['employee', 'fiscal_year', 'months', 'base_amount', 'allowances', 'deductions', 'net_amount', 'paid_amount']
+    list_filter = ['fiscal_year']
+    search_fields = ['employee__employee_id', 'employee__first_name', 'employee__last_name']
+    ordering = ['-fiscal_year', 'employee']
+    performance_select_related = ['employee']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
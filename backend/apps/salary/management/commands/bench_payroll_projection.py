@@ -0,0 +1,48 @@
+"""
+Time the payroll projection engine on a synthetic workforce
+
+Usage:
+    python manage.py bench_payroll_projection
+    python manage.py bench_payroll_projection --employees 10000 --scenarios 100 --departments 25
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.salary.projection import Workforce, project
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the vectorized payroll projection (no database access)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=10000)
+        parser.add_argument('--scenarios', type=int, default=100)
+        parser.add_argument('--departments', type=int, default=25)
+        parser.add_argument('--repeat', type=int, default=5)
+    
+    def handle(self, *args, **options):
+        workforce = Workforce.synthetic(2025, options['employees'], options['departments'])
+        scenarios = [
+            {
+                'increment_pct': 3 + index % 8,
+                'attrition_pct': index % 15,
+                'hiring_pct': index % 10,
+                'hires': {1: index % 4},
+            }
+            for index in range(options['scenarios'])
+        ]
+        
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            cost = project(workforce, scenarios)
+            timings.append(time.perf_counter() - started)
+        
+        self.stdout.write(
+            f'{options["employees"]} employees x {options["scenarios"]} scenarios x 12 months '
+            f'({options["departments"]} departments), result shape {cost.shape}'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'best {min(timings) * 1000:.1f} ms, median {sorted(timings)[len(timings) // 2] * 1000:.1f} ms'
+        ))
@@ -0,0 +1,78 @@
+"""
+Compare PayrollYTD accumulators with the salaries they summarise
+
+Usage:
+    python manage.py reconcile_payroll_ytd                  # report drift
+    python manage.py reconcile_payroll_ytd --fix            # repair it
+    python manage.py reconcile_payroll_ytd --financial-year 2024-25
+"""
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.archive.models import ArchivedSalary
+from apps.core import periods
+from apps.core.models import DataVersion
+from apps.salary.models import Salary, PayrollYTD
+from apps.salary.payroll import AMOUNT_FIELDS, actual_ytd
+
+FIELDS = ('months',) + AMOUNT_FIELDS
+
+
+class Command(BaseCommand):
+    help = 'Detect and optionally repair drift in payroll year-to-date accumulators'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--financial-year', help='Only this year, e.g. 2024-25')
+        parser.add_argument('--fix', action='store_true', help='Write the recomputed totals')
+    
+    def handle(self, *args, **options):
+        querysets = [Salary.objects.all(), ArchivedSalary.objects.all()]
+        accumulators = PayrollYTD.objects.all()
+        fiscal_year = None
+        if options['financial_year']:
+            try:
+                fiscal_year = periods.parse_financial_year(options['financial_year'])
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            # Salaries are keyed by calendar year: April-December and January-March
+            querysets = [
+                queryset.filter(year__in=[fiscal_year, fiscal_year + 1]) for queryset in querysets
+            ]
+            accumulators = accumulators.filter(fiscal_year=fiscal_year)
+        
+        actual = actual_ytd(querysets)
+        if fiscal_year is not None:
+            actual = {key: value for key, value in actual.items() if key[1] == fiscal_year}
+        
+        existing = {(ytd.employee_id, ytd.fiscal_year): ytd for ytd in accumulators}
+        empty = dict.fromkeys(FIELDS, Decimal('0'))
+        
+        drifted = []
+        for key in sorted(existing.keys() | actual.keys()):
+            expected = actual.get(key, empty)
+            ytd = existing.get(key) or PayrollYTD(employee_id=key[0], fiscal_year=key[1])
+            stored = {name: getattr(ytd, name) for name in FIELDS}
+            if all(stored[name] == expected[name] for name in FIELDS):
+                continue
+            
+            self.stdout.write(
+                f'Employee {key[0]} FY {periods.financial_year_label(key[1])}: '
+                f'counter net {stored["net_amount"]} over {stored["months"]} months, '
+                f'actual {expected["net_amount"]} over {expected["months"]} months'
+            )
+            for name in FIELDS:
+                setattr(ytd, name, expected[name])
+            drifted.append(ytd)
+        
+        if options['fix'] and drifted:
+            with transaction.atomic():
+                PayrollYTD.objects.bulk_create([ytd for ytd in drifted if ytd.pk is None], batch_size=500)
+                PayrollYTD.objects.bulk_update([ytd for ytd in drifted if ytd.pk], FIELDS, batch_size=500)
+                DataVersion.bump(PayrollYTD._meta.label)
+        
+        verb = 'Fixed' if options['fix'] else 'Found'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {len(existing)} accumulators. {verb} {len(drifted)} with drift.'
+        ))
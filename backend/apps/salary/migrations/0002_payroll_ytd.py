@@ -0,0 +1,74 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:40
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+import django.db.models.deletion
+
+FISCAL_YEAR_START_MONTH = 4
+
+
+def seed_payroll_ytd(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    PayrollYTD = apps.get_model('salary', 'PayrollYTD')
+    totals = {}
+    
+    for model in (apps.get_model('salary', 'Salary'), apps.get_model('archive', 'ArchivedSalary')):
+        grouped = model.objects.using(db_alias).exclude(status='CANCELLED').values('employee_id', 'year', 'month').annotate(
+            months=Count('id'),
+            base=Sum('base_amount'),
+            allowance_total=Sum('allowances'),
+            deduction_total=Sum('deductions'),
+            net=Sum('net_amount'),
+            paid=Sum('net_amount', filter=Q(status='PAID')),
+        )
+        for row in grouped:
+            fiscal_year = row['year'] if row['month'] >= FISCAL_YEAR_START_MONTH else row['year'] - 1
+            ytd = totals.setdefault(
+                (row['employee_id'], fiscal_year),
+                PayrollYTD(employee_id=row['employee_id'], fiscal_year=fiscal_year),
+            )
+            ytd.months += row['months']
+            ytd.base_amount += row['base']
+            ytd.allowances += row['allowance_total']
+            ytd.deductions += row['deduction_total']
+            ytd.net_amount += row['net']
+            ytd.paid_amount += row['paid'] or Decimal('0')
+    
+    PayrollYTD.objects.using(db_alias).bulk_create(totals.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salary', '0001_initial'),
+        ('archive', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayrollYTD',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fiscal_year', models.PositiveSmallIntegerField()),
+                ('months', models.PositiveSmallIntegerField(default=0)),
+                ('base_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('allowances', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('deductions', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('net_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payroll_ytd', to='salary.employee')),
+            ],
+            options={
+                'db_table': 'payroll_ytd',
+                'ordering': ['-fiscal_year', 'employee'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='payrollytd',
+            constraint=models.UniqueConstraint(fields=('fiscal_year', 'employee'), name='unique_payroll_ytd'),
+        ),
+        migrations.RunPython(seed_payroll_ytd, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0001_initial'),
+        ('salary', '0002_payroll_ytd'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='school',
+            field=models.ForeignKey(default=1, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='employees', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='salary',
+            name='school',
+            field=models.ForeignKey(default=1, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='salaries', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='email',
+            field=models.EmailField(max_length=254),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='employee_id',
+            field=models.CharField(max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['school', 'is_active', 'department'], name='employees_school__ec46e2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salary',
+            index=models.Index(fields=['school', 'year', 'month'], name='salaries_school__37add0_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='employee',
+            constraint=models.UniqueConstraint(fields=('school', 'employee_id'), name='unique_employee_id'),
+        ),
+        migrations.AddConstraint(
+            model_name='employee',
+            constraint=models.UniqueConstraint(fields=('school', 'email'), name='unique_employee_email'),
+        ),
+    ]
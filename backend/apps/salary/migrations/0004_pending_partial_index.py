@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salary', '0003_school'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='salary',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['school', 'year', 'month'], name='salaries_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salary', '0004_pending_partial_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salary',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
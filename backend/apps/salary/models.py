@@ -2,15 +2,21 @@
 Salary & Payroll Models
 """
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
+from apps.core.tenancy import assign_school, department_school_id
+from apps.core.tracking import TrackedFieldsMixin
 from apps.departments.models import Department
 
 User = get_user_model()
 
 
-class Employee(models.Model):
+class Employee(TrackedFieldsMixin, models.Model):
     """Employee Model"""
     
+    # Pending salaries are queued under the employee's department (see apps.approvals)
+    tracked_fields = ('department_id',)
+    
     ROLE_CHOICES = [
         ('TEACHER', 'Teacher'),
         ('ADMIN_STAFF', 'Administrative Staff'),
@@ -20,13 +26,14 @@ class Employee(models.Model):
         ('OTHER', 'Other'),
     ]
     
-    employee_id = models.CharField(max_length=20, unique=True)
+    employee_id = models.CharField(max_length=20)
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
-    email = models.EmailField(unique=True)
+    email = models.EmailField()
     phone = models.CharField(max_length=15)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES)
     department = models.ForeignKey(Department, on_delete=models.PROTECT, related_name='employees')
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='employees', editable=False)
     
     # Salary details
     base_salary = models.DecimalField(max_digits=10, decimal_places=2)
@@ -39,23 +46,43 @@ class Employee(models.Model):
     class Meta:
         db_table = 'employees'
         ordering = ['employee_id']
+        constraints = [
+            models.UniqueConstraint(fields=['school', 'employee_id'], name='unique_employee_id'),
+            models.UniqueConstraint(fields=['school', 'email'], name='unique_employee_email'),
+        ]
+        indexes = [
+            models.Index(fields=['school', 'is_active', 'department']),
+        ]
     
     def __str__(self):
         return f"{self.employee_id} - {self.first_name} {self.last_name}"
     
+    def save(self, *args, **kwargs):
+        assign_school(self, department_school_id(self.department_id))
+        super().save(*args, **kwargs)
+    
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}"
 
 
-class Salary(models.Model):
+class Salary(TrackedFieldsMixin, models.Model):
     """Monthly Salary Records"""
     
+    # Stored values kept for the YTD accumulators (see apps.salary.signals)
+    tracked_fields = ('employee_id', 'month', 'year', 'status', 'base_amount', 'allowances', 'deductions', 'net_amount')
+    
     STATUS_CHOICES = [
         ('PENDING', 'Pending'),
         ('PAID', 'Paid'),
         ('CANCELLED', 'Cancelled'),
     ]
     
+    # Status graph applied by apps.core.transitions: name -> (from, to)
+    TRANSITIONS = {
+        'mark_paid': (('PENDING',), 'PAID'),
+        'cancel': (('PENDING',), 'CANCELLED'),
+    }
+    
     employee = models.ForeignKey(Employee, on_delete=models.PROTECT, related_name='salaries')
     month = models.PositiveSmallIntegerField()  # 1-12
     year = models.PositiveIntegerField()
@@ -68,12 +95,16 @@ class Salary(models.Model):
     
     # Payment details
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    version = models.PositiveIntegerField(default=1, editable=False)  # bumped by every write, for optimistic concurrency
     payment_date = models.DateField(null=True, blank=True)
     payment_mode = models.CharField(max_length=20, blank=True, null=True)
     reference_id = models.CharField(max_length=100, blank=True, null=True)
     
     notes = models.TextField(blank=True, null=True)
     
+    # School (tenant), the employee's
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='salaries', editable=False)
+    
     # Tracking
     processed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='processed_salaries')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -86,6 +117,8 @@ class Salary(models.Model):
         indexes = [
             models.Index(fields=['employee', 'month', 'year']),
             models.Index(fields=['status']),
+            models.Index(fields=['school', 'year', 'month']),
+            models.Index(fields=['school', 'year', 'month'], condition=Q(status='PENDING'), name='salaries_pending_idx'),
         ]
     
     def __str__(self):
@@ -94,4 +127,38 @@ class Salary(models.Model):
     def save(self, *args, **kwargs):
         # Auto-calculate net amount
         self.net_amount = self.base_amount + self.allowances - self.deductions
+        assign_school(self, self.employee.school_id if self.employee_id else None)
+        if not self._state.adding:
+            self.version += 1
         super().save(*args, **kwargs)
+
+
+class PayrollYTD(models.Model):
+    """Year-to-date payroll totals of an employee, kept current by salary signals
+
+    Cancelled salaries are not counted. Gross is base + allowances.
+    """
+    
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='payroll_ytd')
+    fiscal_year = models.PositiveSmallIntegerField()  # e.g. 2024 for "2024-25"
+    months = models.PositiveSmallIntegerField(default=0)  # salary records counted
+    base_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    allowances = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    deductions = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    net_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    paid_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # net of PAID salaries
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'payroll_ytd'
+        ordering = ['-fiscal_year', 'employee']
+        constraints = [
+            models.UniqueConstraint(fields=['fiscal_year', 'employee'], name='unique_payroll_ytd'),
+        ]
+    
+    def __str__(self):
+        return f"{self.employee_id} - FY {self.fiscal_year} - ₹{self.net_amount}"
+    
+    @property
+    def gross_amount(self):
+        return self.base_amount + self.allowances
@@ -0,0 +1,140 @@
+"""
+Payroll year-to-date accumulators and the annual payroll register
+
+Every salary that is not cancelled counts towards the PayrollYTD row of its
+employee and financial year (months April-March). Saves and deletes move a
+salary's contribution with one F() update, so the register is read from
+one row per employee instead of re-summing twelve salary rows each.
+"""
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+
+from apps.core import periods, tenancy
+from apps.core.refdata import refdata, DEPARTMENT
+from .models import Salary, PayrollYTD
+
+AMOUNT_FIELDS = ('base_amount', 'allowances', 'deductions', 'net_amount', 'paid_amount')
+
+REGISTER_COLUMNS = [
+    ('employee_id', 'Employee ID'),
+    ('name', 'Name'),
+    ('department', 'Department'),
+    ('role', 'Role'),
+    ('months', 'Months'),
+    ('base_amount', 'Base'),
+    ('allowances', 'Allowances'),
+    ('gross_amount', 'Gross'),
+    ('deductions', 'Deductions'),
+    ('net_amount', 'Net'),
+    ('paid_amount', 'Paid'),
+]
+
+
+def salary_fiscal_year(month, year):
+    return periods.fiscal_year_of_key(year * 100 + month)
+
+
+def ytd_contribution(state):
+    """((employee_id, fiscal_year), {field: amount}) counted by a salary state, or None"""
+    if not state or state['status'] == 'CANCELLED':
+        return None
+    amounts = {name: Decimal(state[name]) for name in AMOUNT_FIELDS if name != 'paid_amount'}
+    amounts['paid_amount'] = amounts['net_amount'] if state['status'] == 'PAID' else Decimal('0')
+    amounts['months'] = 1
+    return (state['employee_id'], salary_fiscal_year(state['month'], state['year'])), amounts
+
+
+def apply_ytd(key, amounts, sign):
+    """Add (sign=1) or remove (sign=-1) a contribution"""
+    employee_id, fiscal_year = key
+    changes = {name: F(name) + sign * value for name, value in amounts.items()}
+    
+    with transaction.atomic():
+        rows = PayrollYTD.objects.filter(employee_id=employee_id, fiscal_year=fiscal_year)
+        if rows.update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                PayrollYTD.objects.create(
+                    employee_id=employee_id, fiscal_year=fiscal_year,
+                    **{name: sign * value for name, value in amounts.items()}
+                )
+        except IntegrityError:
+            # Another writer created the row first
+            rows.update(**changes)
+
+
+def sync_salary_ytd(before, after):
+    """Move a salary's contribution from its stored state to its new state"""
+    old = ytd_contribution(before)
+    new = ytd_contribution(after)
+    if old == new:
+        return
+    
+    if old and new and old[0] == new[0]:
+        # Same accumulator, only the amounts moved
+        apply_ytd(new[0], {name: new[1][name] - old[1][name] for name in new[1]}, 1)
+        return
+    
+    if old:
+        apply_ytd(*old, -1)
+    if new:
+        apply_ytd(*new, 1)
+
+
+def salary_state(salary):
+    return {name: getattr(salary, name) for name in Salary.tracked_fields}
+
+
+def actual_ytd(querysets):
+    """Recomputed accumulators {(employee_id, fiscal_year): {field: amount}} from salary rows"""
+    totals = {}
+    for queryset in querysets:
+        grouped = queryset.exclude(status='CANCELLED').values('employee_id', 'year', 'month').annotate(
+            months=Count('id'),
+            base=Sum('base_amount'),
+            allowance_total=Sum('allowances'),
+            deduction_total=Sum('deductions'),
+            net=Sum('net_amount'),
+            paid=Sum('net_amount', filter=Q(status='PAID')),
+        )
+        for row in grouped:
+            key = (row['employee_id'], salary_fiscal_year(row['month'], row['year']))
+            entry = totals.setdefault(key, dict.fromkeys(AMOUNT_FIELDS, Decimal('0')) | {'months': 0})
+            entry['months'] += row['months']
+            entry['base_amount'] += row['base']
+            entry['allowances'] += row['allowance_total']
+            entry['deductions'] += row['deduction_total']
+            entry['net_amount'] += row['net']
+            entry['paid_amount'] += row['paid'] or Decimal('0')
+    return totals
+
+
+def register_rows(fiscal_year, department_id=None):
+    """One payroll register row per employee paid in the financial year, by employee ID"""
+    rows = tenancy.scoped(PayrollYTD.objects.filter(fiscal_year=fiscal_year, months__gt=0), 'employee__school')
+    if department_id:
+        rows = rows.filter(employee__department_id=department_id)
+    
+    values = rows.order_by('employee__employee_id').values_list(
+        'employee__employee_id', 'employee__first_name', 'employee__last_name',
+        'employee__department_id', 'employee__role', 'months',
+        'base_amount', 'allowances', 'deductions', 'net_amount', 'paid_amount',
+    )
+    for (employee_id, first_name, last_name, dept_id, role, months,
+         base, allowances, deductions, net, paid) in values.iterator(chunk_size=2000):
+        yield {
+            'employee_id': employee_id,
+            'name': f"{first_name} {last_name}",
+            'department': refdata.name(DEPARTMENT, dept_id),
+            'role': role,
+            'months': months,
+            'base_amount': base,
+            'allowances': allowances,
+            'gross_amount': base + allowances,
+            'deductions': deductions,
+            'net_amount': net,
+            'paid_amount': paid,
+        }
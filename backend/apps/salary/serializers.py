@@ -2,12 +2,14 @@
 Salary Serializers
 """
 from rest_framework import serializers
+from apps.core import tenancy
+from apps.core.refdata import DEPARTMENT, ReferenceNameField
 from .models import Employee, Salary
 
 
 class EmployeeSerializer(serializers.ModelSerializer):
     """Employee Serializer"""
-    department_name = serializers.CharField(source='department.name', read_only=True)
+    department_name = ReferenceNameField(DEPARTMENT, source='department_id')
     full_name = serializers.SerializerMethodField()
     
     class Meta:
@@ -15,6 +17,14 @@ class EmployeeSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['created_at', 'updated_at']
     
+    def validate(self, attrs):
+        department = attrs.get('department')
+        school_id = department.school_id if department is not None else getattr(self.instance, 'school_id', None)
+        errors = tenancy.taken_in_school(Employee, school_id, attrs, ['employee_id', 'email'], self.instance)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+    
     def get_full_name(self, obj):
         return obj.get_full_name()
 
@@ -23,13 +33,13 @@ class SalarySerializer(serializers.ModelSerializer):
     """Salary Serializer"""
     employee_name = serializers.CharField(source='employee.get_full_name', read_only=True)
     employee_id = serializers.CharField(source='employee.employee_id', read_only=True)
-    department_name = serializers.CharField(source='employee.department.name', read_only=True)
+    department_name = ReferenceNameField(DEPARTMENT, source='employee.department_id')
     processed_by_name = serializers.CharField(source='processed_by.get_full_name', read_only=True)
     
     class Meta:
         model = Salary
         fields = '__all__'
-        read_only_fields = ['net_amount', 'processed_by', 'created_at', 'updated_at']
+        read_only_fields = ['status', 'net_amount', 'processed_by', 'created_at', 'updated_at']
     
     def create(self, validated_data):
         validated_data['processed_by'] = self.context['request'].user
@@ -0,0 +1,23 @@
+"""
+Salary Signals - Payroll year-to-date accumulators
+
+See apps.salary.payroll; each save or delete moves the salary's
+contribution between PayrollYTD rows instead of re-summing salaries.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Salary
+from .payroll import salary_state, sync_salary_ytd
+
+
+@receiver(post_save, sender=Salary, dispatch_uid='salary.payroll_ytd.save')
+def update_ytd_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    sync_salary_ytd(instance.stored_state(created), salary_state(instance))
+
+
+@receiver(post_delete, sender=Salary, dispatch_uid='salary.payroll_ytd.delete')
+def update_ytd_on_delete(sender, instance, **kwargs):
+    sync_salary_ytd(instance.stored_state(), None)
@@ -1,6 +1,9 @@
 """
 Salary Views
 """
+from decimal import Decimal
+
+from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -8,11 +11,17 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 
+from apps.core import periods
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.streaming import streaming_csv_response, xlsx_response
+from apps.core.tenancy import TenantScopedMixin
+from apps.core.transitions import TransitionActionsMixin
 from .models import Employee, Salary
+from .payroll import REGISTER_COLUMNS, register_rows
 from .serializers import EmployeeSerializer, SalarySerializer
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(TenantScopedMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """Employee ViewSet"""
     queryset = Employee.objects.filter(is_active=True)
     serializer_class = EmployeeSerializer
@@ -22,10 +31,11 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     search_fields = ['employee_id', 'first_name', 'last_name', 'email']
 
 
-class SalaryViewSet(viewsets.ModelViewSet):
+class SalaryViewSet(TenantScopedMixin, ConditionalGetMixin, TransitionActionsMixin, viewsets.ModelViewSet):
     """Salary ViewSet"""
     queryset = Salary.objects.all()
     serializer_class = SalarySerializer
+    conditional_extra_models = ['salary.PayrollYTD']
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['employee', 'month', 'year', 'status']
@@ -43,17 +53,67 @@ class SalaryViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        if salary.status != 'PENDING':
+        return self.transition(
+            request, salary, 'mark_paid', 'Only pending salaries can be marked as paid',
+            payment_date=request.data.get('payment_date'),
+            payment_mode=request.data.get('payment_mode'),
+            reference_id=request.data.get('reference_id'),
+        )
+    
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        """Cancel a pending salary"""
+        salary = self.get_object()
+        
+        if not request.user.has_finance_access():
+            return Response(
+                {'error': 'You do not have permission to cancel salaries'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        return self.transition(request, salary, 'cancel', 'Only pending salaries can be cancelled')
+    
+    @action(detail=False, methods=['get'])
+    def register(self, request):
+        """Annual payroll register: year-to-date totals per employee
+
+        ``?financial_year=2024-25`` (default: the current one), ``?department=<id>``,
+        ``?export=csv`` or ``?export=xlsx`` downloads the whole register.
+        """
+        if not request.user.has_finance_access():
             return Response(
-                {'error': 'Only pending salaries can be marked as paid'},
-                status=status.HTTP_400_BAD_REQUEST
+                {'error': 'You do not have permission to view the payroll register'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        financial_year = request.query_params.get('financial_year')
+        try:
+            fiscal_year = (
+                periods.parse_financial_year(financial_year) if financial_year
+                else periods.fiscal_year_of(timezone.localdate())
             )
+        except ValueError:
+            return Response({'error': 'Use the "2024-25" format for financial_year'}, status=status.HTTP_400_BAD_REQUEST)
+        label = periods.financial_year_label(fiscal_year)
         
-        salary.status = 'PAID'
-        salary.payment_date = request.data.get('payment_date')
-        salary.payment_mode = request.data.get('payment_mode')
-        salary.reference_id = request.data.get('reference_id')
-        salary.save()
+        rows = register_rows(fiscal_year, request.query_params.get('department'))
+        export = request.query_params.get('export')
+        if export in ('csv', 'xlsx'):
+            header = [title for _, title in REGISTER_COLUMNS]
+            values = ([row[key] for key, _ in REGISTER_COLUMNS] for row in rows)
+            filename = f'payroll-register-{label}.{export}'
+            if export == 'csv':
+                return streaming_csv_response(header, values, filename)
+            return xlsx_response(header, values, filename, title=f'FY {label}')
         
-        serializer = self.get_serializer(salary)
-        return Response(serializer.data)
+        rows = list(rows)
+        totals = {
+            name: sum((row[name] for row in rows), Decimal('0'))
+            for name in ('base_amount', 'allowances', 'gross_amount', 'deductions', 'net_amount', 'paid_amount')
+        }
+        return Response({
+            'financial_year': label,
+            'employees': len(rows),
+            'totals': totals,
+            'results': rows,
+        })
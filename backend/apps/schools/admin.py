@@ -0,0 +1,14 @@
+"""
+Schools Admin Configuration
+"""
+from django.contrib import admin
+from .models import School
+
+
+@admin.register(School)
+class SchoolAdmin(admin.ModelAdmin):
+    """School Admin"""
+    list_display = ['name', 'code', 'database', 'is_active', 'created_at']
+    list_filter = ['is_active']
+    search_fields = ['name', 'code']
+    ordering = ['name']
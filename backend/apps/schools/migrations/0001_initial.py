@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+def create_first_school(apps, schema_editor):
+    # Every existing row belongs to the school this deployment served so far
+    School = apps.get_model('schools', 'School')
+    School.objects.using(schema_editor.connection.alias).get_or_create(
+        pk=1, defaults={'name': 'Main School', 'code': 'MAIN'}
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='School',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+                ('code', models.CharField(max_length=20, unique=True)),
+                ('database', models.CharField(blank=True, max_length=50)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'schools',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RunPython(create_first_school, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+"""
+School Models - the tenants of a deployment
+"""
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models
+
+
+class School(models.Model):
+    """A school served by this deployment
+
+    Departments, incomes, expenses, budgets, employees and salaries carry
+    the school they belong to. ``database`` names the DATABASES entry that
+    holds the school's data when it has a database of its own; blank means
+    the shared default database.
+    """
+    
+    name = models.CharField(max_length=200, unique=True)
+    code = models.CharField(max_length=20, unique=True)
+    database = models.CharField(max_length=50, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'schools'
+        ordering = ['name']
+    
+    def __str__(self):
+        return f"{self.name} ({self.code})"
+    
+    def clean(self):
+        if self.database and self.database not in settings.DATABASES:
+            raise ValidationError({'database': f'"{self.database}" is not configured in DATABASES'})
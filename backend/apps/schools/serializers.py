@@ -0,0 +1,14 @@
+"""
+School Serializers
+"""
+from rest_framework import serializers
+from .models import School
+
+
+class SchoolSerializer(serializers.ModelSerializer):
+    """School Serializer (the database alias stays server-side)"""
+    
+    class Meta:
+        model = School
+        fields = ['id', 'name', 'code', 'is_active', 'created_at']
+        read_only_fields = fields
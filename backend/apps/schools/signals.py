@@ -0,0 +1,34 @@
+"""
+School Signals - keep the process-local school directory and the school's own database current
+"""
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.core.tenancy import schools
+from .models import School
+
+
+@receiver(post_save, sender=School, dispatch_uid='schools.directory.save')
+@receiver(post_delete, sender=School, dispatch_uid='schools.directory.delete')
+def invalidate_school_directory(sender, **kwargs):
+    schools.invalidate()
+
+
+@receiver(post_save, sender=School, dispatch_uid='schools.database.copy')
+def copy_school_to_database(sender, instance, raw=False, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Mirror the row into the school's own database, where its users and rows point at it
+
+    That database has to be migrated (``migrate --database=<alias>``) first.
+    """
+    if raw or not instance.database or instance.database == using:
+        return
+    School.objects.using(instance.database).update_or_create(
+        pk=instance.pk,
+        defaults={
+            'name': instance.name,
+            'code': instance.code,
+            'database': instance.database,
+            'is_active': instance.is_active,
+        },
+    )
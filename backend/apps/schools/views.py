@@ -0,0 +1,22 @@
+"""
+School Views
+"""
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.tenancy import scoped
+from .models import School
+from .serializers import SchoolSerializer
+
+
+class SchoolViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    """Schools of the deployment; school users only see their own"""
+    serializer_class = SchoolSerializer
+    permission_classes = [IsAuthenticated]
+    search_fields = ['name', 'code']
+    
+    def get_queryset(self):
+        # The schools table lives in the default database, whichever database the school uses
+        return scoped(School.objects.using(DEFAULT_DB_ALIAS).filter(is_active=True), 'pk')
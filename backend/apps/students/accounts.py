@@ -0,0 +1,174 @@
+"""
+Student fee balances
+
+Every (student, financial year) has one StudentBalance row: the fee
+schedules billed and the income receipts linked to the student that year.
+Saves and deletes move a record's amount with one F() update, so balance
+lists and defaulter lists read one indexed row per student instead of
+summing receipts.
+
+Payments cover instalments in due-date order; ``first_unpaid_due`` is the
+due date of the first instalment they do not cover. A student is a
+defaulter as of a date when that instalment was due before it.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+from apps.archive.models import ArchivedIncome
+from apps.finance.models import Income
+from .models import FeeSchedule, StudentBalance
+
+
+def receipt_contribution(state):
+    """((student_id, fiscal_year), amount) counted by an income state, or None"""
+    if not state or not state['student_id']:
+        return None
+    return (state['student_id'], state['fiscal_year']), Decimal(state['amount'])
+
+
+def schedule_contribution(state):
+    """((student_id, fiscal_year), amount) billed by a fee schedule state, or None"""
+    if not state:
+        return None
+    return (state['student_id'], state['fiscal_year']), Decimal(state['amount'])
+
+
+def apply_balance(key, billed=Decimal('0'), paid=Decimal('0'), receipts=0):
+    """Add the deltas to a balance row, creating it if missing"""
+    student_id, fiscal_year = key
+    changes = {
+        'billed': F('billed') + billed,
+        'paid': F('paid') + paid,
+        'outstanding': F('outstanding') + billed - paid,
+        'receipts': F('receipts') + receipts,
+    }
+    rows = StudentBalance.objects.filter(student_id=student_id, fiscal_year=fiscal_year)
+    if rows.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            StudentBalance.objects.create(
+                student_id=student_id, fiscal_year=fiscal_year,
+                billed=billed, paid=paid, outstanding=billed - paid, receipts=receipts,
+            )
+    except IntegrityError:
+        # Another writer created the row first
+        rows.update(**changes)
+
+
+def first_unpaid_due(instalments, paid):
+    """Due date of the first (amount, due_date) instalment that ``paid`` does not cover"""
+    for amount, due_date in instalments:
+        paid -= amount
+        if paid < 0:
+            return due_date
+    return None
+
+
+def refresh_first_unpaid(key):
+    student_id, fiscal_year = key
+    rows = StudentBalance.objects.filter(student_id=student_id, fiscal_year=fiscal_year)
+    paid = rows.values_list('paid', flat=True).first()
+    if paid is None:
+        return
+    instalments = FeeSchedule.objects.filter(
+        student_id=student_id, fiscal_year=fiscal_year
+    ).order_by('due_date', 'id').values_list('amount', 'due_date')
+    rows.update(first_unpaid_due=first_unpaid_due(instalments, paid))
+
+
+def sync_receipt(before, after):
+    """Move an income's payment from its stored state to its new state"""
+    old = receipt_contribution(before)
+    new = receipt_contribution(after)
+    if old == new:
+        return
+    with transaction.atomic():
+        if old and new and old[0] == new[0]:
+            apply_balance(new[0], paid=new[1] - old[1])
+        else:
+            if old:
+                apply_balance(old[0], paid=-old[1], receipts=-1)
+            if new:
+                apply_balance(new[0], paid=new[1], receipts=1)
+        for key in {contribution[0] for contribution in (old, new) if contribution}:
+            refresh_first_unpaid(key)
+
+
+def sync_schedule(before, after):
+    """Move a fee schedule's amount from its stored state to its new state"""
+    if before == after:
+        return
+    old = schedule_contribution(before)
+    new = schedule_contribution(after)
+    with transaction.atomic():
+        if old and new and old[0] == new[0]:
+            if new[1] != old[1]:
+                apply_balance(new[0], billed=new[1] - old[1])
+        else:
+            if old:
+                apply_balance(old[0], billed=-old[1])
+            if new:
+                apply_balance(new[0], billed=new[1])
+        # A moved due date changes the order instalments are paid in
+        for key in {contribution[0] for contribution in (old, new) if contribution}:
+            refresh_first_unpaid(key)
+
+
+def record_state(instance, fields):
+    return {name: getattr(instance, name) for name in fields}
+
+
+def actual_balances():
+    """Recomputed {(student_id, fiscal_year): {field: value}} from schedules and receipts"""
+    balances = defaultdict(lambda: {
+        'billed': Decimal('0'), 'paid': Decimal('0'), 'receipts': 0, 'instalments': [],
+    })
+    schedules = FeeSchedule.objects.order_by('student_id', 'fiscal_year', 'due_date', 'id')
+    for student_id, fiscal_year, amount, due_date in schedules.values_list(
+        'student_id', 'fiscal_year', 'amount', 'due_date'
+    ).iterator(chunk_size=5000):
+        balance = balances[(student_id, fiscal_year)]
+        balance['billed'] += amount
+        balance['instalments'].append((amount, due_date))
+
+    for model in (Income, ArchivedIncome):
+        grouped = model.objects.filter(student__isnull=False).order_by().values(
+            'student_id', 'fiscal_year'
+        ).annotate(total=Sum('amount'), count=Count('id'))
+        for row in grouped:
+            balance = balances[(row['student_id'], row['fiscal_year'])]
+            balance['paid'] += row['total']
+            balance['receipts'] += row['count']
+
+    return {
+        key: {
+            'billed': balance['billed'],
+            'paid': balance['paid'],
+            'outstanding': balance['billed'] - balance['paid'],
+            'receipts': balance['receipts'],
+            'first_unpaid_due': first_unpaid_due(balance['instalments'], balance['paid']),
+        }
+        for key, balance in balances.items()
+    }
+
+
+def overdue_amounts(balances, as_of):
+    """{student_id: amount due before ``as_of`` and not paid} for a page of balance rows"""
+    balances = list(balances)
+    if not balances:
+        return {}
+    due = dict(
+        FeeSchedule.objects.filter(
+            student_id__in=[balance.student_id for balance in balances],
+            fiscal_year=balances[0].fiscal_year,
+            due_date__lt=as_of,
+        ).order_by().values_list('student_id').annotate(total=Sum('amount'))
+    )
+    return {
+        balance.student_id: max(due.get(balance.student_id, Decimal('0')) - balance.paid, Decimal('0'))
+        for balance in balances
+    }
@@ -0,0 +1,51 @@
+"""
+Student Admin Configuration
+"""
+from django.contrib import admin
+from apps.core.admin_performance import PerformanceAdminMixin
+from .models import Student, FeeSchedule, StudentBalance
+
+
+class FeeScheduleInline(admin.TabularInline):
+    model = FeeSchedule
+    fields = ['income_source', 'amount', 'due_date', 'description']
+    extra = 0
+
+
+@admin.register(Student)
+class StudentAdmin(PerformanceAdminMixin, admin.ModelAdmin):
+    """Student Admin"""
+    list_display = ['admission_number', 'first_name', 'last_name', 'grade', 'section', 'is_active']
+    list_filter = ['grade', 'section', 'is_active']
+    search_fields = ['admission_number', 'first_name', 'last_name', 'guardian_phone']
+    inlines = [FeeScheduleInline]
+
+
+@admin.register(FeeSchedule)
+class FeeScheduleAdmin(PerformanceAdminMixin, admin.ModelAdmin):
+    """Fee Schedule Admin"""
+    list_display = ['student', 'income_source', 'amount', 'due_date', 'fiscal_year']
+    list_filter = ['fiscal_year', 'income_source']
+    search_fields = ['student__admission_number', 'student__first_name', 'student__last_name']
+    date_hierarchy = 'due_date'
+    performance_select_related = ['student', 'income_source']
+    performance_autocomplete_fields = ['student', 'income_source']
+
+
+@admin.register(StudentBalance)
+class StudentBalanceAdmin(PerformanceAdminMixin, admin.ModelAdmin):
+    """Student fee balances (maintained by fee schedule and income signals, read-only)"""
+    list_display = ['student', 'fiscal_year', 'billed', 'paid', 'outstanding', 'receipts', 'first_unpaid_due']
+    list_filter = ['fiscal_year']
+    search_fields = ['student__admission_number', 'student__first_name', 'student__last_name']
+    ordering = ['-fiscal_year', '-outstanding']
+    performance_select_related = ['student']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
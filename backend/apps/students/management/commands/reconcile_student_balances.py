@@ -0,0 +1,53 @@
+"""
+Compare StudentBalance rows with the fee schedules and receipts they summarise
+
+Usage:
+    python manage.py reconcile_student_balances             # report drift
+    python manage.py reconcile_student_balances --fix       # repair it
+"""
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.core.models import DataVersion
+from apps.students.accounts import actual_balances
+from apps.students.models import StudentBalance
+
+FIELDS = ('billed', 'paid', 'outstanding', 'receipts', 'first_unpaid_due')
+EMPTY = {'billed': Decimal('0'), 'paid': Decimal('0'), 'outstanding': Decimal('0'), 'receipts': 0, 'first_unpaid_due': None}
+
+
+class Command(BaseCommand):
+    help = 'Detect and optionally repair drift in student fee balances'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Write the recomputed balances')
+    
+    def handle(self, *args, **options):
+        actual = actual_balances()
+        stored = {(row.student_id, row.fiscal_year): row for row in StudentBalance.objects.all()}
+        
+        changed = []
+        for key in sorted(stored.keys() | actual.keys()):
+            expected = actual.get(key, EMPTY)
+            row = stored.get(key) or StudentBalance(student_id=key[0], fiscal_year=key[1])
+            drift = [name for name in FIELDS if getattr(row, name) != expected[name]]
+            if not drift:
+                continue
+            self.stdout.write(
+                f'Student {key[0]} FY {key[1]}: '
+                + ', '.join(f'{name} {getattr(row, name)} -> {expected[name]}' for name in drift)
+            )
+            for name in FIELDS:
+                setattr(row, name, expected[name])
+            changed.append(row)
+        
+        if options['fix'] and changed:
+            with transaction.atomic():
+                StudentBalance.objects.bulk_create([row for row in changed if row.pk is None], batch_size=500)
+                StudentBalance.objects.bulk_update([row for row in changed if row.pk], FIELDS, batch_size=500)
+                DataVersion.bump(StudentBalance._meta.label)
+        
+        verb = 'Fixed' if options['fix'] else 'Found'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(changed)} student balances with drift.'))
@@ -0,0 +1,106 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:57
+
+import apps.core.tracking
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('finance', '0004_expense_flags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeeSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('due_date', models.DateField()),
+                ('description', models.CharField(blank=True, max_length=200)),
+                ('fiscal_year', models.PositiveSmallIntegerField(editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'fee_schedules',
+                'ordering': ['due_date', 'id'],
+            },
+            bases=(apps.core.tracking.TrackedFieldsMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='Student',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('admission_number', models.CharField(max_length=50, unique=True)),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(blank=True, max_length=100)),
+                ('grade', models.CharField(blank=True, max_length=20)),
+                ('section', models.CharField(blank=True, max_length=10)),
+                ('guardian_name', models.CharField(blank=True, max_length=200)),
+                ('guardian_phone', models.CharField(blank=True, max_length=15)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'students',
+                'ordering': ['admission_number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fiscal_year', models.PositiveSmallIntegerField()),
+                ('billed', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('paid', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('outstanding', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('receipts', models.PositiveIntegerField(default=0)),
+                ('first_unpaid_due', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='students.student')),
+            ],
+            options={
+                'db_table': 'student_balances',
+                'ordering': ['-fiscal_year', 'student'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['grade', 'section'], name='students_grade_9a2fa6_idx'),
+        ),
+        migrations.AddField(
+            model_name='feeschedule',
+            name='income_source',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='fee_schedules', to='finance.incomesource'),
+        ),
+        migrations.AddField(
+            model_name='feeschedule',
+            name='student',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fee_schedules', to='students.student'),
+        ),
+        migrations.AddIndex(
+            model_name='studentbalance',
+            index=models.Index(fields=['fiscal_year', 'first_unpaid_due'], name='student_bal_fiscal__3cfebb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentbalance',
+            index=models.Index(fields=['fiscal_year', '-outstanding'], name='student_bal_fiscal__7109c9_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentbalance',
+            constraint=models.UniqueConstraint(fields=('fiscal_year', 'student'), name='unique_student_balance'),
+        ),
+        migrations.AddIndex(
+            model_name='feeschedule',
+            index=models.Index(fields=['student', 'fiscal_year', 'due_date'], name='fee_schedul_student_a2f7b0_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='feeschedule',
+            constraint=models.UniqueConstraint(fields=('student', 'income_source', 'due_date'), name='unique_fee_schedule_instalment'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:05
+
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def link_receipts(apps, schema_editor):
+    """One student per admission number found on receipts, linked and with seeded balances"""
+    db_alias = schema_editor.connection.alias
+    Student = apps.get_model('students', 'Student')
+    StudentBalance = apps.get_model('students', 'StudentBalance')
+    models = [apps.get_model('finance', 'Income'), apps.get_model('archive', 'ArchivedIncome')]
+    
+    references = set()
+    for model in models:
+        rows = model.objects.using(db_alias).exclude(student_ref__isnull=True).exclude(student_ref='')
+        references.update(ref.strip() for ref in rows.values_list('student_ref', flat=True).distinct())
+    references.discard('')
+    
+    # Names are not known yet; the admission number stands in until the office fills them in
+    Student.objects.using(db_alias).bulk_create(
+        [Student(admission_number=ref, first_name=ref) for ref in sorted(references)],
+        batch_size=500, ignore_conflicts=True,
+    )
+    students = dict(Student.objects.using(db_alias).values_list('admission_number', 'id'))
+    
+    balances = {}
+    for model in models:
+        linked = []
+        for pk, ref in model.objects.using(db_alias).exclude(student_ref__isnull=True).values_list('id', 'student_ref').iterator():
+            if ref.strip() in students:
+                linked.append(model(id=pk, student_id=students[ref.strip()]))
+        model.objects.using(db_alias).bulk_update(linked, ['student'], batch_size=500)
+        grouped = model.objects.using(db_alias).filter(student__isnull=False).values('student_id', 'fiscal_year').annotate(
+            total=Sum('amount'), count=Count('id')
+        )
+        for row in grouped:
+            balance = balances.setdefault(
+                (row['student_id'], row['fiscal_year']),
+                StudentBalance(student_id=row['student_id'], fiscal_year=row['fiscal_year']),
+            )
+            balance.paid += row['total']
+            balance.outstanding -= row['total']
+            balance.receipts += row['count']
+    StudentBalance.objects.using(db_alias).bulk_create(balances.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('students', '0001_initial'),
+        ('finance', '0005_income_student'),
+        ('archive', '0003_income_student'),
+    ]
+    
+    operations = [
+        migrations.RunPython(link_receipts, migrations.RunPython.noop),
+    ]
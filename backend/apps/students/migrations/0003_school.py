@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0001_initial'),
+        ('students', '0002_link_receipts'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='student',
+            name='students_grade_9a2fa6_idx',
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='school',
+            field=models.ForeignKey(default=1, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='students', to='schools.school'),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='admission_number',
+            field=models.CharField(max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['school', 'grade', 'section'], name='students_school__454a56_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='student',
+            constraint=models.UniqueConstraint(fields=('school', 'admission_number'), name='unique_admission_number'),
+        ),
+    ]
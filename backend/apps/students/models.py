@@ -0,0 +1,110 @@
+"""
+Student Models - Students, their fee schedules and fee balances
+"""
+from django.db import models
+from apps.core import periods
+from apps.core.tenancy import assign_school
+from apps.core.tracking import TrackedFieldsMixin
+
+
+class Student(models.Model):
+    """Student Model"""
+    
+    school = models.ForeignKey('schools.School', on_delete=models.PROTECT, related_name='students', editable=False)
+    admission_number = models.CharField(max_length=50)
+    first_name = models.CharField(max_length=100)
+    last_name = models.CharField(max_length=100, blank=True)
+    grade = models.CharField(max_length=20, blank=True)  # e.g. "10"
+    section = models.CharField(max_length=10, blank=True)  # e.g. "B"
+    guardian_name = models.CharField(max_length=200, blank=True)
+    guardian_phone = models.CharField(max_length=15, blank=True)
+    is_active = models.BooleanField(default=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'students'
+        ordering = ['admission_number']
+        constraints = [
+            models.UniqueConstraint(fields=['school', 'admission_number'], name='unique_admission_number'),
+        ]
+        indexes = [
+            models.Index(fields=['school', 'grade', 'section']),
+        ]
+    
+    def __str__(self):
+        return f"{self.admission_number} - {self.get_full_name()}"
+    
+    def save(self, *args, **kwargs):
+        assign_school(self)
+        super().save(*args, **kwargs)
+    
+    def get_full_name(self):
+        return f"{self.first_name} {self.last_name}".strip()
+
+
+class FeeSchedule(TrackedFieldsMixin, models.Model):
+    """One fee instalment a student owes, e.g. first-term tuition due on 10 April"""
+    
+    # Stored values kept for fee balances (see apps.students.accounts)
+    tracked_fields = ('student_id', 'fiscal_year', 'amount', 'due_date')
+    
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='fee_schedules')
+    income_source = models.ForeignKey('finance.IncomeSource', on_delete=models.PROTECT, related_name='fee_schedules')
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    due_date = models.DateField()
+    description = models.CharField(max_length=200, blank=True)
+    fiscal_year = models.PositiveSmallIntegerField(editable=False)  # derived from due_date
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'fee_schedules'
+        ordering = ['due_date', 'id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student', 'income_source', 'due_date'], name='unique_fee_schedule_instalment'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['student', 'fiscal_year', 'due_date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.student_id} - {self.income_source_id} - ₹{self.amount} due {self.due_date}"
+    
+    def save(self, *args, **kwargs):
+        self.fiscal_year = periods.fiscal_year_of(self.due_date)
+        super().save(*args, **kwargs)
+
+
+class StudentBalance(models.Model):
+    """Fees billed and received per student and financial year, maintained incrementally"""
+    
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='balances')
+    fiscal_year = models.PositiveSmallIntegerField()
+    billed = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # fee schedules
+    paid = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # linked income receipts
+    outstanding = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # billed - paid
+    receipts = models.PositiveIntegerField(default=0)
+    
+    # Due date of the first instalment the payments do not cover, paying instalments
+    # in due-date order; null when everything is paid
+    first_unpaid_due = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'student_balances'
+        ordering = ['-fiscal_year', 'student']
+        constraints = [
+            models.UniqueConstraint(fields=['fiscal_year', 'student'], name='unique_student_balance'),
+        ]
+        indexes = [
+            models.Index(fields=['fiscal_year', 'first_unpaid_due']),  # defaulters
+            models.Index(fields=['fiscal_year', '-outstanding']),  # largest balances first
+        ]
+    
+    def __str__(self):
+        return f"{self.student_id} - FY {periods.financial_year_label(self.fiscal_year)} - ₹{self.outstanding} due"
@@ -0,0 +1,75 @@
+"""
+Student Serializers
+"""
+from rest_framework import serializers
+from apps.core import periods, tenancy
+from apps.core.refdata import INCOME_SOURCE, ReferenceNameField
+from .models import Student, FeeSchedule, StudentBalance
+
+
+class StudentSerializer(serializers.ModelSerializer):
+    """Student Serializer"""
+    full_name = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Student
+        fields = '__all__'
+        read_only_fields = ['created_at', 'updated_at']
+    
+    def validate(self, attrs):
+        school_id = self.instance.school_id if self.instance is not None else tenancy.default_school_id()
+        errors = tenancy.taken_in_school(Student, school_id, attrs, ['admission_number'], self.instance)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+    
+    def get_full_name(self, obj):
+        return obj.get_full_name()
+
+
+class FeeScheduleSerializer(serializers.ModelSerializer):
+    """Fee Schedule Serializer"""
+    source_name = ReferenceNameField(INCOME_SOURCE, source='income_source_id')
+    financial_year = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = FeeSchedule
+        fields = '__all__'
+        read_only_fields = ['fiscal_year', 'created_at', 'updated_at']
+    
+    def get_financial_year(self, obj):
+        return periods.financial_year_label(obj.fiscal_year)
+
+
+class StudentBalanceSerializer(serializers.ModelSerializer):
+    """Fee balance of a student for one financial year (rows are loaded with their student)"""
+    admission_number = serializers.CharField(source='student.admission_number', read_only=True)
+    student_name = serializers.CharField(source='student.get_full_name', read_only=True)
+    grade = serializers.CharField(source='student.grade', read_only=True)
+    section = serializers.CharField(source='student.section', read_only=True)
+    financial_year = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = StudentBalance
+        fields = [
+            'student', 'admission_number', 'student_name', 'grade', 'section', 'financial_year',
+            'billed', 'paid', 'outstanding', 'receipts', 'first_unpaid_due', 'updated_at',
+        ]
+    
+    def get_financial_year(self, obj):
+        return periods.financial_year_label(obj.fiscal_year)
+
+
+class DefaulterSerializer(StudentBalanceSerializer):
+    """Balance with the amount overdue as of a date (``overdue`` and ``as_of`` in the context)"""
+    overdue_amount = serializers.SerializerMethodField()
+    days_overdue = serializers.SerializerMethodField()
+    
+    class Meta(StudentBalanceSerializer.Meta):
+        fields = StudentBalanceSerializer.Meta.fields + ['overdue_amount', 'days_overdue']
+    
+    def get_overdue_amount(self, obj):
+        return self.context['overdue'].get(obj.student_id)
+    
+    def get_days_overdue(self, obj):
+        return (self.context['as_of'] - obj.first_unpaid_due).days
@@ -0,0 +1,36 @@
+"""
+Student Signals - Fee balances
+
+See apps.students.accounts; each save or delete of a fee schedule or a
+student's income receipt moves its amount between StudentBalance rows.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.finance.models import Income
+from .accounts import record_state, sync_receipt, sync_schedule
+from .models import FeeSchedule
+
+
+@receiver(post_save, sender=Income, dispatch_uid='students.balance_receipt.save')
+def update_balance_on_receipt_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    sync_receipt(instance.stored_state(created), record_state(instance, Income.tracked_fields))
+
+
+@receiver(post_delete, sender=Income, dispatch_uid='students.balance_receipt.delete')
+def update_balance_on_receipt_delete(sender, instance, **kwargs):
+    sync_receipt(instance.stored_state(), None)
+
+
+@receiver(post_save, sender=FeeSchedule, dispatch_uid='students.balance_schedule.save')
+def update_balance_on_schedule_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    sync_schedule(instance.stored_state(created), record_state(instance, FeeSchedule.tracked_fields))
+
+
+@receiver(post_delete, sender=FeeSchedule, dispatch_uid='students.balance_schedule.delete')
+def update_balance_on_schedule_delete(sender, instance, **kwargs):
+    sync_schedule(instance.stored_state(), None)
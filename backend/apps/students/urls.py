@@ -0,0 +1,15 @@
+"""
+Student URLs
+"""
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import StudentViewSet, FeeScheduleViewSet, StudentBalanceViewSet
+
+router = DefaultRouter()
+router.register(r'students', StudentViewSet, basename='student')
+router.register(r'fee-schedules', FeeScheduleViewSet, basename='fee-schedule')
+router.register(r'balances', StudentBalanceViewSet, basename='student-balance')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
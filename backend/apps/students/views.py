@@ -0,0 +1,155 @@
+"""
+Student Views
+"""
+import datetime
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters
+
+from apps.archive.ledger import ledger
+from apps.core import periods
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.refdata import refdata, INCOME_SOURCE
+from apps.core.tenancy import TenantScopedMixin
+from apps.finance.models import Income
+from .accounts import overdue_amounts
+from .models import Student, FeeSchedule, StudentBalance
+from .serializers import (
+    StudentSerializer,
+    FeeScheduleSerializer,
+    StudentBalanceSerializer,
+    DefaulterSerializer
+)
+
+# Everything a balance row is derived from (balances themselves change through F() updates)
+BALANCE_SOURCES = ['finance.Income', 'archive.ArchivedIncome', 'students.FeeSchedule']
+
+
+def requested_fiscal_year(request):
+    """``?financial_year=2024-25``, the current one by default; None when malformed"""
+    financial_year = request.query_params.get('financial_year')
+    if not financial_year:
+        return periods.fiscal_year_of(timezone.localdate())
+    try:
+        return periods.parse_financial_year(financial_year)
+    except ValueError:
+        return None
+
+
+class StudentViewSet(TenantScopedMixin, ConditionalGetMixin, viewsets.ModelViewSet):
+    """Student ViewSet"""
+    queryset = Student.objects.all()
+    serializer_class = StudentSerializer
+    conditional_extra_models = BALANCE_SOURCES
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filterset_fields = ['grade', 'section', 'is_active']
+    search_fields = ['admission_number', 'first_name', 'last_name', 'guardian_phone']
+    
+    @action(detail=True, methods=['get'])
+    def ledger(self, request, pk=None):
+        """Fee schedules, receipts and balance of one student for ``?financial_year=2024-25``"""
+        student = self.get_object()
+        fiscal_year = requested_fiscal_year(request)
+        if fiscal_year is None:
+            return Response({'error': 'Use the "2024-25" format for financial_year'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        schedules = FeeSchedule.objects.filter(student=student, fiscal_year=fiscal_year)
+        receipts = []
+        for queryset in ledger(Income, fiscal_years=[fiscal_year], student_id=student.id, fiscal_year=fiscal_year):
+            receipts.extend(queryset.order_by('date', 'id').values(
+                'id', 'date', 'amount', 'income_source_id', 'payment_mode', 'reference_id'
+            ))
+        for receipt in receipts:
+            receipt['source_name'] = refdata.name(INCOME_SOURCE, receipt['income_source_id'])
+        
+        balance = StudentBalance.objects.filter(student=student, fiscal_year=fiscal_year).first()
+        return Response({
+            'student': StudentSerializer(student).data,
+            'financial_year': periods.financial_year_label(fiscal_year),
+            'balance': StudentBalanceSerializer(balance).data if balance else None,
+            'schedules': FeeScheduleSerializer(schedules, many=True).data,
+            'receipts': receipts,
+        })
+
+
+class FeeScheduleViewSet(TenantScopedMixin, ConditionalGetMixin, viewsets.ModelViewSet):
+    """Fee Schedule ViewSet"""
+    queryset = FeeSchedule.objects.all()
+    tenant_field = 'student__school'
+    serializer_class = FeeScheduleSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['student', 'income_source', 'fiscal_year', 'due_date']
+    ordering_fields = ['due_date', 'amount']
+    ordering = ['due_date']
+
+
+class StudentBalanceViewSet(TenantScopedMixin, ConditionalGetMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Fee balances of one financial year, largest outstanding first
+
+    ``?financial_year=2024-25`` (default: the current one), ``?grade=10``,
+    ``?section=B``, ``?outstanding=true`` (only students who owe money).
+    """
+    queryset = StudentBalance.objects.select_related('student')
+    tenant_field = 'student__school'
+    serializer_class = StudentBalanceSerializer
+    conditional_extra_models = BALANCE_SOURCES
+    permission_classes = [IsAuthenticated]
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['outstanding', 'paid', 'billed', 'first_unpaid_due']
+    ordering = ['-outstanding', 'student']
+    
+    def get_conditional_key_parts(self, request):
+        return [timezone.localdate().isoformat()]  # default year and defaulters' as_of
+    
+    def get_queryset(self):
+        balances = super().get_queryset().filter(fiscal_year=self.fiscal_year)
+        params = self.request.query_params
+        if params.get('grade'):
+            balances = balances.filter(student__grade=params['grade'])
+        if params.get('section'):
+            balances = balances.filter(student__section=params['section'])
+        if params.get('outstanding') == 'true':
+            balances = balances.filter(outstanding__gt=0)
+        return balances
+    
+    def initial(self, request, *args, **kwargs):
+        self.fiscal_year = requested_fiscal_year(request)
+        super().initial(request, *args, **kwargs)
+    
+    def list(self, request, *args, **kwargs):
+        if self.fiscal_year is None:
+            return Response({'error': 'Use the "2024-25" format for financial_year'}, status=status.HTTP_400_BAD_REQUEST)
+        return super().list(request, *args, **kwargs)
+    
+    @action(detail=False, methods=['get'])
+    def defaulters(self, request):
+        """Students with an instalment due before ``?as_of`` (default today) still unpaid
+
+        ``?min_days=30`` keeps those overdue by at least that many days;
+        oldest unpaid instalment first.
+        """
+        if self.fiscal_year is None:
+            return Response({'error': 'Use the "2024-25" format for financial_year'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            as_of = parse_date(request.query_params.get('as_of') or '') or timezone.localdate()
+        except ValueError:
+            return Response({'error': 'as_of must be a valid date (YYYY-MM-DD)'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            min_days = max(int(request.query_params.get('min_days', 1)), 1)
+        except ValueError:
+            return Response({'error': 'min_days must be a whole number of days'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        balances = self.get_queryset().filter(
+            first_unpaid_due__lte=as_of - datetime.timedelta(days=min_days)
+        ).order_by('first_unpaid_due', 'student')
+        page = self.paginate_queryset(balances)
+        context = self.get_serializer_context() | {'as_of': as_of, 'overdue': overdue_amounts(page, as_of)}
+        return self.get_paginated_response(DefaulterSerializer(page, many=True, context=context).data)
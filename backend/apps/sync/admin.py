@@ -0,0 +1,30 @@
+"""
+Sync Admin Configuration
+"""
+from django.contrib import admin
+from apps.core.admin_performance import PerformanceAdminMixin
+from .models import ChangeEntry, JournalCompaction
+
+
+@admin.register(ChangeEntry)
+class ChangeEntryAdmin(PerformanceAdminMixin, admin.ModelAdmin):
+    """The change journal (read-only)"""
+    list_display = ['id', 'model', 'object_id', 'action', 'school', 'changed_at']
+    list_filter = ['model', 'action', 'school']
+    search_fields = ['object_id']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(JournalCompaction)
+class JournalCompactionAdmin(admin.ModelAdmin):
+    """Compaction runs and forced resets"""
+    list_display = ['ran_at', 'through_id', 'collapsed', 'expired', 'reason']
+    readonly_fields = ['through_id', 'collapsed', 'expired', 'reason', 'ran_at']
+    
+    def has_add_permission(self, request):
+        return False
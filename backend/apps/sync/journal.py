@@ -0,0 +1,119 @@
+"""
+Change journal - which records changed, in order, for delta sync
+
+Saves and deletes of the journaled models append an entry to a
+per-thread buffer; the buffer is written with one bulk INSERT when the
+transaction commits (right away outside a transaction), so an import or
+payroll run inside ``transaction.atomic()`` adds its entries in a single
+batch. A rolled-back transaction can leave entries behind in the buffer:
+they are written with the next batch and are harmless, since the sync
+endpoint serves a record's current state (a record that does not exist
+reads as deleted).
+
+Writes that skip model signals call ``record_many()`` (F() counter
+updates, bulk fixes) or ``force_reset()`` (archiving a year moves rows
+out of the hot tables wholesale).
+
+Compaction keeps the newest entry of every record and drops entries past
+``SYNC_JOURNAL_RETENTION_DAYS``; cursors older than what it dropped get a
+reset. Schools with a database of their own keep their journal there.
+"""
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+from django.db.models import Max, Subquery
+from django.utils import timezone
+
+from .models import ChangeEntry, JournalCompaction
+
+JOURNALED_MODELS = [
+    'departments.Department',
+    'finance.IncomeSource',
+    'finance.ExpenseCategory',
+    'finance.Income',
+    'finance.Expense',
+    'budget.Budget',
+    'salary.Employee',
+    'salary.Salary',
+]
+
+_buffer = threading.local()
+
+
+def pending(using):
+    """This thread's unwritten entries for a database"""
+    if not hasattr(_buffer, 'entries'):
+        _buffer.entries = {}
+    return _buffer.entries.setdefault(using, [])
+
+
+def record(model, object_id, action, school_id=None, using=None):
+    """Journal one change; written when the current transaction commits"""
+    using = using or router.db_for_write(model)
+    pending(using).append(ChangeEntry(
+        model=model._meta.label, object_id=object_id, action=action, school_id=school_id,
+    ))
+    # Registered every time: a rolled-back transaction drops its callback, not
+    # the buffer, and the first callback to run writes everything pending
+    transaction.on_commit(lambda: flush(using), using=using)
+
+
+def record_many(model, rows, action='UPDATE', using=None):
+    """Journal changes made without model signals; ``rows`` are (id, school_id) pairs"""
+    using = using or router.db_for_write(model)
+    entries = pending(using)
+    label = model._meta.label
+    for object_id, school_id in rows:
+        entries.append(ChangeEntry(model=label, object_id=object_id, action=action, school_id=school_id))
+    transaction.on_commit(lambda: flush(using), using=using)
+
+
+def flush(using):
+    entries = pending(using)
+    if not entries:
+        return
+    batch = entries[:]
+    entries.clear()
+    ChangeEntry.objects.using(using).bulk_create(batch, batch_size=1000)
+
+
+def latest_id(using=None):
+    return ChangeEntry.objects.using(using).aggregate(latest=Max('id'))['latest'] or 0
+
+
+def horizon(using=None):
+    """Cursors below this one can no longer be continued from"""
+    return JournalCompaction.objects.using(using).aggregate(through=Max('through_id'))['through'] or 0
+
+
+def force_reset(reason, using=None):
+    """Make every existing cursor too old, for changes the journal does not list"""
+    using = using or router.db_for_write(ChangeEntry)
+    flush(using)
+    marker = ChangeEntry.objects.using(using).create(model='', object_id=0, action='RESET')
+    return JournalCompaction.objects.using(using).create(through_id=marker.pk, reason=reason)
+
+
+def compact(retention_days=None, using=DEFAULT_DB_ALIAS):
+    """Drop superseded entries and entries past the retention; returns the JournalCompaction"""
+    if retention_days is None:
+        retention_days = getattr(settings, 'SYNC_JOURNAL_RETENTION_DAYS', 30)
+    entries = ChangeEntry.objects.using(using)
+    
+    with transaction.atomic(using=using):
+        cutoff = timezone.now() - timedelta(days=retention_days)
+        through = entries.filter(changed_at__lt=cutoff).aggregate(through=Max('id'))['through']
+        expired = entries.filter(id__lte=through).delete()[0] if through else 0
+        
+        # Only the newest entry of a record matters to any cursor before it
+        newest = entries.order_by().values('model', 'object_id').annotate(newest=Max('id')).values('newest')
+        collapsed = entries.exclude(id__in=Subquery(newest)).delete()[0]
+        
+        return JournalCompaction.objects.using(using).create(
+            through_id=max(through or 0, horizon(using)),
+            collapsed=collapsed,
+            expired=expired,
+            reason=f'compaction, {retention_days} days kept',
+        )
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('schools', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JournalCompaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('through_id', models.PositiveBigIntegerField(default=0)),
+                ('collapsed', models.PositiveIntegerField(default=0)),
+                ('expired', models.PositiveIntegerField(default=0)),
+                ('reason', models.CharField(blank=True, max_length=200)),
+                ('ran_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'change_journal_compactions',
+                'ordering': ['-ran_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ChangeEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=50)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('action', models.CharField(choices=[('CREATE', 'Create'), ('UPDATE', 'Update'), ('DELETE', 'Delete'), ('RESET', 'Reset')], max_length=6)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('school', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='schools.school')),
+            ],
+            options={
+                'verbose_name_plural': 'Change entries',
+                'db_table': 'change_journal',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['school', 'id'], name='change_jour_school__3f55bd_idx'), models.Index(fields=['model', 'object_id'], name='change_jour_model_93e845_idx'), models.Index(fields=['changed_at'], name='change_jour_changed_132be7_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+"""
+Sync Models - the change journal clients follow instead of refetching lists
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class ChangeEntry(models.Model):
+    """One create, update or delete of a journaled record
+
+    The id is the sync cursor. Entries only say which record changed; the
+    sync endpoint reads its current state when it serves them.
+    """
+    
+    ACTION_CHOICES = [
+        ('CREATE', 'Create'),
+        ('UPDATE', 'Update'),
+        ('DELETE', 'Delete'),
+        ('RESET', 'Reset'),  # marker written by journal.force_reset()
+    ]
+    
+    model = models.CharField(max_length=50)  # e.g. "finance.Income"
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    school = models.ForeignKey(
+        'schools.School', on_delete=models.CASCADE, null=True, blank=True, related_name='+'
+    )  # null for records every school shares (income sources, expense categories)
+    changed_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'change_journal'
+        ordering = ['id']
+        verbose_name_plural = 'Change entries'
+        indexes = [
+            models.Index(fields=['school', 'id']),
+            models.Index(fields=['model', 'object_id']),
+            models.Index(fields=['changed_at']),
+        ]
+    
+    def __str__(self):
+        return f"#{self.pk} {self.action} {self.model} {self.object_id}"
+
+
+class JournalCompaction(models.Model):
+    """A compaction run, or a reset forced by a change the journal cannot describe
+
+    Cursors below the highest ``through_id`` are too old to continue from:
+    clients holding one reload their lists.
+    """
+    
+    through_id = models.PositiveBigIntegerField(default=0)
+    collapsed = models.PositiveIntegerField(default=0)  # superseded entries removed
+    expired = models.PositiveIntegerField(default=0)  # entries past the retention removed
+    reason = models.CharField(max_length=200, blank=True)
+    ran_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'change_journal_compactions'
+        ordering = ['-ran_at']
+    
+    def __str__(self):
+        return f"Through #{self.through_id} at {self.ran_at:%Y-%m-%d %H:%M}"
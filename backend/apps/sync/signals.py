@@ -0,0 +1,25 @@
+"""
+Sync Signals - journal every save and delete of the synced models
+"""
+from django.db.models.signals import post_save, post_delete
+
+from . import journal
+
+
+def journal_save(sender, instance, created=False, raw=False, using=None, **kwargs):
+    if raw:
+        # Skip fixture loading
+        return
+    action = 'CREATE' if created else 'UPDATE'
+    journal.record(sender, instance.pk, action, getattr(instance, 'school_id', None), using)
+
+
+def journal_delete(sender, instance, using=None, **kwargs):
+    journal.record(sender, instance.pk, 'DELETE', getattr(instance, 'school_id', None), using)
+
+
+def connect_journal_signals():
+    for label in journal.JOURNALED_MODELS:
+        uid = f'sync.journal.{label}'
+        post_save.connect(journal_save, sender=label, dispatch_uid=uid + '.save')
+        post_delete.connect(journal_delete, sender=label, dispatch_uid=uid + '.delete')
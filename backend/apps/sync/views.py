@@ -0,0 +1,109 @@
+"""
+Sync Views
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.budget.views import BudgetViewSet
+from apps.core import tenancy
+from apps.departments.views import DepartmentViewSet
+from apps.finance.views import IncomeSourceViewSet, IncomeViewSet, ExpenseCategoryViewSet, ExpenseViewSet
+from apps.salary.views import EmployeeViewSet, SalaryViewSet
+from . import journal
+from .models import ChangeEntry
+
+# The list endpoint each journaled model mirrors: its queryset decides what
+# exists (e.g. inactive employees read as deleted) and its serializer the payload
+SYNC_SOURCES = {
+    'departments.Department': DepartmentViewSet,
+    'finance.IncomeSource': IncomeSourceViewSet,
+    'finance.ExpenseCategory': ExpenseCategoryViewSet,
+    'finance.Income': IncomeViewSet,
+    'finance.Expense': ExpenseViewSet,
+    'budget.Budget': BudgetViewSet,
+    'salary.Employee': EmployeeViewSet,
+    'salary.Salary': SalaryViewSet,
+}
+
+
+class SyncView(APIView):
+    """Records changed since a cursor, for clients keeping local copies of the lists
+
+    ``GET /api/sync/`` returns the current cursor. ``?since=<cursor>``
+    returns up to ``?limit`` changes after it, oldest first and one per
+    record: ``UPSERT`` with the record as its list endpoint renders it, or
+    ``DELETE``. Repeat with the returned cursor while ``more`` is true.
+    ``reset: true`` means the cursor is too old (the journal was compacted
+    past it): reload the lists, then continue from the returned cursor.
+    ``?models=finance.Income,finance.Expense`` limits the changes.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        labels = request.query_params.get('models')
+        labels = labels.split(',') if labels else list(SYNC_SOURCES)
+        unknown = [label for label in labels if label not in SYNC_SOURCES]
+        if unknown:
+            return Response({'error': f'Unknown models: {", ".join(unknown)}'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', settings.SYNC_PAGE_SIZE)), settings.SYNC_MAX_PAGE_SIZE)
+            since = request.query_params.get('since')
+            since = int(since) if since not in (None, '') else None
+        except ValueError:
+            return Response({'error': 'since and limit must be whole numbers'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # After a compaction expired everything, the horizon is ahead of the last entry
+        horizon = journal.horizon()
+        latest = max(journal.latest_id(), horizon)
+        if since is None or since < horizon or since > latest:
+            return Response({'cursor': latest, 'reset': since is not None, 'more': False, 'changes': []})
+        
+        entries = ChangeEntry.objects.filter(id__gt=since, model__in=labels)
+        school_id = tenancy.current_school_id()
+        if school_id is not None:
+            entries = entries.filter(Q(school_id=school_id) | Q(school__isnull=True))
+        page = list(entries.order_by('id').values_list('id', 'model', 'object_id')[:limit + 1])
+        more = len(page) > limit
+        page = page[:limit]
+        
+        return Response({
+            'cursor': page[-1][0] if page else latest,
+            'reset': False,
+            'more': more,
+            'changes': self.changes(request, page),
+        })
+    
+    def changes(self, request, page):
+        """The current state of every record in ``page``, in the order of its last change"""
+        last_change = {}
+        for entry_id, label, object_id in page:
+            last_change[(label, object_id)] = entry_id
+        ids = defaultdict(list)
+        for label, object_id in last_change:
+            ids[label].append(object_id)
+        
+        current = {}
+        for label, object_ids in ids.items():
+            viewset = SYNC_SOURCES[label]
+            queryset = viewset.queryset.all()
+            queryset = queryset.filter(pk__in=object_ids, **tenancy.school_filter(queryset.model))
+            serializer = viewset.serializer_class(queryset, many=True, context={'request': request})
+            for data in serializer.data:
+                current[(label, data['id'])] = data
+        
+        changes = []
+        for key, _ in sorted(last_change.items(), key=lambda item: item[1]):
+            data = current.get(key)
+            changes.append({
+                'model': key[0],
+                'id': key[1],
+                'action': 'UPSERT' if data is not None else 'DELETE',
+                'data': data,
+            })
+        return changes
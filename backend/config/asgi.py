@@ -1,5 +1,8 @@
 """
 ASGI config for School ERP System project.
+
+Server-sent events (``/api/events/``, see apps.events) are served here
+beside the Django application.
 """
 
 import os
@@ -8,4 +11,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once get_asgi_application() has set Django up
+from apps.events.asgi import EventStreamRouter  # noqa: E402
+
+application = EventStreamRouter(django_application)
@@ -30,12 +30,20 @@ INSTALLED_APPS = [
     'django_filters',
     
     # Local apps
+    'apps.core',
+    'apps.schools',
     'apps.authentication',
     'apps.departments',
     'apps.finance',
     'apps.budget',
     'apps.salary',
     'apps.reports',
+    'apps.archive',
+    'apps.students',
+    'apps.reconciliation',
+    'apps.sync',
+    'apps.events',
+    'apps.approvals',
 ]
 
 MIDDLEWARE = [
@@ -45,6 +53,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.tenancy.TenantMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -81,6 +90,14 @@ DATABASES = {
     }
 }
 
+# Schools with a database of their own (School.database), as "alias=name,..."
+# on the default database server; create each with `migrate --database=<alias>`
+for entry in filter(None, config('SCHOOL_DATABASES', default='').split(',')):
+    alias, name = entry.split('=', 1)
+    DATABASES[alias.strip()] = {**DATABASES['default'], 'NAME': name.strip()}
+
+DATABASE_ROUTERS = ['apps.core.tenancy.TenantRouter']
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -103,6 +120,9 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads larger than this are streamed to a temporary file instead of memory
+FILE_UPLOAD_MAX_MEMORY_SIZE = config('FILE_UPLOAD_MAX_MEMORY_SIZE', default=256 * 1024, cast=int)  # bytes
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -112,7 +132,7 @@ AUTH_USER_MODEL = 'authentication.User'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.authentication.backends.TenantJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -120,10 +140,96 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'apps.core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'COERCE_DECIMAL_TO_STRING': True,  # Money is sent as exact strings, never floats
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
 }
 
+# Reports
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=300, cast=int)  # seconds
+
+# File downloads: 'django' streams them from Python, 'x-accel-redirect' (nginx)
+# or 'x-sendfile' (Apache) let the proxy send the bytes after Django's checks
+FILE_SERVE_BACKEND = config('FILE_SERVE_BACKEND', default='django')
+FILE_SERVE_ACCEL_PREFIX = config('FILE_SERVE_ACCEL_PREFIX', default='/protected-media/')  # nginx internal location
+
+# Generated exports (audit CSVs) live outside MEDIA_ROOT, so no public media URL reaches
+# them; with x-accel-redirect nginx needs an internal location for them as well
+EXPORT_ROOT = config('EXPORT_ROOT', default=str(BASE_DIR / 'var' / 'exports'))
+EXPORT_ACCEL_PREFIX = config('EXPORT_ACCEL_PREFIX', default='/protected-exports/')
+
+# Admin changelists: joined FKs, autocomplete widgets, estimated counts and cached period filters
+ADMIN_PERFORMANCE_MODE = config('ADMIN_PERFORMANCE_MODE', default=True, cast=bool)
+
+# Seconds between checks that in-memory autocomplete indexes are current
+AUTOCOMPLETE_VERSION_CHECK_INTERVAL = config('AUTOCOMPLETE_VERSION_CHECK_INTERVAL', default=5, cast=int)
+
+# Seconds between checks that cached departments/sources/categories are current
+REFERENCE_DATA_CHECK_INTERVAL = config('REFERENCE_DATA_CHECK_INTERVAL', default=5, cast=int)
+
+# Receipt thumbnails/previews are generated by this many background threads
+RECEIPT_PREVIEW_WORKERS = config('RECEIPT_PREVIEW_WORKERS', default=2, cast=int)
+
+# Expense anomaly scan: robust z-score above which an amount is flagged, and the
+# smallest category/department it judges
+ANOMALY_Z_THRESHOLD = config('ANOMALY_Z_THRESHOLD', default=3.5, cast=float)
+ANOMALY_MIN_GROUP_SIZE = config('ANOMALY_MIN_GROUP_SIZE', default=10, cast=int)
+
+# Bank statement reconciliation: how far a ledger row's amount (rupees) and date (days)
+# may be from a statement line's and still match it
+RECONCILIATION_AMOUNT_TOLERANCE = config('RECONCILIATION_AMOUNT_TOLERANCE', default='0.00')
+RECONCILIATION_DATE_TOLERANCE_DAYS = config('RECONCILIATION_DATE_TOLERANCE_DAYS', default=3, cast=int)
+
+# Seconds a process keeps its copy of the schools table
+SCHOOL_CACHE_SECONDS = config('SCHOOL_CACHE_SECONDS', default=60, cast=int)
+
+# Change journal behind /api/sync/: days compaction keeps, and changes per response
+SYNC_JOURNAL_RETENTION_DAYS = config('SYNC_JOURNAL_RETENTION_DAYS', default=30, cast=int)
+SYNC_PAGE_SIZE = config('SYNC_PAGE_SIZE', default=500, cast=int)
+SYNC_MAX_PAGE_SIZE = 5000
+
+# Server-sent events at /api/events/ (ASGI): the broker carrying events to the streams
+# (apps.events.broker.RedisBroker when more than one process serves the API), the
+# frames a stream may have unread before it is reset, and the keep-alive interval
+EVENTS_BROKER = config('EVENTS_BROKER', default='apps.events.broker.InProcessBroker')
+EVENTS_REDIS_URL = config(
+    'EVENTS_REDIS_URL',
+    default=f"redis://{config('REDIS_HOST', default='localhost')}:{config('REDIS_PORT', default=6379)}/0"
+)
+EVENTS_REDIS_CHANNEL = 'school-erp-events'
+EVENTS_QUEUE_SIZE = 256
+EVENTS_HEARTBEAT_SECONDS = config('EVENTS_HEARTBEAT_SECONDS', default=15, cast=int)
+
+# Report computations shared by concurrent identical requests (apps.core.singleflight):
+# seconds a request waits for the one in flight, and where the worker processes of a
+# node coordinate: a directory only the server's user may write, created 0700
+SINGLEFLIGHT_TIMEOUT = config('SINGLEFLIGHT_TIMEOUT', default=60, cast=int)
+SINGLEFLIGHT_DIR = config('SINGLEFLIGHT_DIR', default=str(BASE_DIR / 'var' / 'singleflight'))
+
+# Admission control for expensive report views (apps.core.admission), per worker process:
+# cost units (one per month of a report's date range) running at once in total and per
+# user, and how many requests may wait for room, for how many seconds, before a 429
+ADMISSION_CAPACITY = config('ADMISSION_CAPACITY', default=48, cast=int)
+ADMISSION_USER_CAPACITY = config('ADMISSION_USER_CAPACITY', default=24, cast=int)
+ADMISSION_MAX_QUEUE = config('ADMISSION_MAX_QUEUE', default=8, cast=int)
+ADMISSION_QUEUE_SECONDS = config('ADMISSION_QUEUE_SECONDS', default=5, cast=int)
+
+# Approval inbox (/api/approvals/): oldest items listed per department and queue
+APPROVAL_INBOX_ITEMS = config('APPROVAL_INBOX_ITEMS', default=20, cast=int)
+APPROVAL_INBOX_MAX_ITEMS = 100
+
+# Budget utilization thresholds (percent) that raise a BudgetAlert when crossed
+BUDGET_ALERT_THRESHOLDS = [80, 100]
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=config('ACCESS_TOKEN_LIFETIME', default=60, cast=int)),
@@ -5,17 +5,25 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from apps.core.views import AutocompleteView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     
     # API endpoints
     path('api/auth/', include('apps.authentication.urls')),
+    path('api/schools/', include('apps.schools.urls')),
     path('api/departments/', include('apps.departments.urls')),
     path('api/finance/', include('apps.finance.urls')),
     path('api/budget/', include('apps.budget.urls')),
     path('api/salary/', include('apps.salary.urls')),
+    path('api/students/', include('apps.students.urls')),
+    path('api/reconciliation/', include('apps.reconciliation.urls')),
     path('api/reports/', include('apps.reports.urls')),
+    path('api/sync/', include('apps.sync.urls')),
+    path('api/approvals/', include('apps.approvals.urls')),
+    path('api/core/', include('apps.core.urls')),
+    path('api/autocomplete/', AutocompleteView.as_view(), name='autocomplete'),
 ]
 
 # Serve media files in development
@@ -22,7 +22,6 @@ export default function BudgetList() {
             department: '',
             financial_year: financialYearString,
             allocated_amount: '',
-            status: 'DRAFT',
             notes: ''
         }
     })
@@ -191,18 +190,6 @@ export default function BudgetList() {
                         </div>
                     </div>
 
-                    <div className="space-y-1.5">
-                        <label className="text-sm font-bold text-slate-700 ml-1">Initial Status</label>
-                        <select
-                            {...register('status')}
-                            className="w-full px-4 py-3 bg-slate-50 border border-slate-200 rounded-2xl focus:ring-4 focus:ring-primary-100 focus:border-primary-400 transition-all text-sm appearance-none"
-                        >
-                            <option value="DRAFT">Draft</option>
-                            <option value="PENDING">Pending Approval</option>
-                            <option value="APPROVED">Already Approved</option>
-                        </select>
-                    </div>
-
                     <div className="space-y-1.5">
                         <label className="text-sm font-bold text-slate-700 ml-1">Planning Notes (Optional)</label>
                         <textarea
@@ -32,30 +32,30 @@ export default function Dashboard() {
     const startDate = `${currentYear}-01-01`
     const endDate = `${currentYear}-12-31`
 
-    const { data: summaryResponse, isLoading: loadingSummary } = useQuery({
-        queryKey: ['financialSummary', startDate, endDate],
-        queryFn: () => reportsService.getIncomeVsExpense({ start_date: startDate, end_date: endDate })
+    const { data: dashboardResponse, isLoading } = useQuery({
+        queryKey: ['dashboard', startDate, endDate],
+        queryFn: () => reportsService.getDashboard({ start_date: startDate, end_date: endDate })
     })
 
-    const { data: budgetResponse, isLoading: loadingBudget } = useQuery({
-        queryKey: ['budgetVsActual', currentYear],
-        queryFn: () => reportsService.getBudgetVsActual({ financial_year: currentYear })
-    })
-
-    const { data: deptSummaryResponse, isLoading: loadingDept } = useQuery({
-        queryKey: ['deptSummary', startDate, endDate],
-        queryFn: () => reportsService.getDepartmentSummary({ start_date: startDate, end_date: endDate })
-    })
-
-    // Safely extract data
-    const summary = summaryResponse?.data?.summary || {}
-    const budgetData = budgetResponse?.data?.budgets || []
-    const deptData = deptSummaryResponse?.data?.departments || []
+    // Amounts arrive as exact decimal strings; charts need numbers
+    const dashboard = dashboardResponse?.data || {}
+    const summary = dashboard.summary || {}
+    const budgetData = (dashboard.budgets || []).map(b => ({
+        ...b,
+        allocated_budget: Number(b.allocated_budget),
+        actual_spent: Number(b.actual_spent),
+    }))
+    const deptData = (dashboard.departments || []).map(d => ({
+        ...d,
+        income: Number(d.income),
+        expenses: Number(d.expenses),
+        net: Number(d.net),
+    }))
 
     const stats = {
-        totalIncome: summary.total_income || 0,
-        totalExpenses: summary.total_expenses || 0,
-        balance: summary.balance || 0,
+        totalIncome: Number(summary.total_income || 0),
+        totalExpenses: Number(summary.total_expenses || 0),
+        balance: Number(summary.balance || 0),
         budgetUsed: budgetData.length > 0
             ? budgetData.reduce((acc, curr) => acc + (curr.utilization_percentage || 0), 0) / budgetData.length
             : 0
@@ -67,7 +67,7 @@ export default function Dashboard() {
         maximumFractionDigits: 0
     }).format(val || 0)
 
-    if (loadingSummary || loadingBudget || loadingDept) {
+    if (isLoading) {
         return (
             <div className="space-y-8">
                 <div className="h-20 bg-slate-100 rounded-2xl animate-pulse" />
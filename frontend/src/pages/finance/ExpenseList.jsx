@@ -22,8 +22,7 @@ export default function ExpenseList() {
             amount: '',
             date: format(new Date(), 'yyyy-MM-dd'),
             description: '',
-            payment_mode: 'CASH',
-            status: 'PENDING'
+            payment_mode: 'CASH'
         }
     })
 
@@ -231,18 +230,6 @@ export default function ExpenseList() {
                                 <option value="CARD">Card</option>
                             </select>
                         </div>
-
-                        <div className="space-y-1.5">
-                            <label className="text-sm font-bold text-slate-700 ml-1">Initial Status</label>
-                            <select
-                                {...register('status')}
-                                className="w-full px-4 py-3 bg-slate-50 border border-slate-200 rounded-2xl focus:ring-4 focus:ring-primary-100 focus:border-primary-400 transition-all text-sm appearance-none"
-                            >
-                                <option value="PENDING">Pending Approval</option>
-                                <option value="APPROVED">Already Approved</option>
-                                <option value="PAID">Mark as Paid</option>
-                            </select>
-                        </div>
                     </div>
 
                     <div className="flex space-x-3 pt-4">
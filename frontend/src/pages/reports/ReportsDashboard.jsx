@@ -64,7 +64,13 @@ export default function ReportsDashboard() {
         queryFn: () => reportsService.getIncomeVsExpense({ start_date: startDate, end_date: endDate })
     })
 
-    const deptData = deptSummary?.data?.departments || []
+    // Amounts arrive as exact decimal strings; charts need numbers
+    const deptData = (deptSummary?.data?.departments || []).map(d => ({
+        ...d,
+        income: Number(d.income),
+        expenses: Number(d.expenses),
+        net: Number(d.net),
+    }))
     const incomeData = incomeVsExpense?.data?.summary ? [incomeVsExpense.data.summary] : []
 
     return (
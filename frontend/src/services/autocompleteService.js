@@ -0,0 +1,9 @@
+import api from './api'
+
+export const autocompleteService = {
+    // types: any of employee, department, income_source, expense_category, user
+    search: (q, types = [], limit = 10) =>
+        api.get('/autocomplete/', { params: { q, types: types.join(',') || undefined, limit } }),
+}
+
+export default autocompleteService
@@ -12,6 +12,9 @@ export const reportsService = {
 
     getDepartmentSummary: (params) =>
         api.get('/reports/department-summary/', { params }),
+
+    getDashboard: (params) =>
+        api.get('/reports/dashboard/', { params }),
 }
 
 export default reportsService